@@ -0,0 +1,143 @@
+"""Boot-time benchmark for pipeline.bootstrap.boot().
+
+Compares, in-process against a scratch copy of the repository's
+templates, slot types and agents:
+
+- ``eager``: the pre-container boot() -- a runner with its own registry,
+  a second registry for the AutoExecutor and an NL matcher that parses
+  every template up front
+- ``shared``: boot() on a lazily built Components container
+
+for two workloads: ``boot`` alone, and ``boot+run`` (boot, then prepare
+and auto-run a two-slot pipeline without NL matching).  The registry's
+disk cache is removed before every run, so both sides parse slot types
+and agents from scratch.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_boot.py
+    PYTHONPATH=src python3 benchmarks/bench_boot.py --runs 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.auto_executor import AutoExecutor, AutoExecutorConfig, CallbackExecutor
+from pipeline.bootstrap import BootstrappedExecutor, boot
+from pipeline.components import DEFAULT_DIRS, REGISTRY_CACHE_FILENAME
+from pipeline.nl_matcher import NLMatcher
+from pipeline.runner import PipelineRunner
+from pipeline.slot_contract import SlotContractManager
+from pipeline.slot_registry import SlotRegistry
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_BENCH_TEMPLATE = """\
+pipeline:
+  id: bench-feature
+  name: Bench Feature
+  version: "1.0.0"
+  description: Boot benchmark pipeline
+  created_by: bench
+  created_at: "2026-01-01T00:00:00Z"
+  slots:
+    - id: slot-design
+      slot_type: designer
+      name: Design
+      task: {objective: Design}
+    - id: slot-implement
+      slot_type: implementer
+      name: Implement
+      depends_on: [slot-design]
+      task: {objective: Implement}
+"""
+
+
+def _make_project(tmp: Path) -> Path:
+    """Copy templates, slot types and agents into a scratch project."""
+    project = tmp / "project"
+    for rel in ("specs/pipelines/templates", "specs/pipelines/slot-types", "agents"):
+        shutil.copytree(_REPO_ROOT / rel, project / rel)
+    (project / "specs/pipelines/templates/bench-feature.yaml").write_text(_BENCH_TEMPLATE)
+    (project / "state" / "active").mkdir(parents=True)
+    # Fresh copies are too new for the registry's mtime fingerprints
+    old = time.time() - 3600
+    for path in project.rglob("*"):
+        os.utime(path, (old, old))
+    return project
+
+
+def _eager_boot(project: Path) -> tuple[BootstrappedExecutor, PipelineRunner]:
+    """boot() as it was before components were shared."""
+    d = {k: str(project / v) for k, v in DEFAULT_DIRS.items()}
+    runner = PipelineRunner(
+        project_root=str(project),
+        templates_dir=d["templates_dir"],
+        state_dir=d["state_dir"],
+        slot_types_dir=d["slot_types_dir"],
+        agents_dir=d["agents_dir"],
+    )
+    auto = AutoExecutor(
+        runner,
+        CallbackExecutor(lambda si, aid: True),
+        SlotContractManager(str(project), d["contracts_dir"]),
+        SlotRegistry(d["slot_types_dir"], d["agents_dir"]),
+        config=AutoExecutorConfig(max_parallel=4),
+        project_root=str(project),
+    )
+    return BootstrappedExecutor(auto, runner, NLMatcher(d["templates_dir"])), runner
+
+
+def _shared_boot(project: Path) -> tuple[BootstrappedExecutor, PipelineRunner]:
+    return boot(str(project))
+
+
+def _time_ms(project: Path, boot_fn, run: bool) -> float:
+    (project / DEFAULT_DIRS["state_dir"] / REGISTRY_CACHE_FILENAME).unlink(missing_ok=True)
+    start = time.perf_counter()
+    auto, runner = boot_fn(project)
+    if run:
+        template = project / DEFAULT_DIRS["templates_dir"] / "bench-feature.yaml"
+        pipeline, state = runner.prepare(str(template), {})
+        auto.run(pipeline, state)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(runs: int) -> int:
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        project = _make_project(Path(tmp))
+        rows = []
+        for workload, with_run in (("boot", False), ("boot+run", True)):
+            for name, fn in (("eager", _eager_boot), ("shared", _shared_boot)):
+                _time_ms(project, fn, with_run)  # warm imports
+                times = [_time_ms(project, fn, with_run) for _ in range(runs)]
+                rows.append((workload, name, statistics.median(times)))
+
+    print(f"median of {runs} runs\n")
+    print(f"{'workload':<10}  {'boot':<7}  {'ms':>8}")
+    for workload, name, ms in rows:
+        print(f"{workload:<10}  {name:<7}  {ms:>8.2f}")
+    print()
+    for i in range(0, len(rows), 2):
+        print(f"{rows[i][0]}: shared is {rows[i][2] / rows[i + 1][2]:.1f}x faster")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Runs per measure (default: 20)")
+    return run(parser.parse_args(argv).runs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
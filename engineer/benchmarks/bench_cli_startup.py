@@ -0,0 +1,209 @@
+"""Import-time and cold-start latency benchmark for the pipeline CLI.
+
+Every ``pipeline <command>`` call is a fresh interpreter, so startup cost
+is paid on each Bash call.  This benchmark measures, in fresh processes:
+
+- ``import``: time to import ``pipeline.cli``
+- one cold-start wall time per subcommand against a throwaway copy of
+  the repository's templates, slot types and agents (plus a gate-free
+  two-slot template for ``begin`` / ``complete``)
+
+Each figure is reported as overhead over a bare ``python -c pass`` so
+budgets are comparable across machines.  Exits 1 if any median overhead
+exceeds its budget.
+
+With ``--daemon`` the commands run against a ``pipeline serve`` daemon
+started for the scratch project, measuring the thin-client path.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_cli_startup.py
+    PYTHONPATH=src python3 benchmarks/bench_cli_startup.py --runs 20 --budget-scale 1.5
+    PYTHONPATH=src python3 benchmarks/bench_cli_startup.py --daemon
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_ENGINEER_DIR = Path(__file__).resolve().parents[1]
+_REPO_ROOT = _ENGINEER_DIR.parent
+_SRC_DIR = _ENGINEER_DIR / "src"
+
+# Regression budgets: median overhead (ms) over a bare interpreter,
+# about 1.5x the figures measured when the fast path landed.  Read-only
+# commands must stay on the state-only fast path (no runner import).
+_BUDGETS_MS: dict[str, float] = {
+    "import": 80.0,
+    "status": 250.0,
+    "summary": 250.0,
+    "next": 400.0,
+    "templates": 500.0,
+    "match": 600.0,
+    "begin": 400.0,
+    "complete": 400.0,
+}
+
+# Gate-free template so begin/complete measure engine cost, not missing files.
+_BENCH_TEMPLATE = """\
+pipeline:
+  id: bench-feature
+  name: Bench Feature
+  version: "1.0.0"
+  description: CLI startup benchmark pipeline
+  created_by: bench
+  created_at: "2026-01-01T00:00:00Z"
+  slots:
+    - id: slot-design
+      slot_type: designer
+      name: Design
+      task: {objective: Design}
+    - id: slot-implement
+      slot_type: implementer
+      name: Implement
+      depends_on: [slot-design]
+      task: {objective: Implement}
+"""
+
+_IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import pipeline.cli; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def _env() -> dict[str, str]:
+    return {**os.environ, "PYTHONPATH": str(_SRC_DIR)}
+
+
+def _wall_ms(cmd: list[str], cwd: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=cwd, env=_env(), capture_output=True, check=False)
+    return (time.perf_counter() - start) * 1000
+
+
+def _make_project(tmp: Path) -> Path:
+    """Copy templates, slot types and agents into a scratch project."""
+    project = tmp / "project"
+    for rel in ("specs/pipelines/templates", "specs/pipelines/slot-types", "agents"):
+        shutil.copytree(_REPO_ROOT / rel, project / rel)
+    (project / "specs/pipelines/templates/bench-feature.yaml").write_text(_BENCH_TEMPLATE)
+    (project / "state" / "active").mkdir(parents=True)
+    return project
+
+
+def _cli(project: Path, *args: str) -> list[str]:
+    return [sys.executable, "-m", "pipeline.cli", "-P", str(project), *args]
+
+
+def _start_daemon(project: Path) -> subprocess.Popen:
+    """Start ``pipeline serve`` for *project* and wait for its socket."""
+    from pipeline.daemon import send_request, socket_path
+
+    proc = subprocess.Popen(
+        _cli(project, "serve", "--idle-timeout", "300"),
+        cwd=str(project), env=_env(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    path = socket_path(str(project / "state" / "active"))
+    deadline = time.monotonic() + 10
+    while not (path.exists() and send_request(path, {"op": "ping"}, timeout=1)):
+        if time.monotonic() > deadline:
+            proc.kill()
+            raise RuntimeError("pipeline daemon did not start")
+        time.sleep(0.02)
+    return proc
+
+
+def run(runs: int, budget_scale: float, daemon: bool = False) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        project = _make_project(Path(tmp))
+        cwd = str(project)
+        server = _start_daemon(project) if daemon else None
+        try:
+            baseline, results = _measure(project, cwd, runs)
+        finally:
+            if server is not None:
+                subprocess.run(
+                    _cli(project, "serve", "--stop"), env=_env(), capture_output=True,
+                )
+                server.wait(timeout=10)
+
+    mode = "daemon" if daemon else "in-process"
+    print(f"Interpreter baseline: {baseline:.1f} ms (median of {runs}), {mode}\n")
+    print(f"{'measure':<10}  {'overhead ms':>11}  {'budget ms':>9}  status")
+    failed = 0
+    for name, value in results.items():
+        budget = _BUDGETS_MS[name] * budget_scale
+        ok = value <= budget
+        failed += not ok
+        print(f"{name:<10}  {value:>11.1f}  {budget:>9.1f}  {'ok' if ok else 'OVER BUDGET'}")
+    return 1 if failed else 0
+
+
+def _measure(project: Path, cwd: str, runs: int) -> tuple[float, dict[str, float]]:
+    """Median baseline and per-measure overheads, in ms."""
+    baseline = statistics.median(
+        _wall_ms([sys.executable, "-c", "pass"], cwd) for _ in range(runs)
+    )
+
+    imports = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SNIPPET],
+            cwd=cwd, env=_env(), capture_output=True, text=True, check=True,
+        ).stdout
+        imports.append(float(out.strip()))
+    results: dict[str, float] = {"import": statistics.median(imports)}
+
+    subprocess.run(
+        _cli(project, "prepare", "bench-feature.yaml"),
+        cwd=cwd, env=_env(), capture_output=True, check=True,
+    )
+    for command in ("status", "summary", "next", "templates"):
+        results[command] = statistics.median(
+            _wall_ms(_cli(project, command), cwd) for _ in range(runs)
+        ) - baseline
+    results["match"] = statistics.median(
+        _wall_ms(_cli(project, "match", "implement", "feature", "login"), cwd)
+        for _ in range(runs)
+    ) - baseline
+
+    # begin/complete mutate state: measure one full slot cycle per run.
+    begins, completes = [], []
+    for _ in range(runs):
+        subprocess.run(
+            _cli(project, "prepare", "bench-feature.yaml"),
+            cwd=cwd, env=_env(), capture_output=True, check=True,
+        )
+        begins.append(_wall_ms(_cli(project, "begin", "slot-design"), cwd) - baseline)
+        completes.append(_wall_ms(_cli(project, "complete", "slot-design"), cwd) - baseline)
+    results["begin"] = statistics.median(begins)
+    results["complete"] = statistics.median(completes)
+    return baseline, results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7, help="Runs per measure (default: 7)")
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0,
+        help="Multiply all budgets (e.g. 2.0 on slow CI machines)",
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="Measure commands forwarded to a 'pipeline serve' daemon",
+    )
+    args = parser.parse_args(argv)
+    return run(args.runs, args.budget_scale, daemon=args.daemon)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Context building benchmark for ContextRouter's file cache.
+
+Builds context for a wave of slots over a generated project (abstracts
+and overviews under the directories the slot types read, plus a
+constitution) and reports the time per ``build_context`` call:
+
+- ``no cache``: every call reads and sizes every file (a fresh cache
+  per call, as before the cache existed)
+- ``first slot``: the first call on a shared cache
+- ``rest of wave``: later calls, which only stat the files
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_context_cache.py
+    PYTHONPATH=src python3 benchmarks/bench_context_cache.py --dirs 500 --size 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.context_router import ContextRouter, new_file_cache
+from pipeline.models import Pipeline, Slot, SlotTask
+
+_SLOT_TYPES = ["designer", "researcher", "implementer", "reviewer", "approver", "auditor"]
+_TOP_DIRS = ["specs", "architect", "agents", "docs", "engineer/src/pipeline", "compliance-auditor"]
+
+
+def _build_project(root: Path, dirs: int, size: int) -> Path:
+    for i in range(dirs):
+        d = root / _TOP_DIRS[i % len(_TOP_DIRS)] / f"area{i}"
+        d.mkdir(parents=True)
+        (d / ".abstract.md").write_text("a" * (size // 8), encoding="utf-8")
+        (d / ".overview.md").write_text("o" * size, encoding="utf-8")
+    constitution = root / "constitution.md"
+    constitution.write_text("c" * size * 4, encoding="utf-8")
+    return constitution
+
+
+def run(args: argparse.Namespace) -> int:
+    slots = [
+        Slot(id=f"slot-{i}", slot_type=_SLOT_TYPES[i % len(_SLOT_TYPES)], name=f"S{i}",
+             task=SlotTask(objective="work"))
+        for i in range(args.wave)
+    ]
+    pipeline = Pipeline(id="bench", name="Bench", version="1.0.0", description="",
+                        created_by="bench", created_at="2026-01-01T00:00:00Z", slots=slots)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        constitution = _build_project(root, args.dirs, args.size)
+
+        uncached = ContextRouter(str(root), str(constitution), index_path="")
+        uncached._scan_files()
+        times = {"no cache": [], "first slot": [], "rest of wave": []}
+        expected = []
+        for slot in slots:
+            uncached._files = new_file_cache()
+            start = time.perf_counter()
+            expected.append(uncached.build_context(slot, pipeline, max_tokens=args.max_tokens))
+            times["no cache"].append((time.perf_counter() - start) * 1000)
+
+        router = ContextRouter(str(root), str(constitution), index_path="")
+        router._scan_files()
+        for i, slot in enumerate(slots):
+            start = time.perf_counter()
+            items = router.build_context(slot, pipeline, max_tokens=args.max_tokens)
+            times["first slot" if i == 0 else "rest of wave"].append(
+                (time.perf_counter() - start) * 1000
+            )
+            if items != expected[i]:
+                print(f"MISMATCH: cached context differs for {slot.id}", file=sys.stderr)
+                return 1
+        cache = router._files
+
+    print(f"{args.dirs * 2} context files, wave of {args.wave} slots\n")
+    print(f"{'build_context':<14}  {'mean ms':>9}")
+    for name, values in times.items():
+        print(f"{name:<14}  {statistics.mean(values):>9.2f}")
+    print(f"\ncache: {len(cache)} files, {cache.bytes_used / 1024:.0f} KB, "
+          f"{cache.hits} hits / {cache.misses} misses")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=300, help="Directories with context files")
+    parser.add_argument("--size", type=int, default=4000, help="Overview size (chars)")
+    parser.add_argument("--wave", type=int, default=12, help="Slots in the wave")
+    parser.add_argument("--max-tokens", type=int, default=200000)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Context file discovery benchmark for pipeline.context_index.
+
+Generates a project tree -- context files in a few hundred source
+directories, plus a large ``.git`` object store and pipeline state
+directory -- and measures how long ContextRouter's file discovery takes:
+
+- ``os.walk``: the previous full walk of the project root
+- ``index cold``: ContextFileIndex with no persisted index (prunes
+  ignored trees, lists every other directory)
+- ``index warm``: a new process's refresh from the persisted index
+  (stats every directory, lists none)
+- ``index warm, 1 change``: the same after one directory gained a file
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_context_index.py
+    PYTHONPATH=src python3 benchmarks/bench_context_index.py --dirs 2000 --objects 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.context_index import ContextFileIndex
+
+
+def _build_tree(root: Path, dirs: int, objects: int, state_files: int) -> None:
+    for i in range(dirs):
+        d = root / f"pkg{i % 20}" / f"mod{i}"
+        d.mkdir(parents=True)
+        (d / ".abstract.md").write_text("a", encoding="utf-8")
+        (d / ".overview.md").write_text("o", encoding="utf-8")
+        for j in range(3):
+            (d / f"file{j}.py").write_text("", encoding="utf-8")
+    for i in range(objects):
+        d = root / ".git" / "objects" / f"{i % 256:02x}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"{i:038x}").write_text("", encoding="utf-8")
+    active = root / "state" / "active"
+    active.mkdir(parents=True)
+    for i in range(state_files):
+        (active / f"pipeline-{i}.state.yaml").write_text("", encoding="utf-8")
+    # Age the tree past the index's racy-mtime window
+    past = time.time() - 60
+    for dirpath, _dirnames, _filenames in os.walk(root):
+        os.utime(dirpath, (past, past))
+
+
+def _walk(root: Path) -> int:
+    found = 0
+    for _dirpath, _dirnames, filenames in os.walk(root):
+        found += sum(f.endswith((".abstract.md", ".overview.md")) for f in filenames)
+    return found
+
+
+def _timed(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        index_path = Path(tmp) / "index.json"
+        _build_tree(root, args.dirs, args.objects, args.state_files)
+
+        def cold() -> int:
+            index_path.unlink(missing_ok=True)
+            index = ContextFileIndex(root, path=index_path)
+            index.refresh()
+            return len(index.abstract_files) + len(index.overview_files)
+
+        def warm() -> int:
+            index = ContextFileIndex(root, path=index_path)
+            index.refresh()
+            return len(index.abstract_files) + len(index.overview_files)
+
+        rows = [("os.walk", *_timed(lambda: _walk(root), args.repeat))]
+        rows.append(("index cold", *_timed(cold, args.repeat)))
+        rows.append(("index warm", *_timed(warm, args.repeat)))
+        (root / "pkg0" / "mod0" / "notes.abstract.md").write_text("n", encoding="utf-8")
+        rows.append(("index warm, 1 change", *_timed(warm, 1)))
+
+    expected = args.dirs * 2
+    print(f"{args.dirs} context dirs, {args.objects} .git objects, "
+          f"{args.state_files} state files\n")
+    print(f"{'scan':<22}  {'ms':>9}  files")
+    for name, ms, found in rows:
+        print(f"{name:<22}  {ms:>9.1f}  {found}")
+    if rows[-1][2] != expected + 1 or any(found != expected for _, _, found in rows[:-1]):
+        print("MISMATCH: scans found different context files", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=500, help="Directories with context files")
+    parser.add_argument("--objects", type=int, default=20000, help="Files under .git/objects")
+    parser.add_argument("--state-files", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measure (best kept)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
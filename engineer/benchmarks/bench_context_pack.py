@@ -0,0 +1,122 @@
+"""Context pack benchmark for pipeline.context_pack.
+
+Generates a project whose slots each read the constitution, a set of
+documents shared by every slot and a few of their own, and compares
+what an agent does to load its context:
+
+- ``files``: open and read every path the slot's context lists (what
+  the context YAML asks for)
+- ``pack``: read the slot's pack manifest and map the one block file
+  (:func:`read_pack`)
+
+and what materializing the contexts costs: the bytes written to the
+shared block store against one self-contained copy per slot.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_context_pack.py
+    PYTHONPATH=src python3 benchmarks/bench_context_pack.py --slots 50 --shared 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.context_pack import BlockStore, read_pack, write_pack
+from pipeline.models import ContextItem, ContextTier
+
+
+def _build_project(root: Path, args: argparse.Namespace) -> dict[str, list[str]]:
+    """Write the documents; returns slot id -> context paths."""
+    def write(rel: str, size: int) -> str:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text((rel + " ") * (size // (len(rel) + 1)), encoding="utf-8")
+        return rel
+
+    shared = [write("docs/constitution.md", 8000)]
+    shared += [write(f"specs/doc{i}/.overview.md", args.doc_bytes) for i in range(args.shared)]
+    return {
+        f"slot-{s}": shared + [
+            write(f"work/slot{s}/file{i}.md", args.doc_bytes) for i in range(args.own)
+        ]
+        for s in range(args.slots)
+    }
+
+
+def _load_files(root: Path, paths: list[str]) -> dict[str, str]:
+    return {rel: (root / rel).read_text(encoding="utf-8") for rel in paths}
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        state = Path(tmp) / "state"
+        contexts = _build_project(root, args)
+        store = BlockStore(state / "context-blocks")
+
+        start = time.perf_counter()
+        for slot, paths in contexts.items():
+            items = [
+                (ContextItem(rel, ContextTier.L1, 0.5, 0), (root / rel).read_text(encoding="utf-8"))
+                for rel in paths
+            ]
+            write_pack(state / f"{slot}-context.pack.json", store, items)
+        write_ms = (time.perf_counter() - start) * 1000
+
+        files_ms = packs_ms = 0.0
+        mismatched = 0
+        for slot, paths in contexts.items():
+            ms, from_files = _best(lambda: _load_files(root, paths), args.repeat)
+            files_ms += ms
+            ms, from_pack = _best(lambda: read_pack(state / f"{slot}-context.pack.json"), args.repeat)
+            packs_ms += ms
+            mismatched += from_files != from_pack
+
+        copies = sum(
+            sum((root / rel).stat().st_size for rel in paths) for paths in contexts.values()
+        )
+        stored = store.data_path.stat().st_size
+
+    per_slot = len(next(iter(contexts.values())))
+    print(f"{args.slots} slots x {per_slot} context files "
+          f"({args.shared + 1} shared, {args.own} own)\n")
+    print(f"{'agent load':<10}  {'ms/slot':>8}  {'opens/slot':>10}")
+    print(f"{'files':<10}  {files_ms / args.slots:>8.3f}  {per_slot:>10}")
+    print(f"{'pack':<10}  {packs_ms / args.slots:>8.3f}  {2:>10}")
+    print(f"\nmaterialize all packs: {write_ms:.1f} ms, "
+          f"{store.blocks_written} blocks written, {store.blocks_reused} reused")
+    print(f"block store {stored / 1024:.0f} KiB vs per-slot copies "
+          f"{copies / 1024:.0f} KiB ({copies / stored:.1f}x)")
+    if mismatched:
+        print(f"MISMATCH: {mismatched} packs differ from the files", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=20)
+    parser.add_argument("--shared", type=int, default=24, help="Documents every slot reads")
+    parser.add_argument("--own", type=int, default=4, help="Documents only one slot reads")
+    parser.add_argument("--doc-bytes", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per load (best kept)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
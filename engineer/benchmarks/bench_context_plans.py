@@ -0,0 +1,124 @@
+"""Context plan memo benchmark for ContextRouter(plan_cache=...).
+
+Generates a project of context directories (``.abstract.md`` and
+``.overview.md`` per directory, plus the source files the knapsack
+selection may pick at L2) and plans the context of a wave of sibling
+slots of the same type and task, as a parallel group does:
+
+- ``no memo``: every slot computes its own plan (the previous behavior)
+- ``memo``: the first slot computes the plan, its siblings reuse it
+- ``persisted``: a new router (a later run) loads the plans from the
+  JSON file in the state directory and computes none
+
+Each mode uses a fresh file cache, as a new process would.  Memoized
+plans must equal the plans computed without the memo.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_context_plans.py
+    PYTHONPATH=src python3 benchmarks/bench_context_plans.py --dirs 400 --wave 16 --selection greedy
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.context_router import ContextRouter
+from pipeline.models import Pipeline, Slot, SlotTask
+from pipeline.ttl_cache import TTLCache
+
+
+def _build_project(root: Path, dirs: int) -> Path:
+    constitution = root / "docs" / "constitution.md"
+    constitution.parent.mkdir(parents=True)
+    constitution.write_text("# Constitution\n" + "Rule.\n" * 200, encoding="utf-8")
+    for i in range(dirs):
+        top = ("specs", "architect", "engineer/src", "research")[i % 4]
+        d = root / top / f"area{i}"
+        d.mkdir(parents=True)
+        (d / ".abstract.md").write_text(f"Area {i} summary.\n", encoding="utf-8")
+        (d / ".overview.md").write_text(f"Area {i} overview line.\n" * 40, encoding="utf-8")
+        (d / f"module{i}.py").write_text(f"# module {i}\n" * 30, encoding="utf-8")
+        (d / f"module{i}.py.overview.md").write_text(f"Module {i}.\n" * 8, encoding="utf-8")
+    # Age the files past the index's racy-mtime window
+    past = time.time() - 60
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(Path(dirpath, name), (past, past))
+    return constitution
+
+
+def _wave(size: int) -> tuple[list[Slot], Pipeline]:
+    slots = [
+        Slot(
+            id=f"slot-impl-{i}", slot_type="implementer", name=f"Implement {i}",
+            task=SlotTask(objective="Implement the area modules"),
+        )
+        for i in range(size)
+    ]
+    pipeline = Pipeline(
+        id="bench", name="Bench", version="1.0.0", description="",
+        created_by="bench", created_at="2026-01-01T00:00:00Z", slots=slots,
+    )
+    return slots, pipeline
+
+
+def run(args: argparse.Namespace) -> int:
+    slots, pipeline = _wave(args.wave)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        constitution = _build_project(root, args.dirs)
+        index_path = Path(tmp) / "index.json"
+        plans_path = Path(tmp) / "state" / ".context-plans.json"
+
+        def router(plan_cache: TTLCache | None) -> ContextRouter:
+            r = ContextRouter(
+                str(root), str(constitution), index_path=index_path,
+                selection=args.selection, plan_cache=plan_cache,
+            )
+            r._scan_files()  # index warm-up is not part of planning
+            return r
+
+        results = {}
+        rows = []
+        modes = {
+            "no memo": lambda: router(None),
+            "memo": lambda: router(TTLCache(3600, path=plans_path)),
+            "persisted": lambda: router(TTLCache(3600, path=plans_path)),
+        }
+        for name, make in modes.items():
+            r = make()
+            start = time.perf_counter()
+            results[name] = [r.build_context(slot, pipeline) for slot in slots]
+            ms = (time.perf_counter() - start) * 1000
+            computed = len(slots) if name == "no memo" else r.plan_misses
+            rows.append((name, ms, computed, r._files.misses))
+
+    print(f"{args.dirs} context directories, wave of {args.wave} "
+          f"'implementer' slots, {args.selection} selection\n")
+    print(f"{'mode':<10}  {'ms':>8}  {'ms/slot':>8}  {'plans':>5}  {'reads':>5}")
+    for name, ms, computed, reads in rows:
+        print(f"{name:<10}  {ms:>8.1f}  {ms / args.wave:>8.2f}  {computed:>5}  {reads:>5}")
+    expected = results["no memo"]
+    mismatched = sum(results[name] != expected for name in ("memo", "persisted"))
+    if mismatched or rows[2][2]:
+        print("MISMATCH: memoized plans differ from computed plans", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=200, help="Context directories")
+    parser.add_argument("--wave", type=int, default=8, help="Sibling slots in the wave")
+    parser.add_argument("--selection", choices=("greedy", "knapsack"), default="knapsack")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Offline file ranking benchmark for pipeline.context_search.
+
+Generates a project of markdown and Python files with a Zipf-like
+vocabulary and measures ContextTextIndex:
+
+- ``build cold``: tokenize every file, no persisted index
+- ``refresh warm``: a new process's refresh from the persisted term
+  counts (stats every file, tokenizes none)
+- ``refresh, N changed``: the same after N files were edited
+- ``query``: median latency of ranking the files against slot-sized
+  queries (objective, deliverables and constraints)
+
+The incrementally refreshed index must rank exactly like an index built
+from scratch over the edited tree.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_context_search.py
+    PYTHONPATH=src python3 benchmarks/bench_context_search.py --files 5000 --changed 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.context_search import ContextTextIndex
+
+_VOCABULARY = 4000
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(
+        f"w{min(int(rng.paretovariate(1.1)), _VOCABULARY)}" for _ in range(words)
+    )
+
+
+def _build_tree(root: Path, files: int, words: int, rng: random.Random) -> list[str]:
+    paths = []
+    for i in range(files):
+        suffix = ".md" if i % 3 == 0 else ".py"
+        rel = f"pkg{i % 25}/mod{i % 200}/file{i}{suffix}"
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(_text(rng, words), encoding="utf-8")
+        paths.append(rel)
+    # Age the files past the index's racy-mtime window
+    past = time.time() - 60
+    for rel in paths:
+        os.utime(root / rel, (past, past))
+    return paths
+
+
+def _rounded(hits: list[tuple[str, float]]) -> list[tuple[str, float]]:
+    # Summation order differs between the two indexes
+    return [(path, round(score, 9)) for path, score in hits]
+
+
+def _timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        index_path = Path(tmp) / "text-index.json"
+        paths = _build_tree(root, args.files, args.words, rng)
+
+        def refresh() -> ContextTextIndex:
+            index = ContextTextIndex(root, path=index_path)
+            index.refresh(paths)
+            return index
+
+        rows = [("build cold", *_timed(refresh))]
+        rows.append(("refresh warm", *_timed(refresh)))
+        past = time.time() - 30
+        for rel in rng.sample(paths, args.changed):
+            (root / rel).write_text(_text(rng, args.words), encoding="utf-8")
+            os.utime(root / rel, (past, past))
+        rows.append((f"refresh, {args.changed} changed", *_timed(refresh)))
+        index = rows[-1][2]
+
+        queries = [_text(rng, args.query_words) for _ in range(args.queries)]
+        latencies = []
+        for query in queries:
+            ms, _ = _timed(lambda: index.search(query, limit=20))
+            latencies.append(ms)
+
+        fresh = ContextTextIndex(root)
+        fresh.refresh(paths)
+        mismatched = sum(
+            _rounded(index.search(q, limit=20)) != _rounded(fresh.search(q, limit=20))
+            for q in queries
+        )
+        size = index_path.stat().st_size
+
+    print(f"{args.files} files x {args.words} words, {args.queries} queries "
+          f"of {args.query_words} words, index file {size / 1024:.0f} KiB\n")
+    print(f"{'operation':<22}  {'ms':>9}  tokenized")
+    for name, ms, result in rows:
+        print(f"{name:<22}  {ms:>9.1f}  {result.tokenized}")
+    print(f"{'query (p50)':<22}  {statistics.median(latencies):>9.2f}")
+    print(f"{'query (max)':<22}  {max(latencies):>9.2f}")
+    if mismatched or rows[1][2].tokenized or rows[2][2].tokenized != args.changed:
+        print(f"MISMATCH: incremental index differs from a fresh build "
+              f"({mismatched} queries)", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="Files in the project")
+    parser.add_argument("--words", type=int, default=300, help="Words per file")
+    parser.add_argument("--changed", type=int, default=10, help="Files edited before a refresh")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--query-words", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=7)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Context selection benchmark: greedy fill vs knapsack selection.
+
+Generates a project of directories with abstracts and overviews of
+varied sizes and builds context for slots of every type with
+ContextRouter's two file-scan selections:
+
+- ``greedy``: the default -- all abstracts in path order, then the slot
+  directories' overviews, then upgrades, while they fit
+- ``knapsack rN``: ``selection="knapsack"`` with the budget split into
+  N units (coarser is faster, finer is closer to optimal)
+
+Quality is the value of the chosen items under the knapsack's own
+scoring (directory relevance for the slot times tier weight), as a share
+of the optimum (knapsack at one-token resolution), plus the share of
+the budget spent on the slot's own directories.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_context_selection.py
+    PYTHONPATH=src python3 benchmarks/bench_context_selection.py --dirs 400 --budget 16000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline import context_selection
+from pipeline.context_router import ContextRouter, _SLOT_DIRECTORY_MAP
+from pipeline.models import ContextTier, Pipeline, Slot, SlotTask
+
+_WORDS = "pipeline slot gate template agent contract audit billing deploy spec".split()
+
+
+def _build_project(root: Path, dirs: int, rng: random.Random) -> Path:
+    tops = sorted({d.split("/")[0] for ds in _SLOT_DIRECTORY_MAP.values() for d in ds})
+    tops += ["misc", "tools", "vendor"]
+    for i in range(dirs):
+        d = root / rng.choice(tops) / f"area{i}"
+        d.mkdir(parents=True)
+        words = " ".join(rng.sample(_WORDS, 3))
+        (d / ".abstract.md").write_text(f"{words} " * rng.randint(5, 60), encoding="utf-8")
+        (d / ".overview.md").write_text(f"{words} " * rng.randint(60, 900), encoding="utf-8")
+    constitution = root / "constitution.md"
+    constitution.write_text("rule " * 400, encoding="utf-8")
+    return constitution
+
+
+def _value(router: ContextRouter, slot: Slot, items) -> tuple[float, float]:
+    """(value under the knapsack scoring, share of tokens in slot directories)."""
+    slot_dirs = router.get_mandatory_reads(slot.slot_type)
+    terms = set(context_selection.tokenize(slot.task.objective))
+    total = in_slot = spent = 0
+    for item in items:
+        if item.tier is ContextTier.L2 and "constitution" in item.path:
+            continue
+        rel_dir = item.path.rsplit("/", 1)[0]
+        relevance = context_selection.directory_relevance(
+            rel_dir, slot_dirs=slot_dirs, objective_terms=terms,
+            text_terms=router._file_terms(f"{rel_dir}/.abstract.md"),
+        )
+        total += context_selection.tier_value(relevance, item.tier)
+        spent += item.tokens_estimate
+        if router._matches_directories(item.path, slot_dirs):
+            in_slot += item.tokens_estimate
+    return total, in_slot / spent if spent else 0.0
+
+
+def run(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    slot_types = sorted(_SLOT_DIRECTORY_MAP)
+    slots = [
+        Slot(id=f"s-{t}", slot_type=t, name=t,
+             task=SlotTask(objective=" ".join(rng.sample(_WORDS, 2))))
+        for t in slot_types
+    ]
+    pipeline = Pipeline(id="bench", name="Bench", version="1.0.0", description="",
+                        created_by="bench", created_at="2026-01-01T00:00:00Z", slots=slots)
+    modes = [("greedy", "greedy", None)]
+    modes += [(f"knapsack r{r}", "knapsack", r) for r in args.resolutions]
+    modes.append(("knapsack exact", "knapsack", args.budget))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        constitution = _build_project(root, args.dirs, rng)
+        results = {}
+        for name, selection, resolution in modes:
+            router = ContextRouter(
+                str(root), str(constitution), index_path="", selection=selection,
+                selection_resolution=resolution or context_selection.DEFAULT_RESOLUTION,
+            )
+            router._scan_files()
+            for slot in slots:  # warm the file cache
+                router.build_context(slot, pipeline, max_tokens=args.budget)
+            times, values, shares = [], [], []
+            for slot in slots:
+                start = time.perf_counter()
+                items = router.build_context(slot, pipeline, max_tokens=args.budget)
+                times.append((time.perf_counter() - start) * 1000)
+                value, share = _value(router, slot, items)
+                values.append(value)
+                shares.append(share)
+            results[name] = (times, values, shares)
+
+    optimum = results["knapsack exact"][1]
+    print(f"{args.dirs} directories, budget {args.budget} tokens, {len(slots)} slot types\n")
+    print(f"{'selection':<16}  {'ms/slot':>8}  {'value':>7}  {'in slot dirs':>12}")
+    for name, (times, values, shares) in results.items():
+        quality = statistics.mean(v / o for v, o in zip(values, optimum) if o)
+        print(f"{name:<16}  {statistics.mean(times):>8.2f}  {quality:>7.1%}  "
+              f"{statistics.mean(shares):>12.1%}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=8000)
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[50, 200, 400, 1000])
+    parser.add_argument("--seed", type=int, default=1)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
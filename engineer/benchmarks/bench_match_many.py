@@ -0,0 +1,113 @@
+"""Batch matching throughput benchmark for NLMatcher.match_many().
+
+Matches a synthetic backlog of requests against the repository's
+templates and reports requests per second for:
+
+- ``match loop``: ``[matcher.match(r) for r in backlog]``
+- ``match_many``: one in-process batch call (distinct requests matched
+  once)
+- ``match_many -jN``: the batch spread across N worker processes
+
+for two backlogs: ``distinct`` (every request unique, e.g. a ticket
+export) and ``repeats`` (requests drawn from a small pool of phrasings,
+like routed chat traffic).  Results are checked against the loop.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_match_many.py
+    PYTHONPATH=src python3 benchmarks/bench_match_many.py --requests 100000 --processes 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+from pipeline.nl_matcher import NLMatcher
+
+_TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "specs" / "pipelines" / "templates"
+
+_PHRASES = [
+    "implement feature {name} for phase{n}",
+    "urgent hotfix {bug} crash in {name} module",
+    "backtest strategy {name} on BTC/USDT",
+    "research and investigate {name} options",
+    "security audit of module {name}, check every CVE",
+    "run a compliance audit on the {name} process",
+    "build a new {name} platform from scratch with a team",
+    "实现{name}功能 阶段{n}",
+    "紧急修复 {bug} 崩溃",
+    "调研 {name} 技术方案",
+    "please take a look at {name} when you have time",
+]
+_NAMES = ["login", "billing", "websocket", "momentum", "exporter", "auth", "gateway"]
+
+
+def _request(rng: random.Random, unique: int | None = None) -> str:
+    text = rng.choice(_PHRASES).format(
+        name=rng.choice(_NAMES),
+        n=rng.randint(1, 9),
+        bug=f"P{rng.randint(0, 3)}-{rng.randint(1, 999):03d}",
+    )
+    return text if unique is None else f"{text} (ticket {unique})"
+
+
+def _throughput(fn, backlog: list[str], repeat: int) -> tuple[float, list]:
+    """Best of *repeat* runs, in requests per second."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        results = fn(backlog)
+        best = min(best, time.perf_counter() - start)
+    return len(backlog) / best, results
+
+
+def run(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    pool = [_request(rng) for _ in range(args.phrasings)]
+    backlogs = {
+        "distinct": [_request(rng, i) for i in range(args.requests)],
+        "repeats": [rng.choice(pool) for _ in range(args.requests)],
+    }
+    matcher = NLMatcher(str(_TEMPLATES_DIR))
+    modes = [
+        ("match loop", lambda b: [matcher.match(r) for r in b]),
+        ("match_many", matcher.match_many),
+        (f"match_many -j{args.processes}",
+         lambda b: matcher.match_many(b, processes=args.processes)),
+    ]
+
+    print(f"{len(matcher._templates)} templates, {args.requests} requests per backlog\n")
+    print(f"{'backlog':<10}  {'mode':<16}  {'req/s':>10}  speedup")
+    for label, backlog in backlogs.items():
+        baseline = expected = None
+        for name, fn in modes:
+            rate, results = _throughput(fn, backlog, args.repeat)
+            if expected is None:
+                baseline, expected = rate, results
+            elif results != expected:
+                print(f"MISMATCH: {name} differs from match loop", file=sys.stderr)
+                return 1
+            print(f"{label:<10}  {name:<16}  {rate:>10.0f}  {rate / baseline:>6.1f}x")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--phrasings", type=int, default=500,
+                        help="Distinct requests in the 'repeats' backlog")
+    parser.add_argument("--processes", type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measure (best kept)")
+    parser.add_argument("--seed", type=int, default=1)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
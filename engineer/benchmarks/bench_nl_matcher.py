@@ -0,0 +1,151 @@
+"""NL template matching benchmark for NLMatcher's keyword automaton.
+
+Generates a synthetic template catalogue (English and Chinese keywords
+declared in each template's ``match`` block) and compares, per match()
+call:
+
+- ``per-keyword``: the original matcher -- one substring search (plus a
+  token lookup) per keyword per template
+- ``indexed``: NLMatcher.match(), one Aho-Corasick pass over the input,
+  then scoring only the templates the inverted index links to a found
+  keyword
+
+for short requests and long inputs (pasted issue text).  Both sides
+return the same matches; the benchmark exits 1 if they differ.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_nl_matcher.py
+    PYTHONPATH=src python3 benchmarks/bench_nl_matcher.py --templates 5000 --input-kb 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from pipeline.nl_matcher import NLMatcher
+
+_CJK = "开发实现功能调研分析策略量化交易回测安全审计漏洞修复紧急崩溃故障合规流程项目产品平台系统"
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    words: set[str] = set()
+    while len(words) < size:
+        if rng.random() < 0.3:
+            words.add("".join(rng.choice(_CJK) for _ in range(rng.randint(2, 3))))
+        else:
+            words.add("".join(rng.choice("abcdefghijklmnopqrstuvwxyz")
+                              for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def _make_catalogue(
+    root: Path, templates: int, keywords: int, vocab: list[str], rng: random.Random
+) -> None:
+    for i in range(templates):
+        template_id = f"template-{i:05d}"
+        (root / f"{template_id}.yaml").write_text(yaml.safe_dump({"pipeline": {
+            "id": template_id, "name": f"Template {i}", "description": f"Synthetic {i}",
+            "match": {
+                "weight": rng.choice([1.0, 1.1, 1.2, 1.5]),
+                "keywords": rng.sample(vocab, keywords),
+            },
+        }}, allow_unicode=True))
+
+
+def _per_keyword_match(matcher: NLMatcher, nl_input: str) -> list[tuple[str, float, list[str]]]:
+    """The pre-automaton scoring loop, for comparison (no param extraction)."""
+    lower_input = nl_input.lower()
+    tokens = set(re.findall(r"[\w\u4e00-\u9fff]+", lower_input))
+    results = []
+    for template_id, meta in matcher._templates.items():
+        weight, keywords = meta["weight"], meta["keywords"]
+        matched = [kw for kw in keywords if kw.lower() in lower_input or kw.lower() in tokens]
+        if not matched:
+            continue
+        score = len(matched) / len(keywords) * weight
+        if template_id in lower_input:
+            score += 0.15
+        confidence = min(score, 1.0)
+        if confidence >= 0.1:
+            results.append((template_id, round(confidence, 3), matched))
+    results.sort(key=lambda r: r[1], reverse=True)
+    return results
+
+
+def _per_call_ms(fn, inputs: list[str]) -> float:
+    start = time.perf_counter()
+    for text in inputs:
+        fn(text)
+    return (time.perf_counter() - start) / len(inputs) * 1000
+
+
+def run(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    vocab = _vocabulary(rng, args.vocabulary)
+    filler = _vocabulary(random.Random(args.seed + 1), 2000)
+
+    def request(words: int) -> str:
+        picked = [rng.choice(vocab) if rng.random() < 0.05 else rng.choice(filler)
+                  for _ in range(words)]
+        return " ".join(picked)
+
+    short = [request(12) for _ in range(args.inputs)]
+    long_words = args.input_kb * 1024 // 7
+    long = [request(long_words) for _ in range(max(args.inputs // 10, 3))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_catalogue(Path(tmp), args.templates, args.keywords, vocab, rng)
+        with mock.patch.object(NLMatcher, "_builtin_params", staticmethod(lambda text: {})), \
+                mock.patch.object(NLMatcher, "_declared_params", lambda self, text, tid: {}):
+            start = time.perf_counter()
+            matcher = NLMatcher(tmp)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            for text in short[:20] + long[:2]:
+                expected = _per_keyword_match(matcher, text)
+                got = [(m.template_id, m.confidence, m.matched_keywords)
+                       for m in matcher.match(text)]
+                if sorted(got) != sorted(expected):
+                    print("MISMATCH between indexed and per-keyword scan", file=sys.stderr)
+                    return 1
+
+            rows = []
+            for label, inputs in (("short", short), (f"{args.input_kb} KB", long)):
+                naive = _per_call_ms(lambda t: _per_keyword_match(matcher, t), inputs)
+                fast = _per_call_ms(matcher.match, inputs)
+                rows.append((label, naive, fast))
+
+    print(
+        f"{args.templates} templates x {args.keywords} keywords "
+        f"({len(matcher._automaton)} distinct), load {load_ms:.0f} ms\n"
+    )
+    print(f"{'input':<8}  {'per-keyword ms':>14}  {'indexed ms':>12}  speedup")
+    for label, naive, fast in rows:
+        print(f"{label:<8}  {naive:>14.3f}  {fast:>12.3f}  {naive / fast:>6.1f}x")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, default=2000)
+    parser.add_argument("--keywords", type=int, default=20, help="Keywords per template")
+    parser.add_argument("--vocabulary", type=int, default=5000,
+                        help="Distinct keywords across the catalogue")
+    parser.add_argument("--inputs", type=int, default=200, help="Short requests to match")
+    parser.add_argument("--input-kb", type=int, default=8, help="Size of long inputs (KB)")
+    parser.add_argument("--seed", type=int, default=1)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""OpenViking transport benchmark for pipeline.ov_client.
+
+Builds a slot context (health, abstract, ls, one overview per resource,
+find) with OVContextRouter over the two transports OVClient supports and
+reports the wall time per build:
+
+- ``cli``: one ``ov`` process per call (a stand-in script that answers
+  like the real CLI, so only process start-up is measured)
+- ``http``: pooled keep-alive connections to a local stand-in server,
+  overviews fetched in parallel
+- ``http+cache``: the same with the per-URI abstract / overview cache
+  warm (only health, ls and find reach the server)
+
+``--latency`` adds a fixed server-side delay per request, to show the
+effect of the parallel overview fetches.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_ov_client.py
+    PYTHONPATH=src python3 benchmarks/bench_ov_client.py --resources 20 --builds 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from pipeline.ov_client import OVClient
+from pipeline.ov_context_router import OVContextRouter
+
+_NAMESPACE = "viking://bench"
+
+_FAKE_CLI = """\
+import json, sys
+cmd = sys.argv[1]
+if cmd == "ls":
+    print("\\n".join(f"r{{i}}" for i in range({resources})))
+elif cmd == "find":
+    print(json.dumps([{{"uri": "viking://bench/r0/a.py", "score": 0.8, "content": "x" * 400}}]))
+else:
+    print(f"{{cmd}} of {{sys.argv[-1]}} " * 20)
+"""
+
+
+def _serve(resources: int, latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _handle(self):
+            parts = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            time.sleep(latency)
+            uri = dict(parse_qsl(parts.query)).get("uri", "")
+            if parts.path.endswith("/ls"):
+                result = [f"r{i}" for i in range(resources)]
+            elif parts.path.endswith("/find"):
+                result = [{"uri": "viking://bench/r0/a.py", "score": 0.8, "content": "x" * 400}]
+            else:
+                result = f"{parts.path} of {uri} " * 20
+            payload = json.dumps({"status": "ok", "result": result}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = _handle
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _time_builds(router: OVContextRouter, builds: int) -> tuple[list[float], int]:
+    times = []
+    count = 0
+    for _ in range(builds):
+        router._healthy = False  # include the health check in every build
+        start = time.perf_counter()
+        items = router.build_context("implementer", "retry logic")
+        times.append((time.perf_counter() - start) * 1000)
+        count = len(items or [])
+    return times, count
+
+
+def run(args: argparse.Namespace) -> int:
+    server = _serve(args.resources, args.latency / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    with tempfile.TemporaryDirectory() as tmp:
+        cli = Path(tmp) / "ov"
+        cli.write_text(f"#!{sys.executable}\n" + _FAKE_CLI.format(resources=args.resources))
+        os.chmod(cli, 0o755)
+        clients = {
+            "cli": OVClient("", ov_binary=str(cli), content_ttl=0),
+            "http": OVClient(url, ov_binary=str(cli), content_ttl=0),
+            "http+cache": OVClient(url, ov_binary=str(cli)),
+        }
+        results = {}
+        for name, client in clients.items():
+            router = OVContextRouter(tmp, ov_namespace=_NAMESPACE, client=client)
+            builds = args.cli_builds if name == "cli" else args.builds
+            results[name] = _time_builds(router, builds)
+            client.close()
+    server.shutdown()
+
+    counts = {count for _, count in results.values()}
+    if len(counts) != 1:
+        print(f"MISMATCH: transports returned different contexts {counts}", file=sys.stderr)
+        return 1
+
+    calls = args.resources + 4
+    print(f"{args.resources} resources, {calls} OV calls per context build\n")
+    print(f"{'transport':<11}  {'p50 ms':>9}  {'mean ms':>9}  {'per call':>9}")
+    baseline = None
+    for name, (times, _) in results.items():
+        p50 = statistics.median(times)
+        baseline = baseline or p50
+        print(
+            f"{name:<11}  {p50:>9.2f}  {statistics.mean(times):>9.2f}  "
+            f"{p50 / calls:>8.2f}  ({baseline / p50:.0f}x)"
+        )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resources", type=int, default=10,
+                        help="Resources under the namespace (one overview each)")
+    parser.add_argument("--builds", type=int, default=200, help="Context builds over HTTP")
+    parser.add_argument("--cli-builds", type=int, default=10, help="Context builds via the CLI")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Server-side delay per HTTP request (ms)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
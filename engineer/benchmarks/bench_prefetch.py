@@ -0,0 +1,201 @@
+"""Next-wave prefetch benchmark for AutoExecutor(prefetch=True).
+
+Runs a staged pipeline -- each stage a parallel group of slots that
+depend on every slot of the previous stage -- with agents that sleep,
+on a project with context directories to route, and measures the
+handoff gap: from the last agent of a stage finishing to the first
+agent of the next stage starting.  That gap holds the dependents'
+begin_slot (gate checks, context routing, state save) and contract
+generation.
+
+- ``inline``: contracts and context built when each slot begins
+- ``prefetch``: the next stage prepared while the current one runs
+
+Both modes memoize context plans (``context_plans=True``) in their own
+state directory and start with cold file caches; a warm-up run persists
+the project's context index first.  Contracts and context files must be
+identical in both modes.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_prefetch.py
+    PYTHONPATH=src python3 benchmarks/bench_prefetch.py --stages 6 --width 8 --dirs 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import yaml
+
+from pipeline.auto_executor import AutoExecutor, AutoExecutorConfig, CallbackExecutor
+from pipeline.models import (
+    ExecutionConfig,
+    Pipeline,
+    PipelineState,
+    PipelineStatus,
+    Slot,
+    SlotState,
+    SlotStatus,
+    SlotTask,
+)
+from pipeline.runner import PipelineRunner
+from pipeline.slot_contract import SlotContractManager
+from pipeline.slot_registry import SlotRegistry
+
+
+def _build_project(root: Path, dirs: int) -> None:
+    (root / "slot-types").mkdir(parents=True)
+    (root / "agents").mkdir()
+    (root / "templates").mkdir()
+    (root / "slot-types" / "implementer.yaml").write_text(yaml.dump({
+        "slot_type": {
+            "id": "implementer", "name": "Implementer", "category": "engineering",
+            "description": "Writes code", "input_schema": {"type": "object"},
+            "output_schema": {"type": "object"}, "required_capabilities": ["python"],
+        }
+    }), encoding="utf-8")
+    (root / "agents" / "eng.md").write_text(
+        "---\nagent_id: ENG-001\nversion: '1.0'\ncapabilities:\n  - python\n"
+        "compatible_slot_types:\n  - implementer\n---\n# Engineer\n",
+        encoding="utf-8",
+    )
+    (root / "docs").mkdir()
+    (root / "docs" / "constitution.md").write_text(
+        "# Constitution\n" + "Rule.\n" * 200, encoding="utf-8"
+    )
+    for i in range(dirs):
+        top = ("engineer/src", "specs", "architect", "research")[i % 4]
+        d = root / top / f"area{i}"
+        d.mkdir(parents=True)
+        (d / ".abstract.md").write_text(f"Area {i} summary.\n", encoding="utf-8")
+        (d / ".overview.md").write_text(f"Area {i} overview line.\n" * 40, encoding="utf-8")
+        (d / f"module{i}.py").write_text(f"# module {i}\n" * 30, encoding="utf-8")
+        (d / f"module{i}.py.overview.md").write_text(f"Module {i}.\n" * 8, encoding="utf-8")
+
+
+def _pipeline(stages: int, width: int) -> Pipeline:
+    slots = []
+    previous: list[str] = []
+    for stage in range(stages):
+        current = [f"s{stage}-{i}" for i in range(width)]
+        slots += [
+            Slot(
+                id=slot_id, slot_type="implementer", name=slot_id,
+                task=SlotTask(objective=f"Implement area {stage * width + i} modules"),
+                depends_on=list(previous),
+                execution=ExecutionConfig(parallel_group=f"stage-{stage}"),
+            )
+            for i, slot_id in enumerate(current)
+        ]
+        previous = current
+    return Pipeline(
+        id="bench-prefetch", name="Bench", version="1.0.0", description="",
+        created_by="bench", created_at="2026-01-01T00:00:00Z", slots=slots,
+    )
+
+
+def _state(pipeline: Pipeline) -> PipelineState:
+    return PipelineState(
+        pipeline_id=pipeline.id, pipeline_version=pipeline.version,
+        definition_hash="bench", status=PipelineStatus.VALIDATED,
+        slots={s.id: SlotState(slot_id=s.id) for s in pipeline.slots},
+    )
+
+
+def _run(root: Path, state_dir: Path, args: argparse.Namespace, prefetch: bool):
+    """Run the pipeline; returns (handoff gaps in ms, contracts, context files)."""
+    pipeline = _pipeline(args.stages, args.width)
+    runner = PipelineRunner(
+        project_root=str(root),
+        templates_dir=str(root / "templates"),
+        state_dir=str(state_dir),
+        slot_types_dir=str(root / "slot-types"),
+        agents_dir=str(root / "agents"),
+        constitution_path=str(root / "docs" / "constitution.md"),
+        context_selection=args.selection,
+        context_plans=True,
+    )
+    contracts: dict[str, tuple] = {}
+    spans: dict[str, tuple[float, float]] = {}
+    lock = threading.Lock()
+
+    def agent(slot_input, agent_id) -> bool:
+        start = time.perf_counter()
+        time.sleep(args.agent_ms / 1000)
+        with lock:
+            contracts[slot_input.slot_id] = (
+                slot_input.input_artifacts, slot_input.task_objective, slot_input.kpis,
+            )
+            spans[slot_input.slot_id] = (start, time.perf_counter())
+        return True
+
+    executor = AutoExecutor(
+        runner,
+        CallbackExecutor(agent),
+        SlotContractManager(str(root), str(state_dir / "contracts")),
+        SlotRegistry(str(root / "slot-types"), str(root / "agents")),
+        config=AutoExecutorConfig(max_parallel=args.width, prefetch=prefetch),
+        project_root=str(root),
+    )
+    final = executor.run(pipeline, _state(pipeline))
+    if any(s.status != SlotStatus.COMPLETED for s in final.slots.values()):
+        raise RuntimeError("pipeline did not complete")
+
+    gaps = []
+    for stage in range(1, args.stages):
+        finished = max(spans[f"s{stage - 1}-{i}"][1] for i in range(args.width))
+        started = min(spans[f"s{stage}-{i}"][0] for i in range(args.width))
+        gaps.append((started - finished) * 1000)
+    contexts = {
+        p.name: p.read_text(encoding="utf-8")
+        for p in sorted(state_dir.glob("*-context.yaml"))
+    }
+    return gaps, contracts, contexts, executor
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        _build_project(root, args.dirs)
+        _run(root, Path(tmp) / "warm-up", args, prefetch=False)
+
+        results = {}
+        for mode, prefetch in (("inline", False), ("prefetch", True)):
+            results[mode] = _run(root, Path(tmp) / mode, args, prefetch)
+
+    print(f"{args.stages} stages x {args.width} slots, {args.dirs} context directories, "
+          f"{args.selection} selection, agents sleep {args.agent_ms} ms\n")
+    print(f"{'mode':<9}  {'gap p50 ms':>10}  {'gap max ms':>10}  {'total ms':>9}  "
+          f"{'hits':>4}  {'discarded':>9}")
+    for mode, (gaps, _, _, executor) in results.items():
+        print(f"{mode:<9}  {statistics.median(gaps):>10.1f}  {max(gaps):>10.1f}  "
+              f"{sum(gaps):>9.1f}  {executor.prefetch_hits:>4}  "
+              f"{executor.prefetch_discarded:>9}")
+
+    inline, prefetched = results["inline"], results["prefetch"]
+    if inline[1] != prefetched[1] or inline[2] != prefetched[2]:
+        print("MISMATCH: prefetched contracts or contexts differ from inline ones",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", type=int, default=5)
+    parser.add_argument("--width", type=int, default=4, help="Slots per stage")
+    parser.add_argument("--dirs", type=int, default=200, help="Context directories")
+    parser.add_argument("--agent-ms", type=int, default=300, help="Agent run time")
+    parser.add_argument("--selection", choices=("greedy", "knapsack"), default="knapsack")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Agent matching benchmark for SlotRegistry's capability index.
+
+Generates a synthetic registry (agent .md files with front-matter and
+slot type YAMLs) and compares, per slot type:
+
+- ``linear``: the original matcher -- build capability sets for every
+  agent and sort, on every call
+- ``index cold``: first find_compatible_agents() call per slot type
+  (bitset intersection + one match per agent, then memoized)
+- ``index warm``: repeated find_compatible_agents() calls (memo hit)
+- ``ids cold`` / ``ids warm``: compatible_agent_ids()
+
+plus a ``resolve`` loop that picks the first compatible agent for many
+slots, as AutoExecutor does, with the linear scan vs the index, and the
+front-matter scan of all agent files (header-only streaming reader vs
+reading and splitting each whole prompt).
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_slot_registry.py
+    PYTHONPATH=src python3 benchmarks/bench_slot_registry.py --agents 5000 --capabilities 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from pipeline.models import CapabilityMatch
+from pipeline.slot_registry import SlotRegistry
+
+
+def _make_registry(
+    root: Path, agents: int, capabilities: int, slot_types: int, seed: int,
+    body_kb: int = 0,
+) -> None:
+    rng = random.Random(seed)
+    caps = [f"cap-{i:05d}" for i in range(capabilities)]
+    # Skewed popularity so common requirements match many agents
+    weights = [1.0 / (i + 1) ** 0.8 for i in range(capabilities)]
+
+    agents_dir = root / "agents"
+    agents_dir.mkdir()
+    body = ("Prompt text for the agent. " * 40 + "\n") * (body_kb * 1024 // 1081 + 1)
+    for i in range(agents):
+        owned = sorted(set(rng.choices(caps, weights, k=rng.randint(5, 30))))
+        (agents_dir / f"agent-{i:05d}.md").write_text(
+            "---\n" + yaml.safe_dump({"agent_id": f"AG-{i:05d}", "capabilities": owned})
+            + "---\n# Agent\n" + body
+        )
+
+    types_dir = root / "slot-types"
+    types_dir.mkdir()
+    for i in range(slot_types):
+        required = sorted(set(rng.choices(caps[:200], weights[:200], k=rng.randint(1, 4))))
+        (types_dir / f"type-{i:04d}.yaml").write_text(yaml.safe_dump({"slot_type": {
+            "id": f"type-{i:04d}", "name": f"Type {i}", "category": "engineering",
+            "required_capabilities": required,
+        }}))
+
+
+def _linear_find(registry: SlotRegistry, slot_type_id: str) -> list[CapabilityMatch]:
+    """The pre-index find_compatible_agents(), for comparison."""
+    required = set(registry.get_slot_type(slot_type_id).required_capabilities)
+    matches = []
+    for agent in registry._agents.values():
+        agent_caps = set(agent.capabilities)
+        matched = sorted(required & agent_caps)
+        missing = sorted(required - agent_caps)
+        matches.append(CapabilityMatch(
+            agent_id=agent.agent_id,
+            prompt_path=agent.prompt_path,
+            matched_capabilities=matched,
+            missing_capabilities=missing,
+            is_compatible=len(missing) == 0,
+        ))
+    matches.sort(key=lambda m: len(m.matched_capabilities), reverse=True)
+    return matches
+
+
+def _full_read_front_matter(md_path: Path) -> dict | None:
+    """The pre-streaming front-matter parser, for comparison."""
+    lines = md_path.read_text(encoding="utf-8").split("\n")
+    if not lines or lines[0].strip() != "---":
+        return None
+    end = next((i for i in range(1, len(lines)) if lines[i].strip() == "---"), None)
+    if end is None:
+        return None
+    return yaml.safe_load("\n".join(lines[1:end]))
+
+
+def _per_call_us(fn, calls: list[str]) -> float:
+    start = time.perf_counter()
+    for arg in calls:
+        fn(arg)
+    return (time.perf_counter() - start) / len(calls) * 1e6
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_registry(
+            root, args.agents, args.capabilities, args.slot_types, args.seed, args.body_kb,
+        )
+        md_files = sorted((root / "agents").glob("*.md"))
+        # Header extraction only: YAML parsing costs the same either way
+        with mock.patch("yaml.safe_load", lambda text: text):
+            scan_full = _per_call_us(_full_read_front_matter, md_files)
+            scan_header = _per_call_us(SlotRegistry._parse_front_matter, md_files)
+
+        registry = SlotRegistry(str(root / "slot-types"), str(root / "agents"))
+        start = time.perf_counter()
+        registry.load_slot_types()
+        registry.load_agent_capabilities()
+        load_ms = (time.perf_counter() - start) * 1000
+
+        type_ids = sorted(registry._slot_types)
+        start = time.perf_counter()
+        registry._get_index()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Same answers as the linear scan
+        for st in type_ids:
+            if registry.find_compatible_agents(st) != _linear_find(registry, st):
+                print(f"MISMATCH for {st}", file=sys.stderr)
+                return 1
+        registry._invalidate_index()
+        registry._get_index()
+
+        rows = [
+            ("linear", _per_call_us(lambda t: _linear_find(registry, t), type_ids)),
+            ("index cold", _per_call_us(registry.find_compatible_agents, type_ids)),
+            ("index warm", _per_call_us(registry.find_compatible_agents, type_ids)),
+        ]
+        registry._compatible_memo = {}
+        rows.append(("ids cold", _per_call_us(registry.compatible_agent_ids, type_ids)))
+        rows.append(("ids warm", _per_call_us(registry.compatible_agent_ids, type_ids)))
+
+        rng = random.Random(args.seed)
+        slots = [rng.choice(type_ids) for _ in range(args.resolves)]
+
+        def linear_resolve(t: str) -> str | None:
+            return next((m.agent_id for m in _linear_find(registry, t) if m.is_compatible), None)
+
+        def index_resolve(t: str) -> str | None:
+            ids = registry.compatible_agent_ids(t)
+            return ids[0] if ids else None
+
+        resolve_linear = _per_call_us(linear_resolve, slots[: max(len(slots) // 20, 1)])
+        resolve_index = _per_call_us(index_resolve, slots)
+
+    compatible = sum(len(registry.compatible_agent_ids(t)) for t in type_ids) / len(type_ids)
+    print(
+        f"{args.agents} agents, {args.capabilities} capabilities, "
+        f"{len(type_ids)} slot types (mean {compatible:.0f} compatible agents)\n"
+        f"load {load_ms:.0f} ms, index build {build_ms:.1f} ms\n"
+    )
+    print(f"front-matter extraction, YAML parse excluded ({args.body_kb} KB prompt bodies)")
+    print(f"{'full read':<12}  {scan_full:>10.1f} us/file")
+    print(f"{'header only':<12}  {scan_header:>10.1f} us/file\n")
+    print(f"{'per call':<12}  {'us':>10}")
+    for name, us in rows:
+        print(f"{name:<12}  {us:>10.1f}")
+    print(f"\nresolve ({args.resolves} slots)")
+    print(f"{'linear':<12}  {resolve_linear:>10.1f} us/slot")
+    print(f"{'index':<12}  {resolve_index:>10.1f} us/slot  "
+          f"({resolve_linear / resolve_index:.0f}x)")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=3000)
+    parser.add_argument("--capabilities", type=int, default=2000)
+    parser.add_argument("--slot-types", type=int, default=200)
+    parser.add_argument("--resolves", type=int, default=20000,
+                        help="Slots resolved in the AutoExecutor-style loop")
+    parser.add_argument("--body-kb", type=int, default=32,
+                        help="Prompt body size per agent file (KB)")
+    parser.add_argument("--seed", type=int, default=1)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Offline text ranking benchmark for pipeline.text_index.
+
+Generates a synthetic template catalogue -- names, descriptions and slot
+objectives drawn from a mixed English / Chinese vocabulary -- and
+measures:
+
+- ``build``: tokenizing the catalogue and building the BM25 index
+- ``load``: reading the persisted index back (what NLMatcher does while
+  the templates are unchanged)
+- ``query``: BM25Index.search() latency for short requests
+- recall: how often the template a request was paraphrased from ranks
+  first / in the top 5 (requests reuse a few of its words plus noise)
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_text_index.py
+    PYTHONPATH=src python3 benchmarks/bench_text_index.py --templates 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.text_index import BM25Index, fingerprint, load_index, save_index
+
+_CJK = "开发实现功能调研分析策略量化交易回测安全审计漏洞修复紧急崩溃故障合规流程项目产品平台系统数据"
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    words: set[str] = set()
+    while len(words) < size:
+        if rng.random() < 0.3:
+            words.add("".join(rng.choice(_CJK) for _ in range(rng.randint(2, 4))))
+        else:
+            words.add("".join(rng.choice("abcdefghijklmnopqrstuvwxyz")
+                              for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def _catalogue(rng: random.Random, templates: int, vocab: list[str]) -> dict[str, str]:
+    docs = {}
+    for i in range(templates):
+        topic = rng.sample(vocab, 12)
+        lines = [f"Template {i} " + " ".join(topic[:3]), " ".join(topic[:8])]
+        for _ in range(rng.randint(2, 6)):
+            lines.append(" ".join(rng.sample(topic, 4) + rng.sample(vocab, 2)))
+        docs[f"template-{i:05d}"] = "\n".join(lines)
+    return docs
+
+
+def _paraphrase(rng: random.Random, text: str, vocab: list[str]) -> str:
+    words = text.split()
+    picked = rng.sample(words, min(3, len(words))) + rng.sample(vocab, 2)
+    rng.shuffle(picked)
+    return " ".join(picked)
+
+
+def run(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    vocab = _vocabulary(rng, args.vocabulary)
+    docs = _catalogue(rng, args.templates, vocab)
+    doc_ids = list(docs)
+    targets = [rng.choice(doc_ids) for _ in range(args.queries)]
+    queries = [_paraphrase(rng, docs[t].split("\n")[1], vocab) for t in targets]
+
+    start = time.perf_counter()
+    index = BM25Index(docs)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index.json"
+        key = fingerprint(docs)
+        save_index(index, path, key)
+        size_kb = path.stat().st_size / 1024
+        start = time.perf_counter()
+        loaded = load_index(path, key)
+        load_ms = (time.perf_counter() - start) * 1000
+    if loaded is None:
+        print("persisted index failed to load", file=sys.stderr)
+        return 1
+
+    latencies = []
+    top1 = top5 = 0
+    for query, target in zip(queries, targets):
+        start = time.perf_counter()
+        ranked = [doc_id for doc_id, _ in loaded.search(query, limit=5)]
+        latencies.append((time.perf_counter() - start) * 1000)
+        top1 += bool(ranked) and ranked[0] == target
+        top5 += target in ranked
+    latencies.sort()
+
+    print(
+        f"{args.templates} templates, {index.vocabulary_size} terms, "
+        f"index {size_kb:.0f} KB on disk\n"
+    )
+    print(f"build            {build_ms:>9.1f} ms")
+    print(f"load (persisted) {load_ms:>9.1f} ms")
+    print(f"query p50        {statistics.median(latencies):>9.3f} ms")
+    print(f"query p99        {latencies[int(len(latencies) * 0.99) - 1]:>9.3f} ms")
+    print(f"recall@1         {top1 / len(queries):>9.1%}")
+    print(f"recall@5         {top5 / len(queries):>9.1%}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, default=2000)
+    parser.add_argument("--vocabulary", type=int, default=8000,
+                        help="Distinct words across the catalogue")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
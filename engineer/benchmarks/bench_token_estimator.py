@@ -0,0 +1,175 @@
+"""Token estimate benchmark for pipeline.token_estimator.
+
+Estimates the tokens of this repository's own markdown, Python and YAML
+files (Chinese-heavy documents reported separately) and compares:
+
+- ``chars/4``: the previous ``len(text) // 4``
+- ``classes``: TokenEstimator with the approximate DEFAULT_RATES
+- ``calibrated``: TokenEstimator fitted with calibrate() on half of the
+  files and measured on the other half (needs a reference tokenizer)
+
+Speed is reported for every estimator.  Accuracy (mean absolute error
+against the reference tokenizer's counts, per corpus) needs the optional
+``tiktoken`` package; without it only speed and the per-corpus ratio to
+``chars/4`` are shown.  The byte-class features are checked against a
+plain per-character classification of every file.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_token_estimator.py
+    PYTHONPATH=src python3 benchmarks/bench_token_estimator.py --encoding cl100k_base
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from pipeline.token_estimator import (
+    FEATURES,
+    TokenEstimator,
+    calibrate,
+    char_estimate,
+    features,
+)
+
+_SUFFIXES = (".md", ".py", ".yaml", ".yml")
+_SKIP_DIRS = {".git", "__pycache__", ".pytest_cache", "node_modules"}
+
+
+def _load_corpora(root: Path) -> dict[str, list[str]]:
+    corpora: dict[str, list[str]] = {"md (zh)": [], "md": [], "py": [], "yaml": []}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+        for name in sorted(filenames):
+            if not name.endswith(_SUFFIXES):
+                continue
+            try:
+                text = Path(dirpath, name).read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+            if name.endswith(".md"):
+                cjk = features(text)["cjk"]
+                corpora["md (zh)" if cjk > 0.05 * len(text) else "md"].append(text)
+            elif name.endswith(".py"):
+                corpora["py"].append(text)
+            else:
+                corpora["yaml"].append(text)
+    return {name: texts for name, texts in corpora.items() if texts}
+
+
+def _slow_features(text: str) -> dict[str, int]:
+    """Per-character classification, the reference for features()."""
+    counts = dict.fromkeys(FEATURES, 0)
+    previous_letter = False
+    for ch in text:
+        code = ord(ch)
+        letter = ch.isascii() and ch.isalpha()
+        if letter:
+            counts["letters"] += 1
+            counts["words"] += not previous_letter
+        elif ch.isascii() and ch.isdigit():
+            counts["digits"] += 1
+        elif ch == "\n":
+            counts["newlines"] += 1
+        elif ch in " \t\r\v\f":
+            counts["spaces"] += 1
+        elif 0x21 <= code < 0x7F:
+            counts["punct"] += 1
+        elif 0x80 <= code < 0x800:
+            counts["latin"] += 1
+        elif 0x3000 <= code < 0xA000:
+            counts["cjk"] += 1
+        elif 0x800 <= code < 0x10000:
+            counts["wide"] += 1
+        elif code >= 0x10000:
+            counts["astral"] += 1
+        previous_letter = letter
+    return counts
+
+
+def _reference(encoding: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    enc = tiktoken.get_encoding(encoding)
+    return lambda text: len(enc.encode(text, disallowed_special=()))
+
+
+def _throughput(estimate, texts: list[str], repeat: int) -> float:
+    size = sum(len(t.encode("utf-8")) for t in texts)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            estimate(text)
+        best = min(best, time.perf_counter() - start)
+    return size / best / 1e6
+
+
+def run(args: argparse.Namespace) -> int:
+    corpora = _load_corpora(Path(args.root))
+    texts = [t for group in corpora.values() for t in group]
+    mismatched = sum(features(t) != _slow_features(t) for t in texts)
+    size = sum(len(t.encode("utf-8")) for t in texts)
+    print(f"{len(texts)} files, {size / 1024:.0f} KiB under {args.root}\n")
+
+    estimators = {"chars/4": char_estimate, "classes": TokenEstimator()}
+    reference = _reference(args.encoding)
+    if reference is not None:
+        train = [t for group in corpora.values() for t in group[::2]]
+        estimators["calibrated"] = calibrate((t, reference(t)) for t in train)
+
+    print(f"{'estimator':<11}  {'MB/s':>8}")
+    for name, estimate in estimators.items():
+        print(f"{name:<11}  {_throughput(estimate, texts, args.repeat):>8.1f}")
+    print(f"{'per-char':<11}  {_throughput(_slow_features, texts, 1):>8.1f}  "
+          "(pure-Python classification)")
+    print()
+
+    if reference is None:
+        print("tiktoken not installed: tokens relative to chars/4 only\n")
+        print(f"{'corpus':<8}  {'files':>5}  {'classes / chars/4':>17}")
+        for name, group in corpora.items():
+            ratio = sum(estimators["classes"](t) for t in group) / max(
+                1, sum(char_estimate(t) for t in group)
+            )
+            print(f"{name:<8}  {len(group):>5}  {ratio:>17.2f}")
+    else:
+        print(f"mean absolute error vs {args.encoding} (calibrated: held-out half)\n")
+        print(f"{'corpus':<8}  {'files':>5}  " + "  ".join(f"{n:>10}" for n in estimators))
+        for name, group in corpora.items():
+            held_out = group[1::2] or group
+            truth = [reference(t) for t in held_out]
+            errors = [
+                statistics.mean(
+                    abs(estimate(t) - n) / max(n, 1) for t, n in zip(held_out, truth)
+                )
+                for estimate in estimators.values()
+            ]
+            print(f"{name:<8}  {len(group):>5}  " + "  ".join(f"{e:>9.1%}" for e in errors))
+
+    if mismatched:
+        print(f"MISMATCH: byte-class features differ from per-character "
+              f"classification in {mismatched} files", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=str(Path(__file__).resolve().parents[2]),
+                        help="Tree to read files from (default: this repository)")
+    parser.add_argument("--encoding", default="cl100k_base",
+                        help="tiktoken encoding used as the reference tokenizer")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per speed measure (best kept)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Pipeline validation benchmark for pipeline.validator.
+
+Generates synthetic pipelines (each slot depends on a few recent slots,
+with data_flow edges along some of them) of growing size and measures,
+per size:
+
+- ``validate``: PipelineValidator.validate() -- one graph build shared
+  by every check
+- ``topo sort``: PipelineValidator.topological_sort()
+- ``legacy``: the previous validate() + topological_sort(), which built
+  the dependency graph once in each (string-keyed Kahn's algorithm)
+- ``cyclic``: validate() of the same pipeline with a three-slot cycle
+  injected deep inside, located with Tarjan SCC
+
+Time per slot should stay flat as the size grows (linear time).  The
+execution order must match the legacy one, and the cyclic pipeline must
+report exactly the injected cycle.
+
+Usage:
+    cd engineer
+    PYTHONPATH=src python3 benchmarks/bench_validator.py
+    PYTHONPATH=src python3 benchmarks/bench_validator.py --sizes 1000,100000 --fan-in 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict, deque
+
+from pipeline.models import ArtifactOutput, DataFlowEdge, Pipeline, Slot
+from pipeline.validator import PipelineValidator
+
+
+def _pipeline(size: int, fan_in: int, rng: random.Random, cycle: bool = False) -> Pipeline:
+    slots = []
+    data_flow = []
+    for i in range(size):
+        deps = sorted({f"s{rng.randrange(max(0, i - 50), i)}" for _ in range(fan_in)} if i else set())
+        if cycle and i == size // 2:
+            # s[n/2] -> s[n/2 + 2] -> s[n/2 + 1] -> s[n/2]
+            deps.append(f"s{i + 2}")
+        slots.append(Slot(
+            id=f"s{i}", slot_type="implementer", name=f"Slot {i}", depends_on=deps,
+            outputs=[ArtifactOutput(name="out", type="code")],
+        ))
+        if deps and i % 4 == 0:
+            data_flow.append(DataFlowEdge(from_slot=deps[0], to_slot=f"s{i}", artifact="out"))
+    if cycle:
+        mid = size // 2
+        slots[mid + 1].depends_on.append(f"s{mid}")
+        slots[mid + 2].depends_on.append(f"s{mid + 1}")
+    return Pipeline(
+        id="bench", name="Bench", version="1.0.0", description="", created_by="bench",
+        created_at="2026-01-01T00:00:00Z", slots=slots, data_flow=data_flow,
+    )
+
+
+def _legacy_kahn(slots: list[Slot]) -> tuple[list[str], dict[str, int]]:
+    """The previous graph build + Kahn's algorithm (check_dag, topological_sort)."""
+    slot_ids = {s.id for s in slots}
+    dependents: dict[str, list[str]] = defaultdict(list)
+    in_degree: dict[str, int] = {s.id: 0 for s in slots}
+    for slot in slots:
+        for dep in slot.depends_on:
+            if dep in slot_ids:
+                dependents[dep].append(slot.id)
+                in_degree[slot.id] += 1
+    queue = deque(sid for sid, deg in in_degree.items() if deg == 0)
+    result: list[str] = []
+    while queue:
+        node = queue.popleft()
+        result.append(node)
+        for dependent in dependents[node]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                queue.append(dependent)
+    return result, in_degree
+
+
+def _legacy(pipeline: Pipeline) -> list[str]:
+    """The previous validate() checks followed by topological_sort()."""
+    slots = pipeline.slots
+    seen: set[str] = set()
+    for slot in slots:
+        seen.add(slot.id)
+    slot_ids = {s.id for s in slots}
+    for slot in slots:
+        for dep in slot.depends_on:
+            dep in slot_ids
+    _legacy_kahn(slots)  # check_dag
+    output_map = {s.id: {o.name for o in s.outputs} for s in slots}
+    for edge in pipeline.data_flow:
+        edge.artifact in output_map.get(edge.from_slot, set())
+    all_deps: set[str] = set()
+    for slot in slots:
+        all_deps.update(slot.depends_on)
+    return _legacy_kahn(slots)[0]  # topological_sort
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run(args: argparse.Namespace) -> int:
+    validator = PipelineValidator(".")
+    sizes = [int(s) for s in args.sizes.split(",")]
+    mismatched = []
+    print(f"fan-in {args.fan_in}, best of {args.repeat}\n")
+    print(f"{'slots':>7}  {'validate ms':>11}  {'topo ms':>8}  {'legacy ms':>9}  "
+          f"{'cyclic ms':>9}  {'us/slot':>7}")
+    for size in sizes:
+        rng = random.Random(args.seed)
+        pipeline = _pipeline(size, args.fan_in, rng)
+        cyclic = _pipeline(size, args.fan_in, random.Random(args.seed), cycle=True)
+
+        validate_ms, result = _best(lambda: validator.validate(pipeline), args.repeat)
+        topo_ms, order = _best(lambda: validator.topological_sort(pipeline.slots), args.repeat)
+        legacy_ms, legacy_order = _best(lambda: _legacy(pipeline), args.repeat)
+        cyclic_ms, cyclic_result = _best(lambda: validator.validate(cyclic), args.repeat)
+
+        mid = size // 2
+        expected = f"s{mid} -> s{mid + 2} -> s{mid + 1} -> s{mid}"
+        if not result.is_valid or order != legacy_order:
+            mismatched.append(f"{size}: order differs from legacy")
+        if [e for e in cyclic_result.errors if "cycle" in e] != [
+            f"Dependency cycle detected: {expected} (each slot depends on the next)"
+        ]:
+            mismatched.append(f"{size}: cycle not reported as {expected}")
+        per_slot = (validate_ms + topo_ms) * 1000 / size
+        print(f"{size:>7}  {validate_ms:>11.1f}  {topo_ms:>8.1f}  {legacy_ms:>9.1f}  "
+              f"{cyclic_ms:>9.1f}  {per_slot:>7.2f}")
+
+    if mismatched:
+        print(f"MISMATCH: {'; '.join(mismatched)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated slot counts")
+    parser.add_argument("--fan-in", type=int, default=3, help="Dependencies per slot (max)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measure (best kept)")
+    parser.add_argument("--seed", type=int, default=7)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,153 +21,126 @@ Manual setup:
     pipeline, state = runner.prepare("templates/standard-feature.yaml", params)
     next_slots = runner.get_next_slots(pipeline, state)
     print(runner.get_summary(state))
+
+Public names are re-exported lazily (PEP 562): ``import pipeline`` stays
+cheap, and each submodule is imported on first attribute access.  This
+keeps short-lived CLI invocations such as ``pipeline status`` from paying
+for the runner, matcher and executor imports they never use.
 """
 
-from pipeline.bootstrap import BootstrappedExecutor, boot
-from pipeline.auto_executor import (
-    AgentExecutor,
-    AgentResult,
-    AutoExecutor,
-    AutoExecutorConfig,
-    CallbackExecutor,
-    SubprocessExecutor,
-)
-from pipeline.context_router import ContextRouter
-from pipeline.enforcer import SlotEnforcer, EnforcementRule, EnforcementResult, EnforcementAction
-from pipeline.ov_context_router import OVContextRouter
-from pipeline.gate_checker import GateChecker
-from pipeline.loader import PipelineLoader, PipelineLoadError, PipelineParameterError
-from pipeline.models import (
-    AgentCapabilities,
-    ArtifactOutput,
-    ArtifactRef,
-    ArtifactType,
-    CapabilityMatch,
-    ConditionType,
-    ContextItem,
-    ContextTier,
-    DataFlowEdge,
-    DeterministicMetrics,
-    ExecutionConfig,
-    Gate,
-    GateCheckResult,
-    Parameter,
-    Pipeline,
-    PipelineObserver,
-    PipelineState,
-    PipelineStatus,
-    Slot,
-    SlotAssignment,
-    SlotState,
-    SlotStatus,
-    SlotTask,
-    SlotTypeDefinition,
-    ValidationLevel,
-)
-from pipeline.nl_matcher import NLMatcher, TemplateMatch
-from pipeline.observer import ComplianceObserver
-from pipeline.pipeline_generator import GenerationResult, PipelineGenerator
-from pipeline.project_planner import (
-    BlueprintCycleError,
-    BlueprintLoadError,
-    BlueprintValidationResult,
-    Phase,
-    PhaseSlot,
-    ProjectBlueprint,
-    ProjectPlanner,
-    RoleRequirement,
-    Subsystem,
-)
-from pipeline.runner import PipelineExecutionError, PipelineRunner
-from pipeline.slot_contract import SlotContractManager, SlotInput, SlotOutputValidation
-from pipeline.slot_registry import SlotRegistry, SlotTypeNotFoundError
-from pipeline.state import PipelineStateTracker, InvalidTransitionError
-from pipeline.validator import PipelineCycleError, PipelineValidator, ValidationResult
+from __future__ import annotations
+
+import importlib
+from typing import Any
 
-__all__ = [
+# Public name -> defining submodule.
+_EXPORTS: dict[str, str] = {
     # Bootstrap
-    "boot",
-    "BootstrappedExecutor",
+    "boot": "pipeline.bootstrap",
+    "BootstrappedExecutor": "pipeline.bootstrap",
+    "Components": "pipeline.components",
     # Auto Executor
-    "AgentExecutor",
-    "AgentResult",
-    "AutoExecutor",
-    "AutoExecutorConfig",
-    "CallbackExecutor",
-    "SubprocessExecutor",
+    "AgentExecutor": "pipeline.auto_executor",
+    "AgentResult": "pipeline.auto_executor",
+    "AutoExecutor": "pipeline.auto_executor",
+    "AutoExecutorConfig": "pipeline.auto_executor",
+    "CallbackExecutor": "pipeline.auto_executor",
+    "SubprocessExecutor": "pipeline.auto_executor",
+    # Agent Assignment
+    "AgentAssigner": "pipeline.assignment",
+    "AssignmentPolicy": "pipeline.assignment",
+    "BatchAssignment": "pipeline.assignment",
     # Context Router
-    "ContextRouter",
-    "OVContextRouter",
-    "ContextItem",
-    "ContextTier",
+    "ContextRouter": "pipeline.context_router",
+    "OVContextRouter": "pipeline.ov_context_router",
+    "ContextItem": "pipeline.models",
+    "ContextTier": "pipeline.models",
     # Enforcer
-    "SlotEnforcer",
-    "EnforcementRule",
-    "EnforcementResult",
-    "EnforcementAction",
+    "SlotEnforcer": "pipeline.enforcer",
+    "EnforcementRule": "pipeline.enforcer",
+    "EnforcementResult": "pipeline.enforcer",
+    "EnforcementAction": "pipeline.enforcer",
     # Models
-    "AgentCapabilities",
-    "ArtifactOutput",
-    "ArtifactRef",
-    "ArtifactType",
-    "CapabilityMatch",
-    "ConditionType",
-    "DataFlowEdge",
-    "DeterministicMetrics",
-    "ExecutionConfig",
-    "Gate",
-    "GateCheckResult",
-    "Parameter",
-    "Pipeline",
-    "PipelineState",
-    "PipelineStatus",
-    "Slot",
-    "SlotAssignment",
-    "SlotState",
-    "SlotStatus",
-    "SlotTask",
-    "SlotTypeDefinition",
-    "PipelineObserver",
-    "ValidationLevel",
+    "AgentCapabilities": "pipeline.models",
+    "ArtifactOutput": "pipeline.models",
+    "ArtifactRef": "pipeline.models",
+    "ArtifactType": "pipeline.models",
+    "CapabilityMatch": "pipeline.models",
+    "ConditionType": "pipeline.models",
+    "DataFlowEdge": "pipeline.models",
+    "DeterministicMetrics": "pipeline.models",
+    "ExecutionConfig": "pipeline.models",
+    "Gate": "pipeline.models",
+    "GateCheckResult": "pipeline.models",
+    "Parameter": "pipeline.models",
+    "Pipeline": "pipeline.models",
+    "PipelineState": "pipeline.models",
+    "PipelineStatus": "pipeline.models",
+    "Slot": "pipeline.models",
+    "SlotAssignment": "pipeline.models",
+    "SlotState": "pipeline.models",
+    "SlotStatus": "pipeline.models",
+    "SlotTask": "pipeline.models",
+    "SlotTypeDefinition": "pipeline.models",
+    "PipelineObserver": "pipeline.models",
+    "ValidationLevel": "pipeline.models",
     # Observer
-    "ComplianceObserver",
+    "ComplianceObserver": "pipeline.observer",
     # Loader
-    "PipelineLoader",
-    "PipelineLoadError",
-    "PipelineParameterError",
+    "PipelineLoader": "pipeline.loader",
+    "PipelineLoadError": "pipeline.loader",
+    "PipelineParameterError": "pipeline.loader",
     # Validator
-    "PipelineValidator",
-    "PipelineCycleError",
-    "ValidationResult",
+    "PipelineValidator": "pipeline.validator",
+    "PipelineCycleError": "pipeline.validator",
+    "ValidationResult": "pipeline.validator",
     # State
-    "PipelineStateTracker",
-    "InvalidTransitionError",
+    "PipelineStateTracker": "pipeline.state",
+    "InvalidTransitionError": "pipeline.state",
     # Slot Contract
-    "SlotContractManager",
-    "SlotInput",
-    "SlotOutputValidation",
+    "SlotContractManager": "pipeline.slot_contract",
+    "SlotInput": "pipeline.slot_contract",
+    "SlotOutputValidation": "pipeline.slot_contract",
     # Slot Registry
-    "SlotRegistry",
-    "SlotTypeNotFoundError",
+    "SlotRegistry": "pipeline.slot_registry",
+    "SlotTypeNotFoundError": "pipeline.slot_registry",
     # Gate Checker
-    "GateChecker",
+    "GateChecker": "pipeline.gate_checker",
     # Runner
-    "PipelineRunner",
-    "PipelineExecutionError",
+    "PipelineRunner": "pipeline.runner",
+    "PipelineExecutionError": "pipeline.runner",
+    # Profiling
+    "PhaseProfiler": "pipeline.profiling",
+    "PhaseStats": "pipeline.profiling",
     # NL Matcher
-    "NLMatcher",
-    "TemplateMatch",
+    "NLMatcher": "pipeline.nl_matcher",
+    "TemplateMatch": "pipeline.nl_matcher",
     # Project Planner (Meta-Orchestration)
-    "ProjectPlanner",
-    "ProjectBlueprint",
-    "RoleRequirement",
-    "Subsystem",
-    "Phase",
-    "PhaseSlot",
-    "BlueprintValidationResult",
-    "BlueprintLoadError",
-    "BlueprintCycleError",
+    "ProjectPlanner": "pipeline.project_planner",
+    "ProjectBlueprint": "pipeline.project_planner",
+    "RoleRequirement": "pipeline.project_planner",
+    "Subsystem": "pipeline.project_planner",
+    "Phase": "pipeline.project_planner",
+    "PhaseSlot": "pipeline.project_planner",
+    "BlueprintValidationResult": "pipeline.project_planner",
+    "BlueprintLoadError": "pipeline.project_planner",
+    "BlueprintCycleError": "pipeline.project_planner",
     # Pipeline Generator (Meta-Orchestration)
-    "PipelineGenerator",
-    "GenerationResult",
-]
+    "PipelineGenerator": "pipeline.pipeline_generator",
+    "GenerationResult": "pipeline.pipeline_generator",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
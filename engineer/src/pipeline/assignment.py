@@ -0,0 +1,384 @@
+"""Agent assignment: which compatible agent fills which slot.
+
+The registry answers "who *can* fill this slot type"; an
+:class:`AgentAssigner` decides who *does*, given how busy each agent is:
+
+- a pluggable :class:`AssignmentPolicy` ranks the compatible agents
+  (first compatible, least loaded, round-robin, best capability overlap)
+- optional per-agent capacity limits cap concurrent slots per agent
+- :meth:`AgentAssigner.assign_batch` assigns a whole wave of ready slots
+  at once as a bipartite matching (slots x agent capacity), spreading
+  the wave as evenly as the compatibility constraints allow
+
+Slots that have compatible agents but no free capacity are *deferred*
+(left for a later wave); slots with no compatible agent at all are
+reported as unassigned.
+"""
+
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from pipeline.models import Slot
+from pipeline.slot_registry import SlotRegistry
+
+
+# ---------------------------------------------------------------------------
+# Policies
+# ---------------------------------------------------------------------------
+
+
+class AssignmentPolicy(ABC):
+    """Ranks the compatible agents for a slot type, most preferred first."""
+
+    #: Policy name used in AutoExecutorConfig.assignment_policy
+    name: str = ""
+
+    #: Spread batches evenly (minimize the busiest agent's load).  When
+    #: False, a batch fills agents greedily in ranked order.
+    balance: bool = True
+
+    @abstractmethod
+    def rank(
+        self, slot_type: str, candidates: list[str], assigner: AgentAssigner
+    ) -> list[str]:
+        """Order *candidates* (compatible agent IDs, in load order)."""
+
+    def on_assigned(self, slot_type: str, agent_id: str) -> None:
+        """Called after an agent is assigned a slot of *slot_type*."""
+
+
+class FirstCompatiblePolicy(AssignmentPolicy):
+    """Always prefer the first compatible agent (the original behavior)."""
+
+    name = "first"
+    balance = False
+
+    def rank(
+        self, slot_type: str, candidates: list[str], assigner: AgentAssigner
+    ) -> list[str]:
+        return candidates
+
+
+class LeastLoadedPolicy(AssignmentPolicy):
+    """Prefer agents with the fewest slots in flight, then fewest overall."""
+
+    name = "least-loaded"
+
+    def rank(
+        self, slot_type: str, candidates: list[str], assigner: AgentAssigner
+    ) -> list[str]:
+        return sorted(
+            candidates, key=lambda a: (assigner.load(a), assigner.total_assigned(a))
+        )
+
+
+class RoundRobinPolicy(AssignmentPolicy):
+    """Rotate through the compatible agents of each slot type."""
+
+    name = "round-robin"
+
+    def __init__(self) -> None:
+        self._next: dict[str, int] = {}
+
+    def rank(
+        self, slot_type: str, candidates: list[str], assigner: AgentAssigner
+    ) -> list[str]:
+        if not candidates:
+            return candidates
+        start = self._next.get(slot_type, 0) % len(candidates)
+        return candidates[start:] + candidates[:start]
+
+    def on_assigned(self, slot_type: str, agent_id: str) -> None:
+        self._next[slot_type] = self._next.get(slot_type, 0) + 1
+
+
+class BestOverlapPolicy(AssignmentPolicy):
+    """Prefer the most specialized agents for the slot type.
+
+    Agents that list the slot type in ``compatible_slot_types`` come
+    first, then agents with the fewest capabilities beyond the required
+    ones (highest overlap), so generalists stay free for slots that
+    only they can fill.
+    """
+
+    name = "best-overlap"
+
+    def rank(
+        self, slot_type: str, candidates: list[str], assigner: AgentAssigner
+    ) -> list[str]:
+        registry = assigner.registry
+        required = set(registry.get_slot_type(slot_type).required_capabilities)
+
+        def key(agent_id: str) -> tuple[bool, int]:
+            agent = registry.get_agent(agent_id)
+            declared = slot_type in agent.compatible_slot_types
+            return (not declared, len(set(agent.capabilities) - required))
+
+        return sorted(candidates, key=key)
+
+
+_POLICIES: dict[str, type[AssignmentPolicy]] = {
+    cls.name: cls
+    for cls in (FirstCompatiblePolicy, LeastLoadedPolicy, RoundRobinPolicy, BestOverlapPolicy)
+}
+
+
+def make_policy(name: str) -> AssignmentPolicy:
+    """Instantiate a built-in policy by name.
+
+    Raises:
+        ValueError: Unknown policy name.
+    """
+    try:
+        return _POLICIES[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown assignment policy {name!r}; "
+            f"expected one of {sorted(_POLICIES)}"
+        ) from None
+
+
+# ---------------------------------------------------------------------------
+# Assigner
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class BatchAssignment:
+    """Outcome of assigning a wave of slots."""
+
+    assigned: dict[str, str] = field(default_factory=dict)  # slot_id -> agent_id
+    deferred: list[str] = field(default_factory=list)  # compatible agents all full
+    unassigned: list[str] = field(default_factory=list)  # no compatible agent
+
+
+class AgentAssigner:
+    """Chooses agents for slots and tracks per-agent load.
+
+    Load is the number of slots an agent currently holds; callers
+    release an agent when its slot finishes.  Thread-safe.
+
+    Usage:
+        assigner = AgentAssigner(registry, "least-loaded", capacity=2)
+        batch = assigner.assign_batch(ready_slots)
+        ...
+        for agent_id in batch.assigned.values():
+            assigner.release(agent_id)
+    """
+
+    def __init__(
+        self,
+        registry: SlotRegistry,
+        policy: AssignmentPolicy | str = "first",
+        *,
+        capacity: int | None = None,
+        capacities: dict[str, int] | None = None,
+    ) -> None:
+        """
+        Args:
+            registry: Registry answering slot type -> compatible agents.
+            policy: Policy instance or built-in policy name.
+            capacity: Max concurrent slots per agent (None = unlimited).
+            capacities: Per-agent overrides of *capacity*.
+
+        Raises:
+            ValueError: Unknown policy name or capacity below 1.
+        """
+        for value in [capacity, *(capacities or {}).values()]:
+            if value is not None and value < 1:
+                raise ValueError(f"Agent capacity must be at least 1, got {value}")
+        self._registry = registry
+        self._policy = make_policy(policy) if isinstance(policy, str) else policy
+        self._capacity = capacity
+        self._capacities = dict(capacities or {})
+        self._load: dict[str, int] = {}
+        self._total: dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def registry(self) -> SlotRegistry:
+        return self._registry
+
+    @property
+    def policy(self) -> AssignmentPolicy:
+        return self._policy
+
+    def capacity(self, agent_id: str) -> int | None:
+        """Max concurrent slots for *agent_id* (None = unlimited)."""
+        return self._capacities.get(agent_id, self._capacity)
+
+    def load(self, agent_id: str) -> int:
+        """Slots *agent_id* currently holds."""
+        return self._load.get(agent_id, 0)
+
+    def total_assigned(self, agent_id: str) -> int:
+        """Slots ever assigned to *agent_id* by this assigner."""
+        return self._total.get(agent_id, 0)
+
+    def candidates(self, slot_type: str) -> list[str]:
+        """Compatible agents for *slot_type*, ranked by the policy."""
+        agents = self._registry.compatible_agent_ids(slot_type)
+        return self._policy.rank(slot_type, agents, self)
+
+    def acquire(self, agent_id: str) -> None:
+        """Record that *agent_id* took a slot (e.g. an explicit assignment)."""
+        with self._lock:
+            self._load[agent_id] = self.load(agent_id) + 1
+            self._total[agent_id] = self.total_assigned(agent_id) + 1
+
+    def release(self, agent_id: str) -> None:
+        """Record that *agent_id* finished a slot."""
+        with self._lock:
+            if self._load.get(agent_id, 0) > 0:
+                self._load[agent_id] -= 1
+
+    def assign(self, slot: Slot) -> str | None:
+        """Pick and acquire an agent for a single slot.
+
+        Unlike assign_batch() this never defers: when every compatible
+        agent is at capacity, the least loaded of them is chosen.
+
+        Returns:
+            Agent ID, or None if no agent is compatible.
+        """
+        with self._lock:
+            ranked = self.candidates(slot.slot_type)
+            if not ranked:
+                return None
+            free = [a for a in ranked if self._free(a) > 0]
+            agent_id = free[0] if free else min(ranked, key=self.load)
+            self._take(slot.slot_type, agent_id)
+            return agent_id
+
+    def assign_batch(self, slots: Sequence[Slot]) -> BatchAssignment:
+        """Assign a wave of ready slots at once and acquire their agents.
+
+        Finds a maximum matching of slots to free agent capacity, so no
+        slot is deferred if some arrangement could place it.  Unless the
+        policy disables balancing, it then picks the matching with the
+        lowest peak agent load; within that, each slot gets its
+        highest-ranked agent where possible.
+
+        Returns:
+            BatchAssignment with assigned, deferred and unassigned slots.
+        """
+        with self._lock:
+            ranked: dict[str, list[str]] = {}
+            slot_types: dict[str, str] = {}
+            unassigned: list[str] = []
+            for slot in slots:
+                agents = self.candidates(slot.slot_type)
+                if agents:
+                    ranked[slot.id] = agents
+                    slot_types[slot.id] = slot.slot_type
+                else:
+                    unassigned.append(slot.id)
+
+            order = list(ranked)
+            matching = _max_matching(order, ranked, self._free)
+            if self._policy.balance and matching:
+                matching = self._balanced(order, ranked, len(matching))
+
+            for slot_id in order:
+                if slot_id in matching:
+                    self._take(slot_types[slot_id], matching[slot_id])
+            return BatchAssignment(
+                assigned={s: matching[s] for s in order if s in matching},
+                deferred=[s for s in order if s not in matching],
+                unassigned=unassigned,
+            )
+
+    # --- Private helpers ---
+
+    def _free(self, agent_id: str) -> int:
+        cap = self.capacity(agent_id)
+        if cap is None:
+            return 1 << 30
+        return max(cap - self.load(agent_id), 0)
+
+    def _take(self, slot_type: str, agent_id: str) -> None:
+        self.acquire(agent_id)
+        self._policy.on_assigned(slot_type, agent_id)
+
+    def _balanced(
+        self, order: list[str], ranked: dict[str, list[str]], target: int
+    ) -> dict[str, str]:
+        """Smallest peak load at which *target* slots still fit.
+
+        Level L lets each agent hold up to L slots in total (current load
+        included), within its free capacity.
+        """
+        agents = {a for candidates in ranked.values() for a in candidates}
+        low = min(self.load(a) for a in agents) + 1
+        high = max(self.load(a) for a in agents) + len(order)
+        best: dict[str, str] = {}
+        while low <= high:
+            level = (low + high) // 2
+            matching = _max_matching(
+                order, ranked,
+                lambda a, level=level: min(self._free(a), max(level - self.load(a), 0)),
+            )
+            if len(matching) >= target:
+                best, high = matching, level - 1
+            else:
+                low = level + 1
+        return best
+
+
+def _max_matching(
+    order: list[str],
+    ranked: dict[str, list[str]],
+    free: Callable[[str], int],
+) -> dict[str, str]:
+    """Maximum bipartite matching of slots to agent capacity.
+
+    Augmenting paths (Kuhn's algorithm with capacities).  Slots are
+    placed in *order*, each taking its highest-ranked free agent, so the
+    result is greedy-by-preference except where a reshuffle of earlier
+    slots places one more.  Recursion depth is bounded by the number of
+    agents.
+
+    Args:
+        order: Slot IDs in placement order.
+        ranked: Slot ID -> candidate agent IDs, most preferred first.
+        free: Agent ID -> slots the agent may still take.
+
+    Returns:
+        Slot ID -> agent ID for every placed slot.
+    """
+    held: dict[str, list[str]] = {}
+    match: dict[str, str] = {}
+    limit: dict[str, int] = {}
+
+    def augment(slot_id: str, seen: set[str]) -> bool:
+        agents = ranked[slot_id]
+        # Prefer a free agent; only displace other slots when none is
+        for agent_id in agents:
+            if agent_id not in limit:
+                limit[agent_id] = free(agent_id)
+            slots = held.setdefault(agent_id, [])
+            if agent_id not in seen and len(slots) < limit[agent_id]:
+                seen.add(agent_id)
+                slots.append(slot_id)
+                match[slot_id] = agent_id
+                return True
+        for agent_id in agents:
+            if agent_id in seen or not limit[agent_id]:
+                continue
+            seen.add(agent_id)
+            slots = held[agent_id]
+            for other in list(slots):
+                if augment(other, seen):
+                    slots.remove(other)
+                    slots.append(slot_id)
+                    match[slot_id] = agent_id
+                    return True
+        return False
+
+    for slot_id in order:
+        augment(slot_id, set())
+    return match
@@ -0,0 +1,77 @@
+"""Atomic file writes: a temp file in the target directory, then a rename.
+
+Every file the engine rewrites in place -- pipeline state, the registry
+cache, context and text indexes, persisted TTL caches, context pack
+manifests -- goes through :func:`write_text` or :func:`write_json`, so a
+reader in any process sees either the old file or the new one, never a
+partial write.
+
+The caches that skip unchanged files by ``(mtime, size)`` stamp share
+one rule for trusting a stamp, :func:`mtime_settled`: a file modified
+within :data:`RACY_WINDOW_NS` of the moment its stamp was taken can be
+written again without the stamp changing, so it is read again.
+
+Usage:
+    write_json(state_dir / ".context-index.json", payload)
+    write_text(state_file, yaml.safe_dump(data))
+    mtime_settled(st.st_mtime_ns, time.time_ns())   # stamp trusted?
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+# A second write within the filesystem's mtime resolution can leave a
+# file's (mtime, size) unchanged
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def mtime_settled(mtime_ns: int, observed_ns: int) -> bool:
+    """Whether a stamp with *mtime_ns*, taken at *observed_ns*, can be trusted.
+
+    True when the file was last modified more than RACY_WINDOW_NS
+    before the stamp was taken, so a later write must change it.
+    """
+    return mtime_ns < observed_ns - RACY_WINDOW_NS
+
+
+def write_text(path: str | Path, text: str) -> None:
+    """Replace *path* with *text* (UTF-8), creating parent directories.
+
+    On failure *path* is left as it was and no temp file remains.
+
+    Raises:
+        OSError: The file could not be written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = memoryview(text.encode("utf-8"))
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    fd_closed = False
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+        os.close(fd)
+        fd_closed = True
+        os.rename(tmp_path, path)
+    except BaseException:
+        if not fd_closed:
+            os.close(fd)
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_json(path: str | Path, payload: Any, *, indent: int | None = None) -> None:
+    """Replace *path* with *payload* as JSON (non-ASCII kept as UTF-8).
+
+    Raises:
+        OSError: The file could not be written.
+        TypeError, ValueError: *payload* is not JSON-serializable (the
+            file is not touched).
+    """
+    write_text(path, json.dumps(payload, ensure_ascii=False, indent=indent))
@@ -3,10 +3,22 @@
 Sits on top of PipelineRunner and automates the full execution loop:
 find agent -> generate contract -> spawn agent -> validate output -> complete slot.
 Abstract AgentExecutor interface allows pluggable agent spawning mechanisms.
+Agents are chosen by an AgentAssigner (see pipeline.assignment), which
+spreads each parallel group across the compatible agents.
+
+With ``AutoExecutorConfig(prefetch=True)`` the executor predicts, while
+a group's agents run, which slots become ready once the in-flight slots
+complete, and prepares them in a background thread: their SlotInput
+contracts, their slot context (routed items, context YAML and pack
+blocks; see PipelineRunner.prefetch_context) and their registry
+matches.  A prefetched contract is used only if the statuses of its
+upstream slots turned out as predicted; otherwise it is discarded and
+generated again when the slot begins.
 """
 
 from __future__ import annotations
 
+import dataclasses
 import logging
 import subprocess
 import threading
@@ -14,8 +26,10 @@ import time
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Any, Callable
 
+from pipeline.assignment import AgentAssigner
 from pipeline.models import (
     Pipeline,
     PipelineState,
@@ -56,6 +70,15 @@ class AutoExecutorConfig:
     max_parallel: int = 4
     timeout_default_hours: float = 4.0
     dry_run: bool = False
+    # Agent choice among compatible agents: "first", "least-loaded",
+    # "round-robin" or "best-overlap" (see pipeline.assignment)
+    assignment_policy: str = "first"
+    # Max concurrent slots per agent; None = unlimited.  Slots over the
+    # limit wait for a later wave.
+    agent_capacity: int | None = None
+    # Prepare the next wave's contracts, context and agent matches
+    # while the current group's agents run.
+    prefetch: bool = False
 
 
 # ---------------------------------------------------------------------------
@@ -245,6 +268,15 @@ class _SlotTask:
     slot_input: SlotInput
 
 
+@dataclass
+class _Prefetched:
+    """Contract prepared for a slot predicted to become ready."""
+
+    slot_input: SlotInput
+    # Upstream slot id -> status the prediction assumed
+    assumed: dict[str, SlotStatus]
+
+
 # ---------------------------------------------------------------------------
 # AutoExecutor
 # ---------------------------------------------------------------------------
@@ -259,6 +291,9 @@ class AutoExecutor:
     Usage:
         executor = AutoExecutor(runner, agent_executor, contract_mgr, registry)
         final_state = executor.run(pipeline, state)
+
+    Pass ``assigner=`` to share agent load tracking between executors;
+    otherwise one is built from the config's assignment settings.
     """
 
     def __init__(
@@ -271,15 +306,28 @@ class AutoExecutor:
         config: AutoExecutorConfig | None = None,
         assignments: list[SlotAssignment] | None = None,
         project_root: str = "",
+        assigner: AgentAssigner | None = None,
     ) -> None:
         self._runner = runner
         self._executor = executor
         self._contract_manager = contract_manager
         self._registry = registry
         self._config = config or AutoExecutorConfig()
+        self._assigner = assigner or AgentAssigner(
+            registry,
+            self._config.assignment_policy,
+            capacity=self._config.agent_capacity,
+        )
         self._project_root = project_root
         self._state_lock = threading.RLock()
 
+        # Speculative contracts by slot_id (see _prefetch_next_wave).
+        # Written only by the prefetch thread while agents run, read
+        # after it has been joined.
+        self._prefetched: dict[str, _Prefetched] = {}
+        self.prefetch_hits = 0
+        self.prefetch_discarded = 0
+
         # Index assignments by slot_id for O(1) lookup
         self._assignments: dict[str, SlotAssignment] = {}
         if assignments:
@@ -315,6 +363,11 @@ class AutoExecutor:
                 else:
                     state = self._execute_group(group_slots, pipeline, state)
 
+        # Predicted slots that never began (an upstream slot failed)
+        self.prefetch_discarded += len(self._prefetched)
+        self._prefetched.clear()
+        if self._config.prefetch:
+            self._runner.discard_prefetched(pipeline.id)
         return state
 
     def run_single_slot(
@@ -335,8 +388,26 @@ class AutoExecutor:
         Returns:
             Tuple of (updated state, AgentResult or None if begin failed).
         """
-        agent_id, agent_prompt = self._resolve_agent(slot)
+        agent_id, agent_prompt = self._resolve_agent(slot, acquire=True)
+        try:
+            return self._run_resolved_slot(
+                slot, pipeline, state, agent_id, agent_prompt
+            )
+        finally:
+            if agent_id:
+                self._assigner.release(agent_id)
 
+    # --- Private: execution ---
+
+    def _run_resolved_slot(
+        self,
+        slot: Slot,
+        pipeline: Pipeline,
+        state: PipelineState,
+        agent_id: str | None,
+        agent_prompt: str | None,
+    ) -> tuple[PipelineState, AgentResult | None]:
+        """Begin, execute and finalize *slot* with an already chosen agent."""
         with self._state_lock:
             state = self._runner.begin_slot(
                 slot, pipeline, state,
@@ -350,9 +421,11 @@ class AutoExecutor:
             return state, None
 
         # Generate contract and execute
-        slot_input = self._contract_manager.generate_slot_input(
-            slot, pipeline, state
-        )
+        slot_input = self._take_prefetched(slot, state)
+        if slot_input is None:
+            slot_input = self._contract_manager.generate_slot_input(
+                slot, pipeline, state
+            )
 
         timeout = (
             slot.execution.timeout_hours * 3600
@@ -373,8 +446,6 @@ class AutoExecutor:
 
         return state, result
 
-    # --- Private: execution ---
-
     def _execute_group(
         self,
         slots: list[Slot],
@@ -383,14 +454,35 @@ class AutoExecutor:
     ) -> PipelineState:
         """Execute a group of slots with three-phase approach.
 
-        Phase 1 (sequential): begin slots, generate contracts
+        Phase 1 (sequential): assign agents, begin slots, generate contracts
         Phase 2 (concurrent): execute agents
         Phase 3 (sequential): finalize slots
+
+        Slots whose compatible agents are all at capacity stay PENDING
+        and are picked up by the next iteration of run().
         """
+        plan = self._plan_group(slots)
+        try:
+            return self._execute_planned(slots, plan, pipeline, state)
+        finally:
+            for agent_id, _ in plan.values():
+                if agent_id:
+                    self._assigner.release(agent_id)
+
+    def _execute_planned(
+        self,
+        slots: list[Slot],
+        plan: dict[str, tuple[str | None, str | None]],
+        pipeline: Pipeline,
+        state: PipelineState,
+    ) -> PipelineState:
+        """Run the three phases for the slots placed by _plan_group()."""
         # Phase 1: Sequential -- state mutations
         tasks: list[_SlotTask] = []
         for slot in slots:
-            agent_id, agent_prompt = self._resolve_agent(slot)
+            if slot.id not in plan:
+                continue  # deferred: no agent capacity this wave
+            agent_id, agent_prompt = plan[slot.id]
 
             with self._state_lock:
                 state = self._runner.begin_slot(
@@ -408,9 +500,11 @@ class AutoExecutor:
                 )
                 continue
 
-            slot_input = self._contract_manager.generate_slot_input(
-                slot, pipeline, state
-            )
+            slot_input = self._take_prefetched(slot, state)
+            if slot_input is None:
+                slot_input = self._contract_manager.generate_slot_input(
+                    slot, pipeline, state
+                )
             tasks.append(_SlotTask(
                 slot=slot,
                 agent_id=agent_id or "",
@@ -421,8 +515,15 @@ class AutoExecutor:
         if not tasks:
             return state
 
-        # Phase 2: Concurrent -- pure I/O
-        results = self._execute_tasks(tasks)
+        # Phase 2: Concurrent -- pure I/O, next wave prefetched alongside
+        prefetcher = None
+        if self._config.prefetch:
+            prefetcher = self._start_prefetch(tasks, pipeline, state)
+        try:
+            results = self._execute_tasks(tasks)
+        finally:
+            if prefetcher is not None:
+                prefetcher.join()
 
         # Phase 3: Sequential -- state mutations
         for task, result in zip(tasks, results):
@@ -480,6 +581,113 @@ class AutoExecutor:
             project_root=self._project_root,
         )
 
+    # --- Private: prefetch ---
+
+    def _start_prefetch(
+        self,
+        tasks: list[_SlotTask],
+        pipeline: Pipeline,
+        state: PipelineState,
+    ) -> threading.Thread | None:
+        """Start preparing the slots that *tasks* completing would make ready.
+
+        The prediction assumes every in-flight slot completes.  It is
+        computed on a copy of *state*, so the prefetch thread never sees
+        the state mutations of phase 3.
+
+        Returns:
+            The started prefetch thread, or None if nothing is predicted.
+        """
+        in_flight = {task.slot.id for task in tasks}
+        predicted = dataclasses.replace(state, slots={
+            slot_id: dataclasses.replace(
+                slot_state,
+                status=SlotStatus.COMPLETED if slot_id in in_flight else slot_state.status,
+            )
+            for slot_id, slot_state in state.slots.items()
+        })
+        ready_now = {s.id for s in self._runner.get_next_slots(pipeline, state)}
+        upcoming = [
+            slot for slot in self._runner.get_next_slots(pipeline, predicted)
+            if slot.id not in ready_now and slot.id not in self._prefetched
+        ]
+        if not upcoming:
+            return None
+        thread = threading.Thread(
+            target=self._prefetch_next_wave,
+            args=(upcoming, pipeline, predicted),
+            name="auto-executor-prefetch",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _prefetch_next_wave(
+        self,
+        slots: list[Slot],
+        pipeline: Pipeline,
+        predicted: PipelineState,
+    ) -> None:
+        """Prepare contract, context and agent matches of *slots*.  Never raises."""
+        sources: dict[str, set[str]] = {}
+        for edge in pipeline.data_flow:
+            sources.setdefault(edge.to_slot, set()).add(edge.from_slot)
+        for slot in slots:
+            try:
+                # Warms the registry's per-type capability index
+                self._registry.compatible_agent_ids(slot.slot_type)
+            except Exception:
+                logger.debug(
+                    "Agent match prefetch failed for slot %s", slot.id, exc_info=True
+                )
+            try:
+                slot_input = self._contract_manager.generate_slot_input(
+                    slot, pipeline, predicted
+                )
+                self._runner.prefetch_context(slot, pipeline)
+            except Exception:
+                logger.warning(
+                    "Prefetch failed for slot %s", slot.id, exc_info=True
+                )
+                continue
+            upstream = (
+                set(slot.depends_on)
+                | {inp.from_slot for inp in slot.inputs}
+                | sources.get(slot.id, set())
+            )
+            self._prefetched[slot.id] = _Prefetched(
+                slot_input=slot_input,
+                assumed={
+                    dep: predicted.slots[dep].status
+                    for dep in upstream if dep in predicted.slots
+                },
+            )
+
+    def _take_prefetched(
+        self, slot: Slot, state: PipelineState
+    ) -> SlotInput | None:
+        """The prefetched contract of *slot* if its prediction held.
+
+        A contract depends on the state only through the statuses of the
+        slot's upstream slots, so it is reused iff they match the
+        predicted ones; otherwise it is discarded.  A reused contract is
+        restamped with the time the slot begins.
+        """
+        entry = self._prefetched.pop(slot.id, None)
+        if entry is None:
+            return None
+        for dep, status in entry.assumed.items():
+            actual = state.slots.get(dep)
+            if actual is None or actual.status != status:
+                self.prefetch_discarded += 1
+                logger.debug("Discarding prefetched contract of slot %s", slot.id)
+                return None
+        self.prefetch_hits += 1
+        return dataclasses.replace(
+            entry.slot_input,
+            generated_at=datetime.now(timezone.utc).isoformat(),
+        )
+
     # --- Private: finalization ---
 
     def _finalize_slot(
@@ -593,28 +801,40 @@ class AutoExecutor:
 
     # --- Private: agent resolution ---
 
-    def _resolve_agent(self, slot: Slot) -> tuple[str | None, str | None]:
+    def _resolve_agent(
+        self, slot: Slot, *, acquire: bool = False
+    ) -> tuple[str | None, str | None]:
         """Resolve the agent for a slot.
 
         Priority:
         1. Explicit assignment from self._assignments
-        2. Auto-match from registry
+        2. Auto-match: the assignment policy's preferred compatible agent
         3. Graceful fallback (None, None)
 
+        Args:
+            slot: The slot to resolve.
+            acquire: Count the slot against the agent's load; the caller
+                must release the agent when the slot finishes.
+
         Returns:
             Tuple of (agent_id, agent_prompt) or (None, None).
         """
         # 1. Explicit assignment
         assignment = self._assignments.get(slot.id)
         if assignment:
+            if acquire:
+                self._assigner.acquire(assignment.agent_id)
             return assignment.agent_id, assignment.agent_prompt
 
-        # 2. Auto-match from registry
+        # 2. Auto-match from registry (compatible agents are memoized per
+        #    slot type by the registry's capability index)
         try:
-            matches = self._registry.find_compatible_agents(slot.slot_type)
-            for match in matches:
-                if match.is_compatible:
-                    return match.agent_id, match.prompt_path
+            if acquire:
+                agent_id = self._assigner.assign(slot)
+            else:
+                agent_id = next(iter(self._assigner.candidates(slot.slot_type)), None)
+            if agent_id:
+                return agent_id, self._registry.get_agent(agent_id).prompt_path
         except Exception:
             logger.warning(
                 "Agent auto-match failed for slot %s (type=%s)",
@@ -625,6 +845,57 @@ class AutoExecutor:
         # 3. Graceful fallback
         return None, None
 
+    def _plan_group(
+        self, slots: list[Slot]
+    ) -> dict[str, tuple[str | None, str | None]]:
+        """Assign agents to a parallel group in one batch.
+
+        Explicit assignments are honored (and count toward their agent's
+        load); the remaining slots are matched to compatible agents by
+        the assigner.  Every agent in the returned plan is acquired and
+        must be released once the group finishes.
+
+        Returns:
+            slot_id -> (agent_id, agent_prompt) for each slot to run now;
+            deferred slots are absent.
+        """
+        plan: dict[str, tuple[str | None, str | None]] = {}
+        auto: list[Slot] = []
+        for slot in slots:
+            if slot.id in self._assignments:
+                plan[slot.id] = self._resolve_agent(slot, acquire=True)
+            else:
+                auto.append(slot)
+        if not auto:
+            return plan
+
+        try:
+            batch = self._assigner.assign_batch(auto)
+        except Exception:
+            logger.warning(
+                "Batch agent assignment failed, resolving slots one by one",
+                exc_info=True,
+            )
+            for slot in auto:
+                plan[slot.id] = self._resolve_agent(slot, acquire=True)
+            return plan
+
+        for slot_id, agent_id in batch.assigned.items():
+            plan[slot_id] = agent_id, self._registry.get_agent(agent_id).prompt_path
+        for slot_id in batch.unassigned:
+            plan[slot_id] = None, None
+        if batch.deferred:
+            logger.info(
+                "Agents at capacity, deferring slots to a later wave: %s",
+                ", ".join(batch.deferred),
+            )
+            if not plan:
+                # Nothing else runs this wave, so nothing would free up
+                # capacity: overcommit one slot rather than stall.
+                first = next(s for s in auto if s.id == batch.deferred[0])
+                plan[first.id] = self._resolve_agent(first, acquire=True)
+        return plan
+
     # --- Private: grouping ---
 
     @staticmethod
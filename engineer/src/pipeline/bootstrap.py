@@ -23,6 +23,10 @@ Usage (in target project's CLAUDE.md):
     ```
 
 Provides sensible defaults for all components.  Override anything via kwargs.
+Components are built lazily from one shared container (see
+pipeline.components): the runner and executor share a single slot
+registry, and templates are parsed for the NL matcher only when
+run_nl() or match() is first called.
 """
 
 from __future__ import annotations
@@ -38,28 +42,14 @@ from pipeline.auto_executor import (
     AutoExecutorConfig,
     CallbackExecutor,
 )
-from pipeline.nl_matcher import NLMatcher
+from pipeline.components import Components
 from pipeline.models import Pipeline, PipelineState
+from pipeline.nl_matcher import NLMatcher
 from pipeline.runner import PipelineRunner
-from pipeline.slot_contract import SlotContractManager
-from pipeline.slot_registry import SlotRegistry
 
 logger = logging.getLogger(__name__)
 
 
-# ---------------------------------------------------------------------------
-# Defaults
-# ---------------------------------------------------------------------------
-
-_DEFAULT_DIRS = {
-    "templates_dir": "specs/pipelines/templates",
-    "state_dir": "state/active",
-    "slot_types_dir": "specs/pipelines/slot-types",
-    "agents_dir": "agents",
-    "contracts_dir": "state/contracts",
-}
-
-
 # ---------------------------------------------------------------------------
 # BootstrappedExecutor — wraps AutoExecutor + NLMatcher
 # ---------------------------------------------------------------------------
@@ -70,17 +60,25 @@ class BootstrappedExecutor:
 
     Returned by boot().  Provides run() for explicit pipelines
     and run_nl() for natural-language-triggered execution.
+
+    *matcher* may be an NLMatcher or a Components container, whose
+    matcher is then built on first use.
     """
 
     def __init__(
         self,
         auto: AutoExecutor,
         runner: PipelineRunner,
-        matcher: NLMatcher,
+        matcher: NLMatcher | Components,
     ) -> None:
         self._auto = auto
         self._runner = runner
-        self._matcher = matcher
+        self._matcher_source = matcher
+
+    @property
+    def _matcher(self) -> NLMatcher:
+        source = self._matcher_source
+        return source.matcher if isinstance(source, Components) else source
 
     # --- Delegated to AutoExecutor ---
 
@@ -194,25 +192,16 @@ def boot(
     """
     root = Path(project_root).resolve()
 
-    # Resolve directories
-    t_dir = str(root / (templates_dir or _DEFAULT_DIRS["templates_dir"]))
-    s_dir = str(root / (state_dir or _DEFAULT_DIRS["state_dir"]))
-    st_dir = str(root / (slot_types_dir or _DEFAULT_DIRS["slot_types_dir"]))
-    a_dir = str(root / (agents_dir or _DEFAULT_DIRS["agents_dir"]))
-    c_dir = str(root / (contracts_dir or _DEFAULT_DIRS["contracts_dir"]))
-
-    # Create components
-    runner = PipelineRunner(
-        project_root=str(root),
-        templates_dir=t_dir,
-        state_dir=s_dir,
-        slot_types_dir=st_dir,
-        agents_dir=a_dir,
+    # Shared, lazily built components (one registry for runner + executor)
+    components = Components(
+        str(root),
+        templates_dir=templates_dir,
+        state_dir=state_dir,
+        slot_types_dir=slot_types_dir,
+        agents_dir=agents_dir,
+        contracts_dir=contracts_dir,
     )
-
-    contract_mgr = SlotContractManager(str(root), c_dir)
-    registry = SlotRegistry(st_dir, a_dir)
-    matcher = NLMatcher(t_dir)
+    runner = components.runner
 
     if executor is None:
         executor = CallbackExecutor(lambda si, aid: True)
@@ -223,14 +212,14 @@ def boot(
     auto_executor = AutoExecutor(
         runner,
         executor,
-        contract_mgr,
-        registry,
+        components.contract_manager,
+        components.registry,
         config=config,
         assignments=assignments,
         project_root=str(root),
     )
 
-    bootstrapped = BootstrappedExecutor(auto_executor, runner, matcher)
+    bootstrapped = BootstrappedExecutor(auto_executor, runner, components)
 
     logger.info("Pipeline engine bootstrapped at %s", root)
 
@@ -0,0 +1,130 @@
+"""Circuit breaker for calls to an external service.
+
+Tracks consecutive failures of a dependency (the OpenViking server) so
+callers stop waiting on it while it is down, and find out on their own
+when it is back:
+
+- ``closed``: calls go through.  *failure_threshold* consecutive
+  failures open the circuit.
+- ``open``: calls are refused without being attempted.  After
+  *reset_timeout* seconds the next caller is let through as a probe.
+- ``half_open``: the single probe is in flight; other calls are refused.
+  Its success closes the circuit, its failure re-opens it for another
+  *reset_timeout*.
+
+Usage:
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    if breaker.allow():
+        try:
+            result = call()
+        except OSError:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from enum import StrEnum
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(StrEnum):
+    """State of a :class:`CircuitBreaker`."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open circuit breaker."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds the circuit stays open before a probe.
+            clock: Time source (seconds); injectable for tests.
+        """
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be >= 1, got {failure_threshold}")
+        self._threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        """Current state (an elapsed open circuit still reads ``open``)."""
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        """Consecutive failures recorded since the last success."""
+        return self._failures
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now.
+
+        Once *reset_timeout* has elapsed on an open circuit, exactly one
+        caller gets ``True`` (the probe) and the circuit turns half-open.
+        A caller that gets ``True`` must report the outcome.
+        """
+        with self._lock:
+            if self._state is BreakerState.CLOSED:
+                return True
+            if (
+                self._state is BreakerState.OPEN
+                and self._clock() - self._opened_at >= self._reset_timeout
+            ):
+                self._state = BreakerState.HALF_OPEN
+                logger.debug("Circuit half-open, probing")
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Report a successful call; closes the circuit."""
+        with self._lock:
+            if self._state is not BreakerState.CLOSED:
+                logger.debug("Circuit closed")
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Report a failed call; may open the circuit."""
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is BreakerState.HALF_OPEN
+                or self._failures >= self._threshold
+            ):
+                self._open_locked()
+
+    def trip(self) -> None:
+        """Open the circuit now, e.g. when the service is known to be down."""
+        with self._lock:
+            self._failures = max(self._failures, self._threshold)
+            self._open_locked()
+
+    # --- Private helpers ---
+
+    def _open_locked(self) -> None:
+        if self._state is not BreakerState.OPEN:
+            logger.debug("Circuit open after %d failure(s)", self._failures)
+        self._state = BreakerState.OPEN
+        self._opened_at = self._clock()
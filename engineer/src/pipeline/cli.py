@@ -20,30 +20,53 @@ Usage:
     # ... Claude does the work ...
     pipeline complete slot-implement
     pipeline summary
+
+    # Diagnose a slow call: per-stage engine timings on stderr
+    pipeline --timings complete slot-design
+
+    # ... or a full cProfile run (.pstats + collapsed stacks in state dir)
+    pipeline --profile --profile-top 30 begin slot-implement
+
+    # Keep the engine warm: commands forward to the daemon while it runs
+    pipeline serve &
+    pipeline serve --stop
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 import textwrap
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from pipeline.runner import PipelineRunner
-from pipeline.nl_matcher import NLMatcher
-from pipeline.slot_registry import SlotRegistry
+# The one engine import at module level: pipeline.components imports
+# nothing beyond the standard library until a component is built.
+from pipeline.components import DEFAULT_DIRS, Components
+
+# Engine modules are imported inside the commands that need them, so
+# read-only commands (status, summary) start without loading the runner,
+# loader, validator, registry, gate checker or NL matcher.
+if TYPE_CHECKING:
+    from pipeline.models import PipelineState
+    from pipeline.profiling import PhaseProfiler
+    from pipeline.runner import PipelineRunner
+    from pipeline.state import PipelineStateTracker
 
 # Session file — tracks active pipeline so subsequent calls find it
 _SESSION_FILENAME = ".pipeline-session.json"
 
+# --profile output directory, relative to the state dir
+_PROFILE_DIRNAME = "profiles"
+
+# `pipeline serve` exits after this long without a request
+_DEFAULT_IDLE_TIMEOUT = 1800.0
+
 # Default directory layout
-_DEFAULTS = {
-    "templates_dir": "specs/pipelines/templates",
-    "state_dir": "state/active",
-    "slot_types_dir": "specs/pipelines/slot-types",
-    "agents_dir": "agents",
-}
+_DEFAULTS = DEFAULT_DIRS
 
 
 # ---------------------------------------------------------------------------
@@ -89,28 +112,67 @@ def _load_session(state_dir: str | None = None) -> dict:
 # Runner factory
 # ---------------------------------------------------------------------------
 
-def _make_runner(project_root: str) -> PipelineRunner:
-    root = Path(project_root).resolve()
-    return PipelineRunner(
-        project_root=str(root),
-        templates_dir=str(root / _DEFAULTS["templates_dir"]),
-        state_dir=str(root / _DEFAULTS["state_dir"]),
-        slot_types_dir=str(root / _DEFAULTS["slot_types_dir"]),
-        agents_dir=str(root / _DEFAULTS["agents_dir"]),
+def _components_for(
+    project_root: str, cache: dict[tuple, Any] | None = None
+) -> Components:
+    """Component container for *project_root*.
+
+    With a *cache* (``pipeline serve``), one container per project is
+    kept across commands, so its runner, resolved pipelines, registry
+    and matcher are reused.
+    """
+    root = str(Path(project_root).resolve())
+    if cache is None:
+        return Components(root)
+    key = ("components", root)
+    components = cache.get(key)
+    if components is None:
+        components = cache[key] = Components(root)
+    return components
+
+
+def _make_runner(
+    project_root: str,
+    *,
+    profiler: PhaseProfiler | None = None,
+    cache: dict[tuple, Any] | None = None,
+) -> PipelineRunner:
+    """Build a runner for *project_root*.
+
+    Unprofiled runners are shared through the project's components;
+    a profiled runner is new (its timings are its own) but still shares
+    the registry and resolved pipelines.
+    """
+    components = _components_for(project_root, cache)
+    if profiler is None:
+        return components.runner
+    return components.make_runner(profiler=profiler)
+
+
+def _runner_for(args, project_root: str) -> PipelineRunner:
+    return _make_runner(
+        project_root,
+        profiler=getattr(args, "profiler", None),
+        cache=getattr(args, "cache", None),
     )
 
 
 def _resolve_project(args) -> str:
-    """Get project_root from args or session."""
+    """Get project_root from args or session.
+
+    Relative paths resolve against the caller's cwd, which a daemon
+    receives with each forwarded command.
+    """
+    cwd = Path(getattr(args, "cwd", None) or Path.cwd())
     if args.project:
-        return str(Path(args.project).resolve())
+        return str((cwd / args.project).resolve())
 
     session = _load_session()
     if session.get("project_root"):
         return session["project_root"]
 
     # Fallback: cwd
-    return str(Path.cwd())
+    return str(cwd)
 
 
 def _resume(runner: PipelineRunner, state_file: str):
@@ -137,12 +199,15 @@ def cmd_templates(args):
         print(f"No templates found in {t_dir}")
         return 1
 
+    components = _components_for(project_root, getattr(args, "cache", None))
     print(f"Available templates ({len(templates)}):\n")
     for t in templates:
         # Quick parse to get id + description
         import yaml
         try:
-            data = yaml.safe_load(t.read_text())
+            data = components.cached(
+                "template", t, lambda: yaml.safe_load(t.read_text())
+            )
             p = data.get("pipeline", {})
             pid = p.get("id", t.stem)
             name = p.get("name", "")
@@ -163,10 +228,11 @@ def cmd_match(args):
     """Match natural language to a template."""
     project_root = _resolve_project(args)
     root = Path(project_root)
-    t_dir = str(root / _DEFAULTS["templates_dir"])
 
     text = " ".join(args.text)
-    matcher = NLMatcher(t_dir)
+    # In the daemon, reused until a template is added or edited
+    components = _components_for(str(root), getattr(args, "cache", None))
+    matcher = components.indexed_matcher if getattr(args, "rank", False) else components.matcher
     matches = matcher.match(text)
 
     if not matches:
@@ -188,7 +254,7 @@ def cmd_prepare(args):
     """Create a new pipeline instance from a template."""
     project_root = _resolve_project(args)
     root = Path(project_root)
-    runner = _make_runner(project_root)
+    runner = _runner_for(args, project_root)
 
     # Resolve template path
     template = args.template
@@ -244,8 +310,11 @@ def cmd_prepare(args):
     return 0
 
 
-def _get_active(args):
-    """Load the active pipeline and state from session."""
+def _locate_active(args) -> tuple[str, str, str]:
+    """Resolve (project_root, state_dir, state_file) for the active pipeline.
+
+    Exits with status 1 when there is no active pipeline.
+    """
     project_root = _resolve_project(args)
     state_dir = str(Path(project_root) / _DEFAULTS["state_dir"])
     session = _load_session(state_dir)
@@ -262,16 +331,38 @@ def _get_active(args):
         print(f"State file not found: {state_file}")
         sys.exit(1)
 
-    runner = _make_runner(project_root)
+    return project_root, state_dir, state_file
+
+
+def _get_active(args):
+    """Load the active pipeline and state from session."""
+    project_root, state_dir, state_file = _locate_active(args)
+    runner = _runner_for(args, project_root)
     pipeline, state = _resume(runner, state_file)
     return runner, pipeline, state, state_file, state_dir
 
 
+def _get_active_state(
+    args,
+) -> tuple[PipelineStateTracker, PipelineState, str]:
+    """Load only the active state file -- the fast path for read-only commands.
+
+    Slot statuses already live in the state file, so status and summary
+    skip template parsing, parameter resolution and the definition-hash
+    check that ``runner.resume`` performs for mutating commands.
+    """
+    from pipeline.state import PipelineStateTracker
+
+    _, state_dir, state_file = _locate_active(args)
+    tracker = PipelineStateTracker(state_dir)
+    return tracker, tracker.load(state_file), state_file
+
+
 def cmd_status(args):
     """Show current pipeline status."""
-    runner, pipeline, state, state_file, _ = _get_active(args)
+    _, state, state_file = _get_active_state(args)
 
-    print(f"Pipeline: {pipeline.id} v{pipeline.version}")
+    print(f"Pipeline: {state.pipeline_id} v{state.pipeline_version}")
     print(f"Status: {state.status.value}")
     print(f"State file: {state_file}")
     print()
@@ -433,8 +524,47 @@ def cmd_skip(args):
 
 def cmd_summary(args):
     """Human-readable pipeline summary."""
-    runner, pipeline, state, _, _ = _get_active(args)
-    print(runner.get_summary(state))
+    tracker, state, _ = _get_active_state(args)
+    print(tracker.format_summary(state))
+    return 0
+
+
+def cmd_serve(args):
+    """Run the pipeline daemon in the foreground, or stop it."""
+    import signal
+    import threading
+
+    from pipeline import daemon
+
+    project_root = _resolve_project(args)
+    state_dir = str(Path(project_root) / _DEFAULTS["state_dir"])
+
+    if args.stop:
+        path = daemon.socket_path(state_dir)
+        response = None
+        if path.exists():
+            response = daemon.send_request(path, {"op": "shutdown"}, timeout=5.0)
+        if response is None:
+            print("No pipeline daemon running.")
+            return 1
+        print(f"Pipeline daemon stopped ({path}).")
+        return 0
+
+    server = daemon.PipelineDaemon(state_dir, idle_timeout=args.idle_timeout)
+    if threading.current_thread() is threading.main_thread():
+        # Unwind through serve_forever() so the socket file is removed
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    print(f"Pipeline daemon for {project_root}")
+    print(f"  Socket: {server.path}")
+    print("  Stop with 'pipeline serve --stop'.", flush=True)
+    try:
+        server.serve_forever()
+    except daemon.DaemonError as e:
+        print(str(e))
+        return 1
+    except KeyboardInterrupt:
+        pass
     return 0
 
 
@@ -462,6 +592,31 @@ def build_parser() -> argparse.ArgumentParser:
         "--project", "-P",
         help="Project root directory (saved in session after first use).",
     )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run in-process even if a 'pipeline serve' daemon is running.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-stage engine timings (load, validate, gates, ...) to stderr.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Run the command under cProfile; write .pstats and collapsed "
+            "stacks (flamegraph input) to <state_dir>/profiles/."
+        ),
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Number of hot functions to print with --profile (default: 20).",
+    )
 
     sub = parser.add_subparsers(dest="command", help="Command to run")
 
@@ -471,6 +626,12 @@ def build_parser() -> argparse.ArgumentParser:
     # match
     p_match = sub.add_parser("match", help="Match natural language to a template")
     p_match.add_argument("text", nargs="+", help="Natural language request")
+    p_match.add_argument(
+        "--rank",
+        action="store_true",
+        help="Also rank templates by name, description and slot objectives "
+        "(offline BM25 index).",
+    )
 
     # prepare
     p_prep = sub.add_parser("prepare", help="Create a pipeline instance from a template")
@@ -503,6 +664,24 @@ def build_parser() -> argparse.ArgumentParser:
     # summary
     sub.add_parser("summary", help="Human-readable pipeline summary")
 
+    # serve
+    p_serve = sub.add_parser(
+        "serve", help="Keep the engine loaded; other commands forward to it",
+    )
+    p_serve.add_argument(
+        "--stop", action="store_true", help="Stop the running daemon",
+    )
+    p_serve.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=_DEFAULT_IDLE_TIMEOUT,
+        metavar="SECONDS",
+        help=(
+            "Exit after this long without a request; 0 disables "
+            f"(default: {_DEFAULT_IDLE_TIMEOUT:.0f})"
+        ),
+    )
+
     return parser
 
 
@@ -517,12 +696,35 @@ _COMMANDS = {
     "fail": cmd_fail,
     "skip": cmd_skip,
     "summary": cmd_summary,
+    "serve": cmd_serve,
 }
 
 
 def main(argv: list[str] | None = None) -> int:
+    raw_argv = sys.argv[1:] if argv is None else list(argv)
+    return execute(raw_argv, forward=True)
+
+
+def execute(
+    argv: list[str],
+    *,
+    cwd: str | None = None,
+    cache: dict[tuple, Any] | None = None,
+    forward: bool = False,
+) -> int:
+    """Parse *argv* and run the command.
+
+    Args:
+        argv: Command line, without the program name.
+        cwd: Directory relative paths resolve against (default: cwd).
+        cache: Long-lived component cache; ``pipeline serve`` passes
+            one so runners and matchers survive between commands.
+        forward: Hand the command to a running daemon when there is one.
+    """
     parser = build_parser()
     args = parser.parse_args(argv)
+    args.cwd = cwd
+    args.cache = cache
 
     if not args.command:
         parser.print_help()
@@ -533,6 +735,59 @@ def main(argv: list[str] | None = None) -> int:
         parser.print_help()
         return 1
 
+    if forward and _can_forward(args):
+        ret = _forward_to_daemon(args, argv)
+        if ret is not None:
+            return ret
+
+    if args.timings:
+        from pipeline.profiling import PhaseProfiler
+
+        args.profiler = PhaseProfiler(enabled=True)
+
+    try:
+        if args.profile:
+            return _run_profiled(handler, args)
+        return _run_handler(handler, args)
+    finally:
+        if args.timings:
+            print(f"\nStage timings:\n{args.profiler.format_table()}", file=sys.stderr)
+
+
+def _can_forward(args) -> bool:
+    """Diagnostics measure this process, so they always run in-process."""
+    return not (
+        args.command == "serve" or args.no_daemon or args.timings or args.profile
+    )
+
+
+def _forward_to_daemon(args, argv: list[str]) -> int | None:
+    """Run the command on a ``pipeline serve`` daemon, if one is up.
+
+    Returns:
+        The command's exit status, or None when no daemon is running.
+    """
+    from pipeline import daemon
+
+    state_dir = str(Path(_resolve_project(args)) / _DEFAULTS["state_dir"])
+    cwd = args.cwd or os.getcwd()
+    try:
+        response = daemon.forward(state_dir, argv, cwd)
+    except (OSError, ValueError) as e:
+        print(f"Error: pipeline daemon request failed: {e}", file=sys.stderr)
+        return 1
+    if response is None:
+        return None
+    if not response.get("ok"):
+        print(f"Error: pipeline daemon: {response.get('error')}", file=sys.stderr)
+        return 1
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return int(response.get("exit_code", 1))
+
+
+def _run_handler(handler, args) -> int:
     try:
         return handler(args) or 0
     except Exception as e:
@@ -540,5 +795,44 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
 
+def _run_profiled(handler, args) -> int:
+    """Run a command handler under cProfile and report hot functions.
+
+    Writes ``<command>-<timestamp>.pstats`` and
+    ``<command>-<timestamp>.collapsed.txt`` into ``<state_dir>/profiles/``
+    and prints the top ``--profile-top`` functions by cumulative time
+    to stderr.
+    """
+    import cProfile
+    import pstats
+
+    from pipeline.profiling import write_collapsed_stacks
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        ret = _run_handler(handler, args)
+    finally:
+        profile.disable()
+
+    out_dir = (
+        Path(_resolve_project(args)) / _DEFAULTS["state_dir"] / _PROFILE_DIRNAME
+    )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    base = out_dir / f"{args.command}-{stamp}"
+
+    pstats_path = base.with_suffix(".pstats")
+    collapsed_path = base.with_suffix(".collapsed.txt")
+    profile.dump_stats(str(pstats_path))
+    stats = pstats.Stats(profile, stream=sys.stderr)
+    write_collapsed_stacks(stats, collapsed_path)
+
+    print(f"\nProfile: {pstats_path}", file=sys.stderr)
+    print(f"Collapsed stacks: {collapsed_path}", file=sys.stderr)
+    stats.sort_stats("cumulative").print_stats(max(args.profile_top, 0))
+    return ret
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,226 @@
+"""Shared, lazily built engine components for one project.
+
+A :class:`Components` container owns the long-lived pieces of the engine
+for one project layout -- loader, validator, gate checker, slot registry,
+contract manager, NL matcher, resolved-pipeline cache, context file
+cache and a default runner -- and builds each on first use.
+``boot()``, the CLI (and the ``pipeline serve`` daemon through it) and
+:class:`PipelineRunner` all take their components from the same
+container, so a process never builds a second registry or parses the
+templates for a matcher it does not use.
+
+Usage:
+    components = Components("/path/to/project")
+    runner = components.runner          # built on first access
+    matcher = components.matcher        # parses templates only now
+
+Engine modules are imported inside the builders: importing this module
+stays as cheap as importing the CLI.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from pipeline.file_cache import FileCache
+    from pipeline.gate_checker import GateChecker
+    from pipeline.loader import PipelineLoader
+    from pipeline.models import Pipeline
+    from pipeline.nl_matcher import NLMatcher
+    from pipeline.runner import PipelineRunner
+    from pipeline.slot_contract import SlotContractManager
+    from pipeline.slot_registry import SlotRegistry
+    from pipeline.validator import PipelineValidator
+
+# Default directory layout, relative to the project root
+DEFAULT_DIRS = {
+    "templates_dir": "specs/pipelines/templates",
+    "state_dir": "state/active",
+    "slot_types_dir": "specs/pipelines/slot-types",
+    "agents_dir": "agents",
+    "contracts_dir": "state/contracts",
+}
+
+# Parsed slot types / agents, persisted in the state dir between processes
+REGISTRY_CACHE_FILENAME = ".registry-cache.json"
+
+
+class Components:
+    """Lazily initialized engine components shared by runner, boot and CLI.
+
+    Each component is built once, on first access, and reused.  The NL
+    matcher and :meth:`cached` entries are additionally rebuilt when the
+    files they were built from change, so a long-lived container (the
+    daemon's) picks up edited templates.
+    """
+
+    def __init__(
+        self,
+        project_root: str,
+        *,
+        templates_dir: str | None = None,
+        state_dir: str | None = None,
+        slot_types_dir: str | None = None,
+        agents_dir: str | None = None,
+        contracts_dir: str | None = None,
+    ) -> None:
+        """
+        Args:
+            project_root: Project root directory.
+            templates_dir: Templates directory (absolute, or relative to
+                the project root).  Defaults to DEFAULT_DIRS.
+            state_dir: State directory, as above.
+            slot_types_dir: Slot type definitions directory, as above.
+            agents_dir: Agent prompts directory, as above.
+            contracts_dir: Slot contracts directory, as above.
+        """
+        root = Path(project_root).resolve()
+
+        def resolve(value: str | None, name: str) -> str:
+            return str(root / (value or DEFAULT_DIRS[name]))
+
+        self.project_root = str(root)
+        self.templates_dir = resolve(templates_dir, "templates_dir")
+        self.state_dir = resolve(state_dir, "state_dir")
+        self.slot_types_dir = resolve(slot_types_dir, "slot_types_dir")
+        self.agents_dir = resolve(agents_dir, "agents_dir")
+        self.contracts_dir = resolve(contracts_dir, "contracts_dir")
+        # Resolved pipelines keyed by (path, mtime_ns, size, params); see
+        # PipelineRunner._load_pipeline.  All runners on this container
+        # share them, so none may mutate a resolved pipeline.
+        self.pipeline_cache: dict[tuple[str, int, int, str], Pipeline] = {}
+        self._built: dict[str, Any] = {}
+        self._stamped: dict[tuple[str, str], tuple[Any, Any]] = {}
+        self._lock = threading.RLock()
+
+    # --- Components ---
+
+    @property
+    def loader(self) -> PipelineLoader:
+        from pipeline.loader import PipelineLoader
+
+        return self.get("loader", PipelineLoader)
+
+    @property
+    def validator(self) -> PipelineValidator:
+        from pipeline.validator import PipelineValidator
+
+        return self.get("validator", lambda: PipelineValidator(self.project_root))
+
+    @property
+    def gate_checker(self) -> GateChecker:
+        from pipeline.gate_checker import GateChecker
+
+        return self.get("gate_checker", lambda: GateChecker(self.project_root))
+
+    @property
+    def registry(self) -> SlotRegistry:
+        """Slot registry, with its parse cache persisted in the state dir."""
+        from pipeline.slot_registry import SlotRegistry
+
+        return self.get("registry", lambda: SlotRegistry(
+            self.slot_types_dir,
+            self.agents_dir,
+            cache_path=str(Path(self.state_dir) / REGISTRY_CACHE_FILENAME),
+        ))
+
+    @property
+    def contract_manager(self) -> SlotContractManager:
+        from pipeline.slot_contract import SlotContractManager
+
+        return self.get(
+            "contract_manager",
+            lambda: SlotContractManager(self.project_root, self.contracts_dir),
+        )
+
+    @property
+    def matcher(self) -> NLMatcher:
+        """NL matcher, rebuilt when a template is added, removed or edited."""
+        from pipeline.nl_matcher import NLMatcher
+
+        return self.cached(
+            "matcher", Path(self.templates_dir), lambda: NLMatcher(self.templates_dir)
+        )
+
+    @property
+    def indexed_matcher(self) -> NLMatcher:
+        """NL matcher that also ranks templates with the BM25 text index."""
+        from pipeline.nl_matcher import NLMatcher
+
+        return self.cached(
+            "indexed_matcher",
+            Path(self.templates_dir),
+            lambda: NLMatcher(self.templates_dir, use_text_index=True),
+        )
+
+    @property
+    def file_cache(self) -> FileCache:
+        """Context file text / token cache shared by the runners' context routers."""
+        from pipeline.context_router import new_file_cache
+
+        return self.get("file_cache", new_file_cache)
+
+    @property
+    def runner(self) -> PipelineRunner:
+        """Default (unprofiled) runner on these components."""
+        return self.get("runner", self.make_runner)
+
+    def make_runner(self, **kwargs: Any) -> PipelineRunner:
+        """Build a new runner sharing these components.
+
+        Args:
+            **kwargs: Extra PipelineRunner keyword arguments (profiler,
+                observers, constitution_path, ...).
+        """
+        from pipeline.runner import PipelineRunner
+
+        return PipelineRunner(
+            project_root=self.project_root,
+            templates_dir=self.templates_dir,
+            state_dir=self.state_dir,
+            slot_types_dir=self.slot_types_dir,
+            agents_dir=self.agents_dir,
+            components=self,
+            **kwargs,
+        )
+
+    # --- Generic access ---
+
+    def get(self, name: str, build: Callable[[], Any]) -> Any:
+        """Return component *name*, calling ``build()`` on first access."""
+        try:
+            return self._built[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._built:
+                self._built[name] = build()
+            return self._built[name]
+
+    def is_built(self, name: str) -> bool:
+        """Whether component *name* has been built yet."""
+        return name in self._built or any(k[0] == name for k in self._stamped)
+
+    def cached(self, kind: str, path: Path, build: Callable[[], Any]) -> Any:
+        """Return ``build()``, reused while *path* is unchanged.
+
+        For a directory the stamp covers every ``*.yaml`` file in it, so
+        adding or editing a template invalidates the entry.
+        """
+        if path.is_dir():
+            stamp: Any = tuple(
+                (p.name, p.stat().st_mtime_ns) for p in sorted(path.glob("*.yaml"))
+            )
+        elif path.exists():
+            stamp = path.stat().st_mtime_ns
+        else:
+            stamp = None
+        key = (kind, str(path))
+        with self._lock:
+            entry = self._stamped.get(key)
+            if entry is None or entry[0] != stamp:
+                entry = self._stamped[key] = (stamp, build())
+            return entry[1]
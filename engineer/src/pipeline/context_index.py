@@ -0,0 +1,241 @@
+"""Persistent, incremental index of a project's context files.
+
+ContextRouter needs the paths of every ``.abstract.md`` and
+``.overview.md`` file under the project root.  Walking the whole tree
+for them on every start-up also walks ``.git``, pipeline state and
+generated trees.  :class:`ContextFileIndex` instead remembers, per
+directory, its modification time, its context files and its
+subdirectories.  A refresh stats every indexed directory but only lists
+the ones whose mtime changed (a directory's mtime changes when an entry
+is added, removed or renamed in it), and never descends into ignored
+directories.  Other file types can be tracked too (*suffixes*), e.g. the
+markdown and source files ranked by :mod:`pipeline.context_search`.
+
+The index is persisted as JSON (atomic temp file + rename), so a new
+process starts from the previous scan.
+
+Usage:
+    index = ContextFileIndex(root, path=root / ".context-index.json")
+    index.refresh()
+    index.abstract_files    # ["specs/.abstract.md", ...]
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from pipeline.atomic_file import mtime_settled, write_json
+
+logger = logging.getLogger(__name__)
+
+_INDEX_VERSION = 1
+
+ABSTRACT_SUFFIX = ".abstract.md"
+OVERVIEW_SUFFIX = ".overview.md"
+
+# Directory names pruned anywhere in the tree, and root-relative paths
+# pruned at that location (pipeline state written by the runner)
+DEFAULT_IGNORED_DIRS: tuple[str, ...] = (
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    "node_modules",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "state/active",
+    "state/archive",
+)
+
+
+class ContextFileIndex:
+    """Context files under *root*, refreshed incrementally by directory mtime."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        path: str | Path | None = None,
+        ignore: Iterable[str] = DEFAULT_IGNORED_DIRS,
+        suffixes: Iterable[str] = (ABSTRACT_SUFFIX, OVERVIEW_SUFFIX),
+    ) -> None:
+        """
+        Args:
+            root: Project root to index.
+            path: JSON file to persist the index in, or None for memory only.
+            ignore: Directory names (pruned anywhere) and root-relative
+                paths containing ``/`` (pruned at that location).
+            suffixes: File name suffixes to track.  The context file
+                suffixes are always included.
+        """
+        self._root = Path(root)
+        self._path = Path(path) if path is not None else None
+        self._ignore = sorted({entry.strip("/") for entry in ignore if entry.strip("/")})
+        self._ignored_names = frozenset(e for e in self._ignore if "/" not in e)
+        self._ignored_paths = frozenset(
+            os.path.normpath(e) for e in self._ignore if "/" in e
+        )
+        self._suffixes = sorted({*suffixes, ABSTRACT_SUFFIX, OVERVIEW_SUFFIX})
+        self._suffix_tuple = tuple(self._suffixes)
+        # rel_dir ("" for the root) -> {"mtime_ns", "files", "dirs"}
+        self._dirs: dict[str, dict[str, Any]] = {}
+        self._scanned_ns = 0
+        self._listing: dict[str, list[str]] = {}  # suffix -> sorted paths
+        self._loaded = self._path is None
+        self.dirs_listed = 0  # directories listed by the last refresh
+
+    @property
+    def abstract_files(self) -> list[str]:
+        """Root-relative paths of ``.abstract.md`` files, sorted."""
+        return self._files(ABSTRACT_SUFFIX)
+
+    @property
+    def overview_files(self) -> list[str]:
+        """Root-relative paths of ``.overview.md`` files, sorted."""
+        return self._files(OVERVIEW_SUFFIX)
+
+    def files(self, suffix: str = "") -> list[str]:
+        """Root-relative paths of tracked files ending in *suffix*, sorted."""
+        return self._files(suffix)
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the tree (and persist changes)."""
+        if not self._loaded:
+            self._load()
+        started_ns = time.time_ns()
+        old = self._dirs
+        self._dirs = {}
+        self.dirs_listed = 0
+        if self._root.is_dir():
+            self._walk(old)
+        self._scanned_ns = started_ns
+        self._listing = {}
+        if self._path is not None and self._changed(old):
+            self._save()
+
+    # --- Private helpers ---
+
+    def _files(self, suffix: str) -> list[str]:
+        files = self._listing.get(suffix)
+        if files is None:
+            files = self._listing[suffix] = sorted(
+                os.path.join(rel_dir, name)
+                for rel_dir, entry in self._dirs.items()
+                for name in entry["files"]
+                if name.endswith(suffix)
+            )
+        return list(files)
+
+    def _walk(self, old: dict[str, dict[str, Any]]) -> None:
+        """Index the root and its non-ignored subdirectories, reusing *old*."""
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            full = os.path.join(self._root, rel) if rel else str(self._root)
+            try:
+                mtime_ns = os.stat(full).st_mtime_ns
+            except OSError:
+                continue
+            entry = old.get(rel)
+            if (
+                entry is None
+                or entry["mtime_ns"] != mtime_ns
+                or not mtime_settled(mtime_ns, self._scanned_ns)
+            ):
+                entry = self._list(full, mtime_ns)
+                if entry is None:
+                    continue
+            self._dirs[rel] = entry
+            for name in entry["dirs"]:
+                child = os.path.join(rel, name) if rel else name
+                if name in self._ignored_names or child in self._ignored_paths:
+                    continue
+                stack.append(child)
+
+    def _changed(self, old: dict[str, dict[str, Any]]) -> bool:
+        """Whether the index differs from *old* in a way worth persisting.
+
+        Writing the index file bumps the mtime of its own directory; that
+        alone is not a change, or every refresh would rewrite the file.
+        """
+        if self._dirs.keys() != old.keys():
+            return True
+        own = os.path.relpath(self._path.parent, self._root)
+        own = "" if own == "." else own
+        for rel, entry in self._dirs.items():
+            before = old[rel]
+            if entry["files"] != before["files"] or entry["dirs"] != before["dirs"]:
+                return True
+            if entry["mtime_ns"] != before["mtime_ns"] and rel != own:
+                return True
+        return False
+
+    def _list(self, full: str, mtime_ns: int) -> dict[str, Any] | None:
+        self.dirs_listed += 1
+        files: list[str] = []
+        dirs: list[str] = []
+        try:
+            with os.scandir(full) as it:
+                for dirent in it:
+                    try:
+                        if dirent.is_dir(follow_symlinks=False):
+                            dirs.append(dirent.name)
+                        elif dirent.name.endswith(self._suffix_tuple):
+                            files.append(dirent.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return {"mtime_ns": mtime_ns, "files": sorted(files), "dirs": sorted(dirs)}
+
+    def _load(self) -> None:
+        """Read the persisted index, once.  A missing or stale file is ignored."""
+        self._loaded = True
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+            if (
+                raw.get("version") != _INDEX_VERSION
+                or raw.get("root") != str(self._root.resolve())
+                or raw.get("ignore") != self._ignore
+                or raw.get("suffixes") != self._suffixes
+            ):
+                return
+            dirs = {
+                str(rel): {
+                    "mtime_ns": int(entry["mtime_ns"]),
+                    "files": list(entry["files"]),
+                    "dirs": list(entry["dirs"]),
+                }
+                for rel, entry in raw["dirs"].items()
+            }
+            scanned_ns = int(raw["scanned_ns"])
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return
+        self._dirs = dirs
+        self._scanned_ns = scanned_ns
+
+    def _save(self) -> None:
+        """Persist the index atomically; failures are logged, never raised."""
+        payload = {
+            "version": _INDEX_VERSION,
+            "root": str(self._root.resolve()),
+            "ignore": self._ignore,
+            "suffixes": self._suffixes,
+            "scanned_ns": self._scanned_ns,
+            "dirs": self._dirs,
+        }
+        try:
+            write_json(self._path, payload)
+        except OSError:
+            logger.warning("Could not write context index %s", self._path, exc_info=True)
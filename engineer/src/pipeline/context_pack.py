@@ -0,0 +1,351 @@
+"""Materialized context packs for slots, backed by a shared block store.
+
+A slot's context YAML only lists paths, so every agent opens and reads
+the constitution and each referenced file itself -- and sibling slots
+read the same files again.  A context pack materializes the content
+once:
+
+- :class:`BlockStore` is a content-addressed, append-only store: one
+  ``blocks.bin`` data file plus a ``blocks.idx`` index of
+  ``<sha256> <offset> <length>`` lines.  A document already stored (by
+  any slot) is not written again.
+- A pack is a small JSON manifest per slot listing its context items
+  with the offset and length of each item's content in ``blocks.bin``.
+  An agent reads the manifest and maps the one data file
+  (:func:`read_pack`) instead of opening dozens of files.
+
+:func:`write_pack` stores the blocks and writes the manifest in one go;
+:func:`store_items` and :func:`write_manifest` split it, so the blocks
+can be stored ahead of time (the runner's context prefetch) and only
+the manifest written when the slot begins.
+
+Appends go through ``O_APPEND`` with one ``write`` per block or index
+line, so runners in several processes can share a store; a block two
+processes store at once is merely kept twice.
+
+The store only grows while slots run: a document edited between runs is
+stored again and its old block stays behind.  :meth:`BlockStore.compact`
+rewrites the store with only the blocks the existing pack manifests
+reference, and updates their offsets; :class:`PipelineRunner` runs it in
+``prepare()``, before a pipeline writes any pack.  Compaction rewrites
+``blocks.bin`` in place, so it must not overlap a pipeline run (or an
+agent reading a pack) in another process.
+
+Usage:
+    store = BlockStore(state_dir / "context-blocks")
+    write_pack(state_dir / "p-1-slot-a-context.pack.json", store,
+               [(item, text), ...])
+    read_pack(state_dir / "p-1-slot-a-context.pack.json")   # {path: text}
+    entries = store_items(store, [(item, text), ...])       # blocks ahead of time
+    write_manifest(state_dir / "p-1-slot-a-context.pack.json", store, entries)
+    store.compact(state_dir.glob("*.pack.json"))             # bytes reclaimed
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from pipeline.atomic_file import write_json
+from pipeline.models import ContextItem
+
+logger = logging.getLogger(__name__)
+
+PACK_VERSION = 1
+BLOCKS_FILENAME = "blocks.bin"
+INDEX_FILENAME = "blocks.idx"
+
+
+class BlockRef(NamedTuple):
+    """Location of one stored block."""
+
+    digest: str
+    offset: int
+    length: int
+
+
+class BlockStore:
+    """Content-addressed, append-only store of context file contents."""
+
+    def __init__(self, root: str | Path) -> None:
+        """
+        Args:
+            root: Directory holding ``blocks.bin`` and ``blocks.idx``
+                (created on first write).
+        """
+        self._root = Path(root)
+        self._blocks: dict[str, BlockRef] = {}
+        self._index_read = 0  # bytes of blocks.idx already loaded
+        self._index_inode = 0  # blocks.idx replaced by a compaction: reload
+        self._lock = threading.Lock()
+        self.blocks_written = 0
+        self.blocks_reused = 0
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def data_path(self) -> Path:
+        """The data file every block lives in."""
+        return self._root / BLOCKS_FILENAME
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load_index()
+            return len(self._blocks)
+
+    def __contains__(self, digest: object) -> bool:
+        with self._lock:
+            self._load_index()
+            return digest in self._blocks
+
+    def put(self, data: bytes) -> BlockRef:
+        """Store *data* unless a block with the same content exists.
+
+        Raises:
+            OSError: The store could not be written.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._load_index()
+            ref = self._blocks.get(digest)
+            if ref is not None:
+                self.blocks_reused += 1
+                return ref
+            self._root.mkdir(parents=True, exist_ok=True)
+            offset = _append(self.data_path, data) - len(data)
+            ref = BlockRef(digest, offset, len(data))
+            _append(self._root / INDEX_FILENAME, f"{digest} {offset} {len(data)}\n".encode())
+            self._blocks[digest] = ref
+            self.blocks_written += 1
+            return ref
+
+    def get(self, digest: str) -> bytes | None:
+        """Content of the block *digest*, or None if it is not stored."""
+        with self._lock:
+            self._load_index()
+            ref = self._blocks.get(digest)
+        if ref is None:
+            return None
+        try:
+            with open(self.data_path, "rb") as f:
+                f.seek(ref.offset)
+                data = f.read(ref.length)
+        except OSError:
+            return None
+        return data if len(data) == ref.length else None
+
+    def compact(self, manifests: Iterable[str | Path]) -> int:
+        """Drop the blocks no pack manifest references.
+
+        The referenced blocks are copied to a new data file and index,
+        which replace the old ones, then each manifest is rewritten with
+        its blocks' new offsets.  Manifests of other stores are left
+        alone; an unreadable one references nothing.  Must not run while
+        another process writes to the store or reads one of its packs.
+
+        Args:
+            manifests: Every pack manifest (``*.pack.json``) still in use.
+
+        Returns:
+            Bytes reclaimed from ``blocks.bin`` (0 if nothing was dropped).
+
+        Raises:
+            OSError: The store or a manifest could not be rewritten.
+        """
+        packs: list[tuple[Path, dict[str, Any]]] = []
+        for path in manifests:
+            path = Path(path)
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+                blocks = (path.parent / manifest["blocks"]).resolve()
+            except (OSError, ValueError, KeyError, TypeError):
+                logger.debug("Skipping unreadable context pack %s", path, exc_info=True)
+                continue
+            if blocks == self.data_path.resolve():
+                packs.append((path, manifest))
+        live = {
+            item["digest"] for _, manifest in packs
+            for item in manifest.get("items", []) if "digest" in item
+        }
+        with self._lock:
+            self._load_index()
+            try:
+                size = self.data_path.stat().st_size
+            except FileNotFoundError:
+                return 0
+            kept = sorted(
+                (ref for digest, ref in self._blocks.items() if digest in live),
+                key=lambda ref: ref.offset,
+            )
+            reclaimed = size - sum(ref.length for ref in kept)
+            if reclaimed <= 0:
+                return 0
+            moved: dict[str, BlockRef] = {}
+            data_tmp = self._root / f"{BLOCKS_FILENAME}.tmp"
+            index_tmp = self._root / f"{INDEX_FILENAME}.tmp"
+            try:
+                with open(self.data_path, "rb") as src, open(data_tmp, "wb") as dst:
+                    for ref in kept:
+                        src.seek(ref.offset)
+                        moved[ref.digest] = BlockRef(ref.digest, dst.tell(), ref.length)
+                        dst.write(src.read(ref.length))
+                index = "".join(f"{r.digest} {r.offset} {r.length}\n" for r in moved.values())
+                index_tmp.write_text(index, encoding="ascii")
+                os.rename(data_tmp, self.data_path)
+                os.rename(index_tmp, self._root / INDEX_FILENAME)
+            finally:
+                for tmp in (data_tmp, index_tmp):
+                    if tmp.exists():
+                        tmp.unlink()
+            self._blocks = moved
+            self._index_read = len(index)
+            self._index_inode = os.stat(self._root / INDEX_FILENAME).st_ino
+        for path, manifest in packs:
+            for item in manifest.get("items", []):
+                ref = moved.get(item.get("digest", ""))
+                if ref is not None:
+                    item["offset"] = ref.offset
+            write_json(path, manifest, indent=1)
+        logger.debug("Compacted %s: %d bytes reclaimed", self._root, reclaimed)
+        return reclaimed
+
+    # --- Private helpers ---
+
+    def _load_index(self) -> None:
+        """Read index lines appended since the last call (by any process)."""
+        try:
+            with open(self._root / INDEX_FILENAME, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                if inode != self._index_inode:
+                    # New, or replaced by another instance's compaction
+                    self._blocks.clear()
+                    self._index_read = 0
+                    self._index_inode = inode
+                f.seek(self._index_read)
+                tail = f.read()
+        except OSError:
+            return
+        # Only complete lines; a partial last line is read next time
+        end = tail.rfind(b"\n") + 1
+        self._index_read += end
+        for line in tail[:end].splitlines():
+            try:
+                digest, offset, length = line.decode().split()
+                ref = BlockRef(digest, int(offset), int(length))
+            except ValueError:
+                logger.debug("Skipping corrupt block index line %r", line)
+                continue
+            self._blocks.setdefault(digest, ref)
+
+
+def write_pack(
+    path: str | Path,
+    store: BlockStore,
+    items: Iterable[tuple[ContextItem, str | None]],
+) -> None:
+    """Store the items' contents in *store* and write the pack manifest.
+
+    Same as :func:`store_items` followed by :func:`write_manifest`.
+
+    Args:
+        path: Manifest file to write.
+        store: Block store holding the contents.
+        items: (context item, its text or None) pairs, in context order.
+
+    Raises:
+        OSError: The store or the manifest could not be written.
+    """
+    write_manifest(path, store, store_items(store, items))
+
+
+def store_items(
+    store: BlockStore,
+    items: Iterable[tuple[ContextItem, str | None]],
+) -> list[dict[str, Any]]:
+    """Store the items' contents in *store*; return their manifest entries.
+
+    Items without content (e.g. OpenViking URIs) get an entry without a
+    block.  The entries stay valid until the store is compacted.
+
+    Raises:
+        OSError: The store could not be written.
+    """
+    entries: list[dict[str, Any]] = []
+    for item, text in items:
+        entry: dict[str, Any] = {
+            "path": item.path,
+            "tier": item.tier.value,
+            "relevance": item.relevance,
+            "tokens_estimate": item.tokens_estimate,
+        }
+        if text is not None:
+            entry.update(store.put(text.encode("utf-8"))._asdict())
+        entries.append(entry)
+    return entries
+
+
+def write_manifest(
+    path: str | Path,
+    store: BlockStore,
+    entries: list[dict[str, Any]],
+) -> None:
+    """Write a pack manifest of *entries* (from :func:`store_items`).
+
+    The manifest is written atomically (temp file + rename).
+
+    Raises:
+        OSError: The manifest could not be written.
+    """
+    path = Path(path)
+    payload = {
+        "version": PACK_VERSION,
+        "blocks": os.path.relpath(store.data_path, path.parent),
+        "items": entries,
+    }
+    write_json(path, payload, indent=1)
+
+
+def read_pack(path: str | Path) -> dict[str, str]:
+    """Contents of a pack's items by path, read through one mapping.
+
+    Items stored without content are omitted.
+
+    Raises:
+        OSError, ValueError, KeyError: Missing or invalid pack.
+    """
+    path = Path(path)
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("version") != PACK_VERSION:
+        raise ValueError(f"Unsupported context pack version in {path}")
+    stored = [item for item in manifest["items"] if "digest" in item]
+    if not stored:
+        return {}
+    with open(path.parent / manifest["blocks"], "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:  # only empty documents
+            return {item["path"]: "" for item in stored}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return {
+                item["path"]: view[item["offset"]:item["offset"] + item["length"]].decode("utf-8")
+                for item in stored
+            }
+
+
+def _append(path: Path, data: bytes) -> int:
+    """Append *data* with one write; returns the file offset after it."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        written = os.write(fd, data)
+        if written != len(data):
+            raise OSError(f"Short write to {path}: {written} of {len(data)} bytes")
+        return os.lseek(fd, 0, os.SEEK_CUR)
+    finally:
+        os.close(fd)
@@ -2,7 +2,36 @@
 
 Scans a project for .abstract.md and .overview.md files, builds a tiered
 context list for each slot based on its type, and manages token budget
-allocation.  Only depends on models.py + stdlib (pathlib, yaml, os, re).
+allocation.  Only depends on models.py, context_index.py,
+context_search.py, context_selection.py, file_cache.py, text_index.py,
+token_estimator.py, ttl_cache.py + stdlib (pathlib, yaml, os, re,
+hashlib, json).
+
+The scan is lazy (first build_context) and incremental: a persisted
+:class:`ContextFileIndex` re-lists only directories whose mtime changed
+and skips ``.git``, pipeline state and other ignored trees.  File
+texts and token estimates come from a :class:`FileCache` (shareable
+between routers), so sizing a file that has not changed costs a stat.
+Token estimates are per character class (:mod:`pipeline.token_estimator`,
+with its approximate default rates), so a Chinese character is no longer
+budgeted as a quarter token, nor indentation as real text.
+
+With ``selection="knapsack"`` the file-scan context is chosen by
+:mod:`pipeline.context_selection` -- one tier per directory, scored by
+slot type and objective, maximizing relevance within the token budget
+-- instead of the default greedy fill.
+
+With ``use_text_index=True`` the project's markdown and source files are
+also ranked against the slot's objective, deliverables and constraints
+by an offline BM25 index (:mod:`pipeline.context_search`); the best
+matches join the context and raise the relevance of their directories.
+
+With a *plan_cache* the file-scan result (the context plan) is memoized
+by slot type, task text, budget, router settings and a fingerprint of
+every candidate file's ``(mtime_ns, size)``: sibling slots of a wave
+with the same type and task share one computation, and a persisted
+cache carries plans across runs.  Any change to a candidate file
+changes the fingerprint, so a stale plan is never returned.
 
 When *use_openviking* is ``True``, delegates to :class:`OVContextRouter`
 first and falls back to the file-scan implementation on failure.
@@ -10,17 +39,54 @@ first and falls back to the file-scan implementation on failure.
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
 import re
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import Any
 
 import yaml
 
+from pipeline.context_pack import BlockStore, store_items
+from pipeline.context_index import (
+    ABSTRACT_SUFFIX,
+    DEFAULT_IGNORED_DIRS,
+    OVERVIEW_SUFFIX,
+    ContextFileIndex,
+)
+from pipeline.context_search import TEXT_SUFFIXES, ContextTextIndex
+from pipeline.context_selection import (
+    DEFAULT_RESOLUTION,
+    Candidate,
+    directory_relevance,
+    select,
+    tier_value,
+)
+from pipeline.file_cache import FileCache
 from pipeline.models import ContextItem, ContextTier, Pipeline, Slot
+from pipeline.text_index import tokenize
+from pipeline.token_estimator import estimate_tokens
+from pipeline.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Persisted context file index, in the project root
+CONTEXT_INDEX_FILENAME = ".context-index.json"
+CONTEXT_TEXT_INDEX_FILENAME = ".context-text-index.json"
+
+# Bumped when the plan format or the selection logic changes
+_PLAN_VERSION = 1
+
+# File-scan selection strategies (ContextRouter(selection=...))
+SELECTIONS = ("greedy", "knapsack")
+
+# Text-ranked files considered per slot, and the relevance of the best one
+_TEXT_RANK_LIMIT = 20
+_TEXT_RANK_RELEVANCE = 0.8
+
 
 # ---------------------------------------------------------------------------
 # Slot type -> relevant directories mapping
@@ -37,9 +103,13 @@ _SLOT_DIRECTORY_MAP: dict[str, list[str]] = {
 }
 
 
-def _estimate_tokens(content: str) -> int:
-    """Rough token estimate: character count / 4."""
-    return len(content) // 4
+def new_file_cache(
+    max_bytes: int = 16 * 1024 * 1024,
+    *,
+    estimate: Callable[[str], int] = estimate_tokens,
+) -> FileCache:
+    """A FileCache using ContextRouter's token estimate (or *estimate*)."""
+    return FileCache(estimate=estimate, max_bytes=max_bytes)
 
 
 class ContextRouter:
@@ -58,11 +128,76 @@ class ContextRouter:
         use_openviking: bool = False,
         ov_binary: str = "ov",
         ov_namespace: str = "viking://agent-orchestrator",
+        index_path: str | Path | None = None,
+        ignore_dirs: Iterable[str] = (),
+        file_cache: FileCache | None = None,
+        selection: str = "greedy",
+        selection_resolution: int = DEFAULT_RESOLUTION,
+        use_text_index: bool = False,
+        text_index_path: str | Path | None = None,
+        token_estimator: Callable[[str], int] | None = None,
+        plan_cache: TTLCache | None = None,
     ) -> None:
+        """
+        Args:
+            index_path: Where to persist the context file index.  Defaults
+                to ``.context-index.json`` in the project root; an empty
+                string keeps it in memory only.
+            ignore_dirs: Directory names or root-relative paths to skip,
+                in addition to DEFAULT_IGNORED_DIRS.
+            file_cache: Shared file text / token cache.  Defaults to a
+                private one (see new_file_cache()).
+            token_estimator: Token estimate of a text, for the private
+                file cache and OpenViking results.  Defaults to
+                token_estimator.estimate_tokens (approximate default
+                rates, not fitted to a tokenizer); a shared *file_cache*
+                brings its own.
+            plan_cache: Memo of file-scan context plans (see the module
+                docstring); shareable between routers and persistable.
+            selection: File-scan selection strategy, one of SELECTIONS.
+            selection_resolution: Budget units of the knapsack selection
+                (see context_selection.select).
+            use_text_index: Also rank the project's files against each
+                slot's task with the offline BM25 index.
+            text_index_path: Where the text index is persisted.  Defaults
+                to ``.context-text-index.json`` in the project root; an
+                empty string keeps it in memory only.
+
+        Raises:
+            ValueError: Unknown *selection*.
+        """
+        if selection not in SELECTIONS:
+            raise ValueError(
+                f"Unknown context selection {selection!r}; expected one of {SELECTIONS}"
+            )
+        self._selection = selection
+        self._resolution = selection_resolution
+        self._terms: dict[str, tuple[str, frozenset[str]]] = {}
         self._project_root = Path(project_root)
+        self._root_str = str(self._project_root)
         self._constitution_path = Path(constitution_path)
-        self._abstract_files: list[str] = []  # Relative paths
-        self._overview_files: list[str] = []  # Relative paths
+        if index_path is None:
+            index_path = self._project_root / CONTEXT_INDEX_FILENAME
+        self._index = ContextFileIndex(
+            self._project_root,
+            path=index_path or None,
+            ignore=(*DEFAULT_IGNORED_DIRS, *ignore_dirs),
+            suffixes=TEXT_SUFFIXES if use_text_index else (),
+        )
+        self._indexed = False
+        self._text_index: ContextTextIndex | None = None
+        if use_text_index:
+            if text_index_path is None:
+                text_index_path = self._project_root / CONTEXT_TEXT_INDEX_FILENAME
+            self._text_index = ContextTextIndex(
+                self._project_root, path=text_index_path or None,
+            )
+        if file_cache is None:
+            file_cache = new_file_cache(estimate=token_estimator or estimate_tokens)
+        self._files = file_cache
+        self._plans = plan_cache
+        self.plan_hits = 0
+        self.plan_misses = 0
         self._use_openviking = use_openviking
         self._ov_router: "OVContextRouter | None" = None
         if use_openviking:
@@ -72,22 +207,28 @@ class ContextRouter:
                 project_root,
                 ov_binary=ov_binary,
                 ov_namespace=ov_namespace,
+                estimate_tokens=self._files.estimate,
             )
+
+    @property
+    def _abstract_files(self) -> list[str]:
+        """Relative paths of .abstract.md files (scanned on first use)."""
+        self._scan_files()
+        return self._index.abstract_files
+
+    @property
+    def _overview_files(self) -> list[str]:
+        """Relative paths of .overview.md files (scanned on first use)."""
         self._scan_files()
+        return self._index.overview_files
 
     def _scan_files(self) -> None:
-        """Walk project root and collect .abstract.md / .overview.md files."""
-        root = self._project_root
-        if not root.is_dir():
-            return
-        for dirpath, _dirnames, filenames in os.walk(root):
-            for fname in filenames:
-                full = Path(dirpath) / fname
-                rel = str(full.relative_to(root))
-                if fname.endswith(".abstract.md"):
-                    self._abstract_files.append(rel)
-                elif fname.endswith(".overview.md"):
-                    self._overview_files.append(rel)
+        """Refresh the context file (and text) index, once per router."""
+        if not self._indexed:
+            self._indexed = True
+            self._index.refresh()
+            if self._text_index is not None:
+                self._text_index.refresh(self._index.files())
 
     def build_context(
         self,
@@ -124,7 +265,71 @@ class ContextRouter:
                     exc_info=True,
                 )
 
-        return self._build_context_from_files(slot, pipeline, max_tokens=max_tokens)
+        if self._plans is None:
+            return self._build_context_from_files(slot, pipeline, max_tokens=max_tokens)
+        key = self._plan_key(slot, max_tokens)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self.plan_hits += 1
+            return [
+                ContextItem(path=path, tier=ContextTier(tier), relevance=relevance,
+                            tokens_estimate=tokens)
+                for path, tier, relevance, tokens in plan
+            ]
+        self.plan_misses += 1
+        items = self._build_context_from_files(slot, pipeline, max_tokens=max_tokens)
+        self._plans.put(key, [
+            [i.path, i.tier.value, i.relevance, i.tokens_estimate] for i in items
+        ])
+        return items
+
+    def context_fingerprint(self, slot: Slot, *, max_tokens: int = 8000) -> str | None:
+        """Fingerprint of everything build_context() for *slot* depends on.
+
+        While it is unchanged, a context built earlier is still current.
+        None with OpenViking enabled: its results depend on the server.
+        """
+        if self._ov_router is not None:
+            return None
+        return self._plan_key(slot, max_tokens)
+
+    def _plan_key(self, slot: Slot, max_tokens: int) -> str:
+        """Memo key of the file-scan plan for *slot*.
+
+        Covers everything the plan depends on: slot type, task text,
+        budget, router settings and the fingerprint of the candidate
+        files (constitution, abstracts, overviews, the knapsack's L2
+        sources and, with the text index, every ranked file).
+        """
+        self._scan_files()
+        paths = {self._constitution_rel_path()}
+        paths.update(self._abstract_files)
+        overviews = self._overview_files
+        paths.update(overviews)
+        if self._selection == "knapsack":
+            paths.update(p[:-len(OVERVIEW_SUFFIX)] for p in overviews)
+        if self._text_index is not None:
+            paths.update(self._index.files())
+        prefix = os.path.join(self._root_str, "")
+        stamps = []
+        for rel_path in sorted(paths):
+            try:
+                st = os.stat(prefix + rel_path)
+                stamps.append(f"{rel_path}\0{st.st_mtime_ns}:{st.st_size}")
+            except OSError:
+                stamps.append(f"{rel_path}\0-")
+        digest = hashlib.sha256("\n".join(stamps).encode("utf-8", "surrogatepass"))
+        return hashlib.sha256(json.dumps([
+            _PLAN_VERSION,
+            slot.slot_type,
+            self._task_text(slot),
+            max_tokens,
+            self._selection,
+            self._resolution,
+            self._text_index is not None,
+            repr(self._files.estimate),
+            digest.hexdigest(),
+        ], ensure_ascii=False).encode("utf-8", "surrogatepass")).hexdigest()
 
     def _build_context_from_files(
         self,
@@ -145,25 +350,19 @@ class ContextRouter:
         used_tokens = 0
 
         # 1. Constitution is always L2
-        constitution_content = self.get_constitution()
-        if constitution_content:
-            tokens = _estimate_tokens(constitution_content)
-            items.append(ContextItem(
-                path=str(self._constitution_path.relative_to(self._project_root))
-                if self._constitution_path.is_relative_to(self._project_root)
-                else str(self._constitution_path),
-                tier=ContextTier.L2,
-                relevance=1.0,
-                tokens_estimate=tokens,
-            ))
-            used_tokens += tokens
+        constitution = self._constitution_item()
+        if constitution is not None:
+            items.append(constitution)
+            used_tokens += constitution.tokens_estimate
+
+        if self._selection == "knapsack":
+            return items + self._select_items(slot, max_tokens - used_tokens)
 
         # 2. Load all L0 files
         for rel_path in sorted(self._abstract_files):
-            content = self._read_file(rel_path)
-            if content is None:
+            tokens = self._file_tokens(rel_path)
+            if tokens is None:
                 continue
-            tokens = _estimate_tokens(content)
             if used_tokens + tokens > max_tokens:
                 continue
             items.append(ContextItem(
@@ -179,10 +378,9 @@ class ContextRouter:
         for rel_path in sorted(self._overview_files):
             if not self._matches_directories(rel_path, mandatory_dirs):
                 continue
-            content = self._read_file(rel_path)
-            if content is None:
+            tokens = self._file_tokens(rel_path)
+            if tokens is None:
                 continue
-            tokens = _estimate_tokens(content)
             if used_tokens + tokens > max_tokens:
                 continue
             items.append(ContextItem(
@@ -213,18 +411,159 @@ class ContextRouter:
             else:
                 upgraded.append(item)
 
+        # 5. Files ranked against the slot's task, best first
+        included = {item.path for item in upgraded}
+        for rel_path, relevance in self._ranked_files(slot).items():
+            if rel_path in included:
+                continue
+            tokens = self._file_tokens(rel_path)
+            if tokens is None or used_tokens + tokens > max_tokens:
+                continue
+            upgraded.append(ContextItem(
+                path=rel_path,
+                tier=_tier_of(rel_path),
+                relevance=relevance,
+                tokens_estimate=tokens,
+            ))
+            used_tokens += tokens
+
         return upgraded
 
+    def _select_items(self, slot: Slot, budget: int) -> list[ContextItem]:
+        """Choose one tier per context directory with the knapsack selection."""
+        slot_dirs = self.get_mandatory_reads(slot.slot_type)
+        objective_terms = set(tokenize(getattr(slot.task, "objective", "") or ""))
+        ranked = self._ranked_files(slot)
+
+        # Group key: the path without its tier suffix ("specs/" for
+        # "specs/.abstract.md", "a/b.py" for "a/b.py.overview.md")
+        tiers: dict[str, dict[ContextTier, str]] = {}
+        for rel_path in self._abstract_files:
+            tiers.setdefault(rel_path[:-len(ABSTRACT_SUFFIX)], {})[ContextTier.L0] = rel_path
+        for rel_path in self._overview_files:
+            tiers.setdefault(rel_path[:-len(OVERVIEW_SUFFIX)], {})[ContextTier.L1] = rel_path
+
+        groups: list[list[Candidate]] = []
+        for key in sorted(tiers):
+            paths = dict(tiers[key])
+            if ContextTier.L1 in paths and key and not key.endswith("/"):
+                paths[ContextTier.L2] = key
+            describe = paths.get(ContextTier.L0) or paths.get(ContextTier.L1)
+            relevance = directory_relevance(
+                key.rstrip("/"),
+                slot_dirs=slot_dirs,
+                objective_terms=objective_terms,
+                text_terms=self._file_terms(describe) if objective_terms else frozenset(),
+            )
+            relevance = max(relevance, *(ranked.pop(p, 0.0) for p in paths.values()))
+            group = []
+            for tier, rel_path in paths.items():
+                tokens = self._file_tokens(rel_path)
+                if tokens is not None:
+                    group.append(Candidate(
+                        group=key,
+                        path=rel_path,
+                        tier=tier,
+                        tokens=tokens,
+                        value=tier_value(relevance, tier),
+                        relevance=round(relevance, 3),
+                    ))
+            groups.append(group)
+
+        # Ranked files outside any context directory group: a group each
+        for rel_path, relevance in ranked.items():
+            tokens = self._file_tokens(rel_path)
+            if tokens is not None:
+                tier = _tier_of(rel_path)
+                groups.append([Candidate(
+                    group=rel_path,
+                    path=rel_path,
+                    tier=tier,
+                    tokens=tokens,
+                    value=tier_value(relevance, tier),
+                    relevance=relevance,
+                )])
+
+        chosen = select(groups, budget, resolution=self._resolution)
+        chosen.sort(key=lambda c: (-c.relevance, c.path))
+        return [
+            ContextItem(
+                path=c.path,
+                tier=c.tier,
+                relevance=c.relevance,
+                tokens_estimate=c.tokens,
+            )
+            for c in chosen
+        ]
+
+    def _ranked_files(self, slot: Slot) -> dict[str, float]:
+        """Files ranked against the slot's task -> relevance, best first.
+
+        Empty without a text index.  The query is the task's objective,
+        deliverables and constraints; the best match gets relevance
+        _TEXT_RANK_RELEVANCE and the rest scale with their BM25 score.
+        """
+        if self._text_index is None:
+            return {}
+        self._scan_files()
+        query = "\n".join(self._task_text(slot))
+        constitution = self._constitution_rel_path()
+        hits = [
+            (path, score)
+            for path, score in self._text_index.search(query, limit=_TEXT_RANK_LIMIT + 1)
+            if path != constitution
+        ][:_TEXT_RANK_LIMIT]
+        if not hits:
+            return {}
+        best = hits[0][1]
+        return {
+            path: round(_TEXT_RANK_RELEVANCE * score / best, 3)
+            for path, score in hits
+        }
+
+    @staticmethod
+    def _task_text(slot: Slot) -> list[str]:
+        """The slot task's objective, deliverables and constraints."""
+        task = slot.task
+        return [
+            getattr(task, "objective", "") or "",
+            *(getattr(task, "deliverables", None) or []),
+            *(getattr(task, "constraints", None) or []),
+        ]
+
+    def _file_terms(self, rel_path: str) -> frozenset[str]:
+        """tokenize() terms of a file, memoized while its text is unchanged."""
+        text = self._files.read(os.path.join(self._root_str, rel_path)) or ""
+        cached = self._terms.get(rel_path)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        terms = frozenset(tokenize(text))
+        self._terms[rel_path] = (text, terms)
+        return terms
+
+    def _constitution_item(self) -> ContextItem | None:
+        tokens = self._files.tokens(self._constitution_path)
+        if tokens is None or not self._files.read(self._constitution_path):
+            return None
+        return ContextItem(
+            path=self._constitution_rel_path(),
+            tier=ContextTier.L2,
+            relevance=1.0,
+            tokens_estimate=tokens,
+        )
+
+    def _constitution_rel_path(self) -> str:
+        if self._constitution_path.is_relative_to(self._project_root):
+            return str(self._constitution_path.relative_to(self._project_root))
+        return str(self._constitution_path)
+
     def get_constitution(self) -> str:
         """Read and return constitution.md content.
 
         Returns:
             File content as string, or empty string if not found.
         """
-        try:
-            return self._constitution_path.read_text(encoding="utf-8")
-        except (FileNotFoundError, OSError):
-            return ""
+        return self._files.read(self._constitution_path) or ""
 
     def get_mandatory_reads(self, slot_type: str) -> list[str]:
         """Return relevant directory prefixes for the given slot type.
@@ -279,20 +618,36 @@ class ContextRouter:
                 f"Invalid upgrade: {item.tier.value} -> {target.value}"
             )
 
-        full_path = self._project_root / new_path
-        if not full_path.is_file():
+        tokens = self._file_tokens(new_path)
+        if tokens is None:
             raise FileNotFoundError(
                 f"Upgraded file not found: {new_path}"
             )
 
-        content = full_path.read_text(encoding="utf-8")
         return ContextItem(
             path=new_path,
             tier=target,
             relevance=item.relevance,
-            tokens_estimate=_estimate_tokens(content),
+            tokens_estimate=tokens,
         )
 
+    def store_context_blocks(
+        self, items: list[ContextItem], store: BlockStore
+    ) -> list[dict[str, Any]]:
+        """Store *items*' contents in *store*, ahead of writing their pack.
+
+        Contents come from the file cache, so files already sized for
+        the budget are not read again; items that are not project files
+        (OpenViking URIs, unreadable paths) are listed without content.
+
+        Returns:
+            Manifest entries for :func:`pipeline.context_pack.write_manifest`.
+
+        Raises:
+            OSError: The store could not be written.
+        """
+        return store_items(store, ((item, self._item_text(item)) for item in items))
+
     def generate_slot_context_yaml(self, items: list[ContextItem]) -> str:
         """Generate a YAML string describing the context items.
 
@@ -320,12 +675,14 @@ class ContextRouter:
 
     # --- Private helpers ---
 
-    def _read_file(self, rel_path: str) -> str | None:
-        """Read a file relative to project root.  Returns None on error."""
-        try:
-            return (self._project_root / rel_path).read_text(encoding="utf-8")
-        except (FileNotFoundError, OSError):
+    def _item_text(self, item: ContextItem) -> str | None:
+        if "://" in item.path:
             return None
+        return self._files.read(os.path.join(self._root_str, item.path))
+
+    def _file_tokens(self, rel_path: str) -> int | None:
+        """Token estimate of a file relative to project root.  None on error."""
+        return self._files.tokens(os.path.join(self._root_str, rel_path))
 
     @staticmethod
     def _matches_directories(path: str, directories: list[str]) -> bool:
@@ -334,3 +691,12 @@ class ContextRouter:
             if path.startswith(d):
                 return True
         return False
+
+
+def _tier_of(rel_path: str) -> ContextTier:
+    """Tier of a file by name: abstract L0, overview L1, anything else L2."""
+    if rel_path.endswith(ABSTRACT_SUFFIX):
+        return ContextTier.L0
+    if rel_path.endswith(OVERVIEW_SUFFIX):
+        return ContextTier.L1
+    return ContextTier.L2
@@ -0,0 +1,175 @@
+"""Offline BM25 ranking of a project's files for slot context.
+
+Without OpenViking, ContextRouter only knows which directories a slot
+type reads.  :class:`ContextTextIndex` ranks the project's markdown and
+source files against free text (a slot's objective, deliverables and
+constraints) with an :class:`IncrementalBM25Index`, so the file-scan
+context can target the files a task is actually about.
+
+Each file is indexed under its root-relative path, as its path words
+plus its text.  The index remembers every file's ``(mtime_ns, size)``
+and term counts, and a refresh re-tokenizes only files that were added
+or changed since -- an unchanged file costs one ``stat``.  Term counts
+are persisted as JSON (atomic temp file + rename), so a new process
+starts from the previous refresh.  The file list itself comes from the
+caller, usually a :class:`ContextFileIndex` tracking TEXT_SUFFIXES.
+
+Usage:
+    index = ContextTextIndex(root, path=root / ".context-text-index.json")
+    index.refresh(["specs/plan.md", "engineer/src/pipeline/runner.py"])
+    index.search("retry failed slots", limit=5)   # [("...runner.py", 0.4)]
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+from pipeline.atomic_file import mtime_settled, write_json
+from pipeline.text_index import IncrementalBM25Index, tokenize
+
+logger = logging.getLogger(__name__)
+
+_INDEX_VERSION = 1
+
+# File types ranked by default: markdown and source
+TEXT_SUFFIXES: tuple[str, ...] = (".md", ".py", ".yaml", ".yml")
+
+# Larger files (generated data, vendored bundles) are not indexed
+DEFAULT_MAX_FILE_BYTES = 256 * 1024
+
+
+class ContextTextIndex:
+    """BM25 index over project files, refreshed incrementally by mtime."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        path: str | Path | None = None,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    ) -> None:
+        """
+        Args:
+            root: Project root the indexed paths are relative to.
+            path: JSON file to persist term counts in, or None for memory
+                only.
+            max_file_bytes: Files larger than this are skipped.
+        """
+        self._root = Path(root)
+        self._root_str = str(self._root)
+        self._path = Path(path) if path is not None else None
+        self._max_bytes = max_file_bytes
+        self._index = IncrementalBM25Index()
+        self._stamps: dict[str, tuple[int, int]] = {}  # path -> (mtime_ns, size)
+        self._refreshed_ns = 0
+        self._loaded = self._path is None
+        self.tokenized = 0  # files (re-)tokenized by the last refresh
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, rel_path: object) -> bool:
+        return rel_path in self._index
+
+    def refresh(self, rel_paths: Iterable[str]) -> None:
+        """Index *rel_paths*, dropping files no longer listed (and persist)."""
+        if not self._loaded:
+            self._load()
+        started_ns = time.time_ns()
+        self.tokenized = 0
+        listed = set()
+        changed = False
+        for rel in rel_paths:
+            listed.add(rel)
+            try:
+                st = os.stat(os.path.join(self._root_str, rel))
+            except OSError:
+                listed.discard(rel)
+                continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            if (
+                self._stamps.get(rel) == stamp
+                and mtime_settled(stamp[0], self._refreshed_ns)
+            ):
+                continue
+            if st.st_size > self._max_bytes:
+                listed.discard(rel)
+                continue
+            counts = self._tokenize(rel)
+            if counts is None:
+                listed.discard(rel)
+                continue
+            self.tokenized += 1
+            if self._stamps.get(rel) != stamp or self._index_counts(rel) != counts:
+                changed = True
+            self._stamps[rel] = stamp
+            self._index.add_counts(rel, counts)
+        for rel in [r for r in self._stamps if r not in listed]:
+            del self._stamps[rel]
+            self._index.remove(rel)
+            changed = True
+        self._refreshed_ns = started_ns
+        if self._path is not None and changed:
+            self._save()
+
+    def search(self, query: str, limit: int | None = 10) -> list[tuple[str, float]]:
+        """Indexed files ranked against *query*: (path, score 0.0-1.0), best first."""
+        return self._index.search(query, limit)
+
+    # --- Private helpers ---
+
+    def _tokenize(self, rel: str) -> Counter[str] | None:
+        try:
+            with open(os.path.join(self._root_str, rel), encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        words = rel.replace("/", " ").replace(".", " ").replace("-", " ")
+        return Counter(tokenize(f"{words}\n{text}"))
+
+    def _index_counts(self, rel: str) -> dict[str, int] | None:
+        return self._index.term_counts(rel) if rel in self._index else None
+
+    def _load(self) -> None:
+        """Read persisted term counts, once.  A missing or stale file is ignored."""
+        self._loaded = True
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+            if (
+                raw.get("version") != _INDEX_VERSION
+                or raw.get("root") != str(self._root.resolve())
+            ):
+                return
+            files = {
+                str(rel): ((int(mtime_ns), int(size)), dict(counts))
+                for rel, (mtime_ns, size, counts) in raw["files"].items()
+            }
+            refreshed_ns = int(raw["refreshed_ns"])
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return
+        for rel, (stamp, counts) in files.items():
+            self._stamps[rel] = stamp
+            self._index.add_counts(rel, counts)
+        self._refreshed_ns = refreshed_ns
+
+    def _save(self) -> None:
+        """Persist term counts atomically; failures are logged, never raised."""
+        payload = {
+            "version": _INDEX_VERSION,
+            "root": str(self._root.resolve()),
+            "refreshed_ns": self._refreshed_ns,
+            "files": {
+                rel: [*stamp, self._index.term_counts(rel)]
+                for rel, stamp in self._stamps.items()
+            },
+        }
+        try:
+            write_json(self._path, payload)
+        except OSError:
+            logger.warning("Could not write context text index %s", self._path, exc_info=True)
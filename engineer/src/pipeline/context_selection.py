@@ -0,0 +1,156 @@
+"""Relevance-optimal selection of context items under a token budget.
+
+The file-scan ContextRouter fills the budget greedily: every abstract in
+path order, then the overviews of the slot's directories.  A low-value
+abstract early in the order can use up the budget a relevant overview
+needed.  This module instead:
+
+1. scores each directory for the slot -- its slot-type directory match
+   and how many of the objective's terms its path and abstract contain
+   (:func:`directory_relevance`);
+2. offers each directory as a group of alternative tiers (L0 abstract,
+   L1 overview, L2 source where one exists), each with a value of
+   relevance times the tier's weight (:func:`tier_value`);
+3. picks at most one tier per directory maximizing the total value
+   within the budget -- a multiple-choice knapsack (:func:`select`).
+
+The knapsack is solved by dynamic programming over the budget split
+into *resolution* units; costs are rounded up to whole units, so the
+selection never exceeds the budget and a coarser resolution trades a
+little value for speed.
+
+Usage:
+    groups = [[Candidate("specs", "specs/.abstract.md", ContextTier.L0, 120, 0.4, 0.8),
+               Candidate("specs", "specs/.overview.md", ContextTier.L1, 900, 0.8, 0.8)]]
+    chosen = select(groups, budget=8000)
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Iterable, Sequence, Set
+from dataclasses import dataclass
+
+from pipeline.models import ContextTier
+from pipeline.text_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Budget units of the knapsack table
+DEFAULT_RESOLUTION = 400
+
+# Value of a tier relative to the directory's relevance
+_TIER_WEIGHTS = {ContextTier.L0: 0.5, ContextTier.L1: 1.0, ContextTier.L2: 1.3}
+
+# directory_relevance() weights: base, slot-type directory, objective terms
+_BASE_RELEVANCE = 0.2
+_SLOT_DIR_WEIGHT = 0.5
+_OBJECTIVE_WEIGHT = 0.3
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """One tier of one directory that may go into the context."""
+
+    group: str             # Directory (one tier per group is chosen)
+    path: str              # File path relative to project root
+    tier: ContextTier
+    tokens: int            # Token cost
+    value: float           # Knapsack value
+    relevance: float       # Relevance reported on the ContextItem
+
+
+def directory_relevance(
+    rel_dir: str,
+    *,
+    slot_dirs: Sequence[str],
+    objective_terms: set[str],
+    text_terms: Set[str] = frozenset(),
+) -> float:
+    """Relevance 0.0-1.0 of a directory for a slot.
+
+    Args:
+        rel_dir: Directory relative to the project root ("" for the root).
+        slot_dirs: Directory prefixes the slot type reads (with "/").
+        objective_terms: tokenize() terms of the slot's objective.
+        text_terms: tokenize() terms of text describing the directory
+            (its abstract).
+    """
+    score = _BASE_RELEVANCE
+    prefix = f"{rel_dir}/" if rel_dir else ""
+    if any(prefix.startswith(d) for d in slot_dirs):
+        score += _SLOT_DIR_WEIGHT
+    if objective_terms:
+        terms = set(tokenize(rel_dir.replace("/", " ").replace("-", " ")))
+        terms.update(text_terms)
+        score += _OBJECTIVE_WEIGHT * len(objective_terms & terms) / len(objective_terms)
+    return min(score, 1.0)
+
+
+def tier_value(relevance: float, tier: ContextTier) -> float:
+    """Knapsack value of including a directory's *tier*."""
+    return relevance * _TIER_WEIGHTS[tier]
+
+
+def select(
+    groups: Iterable[Sequence[Candidate]],
+    budget: int,
+    *,
+    resolution: int = DEFAULT_RESOLUTION,
+) -> list[Candidate]:
+    """Choose at most one candidate per group, maximizing total value.
+
+    Args:
+        groups: Alternative candidates per directory.
+        budget: Token budget; the chosen candidates' tokens never exceed it.
+        resolution: Number of budget units in the DP table.  Costs are
+            rounded up to a whole unit.
+
+    Returns:
+        The chosen candidates, in group order.
+    """
+    groups = [
+        [c for c in group if c.tokens <= budget and c.value > 0]
+        for group in groups
+    ]
+    groups = [group for group in groups if group]
+    if budget <= 0 or not groups:
+        return []
+
+    # Everything's best tier fits: no trade-off to make
+    best = [max(group, key=lambda c: (c.value, -c.tokens)) for group in groups]
+    if sum(c.tokens for c in best) <= budget:
+        return best
+
+    unit = max(1, math.ceil(budget / max(1, resolution)))
+    capacity = budget // unit
+    # dp[w]: best value using at most w units; choices[g][w]: option index + 1
+    dp = [0.0] * (capacity + 1)
+    choices: list[bytearray] = []
+    for group in groups:
+        new = dp[:]
+        choice = bytearray(capacity + 1)
+        for index, candidate in enumerate(group, start=1):
+            cost = math.ceil(candidate.tokens / unit)
+            if cost > capacity:
+                continue
+            value = candidate.value
+            for w in range(cost, capacity + 1):
+                total = dp[w - cost] + value
+                if total > new[w]:
+                    new[w] = total
+                    choice[w] = index
+        dp = new
+        choices.append(choice)
+
+    chosen: list[Candidate] = []
+    w = capacity
+    for group, choice in zip(reversed(groups), reversed(choices)):
+        index = choice[w]
+        if index:
+            candidate = group[index - 1]
+            chosen.append(candidate)
+            w -= math.ceil(candidate.tokens / unit)
+    chosen.reverse()
+    return chosen
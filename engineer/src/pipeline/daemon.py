@@ -0,0 +1,289 @@
+"""Long-lived pipeline server with thin CLI clients.
+
+Every ``pipeline <command>`` call is a fresh interpreter that re-imports
+the engine, re-parses the template and reloads the registry.  A
+:class:`PipelineDaemon` (started with ``pipeline serve``) keeps runners,
+resolved pipelines, the slot registry and NL matchers in memory and runs
+CLI commands in-process on their behalf.
+
+The daemon listens on a Unix socket in the project's state dir.  The CLI
+checks for that socket before running a command; when a daemon answers,
+argv is forwarded and its captured output replayed, otherwise the command
+runs in-process exactly as before.
+
+Protocol -- one JSON object per line in each direction:
+
+    request:  {"op": "run", "argv": [...], "cwd": "/abs/dir"}
+              {"op": "ping"}
+              {"op": "shutdown"}
+    response: {"ok": true, "exit_code": 0, "stdout": "...", "stderr": "..."}
+              {"ok": true, "pid": 1234}
+              {"ok": false, "error": "..."}
+
+Requests are handled one at a time, so state file updates from
+concurrent clients are serialized.
+
+Only depends on stdlib (socket, socketserver, json).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+# socket/socketserver are imported where used (and logging not at all):
+# every CLI call probes for the daemon, and most find none.
+if TYPE_CHECKING:
+    import socketserver
+
+# Socket file name inside the project's state dir
+SOCKET_FILENAME = ".pipeline.sock"
+
+# AF_UNIX paths are limited to ~108 bytes; longer ones fall back to tmp
+_MAX_SOCKET_PATH = 100
+
+# Client connect timeout -- a dead socket must not stall the CLI
+_CONNECT_TIMEOUT = 0.5
+
+# Largest accepted request line
+_MAX_REQUEST_BYTES = 1 << 20
+
+
+class DaemonError(Exception):
+    """Raised when the daemon cannot start."""
+
+
+def socket_path(state_dir: str) -> Path:
+    """Socket path for the daemon serving *state_dir*.
+
+    Normally ``<state_dir>/.pipeline.sock``; when that exceeds the
+    AF_UNIX path limit, a per-state-dir name in the temp directory.
+    """
+    path = Path(state_dir).resolve() / SOCKET_FILENAME
+    if len(os.fsencode(str(path))) <= _MAX_SOCKET_PATH:
+        return path
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha1(os.fsencode(str(path))).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"pipeline-{digest}.sock"
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+def send_request(
+    path: str | Path,
+    payload: dict[str, Any],
+    *,
+    timeout: float | None = None,
+) -> dict[str, Any] | None:
+    """Send one request to the daemon at *path* and return its response.
+
+    Returns None when no daemon is listening (missing or stale socket),
+    so callers can fall back to in-process execution.  Failures after
+    the request was sent raise instead: the command may already have
+    run, so retrying it elsewhere is not safe.
+
+    Args:
+        path: Daemon socket path.
+        payload: Request object (see module docstring).
+        timeout: Seconds to wait for the response; None waits as long
+            as the command takes.
+
+    Raises:
+        OSError: The connection failed mid-request.
+        ValueError: The response was not valid JSON.
+    """
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(_CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return None
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+
+    if not line:
+        raise ConnectionError(f"Pipeline daemon at {path} closed without a response")
+    return json.loads(line)
+
+
+def forward(
+    state_dir: str, argv: list[str], cwd: str
+) -> dict[str, Any] | None:
+    """Run a CLI command on the daemon serving *state_dir*, if any.
+
+    Returns:
+        The daemon's response, or None when no daemon is running.
+    """
+    path = socket_path(state_dir)
+    if not path.exists():
+        return None
+    return send_request(path, {"op": "run", "argv": argv, "cwd": cwd})
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+def _make_server(path: str, daemon: PipelineDaemon) -> socketserver.UnixStreamServer:
+    """Unix socket server that hands each request line to *daemon*."""
+    import socketserver
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        """Reads one JSON request line and writes one JSON response line."""
+
+        def handle(self) -> None:
+            line = self.rfile.readline(_MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > _MAX_REQUEST_BYTES:
+                response = {"ok": False, "error": "request too large"}
+            else:
+                try:
+                    request = json.loads(line)
+                except ValueError as exc:
+                    response = {"ok": False, "error": f"invalid JSON: {exc}"}
+                else:
+                    response = daemon.handle(request)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    class Server(socketserver.UnixStreamServer):
+        def handle_timeout(self) -> None:
+            daemon.stop()  # idle timeout
+
+    return Server(path, RequestHandler)
+
+
+class PipelineDaemon:
+    """Serves pipeline CLI commands from one long-lived process.
+
+    Usage:
+        daemon = PipelineDaemon(state_dir, idle_timeout=1800)
+        daemon.serve_forever()   # until a shutdown request or idle timeout
+    """
+
+    def __init__(
+        self,
+        state_dir: str,
+        *,
+        idle_timeout: float | None = None,
+    ) -> None:
+        """
+        Args:
+            state_dir: Project state dir; the socket is created inside it.
+            idle_timeout: Exit after this many seconds without a request.
+                None or 0 serves until shut down.
+        """
+        self._path = socket_path(state_dir)
+        self._idle_timeout = idle_timeout or None
+        self._running = False
+        # Runners, matchers etc. reused across commands (see cli.execute)
+        self._cache: dict[tuple, Any] = {}
+        self._requests = 0
+
+    @property
+    def path(self) -> Path:
+        """Socket path the daemon listens on."""
+        return self._path
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Dispatch one decoded request and return the response object."""
+        op = request.get("op") if isinstance(request, dict) else None
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "requests": self._requests}
+        if op == "shutdown":
+            self.stop()
+            return {"ok": True}
+        if op == "run":
+            argv = request.get("argv")
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                return {"ok": False, "error": "'argv' must be a list of strings"}
+            cwd = request.get("cwd")
+            if cwd is not None and not isinstance(cwd, str):
+                return {"ok": False, "error": "'cwd' must be a string"}
+            self._requests += 1
+            return self._run(argv, cwd)
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+    def serve_forever(self) -> None:
+        """Bind the socket and serve requests until stopped.
+
+        Raises:
+            DaemonError: Another daemon is already serving this state dir.
+        """
+        self._prepare_socket()
+        server = _make_server(str(self._path), self)
+        try:
+            os.chmod(self._path, 0o600)
+            server.timeout = self._idle_timeout
+            self._running = True
+            while self._running:
+                server.handle_request()
+        finally:
+            self._running = False
+            server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                self._path.unlink()
+
+    def stop(self) -> None:
+        """Stop after the request currently being handled."""
+        self._running = False
+
+    # --- Private helpers ---
+
+    def _prepare_socket(self) -> None:
+        """Remove a stale socket file; refuse to start over a live one."""
+        if not self._path.exists():
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            return
+        try:
+            alive = send_request(self._path, {"op": "ping"}, timeout=_CONNECT_TIMEOUT)
+        except (OSError, ValueError):
+            alive = None
+        if alive:
+            raise DaemonError(f"A pipeline daemon is already running on {self._path}")
+        self._path.unlink()
+
+    def _run(self, argv: list[str], cwd: str | None) -> dict[str, Any]:
+        """Run one CLI command in-process, capturing its output."""
+        from pipeline import cli
+
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                code = cli.execute(argv, cwd=cwd, cache=self._cache)
+            except SystemExit as exc:
+                # argparse errors and sys.exit() inside commands
+                if exc.code is None or isinstance(exc.code, int):
+                    code = exc.code or 0
+                else:
+                    print(exc.code, file=sys.stderr)
+                    code = 1
+            except Exception as exc:
+                # Keep serving: one broken command must not kill the daemon
+                print(f"Error: {exc}", file=sys.stderr)
+                code = 1
+        return {
+            "ok": True,
+            "exit_code": code,
+            "stdout": out.getvalue(),
+            "stderr": err.getvalue(),
+        }
+
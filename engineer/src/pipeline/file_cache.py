@@ -0,0 +1,159 @@
+"""Shared cache of file contents and token estimates.
+
+ContextRouter sizes every candidate context file (constitution,
+abstracts, overviews) on each ``build_context`` call, which used to
+mean reading each file in full just to compute a token estimate.
+:class:`FileCache` keeps, per file, the token estimate and -- while it
+fits in the byte budget -- the text, validated against the file's
+``(mtime_ns, size)`` on every lookup.  An unchanged file costs one
+``stat``; an edited file is simply read again.
+
+Entries are evicted least recently used first once the cached text
+exceeds *max_bytes*.  A file larger than the budget keeps only its token
+estimate.
+
+Usage:
+    cache = FileCache(estimate=lambda text: len(text) // 4)
+    cache.tokens("/project/specs/.overview.md")     # read once
+    cache.tokens("/project/specs/.overview.md")     # stat only
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Bookkeeping charged per entry against the byte budget
+_ENTRY_OVERHEAD = 128
+
+
+class _Entry(NamedTuple):
+    mtime_ns: int
+    size: int
+    tokens: int
+    content: str | None
+
+
+class FileCache:
+    """Thread-safe LRU cache of file text and token estimates, by path and mtime."""
+
+    def __init__(
+        self,
+        *,
+        estimate: Callable[[str], int],
+        max_bytes: int = 16 * 1024 * 1024,
+        store_content: bool = True,
+    ) -> None:
+        """
+        Args:
+            estimate: Token estimate of a file's text.
+            max_bytes: Budget for cached text (plus per-entry overhead).
+            store_content: Keep file text, not just token estimates.
+        """
+        self._estimate = estimate
+        self._max_bytes = max_bytes
+        self._store_content = store_content
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def estimate(self) -> Callable[[str], int]:
+        """The token estimate applied to file text."""
+        return self._estimate
+
+    @property
+    def bytes_used(self) -> int:
+        """Bytes charged against the budget."""
+        return self._bytes
+
+    def tokens(self, path: str | Path) -> int | None:
+        """Token estimate of the file at *path*, or None if unreadable."""
+        entry = self._lookup(str(path))
+        return entry.tokens if entry is not None else None
+
+    def read(self, path: str | Path) -> str | None:
+        """Text of the file at *path*, or None if unreadable."""
+        entry = self._lookup(str(path))
+        if entry is None:
+            return None
+        if entry.content is not None:
+            return entry.content
+        # Not kept (over budget or store_content off): read through
+        return _read_text(str(path))
+
+    def invalidate(self, path: str | Path) -> None:
+        """Drop the entry for *path*, if any."""
+        with self._lock:
+            entry = self._entries.pop(str(path), None)
+            if entry is not None:
+                self._bytes -= _cost(entry)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # --- Private helpers ---
+
+    def _lookup(self, path: str) -> _Entry | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if (
+                entry is not None
+                and entry.mtime_ns == st.st_mtime_ns
+                and entry.size == st.st_size
+            ):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        content = _read_text(path)
+        if content is None:
+            self.invalidate(path)
+            return None
+        entry = _Entry(st.st_mtime_ns, st.st_size, self._estimate(content), content)
+        self._store(path, entry)
+        return entry
+
+    def _store(self, path: str, entry: _Entry) -> None:
+        if not self._store_content or entry.size + _ENTRY_OVERHEAD > self._max_bytes:
+            entry = entry._replace(content=None)
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= _cost(old)
+            self._entries[path] = entry
+            self._bytes += _cost(entry)
+            while self._bytes > self._max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _cost(evicted)
+
+
+def _cost(entry: _Entry) -> int:
+    return _ENTRY_OVERHEAD + (entry.size if entry.content is not None else 0)
+
+
+def _read_text(path: str) -> str | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
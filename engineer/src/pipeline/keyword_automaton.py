@@ -0,0 +1,160 @@
+"""Aho-Corasick keyword automaton for multi-keyword substring search.
+
+Finds every occurrence of a fixed set of keywords in one left-to-right
+pass over the input, independent of how many keywords there are.  Used
+by NLMatcher, which previously ran one substring search per keyword per
+template.
+
+Matching is case-insensitive (keywords and text are lowercased) and
+plain substring based, like ``keyword in text.lower()``; keywords may
+contain spaces or CJK characters.
+
+Transitions are resolved lazily: the first time a (state, character)
+pair is seen its failure-link walk is stored as a direct edge, so
+repeated inputs run at one dict lookup per character without building
+the full state x alphabet table up front.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+
+class KeywordAutomaton:
+    """Multi-pattern matcher over a fixed set of keywords.
+
+    Usage:
+        automaton = KeywordAutomaton(["bug", "hotfix", "修复"])
+        automaton.find("Urgent HOTFIX: 修复 crash")   # {"hotfix", "修复"}
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """
+        Args:
+            keywords: Keywords to search for.  Empty strings are ignored
+                and duplicates (after lowercasing) are merged.
+        """
+        self._keywords: list[str] = []
+        # Per state: char -> next state (trie edges, then memoized jumps)
+        self._delta: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Per state: keyword ids ending here (own + via suffix links)
+        self._out: list[tuple[int, ...]] = [()]
+        self._alphabet: set[str] = set()
+
+        self._ids: dict[str, int] = {}
+        own: dict[int, int] = {}
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if not keyword or keyword in self._ids:
+                continue
+            self._ids[keyword] = len(self._keywords)
+            own[self._insert(keyword)] = len(self._keywords)
+            self._keywords.append(keyword)
+        self._link(own)
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    @property
+    def keywords(self) -> list[str]:
+        """Lowercased keywords, in insertion order (index = keyword id)."""
+        return list(self._keywords)
+
+    def keyword(self, keyword_id: int) -> str:
+        """The (lowercased) keyword with id *keyword_id*."""
+        return self._keywords[keyword_id]
+
+    def keyword_id(self, keyword: str) -> int:
+        """ID of *keyword* (case-insensitive).
+
+        Raises:
+            KeyError: Not one of the automaton's keywords.
+        """
+        return self._ids[keyword.lower()]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield ``(end, keyword_id)`` for every occurrence in *text*.
+
+        *end* is the index just past the match in ``text.lower()``.
+        Overlapping occurrences are all reported.
+        """
+        delta, out, alphabet = self._delta, self._out, self._alphabet
+        state = 0
+        for end, ch in enumerate(text.lower(), 1):
+            if ch not in alphabet:
+                state = 0
+                continue
+            nxt = delta[state].get(ch)
+            if nxt is None:
+                nxt = self._resolve(state, ch)
+            state = nxt
+            for keyword_id in out[state]:
+                yield end, keyword_id
+
+    def find_ids(self, text: str) -> set[int]:
+        """IDs of the keywords occurring in *text* (each reported once)."""
+        delta, out, alphabet = self._delta, self._out, self._alphabet
+        found: set[int] = set()
+        state = 0
+        for ch in text.lower():
+            if ch not in alphabet:
+                state = 0
+                continue
+            nxt = delta[state].get(ch)
+            if nxt is None:
+                nxt = self._resolve(state, ch)
+            state = nxt
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def find(self, text: str) -> set[str]:
+        """Keywords (lowercased) occurring in *text*."""
+        return {self._keywords[i] for i in self.find_ids(text)}
+
+    # --- Private helpers ---
+
+    def _insert(self, keyword: str) -> int:
+        state = 0
+        for ch in keyword:
+            self._alphabet.add(ch)
+            nxt = self._delta[state].get(ch)
+            if nxt is None:
+                nxt = len(self._delta)
+                self._delta.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._delta[state][ch] = nxt
+            state = nxt
+        return state
+
+    def _link(self, own: dict[int, int]) -> None:
+        """Compute failure links and merged outputs breadth-first."""
+        queue: deque[int] = deque()
+        for child in self._delta[0].values():
+            self._out[child] = (own[child],) if child in own else ()
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._delta[state].items():
+                fail = self._fail[state]
+                while fail and ch not in self._delta[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._delta[fail].get(ch, 0)
+                inherited = self._out[self._fail[child]]
+                self._out[child] = ((own[child],) if child in own else ()) + inherited
+                queue.append(child)
+
+    def _resolve(self, state: int, ch: str) -> int:
+        """Transition for (state, ch) via failure links, memoized."""
+        if state == 0:
+            nxt = 0
+        else:
+            fail = self._fail[state]
+            nxt = self._delta[fail].get(ch)
+            if nxt is None:
+                nxt = self._resolve(fail, ch)
+        self._delta[state][ch] = nxt
+        return nxt
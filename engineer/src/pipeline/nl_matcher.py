@@ -4,9 +4,40 @@ Matches free-text requests (English or Chinese) to pipeline templates
 using keyword matching and regex pattern extraction.  No LLM calls --
 purely deterministic keyword + regex scoring.
 
+Templates declare how they are matched in an optional ``match`` block:
+
+    pipeline:
+      id: hotfix
+      match:
+        weight: 1.3
+        keywords: [hotfix, urgent, bug, 紧急, 修复]
+        params:
+          - name: bug_id
+            pattern: '[A-Z]{1,4}[0-9]?-[0-9]{1,4}'
+
+The block is specified in ``specs/pipelines/schema.yaml``.  Only
+templates without one (written before templates declared their match
+metadata) fall back to the built-in ``_KEYWORD_MAP``, by template id.  At
+load time an inverted index maps each keyword to the templates that
+declare it, so match() only scores templates sharing a keyword with
+the input.
+
+When *use_text_index* is ``True``, keyword matches are supplemented by
+an offline BM25 ranking (see :mod:`pipeline.text_index`) over each
+template's name, description and slot names/objectives.  The index is
+persisted next to the templates (``.match-index.json``) and rebuilt only
+when that text changes.
+
 When *use_openviking* is ``True``, supplements keyword matches with
-semantic search via ``ov find``.  OV results **only boost** existing
-matches or add new candidates — they never reduce keyword scores.
+semantic search via ``ov find``.  The query starts on a background
+thread before keyword scoring, and match() waits for it only until its
+latency budget (*ov_budget*) is spent -- a slow OV never delays the
+keyword results by more than that.  Answers are cached on disk
+(``.ov-find-cache.json`` next to the templates) by normalized query for
+*ov_cache_ttl* seconds; a query that misses the budget still fills the
+cache when it completes.  Text index and OV results **only boost**
+existing matches or add new candidates — they never reduce keyword
+scores.
 """
 
 from __future__ import annotations
@@ -15,16 +46,44 @@ import json
 import logging
 import re
 import subprocess
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from pipeline.keyword_automaton import KeywordAutomaton
+from pipeline.text_index import BM25Index, load_or_build
+from pipeline.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 _OV_TIMEOUT = 15  # seconds per ov find call
 
+# Cached ov find answers, in the templates directory
+OV_CACHE_FILENAME = ".ov-find-cache.json"
+
+# Persisted BM25 index, in the templates directory
+TEXT_INDEX_FILENAME = ".match-index.json"
+_TEXT_INDEX_LIMIT = 5  # ranked templates considered per request
+
+# match_many(): unique requests below this are never sent to a process pool
+_POOL_MIN_BATCH = 1000
+
+# Built-in parameter patterns, see extract_params()
+_SYMBOL_RE = re.compile(r"[A-Z]{2,10}/[A-Z]{2,10}")
+_PHASE_RE = re.compile(r"phase[-_]?(\d+)", re.IGNORECASE)
+_PHASE_ZH_RE = re.compile(r"阶段\s*(\d+)")
+_BUG_ID_RE = re.compile(r"[A-Z]{1,4}\d?-\d{1,4}")
+_FEATURE_RE = re.compile(r"(?:feature|功能)\s+[\"']?(\S+)[\"']?", re.IGNORECASE)
+_STRATEGY_RE = re.compile(r"(?:strategy|策略)\s+[\"']?(\S+)[\"']?", re.IGNORECASE)
+_MODULE_RE = re.compile(r"(?:module|模块)\s+[\"']?(\S+)[\"']?", re.IGNORECASE)
+
 
 @dataclass(frozen=True)
 class TemplateMatch:
@@ -38,7 +97,10 @@ class TemplateMatch:
     suggested_params: dict[str, Any]
 
 
-# Keyword definitions per template id.
+# Fallback keyword definitions for templates without a ``match`` block,
+# for projects whose copies of the stock templates predate it.  The
+# repository's templates declare their own (test_nl_matcher checks the
+# two agree); a template with a ``match`` block never uses this table.
 # Keys = template id, values = (weight, keywords list).
 # Keywords include both English and Chinese terms.
 _KEYWORD_MAP: dict[str, tuple[float, list[str]]] = {
@@ -183,58 +245,123 @@ _KEYWORD_MAP: dict[str, tuple[float, list[str]]] = {
 class NLMatcher:
     """Matches natural language input to pipeline templates.
 
-    Scans a templates directory at init time and builds a keyword index.
-    The match() method scores each template against the input and returns
-    candidates sorted by confidence.
+    Scans a templates directory at init time and builds a keyword
+    automaton over every template's keywords, plus an inverted index from
+    keyword to templates.  The match() method finds all keywords in one
+    pass over the input, scores only the templates that declare one of
+    them and returns candidates sorted by confidence.
     """
 
     def __init__(
         self,
         templates_dir: str,
         *,
+        use_text_index: bool = False,
+        text_index_path: str | None = None,
         use_openviking: bool = False,
         ov_binary: str = "ov",
         ov_namespace: str = "viking://agent-orchestrator",
+        ov_budget: float = 1.0,
+        ov_cache_path: str | None = None,
+        ov_cache_ttl: float = 3600.0,
     ) -> None:
+        """
+        Args:
+            templates_dir: Directory of pipeline template YAML files.
+            use_text_index: Also rank templates with the offline BM25
+                text index.
+            text_index_path: Where the text index is persisted.  Defaults
+                to TEXT_INDEX_FILENAME in *templates_dir*.
+            use_openviking: Also rank templates with ``ov find``.
+            ov_binary: OpenViking CLI binary.
+            ov_namespace: OpenViking namespace holding the specs.
+            ov_budget: Seconds match() waits for ``ov find``, counted
+                from the start of the call.
+            ov_cache_path: Where ``ov find`` answers are cached.  Defaults
+                to OV_CACHE_FILENAME in *templates_dir*.
+            ov_cache_ttl: Seconds a cached answer stays valid (0 disables
+                the cache).
+        """
         self._templates_dir = Path(templates_dir)
         self._templates: dict[str, dict[str, Any]] = {}
+        self._use_text_index = use_text_index
+        self._text_index_path = (
+            Path(text_index_path) if text_index_path
+            else self._templates_dir / TEXT_INDEX_FILENAME
+        )
+        self._text_index: BM25Index | None = None
         self._use_openviking = use_openviking
         self._ov_binary = ov_binary
         self._ov_namespace = ov_namespace
+        self._ov_budget = ov_budget
+        self._ov_cache: TTLCache | None = None
+        if use_openviking:
+            self._ov_cache = TTLCache(
+                ov_cache_ttl,
+                path=ov_cache_path or self._templates_dir / OV_CACHE_FILENAME,
+            )
+        # Normalized query -> ov find still running (possibly past its budget)
+        self._ov_inflight: dict[str, Future] = {}
+        self._ov_lock = threading.Lock()
+        self._automaton = KeywordAutomaton(())
+        # Automaton keyword id -> indexes of templates declaring it
+        self._keyword_index: list[list[int]] = []
+        self._template_ids: list[str] = []
         self._load_templates()
 
+    def __getstate__(self) -> dict[str, Any]:
+        # Pickled for match_many() workers: the lock and running OV
+        # queries stay with this process
+        state = self.__dict__.copy()
+        state["_ov_inflight"] = {}
+        del state["_ov_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._ov_lock = threading.Lock()
+
     def match(self, nl_input: str) -> list[TemplateMatch]:
         """Find matching templates for a natural language input.
 
         Algorithm:
-        1. Tokenize input (Unicode-aware)
-        2. For each template, count keyword matches
+        1. Find all keywords in the input (one automaton pass)
+        2. For each template declaring a found keyword, count matches
         3. Score = matched / total * weight
         4. Apply regex pattern bonuses
         5. Sort by score descending
         6. Return candidates with confidence > 0.1
 
+        With OpenViking enabled, ``ov find`` runs concurrently with steps
+        1-5 and its answer is merged only if it arrives within the
+        latency budget.
+
         Returns:
             List of TemplateMatch sorted by confidence (descending).
         """
-        tokens = self._tokenize(nl_input)
+        deadline = time.monotonic() + self._ov_budget
+        ov_pending = self._start_ov_find(nl_input) if self._use_openviking else None
+
         lower_input = nl_input.lower()
+        # Every token is a substring of the input, so substring hits
+        # cover the former token check too
+        found_ids = self._automaton.find_ids(lower_input)
+        candidates: set[int] = set()
+        for keyword_id in found_ids:
+            candidates.update(self._keyword_index[keyword_id])
         results: list[TemplateMatch] = []
-
-        for template_id, meta in self._templates.items():
-            weight, keywords = _KEYWORD_MAP.get(template_id, (1.0, []))
-            if not keywords:
-                continue
-
-            matched = []
-            for kw in keywords:
-                if kw.lower() in lower_input or kw.lower() in tokens:
-                    matched.append(kw)
-
-            if not matched:
-                continue
-
-            score = (len(matched) / len(keywords)) * weight
+        # Built-in params do not depend on the template: extract them once
+        builtin: dict[str, Any] | None = None
+
+        for index in sorted(candidates):
+            template_id = self._template_ids[index]
+            meta = self._templates[template_id]
+            keywords = meta["keywords"]
+            matched = [
+                kw for kw, keyword_id in zip(keywords, meta["keyword_ids"])
+                if keyword_id in found_ids
+            ]
+            score = (len(matched) / len(keywords)) * meta["weight"]
 
             # Bonus for exact template name match
             if template_id in lower_input:
@@ -245,7 +372,10 @@ class NLMatcher:
             if confidence < 0.1:
                 continue
 
-            suggested_params = self.extract_params(nl_input, template_id)
+            if builtin is None:
+                builtin = self._builtin_params(nl_input)
+            suggested_params = dict(builtin)
+            suggested_params.update(self._declared_params(nl_input, template_id))
 
             results.append(
                 TemplateMatch(
@@ -258,13 +388,78 @@ class NLMatcher:
                 )
             )
 
-        # OV semantic enhancement: boost or add candidates
-        if self._use_openviking:
-            results = self._enhance_with_ov(nl_input, results)
+        # Offline text ranking: boost or add candidates
+        if self._text_index is not None:
+            results = self._merge_ranked(
+                nl_input,
+                results,
+                dict(self._text_index.search(nl_input, limit=_TEXT_INDEX_LIMIT)),
+            )
+
+        # OV semantic enhancement: boost or add candidates, if OV answered
+        # within the budget
+        if ov_pending is not None:
+            try:
+                ov_results = ov_pending.result(timeout=max(deadline - time.monotonic(), 0))
+            except FutureTimeoutError:
+                logger.debug("ov find exceeded %.2fs budget, using keyword results", self._ov_budget)
+                ov_results = None
+            if ov_results is not None:
+                results = self._merge_ranked(nl_input, results, self._ov_scores(ov_results))
 
         results.sort(key=lambda m: m.confidence, reverse=True)
         return results
 
+    def match_many(
+        self,
+        requests: Iterable[str],
+        *,
+        processes: int | None = None,
+        chunk_size: int = 256,
+    ) -> list[list[TemplateMatch]]:
+        """Match a batch of natural language inputs.
+
+        Same results as ``[self.match(r) for r in requests]``, but each
+        distinct input is matched only once, and very large batches can
+        be spread across a process pool.
+
+        Args:
+            requests: Natural language inputs.
+            processes: Worker processes for batches of at least
+                _POOL_MIN_BATCH distinct inputs.  None or 1 matches in
+                this process.
+            chunk_size: Inputs sent to a worker at a time.
+
+        Returns:
+            One list of TemplateMatch per input, in input order.
+        """
+        requests = list(requests)
+        unique = list(dict.fromkeys(requests))
+
+        if processes and processes > 1 and len(unique) >= _POOL_MIN_BATCH:
+            chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+            with ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_worker, initargs=(self,)
+            ) as pool:
+                matched = [r for chunk in pool.map(_match_chunk, chunks) for r in chunk]
+        else:
+            matched = [self.match(text) for text in unique]
+
+        by_text = dict(zip(unique, matched))
+        seen: set[str] = set()
+        results: list[list[TemplateMatch]] = []
+        for text in requests:
+            if text in seen:
+                # Repeated input: fresh params dicts, so callers can edit them
+                results.append([
+                    replace(m, suggested_params=dict(m.suggested_params))
+                    for m in by_text[text]
+                ])
+            else:
+                seen.add(text)
+                results.append(by_text[text])
+        return results
+
     def _enhance_with_ov(
         self,
         nl_input: str,
@@ -276,8 +471,60 @@ class NLMatcher:
         correspond to an existing keyword result increase its confidence.
         OV matches not in keyword results are added as new candidates.
 
+        Synchronous (no latency budget); match() uses _start_ov_find().
         Returns keyword_results unchanged on any OV failure.
         """
+        ov_results = self._ov_find(nl_input)
+        if ov_results is None:
+            return keyword_results
+        return self._merge_ranked(nl_input, keyword_results, self._ov_scores(ov_results))
+
+    def _start_ov_find(self, nl_input: str) -> Future:
+        """Start ``ov find`` for *nl_input* on a background thread.
+
+        Served from the cache when possible; a query already running
+        (e.g. one that missed an earlier budget) is joined, not repeated.
+
+        Returns:
+            Future resolving to the OV results, or None on failure.
+        """
+        key = self._ov_cache_key(nl_input)
+        future: Future = Future()
+        cached = self._ov_cache.get(key) if self._ov_cache is not None else None
+        if cached is not None:
+            future.set_result(cached)
+            return future
+
+        with self._ov_lock:
+            running = self._ov_inflight.get(key)
+            if running is not None:
+                return running
+            self._ov_inflight[key] = future
+
+        def run() -> None:
+            try:
+                result = self._ov_find(nl_input)
+            except Exception:
+                result = None
+            with self._ov_lock:
+                self._ov_inflight.pop(key, None)
+            future.set_result(result)
+
+        # Daemon thread: a query still running at exit never blocks it
+        threading.Thread(target=run, name="nl-matcher-ov-find", daemon=True).start()
+        return future
+
+    def _ov_find(self, nl_input: str) -> list[dict[str, Any]] | None:
+        """Run ``ov find`` (or serve it from the cache).
+
+        Returns:
+            OV result entries, or None on any OV failure.
+        """
+        key = self._ov_cache_key(nl_input)
+        if self._ov_cache is not None:
+            cached = self._ov_cache.get(key)
+            if cached is not None:
+                return cached
         try:
             result = subprocess.run(
                 [
@@ -296,7 +543,7 @@ class NLMatcher:
                 timeout=_OV_TIMEOUT,
             )
             if result.returncode != 0:
-                return keyword_results
+                return None
 
             data = json.loads(result.stdout)
             ov_results = (
@@ -309,9 +556,18 @@ class NLMatcher:
             Exception,
         ):
             logger.debug("OV semantic search failed, using keyword results only", exc_info=True)
-            return keyword_results
+            return None
+
+        if self._ov_cache is not None:
+            self._ov_cache.put(key, ov_results)
+        return ov_results
+
+    def _ov_cache_key(self, nl_input: str) -> str:
+        """Cache key: namespace plus the case- and whitespace-normalized query."""
+        return f"{self._ov_namespace}\n{' '.join(nl_input.lower().split())}"
 
-        # Build a map of OV scores by template id
+    def _ov_scores(self, ov_results: list[dict[str, Any]]) -> dict[str, float]:
+        """Map OV result entries to the best score per template id."""
         ov_scores: dict[str, float] = {}
         for entry in ov_results:
             uri = str(entry.get("uri", entry.get("path", "")))
@@ -320,16 +576,28 @@ class NLMatcher:
             for tid in self._templates:
                 if tid in uri:
                     ov_scores[tid] = max(ov_scores.get(tid, 0), score)
+        return ov_scores
 
-        if not ov_scores:
+    def _merge_ranked(
+        self,
+        nl_input: str,
+        keyword_results: list[TemplateMatch],
+        ranked: dict[str, float],
+    ) -> list[TemplateMatch]:
+        """Merge semantic scores (0.0 - 1.0 per template) into keyword results.
+
+        Matches in *ranked* get a confidence boost; ranked templates with
+        no keyword match are added with a conservative confidence.
+        """
+        if not ranked:
             return keyword_results
 
         # Boost existing results
         existing_ids = {r.template_id for r in keyword_results}
         boosted: list[TemplateMatch] = []
         for match in keyword_results:
-            if match.template_id in ov_scores:
-                boost = min(ov_scores[match.template_id] * 0.2, 0.15)
+            if match.template_id in ranked:
+                boost = min(ranked[match.template_id] * 0.2, 0.15)
                 new_confidence = min(match.confidence + boost, 1.0)
                 boosted.append(TemplateMatch(
                     template_id=match.template_id,
@@ -342,14 +610,14 @@ class NLMatcher:
             else:
                 boosted.append(match)
 
-        # Add new candidates from OV not in keyword results
-        for tid, score in ov_scores.items():
+        # Add new candidates not in keyword results
+        for tid, score in ranked.items():
             if tid in existing_ids:
                 continue
             meta = self._templates.get(tid)
             if meta is None:
                 continue
-            confidence = min(score * 0.5, 0.4)  # Conservative for OV-only
+            confidence = min(score * 0.5, 0.4)  # Conservative for ranking-only
             if confidence < 0.1:
                 continue
             suggested_params = self.extract_params(nl_input, tid)
@@ -369,6 +637,9 @@ class NLMatcher:
     ) -> dict[str, Any]:
         """Extract parameter values from natural language.
 
+        Patterns declared in the template's ``match.params`` are tried
+        first; the built-in patterns below fill in any remaining keys.
+
         Pattern-based extraction:
         - Trading symbol: r'[A-Z]{2,10}/[A-Z]{2,10}'
         - Feature name: alphanumeric-kebab words after "feature" or "功能"
@@ -378,84 +649,92 @@ class NLMatcher:
         Returns:
             Dict of extracted params. Missing params keep template defaults.
         """
+        params = self._builtin_params(nl_input)
+        params.update(self._declared_params(nl_input, template_id))
+        return params
+
+    def generate_summary(
+        self, match: TemplateMatch, params: dict[str, Any]
+    ) -> str:
+        """Generate human-readable pipeline summary for CEO review.
+
+        Format:
+            Template: {name} ({id})
+            Parameters:
+              - key: value
+            Confidence: 0.85
+        """
+        lines = [
+            f"Template: {match.description.strip()[:60]} ({match.template_id})",
+            "Parameters:",
+        ]
+        if params:
+            for k, v in params.items():
+                lines.append(f"  - {k}: {v}")
+        else:
+            lines.append("  (none)")
+        lines.append(f"Confidence: {match.confidence}")
+        return "\n".join(lines)
+
+    # --- Private helpers ---
+
+    def _declared_params(self, nl_input: str, template_id: str) -> dict[str, Any]:
+        """Params from the template's ``match.params`` patterns."""
+        declared: dict[str, Any] = {}
+        meta = self._templates.get(template_id)
+        for name, regex in meta["param_patterns"] if meta else ():
+            if name in declared:
+                continue
+            m = regex.search(nl_input)
+            if m:
+                value = m.group(1) if regex.groups else m.group()
+                declared[name] = value.strip("\"'")
+        return declared
+
+    @staticmethod
+    def _builtin_params(nl_input: str) -> dict[str, Any]:
+        """Params from the built-in patterns (same for every template)."""
         params: dict[str, Any] = {}
 
         # Trading symbol: BTC/USDT, ETH/BTC
-        symbol_match = re.search(r"[A-Z]{2,10}/[A-Z]{2,10}", nl_input)
+        symbol_match = _SYMBOL_RE.search(nl_input)
         if symbol_match:
             params["target_symbol"] = symbol_match.group()
 
         # Phase id: phase5, phase-2, 阶段3
-        phase_match = re.search(
-            r"phase[-_]?(\d+)", nl_input, re.IGNORECASE
-        )
-        if not phase_match:
-            phase_match = re.search(r"阶段\s*(\d+)", nl_input)
+        phase_match = _PHASE_RE.search(nl_input) or _PHASE_ZH_RE.search(nl_input)
         if phase_match:
             params["phase_id"] = f"phase{phase_match.group(1)}"
 
         # Bug id: P0-001, P1-042, KI-003
-        bug_match = re.search(r"[A-Z]{1,4}\d?-\d{1,4}", nl_input)
+        bug_match = _BUG_ID_RE.search(nl_input)
         if bug_match:
             params["bug_id"] = bug_match.group()
 
         # Feature name: word after "feature" or "功能"
-        feature_match = re.search(
-            r"(?:feature|功能)\s+[\"']?(\S+)[\"']?", nl_input, re.IGNORECASE
-        )
+        feature_match = _FEATURE_RE.search(nl_input)
         if feature_match:
-            name = feature_match.group(1).strip("\"'")
-            params["feature_name"] = name
+            params["feature_name"] = feature_match.group(1).strip("\"'")
 
         # Strategy name
-        strategy_match = re.search(
-            r"(?:strategy|策略)\s+[\"']?(\S+)[\"']?",
-            nl_input,
-            re.IGNORECASE,
-        )
+        strategy_match = _STRATEGY_RE.search(nl_input)
         if strategy_match:
             params["strategy_name"] = strategy_match.group(1).strip("\"'")
 
         # Module name: after "module" or "模块"
-        module_match = re.search(
-            r"(?:module|模块)\s+[\"']?(\S+)[\"']?", nl_input, re.IGNORECASE
-        )
+        module_match = _MODULE_RE.search(nl_input)
         if module_match:
             params["target_module"] = module_match.group(1).strip("\"'")
             params["affected_module"] = module_match.group(1).strip("\"'")
 
         return params
 
-    def generate_summary(
-        self, match: TemplateMatch, params: dict[str, Any]
-    ) -> str:
-        """Generate human-readable pipeline summary for CEO review.
-
-        Format:
-            Template: {name} ({id})
-            Parameters:
-              - key: value
-            Confidence: 0.85
-        """
-        lines = [
-            f"Template: {match.description.strip()[:60]} ({match.template_id})",
-            "Parameters:",
-        ]
-        if params:
-            for k, v in params.items():
-                lines.append(f"  - {k}: {v}")
-        else:
-            lines.append("  (none)")
-        lines.append(f"Confidence: {match.confidence}")
-        return "\n".join(lines)
-
-    # --- Private helpers ---
-
     def _load_templates(self) -> None:
         """Scan templates_dir for YAML files and extract metadata."""
         if not self._templates_dir.exists():
             return
 
+        documents: dict[str, str] = {}
         for path in sorted(self._templates_dir.glob("*.yaml")):
             try:
                 data = yaml.safe_load(path.read_text(encoding="utf-8"))
@@ -463,18 +742,102 @@ class NLMatcher:
                     continue
                 pipeline_data = data.get("pipeline", data)
                 template_id = pipeline_data.get("id", path.stem)
+                weight, keywords, param_patterns = self._parse_match_spec(
+                    pipeline_data.get("match"), template_id, path
+                )
                 self._templates[template_id] = {
                     "path": str(path),
                     "name": pipeline_data.get("name", ""),
                     "description": pipeline_data.get("description", ""),
                     "parameters": pipeline_data.get("parameters", []),
+                    "weight": weight,
+                    "keywords": keywords,
+                    "param_patterns": param_patterns,
                 }
+                if self._use_text_index:
+                    documents[template_id] = self._index_text(pipeline_data)
             except Exception:
                 continue
 
+        if self._use_text_index:
+            self._text_index = load_or_build(documents, self._text_index_path)
+
+        self._template_ids = list(self._templates)
+        self._automaton = KeywordAutomaton(
+            kw for meta in self._templates.values() for kw in meta["keywords"]
+        )
+        self._keyword_index = [[] for _ in range(len(self._automaton))]
+        for index, meta in enumerate(self._templates.values()):
+            meta["keyword_ids"] = [self._automaton.keyword_id(kw) for kw in meta["keywords"]]
+            for keyword_id in sorted(set(meta["keyword_ids"])):
+                self._keyword_index[keyword_id].append(index)
+
+    @staticmethod
+    def _parse_match_spec(
+        spec: Any, template_id: str, path: Path
+    ) -> tuple[float, list[str], list[tuple[str, re.Pattern[str]]]]:
+        """Read a template's ``match`` block.
+
+        A template without the block falls back to _KEYWORD_MAP; one
+        with a block but no keywords is never matched by keyword.
+        Invalid parameter patterns are skipped with a warning.
+
+        Returns:
+            (weight, keywords, [(param name, compiled pattern), ...]).
+        """
+        if not isinstance(spec, dict):
+            weight, keywords = _KEYWORD_MAP.get(template_id, (1.0, []))
+            return weight, list(keywords), []
+        keywords = [str(kw) for kw in spec.get("keywords") or [] if str(kw).strip()]
+        try:
+            weight = float(spec.get("weight", 1.0))
+        except (TypeError, ValueError):
+            logger.warning("%s: match.weight must be a number", path)
+            weight = 1.0
+
+        param_patterns: list[tuple[str, re.Pattern[str]]] = []
+        for entry in spec.get("params") or []:
+            if not isinstance(entry, dict) or "name" not in entry or "pattern" not in entry:
+                logger.warning("%s: match.params entries need 'name' and 'pattern'", path)
+                continue
+            flags = re.IGNORECASE if entry.get("ignore_case") else 0
+            try:
+                regex = re.compile(str(entry["pattern"]), flags)
+            except re.error as exc:
+                logger.warning(
+                    "%s: invalid pattern for param %s: %s", path, entry["name"], exc
+                )
+                continue
+            param_patterns.append((str(entry["name"]), regex))
+        return weight, keywords, param_patterns
+
     @staticmethod
-    def _tokenize(text: str) -> set[str]:
-        """Tokenize text into lowercase word tokens (Unicode-aware)."""
-        # Split on whitespace and punctuation, keep Unicode chars
-        tokens = re.findall(r"[\w\u4e00-\u9fff]+", text.lower())
-        return set(tokens)
+    def _index_text(pipeline_data: dict[str, Any]) -> str:
+        """Text the BM25 index ranks a template by."""
+        parts = [pipeline_data.get("name"), pipeline_data.get("description")]
+        for slot in pipeline_data.get("slots") or []:
+            if not isinstance(slot, dict):
+                continue
+            task = slot.get("task")
+            parts.append(slot.get("name"))
+            parts.append(task.get("objective") if isinstance(task, dict) else None)
+        return "\n".join(p for p in parts if isinstance(p, str) and p.strip())
+
+
+# ---------------------------------------------------------------------------
+# Process pool workers (match_many)
+# ---------------------------------------------------------------------------
+
+_worker_matcher: NLMatcher | None = None
+
+
+def _init_worker(matcher: NLMatcher) -> None:
+    """Receive the matcher once per worker process."""
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _match_chunk(texts: list[str]) -> list[list[TemplateMatch]]:
+    if _worker_matcher is None:
+        raise RuntimeError("match_many worker started without a matcher")
+    return [_worker_matcher.match(text) for text in texts]
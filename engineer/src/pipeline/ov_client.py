@@ -0,0 +1,498 @@
+"""OpenViking client: pooled keep-alive HTTP with ``ov`` CLI fallback.
+
+The ``ov`` CLI starts a process per call; building one slot's context
+took N+3 of them (health, abstract, ls, one overview per resource, find).
+:class:`OVClient` instead talks to the server started by
+``scripts/ov-serve.sh`` (port 8686 by default) over a small pool of
+persistent HTTP/1.1 connections, so a whole context build reuses one
+connection.  When the server cannot be reached the same call runs
+through the CLI, and HTTP is retried after *http_retry_after* seconds.
+
+Abstracts and overviews are cached per URI for *content_ttl* seconds,
+and :meth:`OVClient.overviews` fetches up to *pool_size* URIs in
+parallel.  A :class:`CircuitBreaker` tracks whether OpenViking answers
+at all (over either transport): while it is open every operation fails
+fast instead of waiting out its timeout, and after *reset_timeout* one
+call probes the server again.
+
+Server routes are listed in ``_ROUTES``; responses may be bare JSON or
+wrapped as ``{"status": "ok", "result": ...}``.  A route the server
+answers with 404, 405 or 501 is taken as unsupported: that operation
+runs through the CLI, and HTTP is tried again after *http_retry_after*.
+
+Only depends on stdlib (http.client, subprocess, json).  No external
+Python packages (Constitution §2.2); the CLI runs without ``shell=True``
+(Constitution §6.2).
+
+Usage:
+    client = OVClient()                     # http://127.0.0.1:8686
+    if client.health():
+        texts = client.overviews([f"{ns}/pipeline", f"{ns}/specs"])
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+from pipeline.circuit_breaker import CircuitBreaker
+from pipeline.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_OV_TIMEOUT = 30  # seconds per call (HTTP request or CLI process)
+_DEFAULT_PORT = 8686  # scripts/ov-serve.sh
+
+# Command -> (HTTP method, path) on the OV server
+_ROUTES: dict[str, tuple[str, str]] = {
+    "health": ("GET", "/health"),
+    "abstract": ("GET", "/api/v1/content/abstract"),
+    "overview": ("GET", "/api/v1/content/overview"),
+    "ls": ("GET", "/api/v1/fs/ls"),
+    "find": ("POST", "/api/v1/search/find"),
+    "relations": ("GET", "/api/v1/relations"),
+}
+
+# Statuses meaning the server has no such route: use the CLI instead
+_ROUTE_UNSUPPORTED = frozenset({404, 405, 501})
+
+
+def default_base_url() -> str:
+    """Server URL from ``OV_URL``, else localhost on ``OV_PORT`` (8686)."""
+    url = os.environ.get("OV_URL")
+    if url is not None:
+        return url
+    return f"http://127.0.0.1:{os.environ.get('OV_PORT', _DEFAULT_PORT)}"
+
+
+class _ServerUnreachable(Exception):
+    """The server is unreachable or lacks the route; use the CLI instead."""
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP connections to one host.
+
+    Connections are returned to the pool after each complete response
+    and reused by the next request.  A request on a reused connection
+    that the server has meanwhile closed is retried once on a new one.
+    """
+
+    def __init__(self, host: str, port: int, *, timeout: float, size: int = 4) -> None:
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._size = size
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, str, bytes]:
+        """Send one request.
+
+        Returns:
+            (status, content type, body).
+
+        Raises:
+            OSError, http.client.HTTPException: The request failed.
+        """
+        conn, reused = self._acquire()
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            data = response.read()
+        except (ConnectionError, http.client.BadStatusLine):
+            conn.close()
+            if not reused:
+                raise
+            # Stale keep-alive connection: retry once on a fresh one
+            return self._fresh_request(method, path, body, headers)
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn, response)
+        return response.status, response.getheader("Content-Type", ""), data
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    # --- Private helpers ---
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+            self.connections_opened += 1
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout), False
+
+    def _release(
+        self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse
+    ) -> None:
+        if response.will_close:
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < self._size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _fresh_request(
+        self, method: str, path: str, body: bytes | None, headers: dict[str, str] | None
+    ) -> tuple[int, str, bytes]:
+        with self._lock:
+            self.connections_opened += 1
+        conn = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            data = response.read()
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn, response)
+        return response.status, response.getheader("Content-Type", ""), data
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class OVClient:
+    """OpenViking operations over pooled HTTP, falling back to the ``ov`` CLI.
+
+    Every operation returns ``None`` (or False for :meth:`health`) on
+    failure, like :class:`OVContextRouter`, and immediately while
+    :attr:`breaker` is open.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        ov_binary: str = "ov",
+        timeout: float = _OV_TIMEOUT,
+        pool_size: int = 4,
+        http_retry_after: float = 30.0,
+        content_ttl: float = 300.0,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        """
+        Args:
+            base_url: OV server URL.  Defaults to default_base_url(); an
+                empty string disables HTTP (CLI only).
+            ov_binary: CLI used when the server is unreachable.
+            timeout: Seconds per HTTP request or CLI process.
+            pool_size: Idle keep-alive connections kept, and the number
+                of overviews fetched in parallel.
+            http_retry_after: Seconds to use only the CLI after the
+                server was unreachable.
+            content_ttl: Seconds abstracts and overviews stay cached
+                (``0`` disables the cache).
+            breaker: Availability breaker; defaults to a new
+                CircuitBreaker().
+        """
+        self._ov = ov_binary
+        self._timeout = timeout
+        self._retry_after = http_retry_after
+        self._parallel = max(1, pool_size)
+        self._pool: ConnectionPool | None = None
+        base_url = default_base_url() if base_url is None else base_url
+        if base_url:
+            parts = urlsplit(base_url)
+            if parts.scheme != "http" or not parts.hostname:
+                raise ValueError(f"Unsupported OV server URL: {base_url!r}")
+            self._prefix = parts.path.rstrip("/")
+            self._pool = ConnectionPool(
+                parts.hostname, parts.port or 80, timeout=timeout, size=pool_size
+            )
+        self._http_down_until = 0.0
+        # Command -> monotonic time until which its route is not tried
+        self._route_missing_until: dict[str, float] = {}
+        self._content = TTLCache(content_ttl)
+        self.breaker = breaker or CircuitBreaker()
+        # Set when the CLI binary is missing
+        self.cli_missing = False
+        # Calls served per transport
+        self.calls = {"http": 0, "cli": 0}
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        return self._pool
+
+    def close(self) -> None:
+        """Close pooled connections (the client stays usable)."""
+        if self._pool is not None:
+            self._pool.close()
+
+    def __enter__(self) -> OVClient:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # --- Operations ---
+
+    def health(self) -> bool:
+        """Whether the OV server is up (via HTTP, else ``ov health``)."""
+        return self.check_health() is True
+
+    def check_health(self) -> bool | None:
+        """Like :meth:`health`, but None when the breaker refused the call.
+
+        The breaker refuses while it is open, and while another caller's
+        half-open probe is in flight; neither says the server is down.
+        """
+        if not self.breaker.allow():
+            return None
+        try:
+            return self._http("health") is not None
+        except _ServerUnreachable:
+            return self.run_cli(["health"]) is not None
+
+    def abstract(self, uri: str) -> str | None:
+        """L0 abstract of *uri*."""
+        return self._text("abstract", uri)
+
+    def overview(self, uri: str) -> str | None:
+        """L1 overview of *uri*."""
+        return self._text("overview", uri)
+
+    def overviews(self, uris: Iterable[str]) -> dict[str, str | None]:
+        """Overviews of several URIs, up to *pool_size* fetched in parallel.
+
+        Returns:
+            URI -> overview text (None where it failed), in input order.
+        """
+        uris = list(dict.fromkeys(uris))
+        texts = {uri: self._content.get(f"overview\n{uri}") for uri in uris}
+        missing = [uri for uri, text in texts.items() if text is None]
+        if len(missing) == 1:
+            texts[missing[0]] = self.overview(missing[0])
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(self._parallel, len(missing))) as pool:
+                texts.update(zip(missing, pool.map(self.overview, missing)))
+        return texts
+
+    def ls(self, uri: str) -> list[str] | None:
+        """Names (or URIs) of the resources directly under *uri*."""
+        if not self.breaker.allow():
+            return None
+        try:
+            data = self._http("ls", params={"uri": uri, "simple": "true"})
+        except _ServerUnreachable:
+            output = self.run_cli(["ls", uri, "-s"])
+            if output is None:
+                return None
+            return [line.strip() for line in output.splitlines() if line.strip()]
+        if data is None:
+            return None
+        if isinstance(data, dict):
+            data = data.get("entries", data.get("children", []))
+        if not isinstance(data, list):
+            return None
+        names = []
+        for entry in data:
+            name = entry.get("uri", entry.get("name")) if isinstance(entry, dict) else entry
+            if name:
+                names.append(str(name))
+        return names
+
+    def find(self, query: str, *, uri: str, limit: int = 10) -> list[dict[str, Any]] | None:
+        """Semantic search below *uri*.
+
+        Returns:
+            Result entries (dicts with ``uri``, ``score``, ...).
+        """
+        if not self.breaker.allow():
+            return None
+        try:
+            data = self._http(
+                "find", body={"query": query, "target_uri": uri, "limit": limit}
+            )
+        except _ServerUnreachable:
+            output = self.run_cli(
+                ["find", query, "--uri", uri, "--limit", str(limit), "-o", "json"]
+            )
+            data = _parse_json(output)
+        return _entries(data, "results")
+
+    def relations(self, uri: str) -> list[Any] | None:
+        """Relations of *uri* (dicts with ``uri`` or plain URIs)."""
+        if not self.breaker.allow():
+            return None
+        try:
+            data = self._http("relations", params={"uri": uri})
+        except _ServerUnreachable:
+            data = _parse_json(self.run_cli(["relations", uri, "-o", "json"]))
+        return _entries(data, "relations")
+
+    def run_cli(self, args: list[str]) -> str | None:
+        """Execute an ``ov`` CLI command.
+
+        Uses explicit argument list (no ``shell=True``) per Constitution
+        §6.2.  Returns stdout on success, ``None`` on any failure.  The
+        outcome is reported to :attr:`breaker`: a zero exit status counts
+        as OpenViking answering; a nonzero one (``ov`` exits nonzero when
+        the server is down), a timeout or a crash as a failure; and a
+        missing binary opens the circuit.
+        """
+        self.calls["cli"] += 1
+        try:
+            result = subprocess.run(
+                [self._ov, *args],
+                capture_output=True,
+                text=True,
+                timeout=self._timeout,
+            )
+            if result.returncode == 0:
+                self.breaker.record_success()
+                return result.stdout
+            logger.debug(
+                "ov %s failed (rc=%d): %s",
+                args[0] if args else "?",
+                result.returncode,
+                result.stderr[:200],
+            )
+            self.breaker.record_failure()
+            return None
+        except FileNotFoundError:
+            logger.debug("ov binary not found at %s", self._ov)
+            self.cli_missing = True
+            self.breaker.trip()
+            return None
+        except subprocess.TimeoutExpired:
+            logger.debug("ov %s timed out after %ss", args[0] if args else "?", self._timeout)
+            self.breaker.record_failure()
+            return None
+        except Exception:
+            logger.debug("ov call failed", exc_info=True)
+            self.breaker.record_failure()
+            return None
+
+    # --- Private helpers ---
+
+    def _text(self, command: str, uri: str) -> str | None:
+        key = f"{command}\n{uri}"
+        text = self._content.get(key)
+        if text is not None:
+            return text
+        if not self.breaker.allow():
+            return None
+        try:
+            data = self._http(command, params={"uri": uri})
+        except _ServerUnreachable:
+            data = self.run_cli([command, uri])
+        if isinstance(data, dict):
+            data = data.get("content", data.get("text"))
+        if not isinstance(data, str):
+            return None
+        self._content.put(key, data)
+        return data
+
+    def _http(
+        self,
+        command: str,
+        *,
+        params: dict[str, str] | None = None,
+        body: dict[str, Any] | None = None,
+    ) -> Any:
+        """Call *command* on the server.
+
+        The outcome is reported to :attr:`breaker`: a 5xx status counts
+        as a failure; a 2xx or another 4xx (the server handled the
+        request) as a success.
+
+        Returns:
+            The decoded result, or None if the server answered with an
+            error status or an unreadable body.
+
+        Raises:
+            _ServerUnreachable: HTTP is disabled, cooling down after a
+                failure, the request failed at the connection level, or
+                the server does not support *command*'s route.
+        """
+        now = time.monotonic()
+        if (
+            self._pool is None
+            or now < self._http_down_until
+            or now < self._route_missing_until.get(command, 0.0)
+        ):
+            raise _ServerUnreachable
+        method, path = _ROUTES[command]
+        path = self._prefix + path
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Accept": "application/json"}
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+        try:
+            status, content_type, data = self._pool.request(method, path, payload, headers)
+        except (OSError, http.client.HTTPException) as exc:
+            logger.debug("OV server unreachable (%s), using the CLI", exc)
+            self._http_down_until = time.monotonic() + self._retry_after
+            raise _ServerUnreachable from exc
+        self.calls["http"] += 1
+        if status in _ROUTE_UNSUPPORTED:
+            logger.debug("OV server has no %s route (HTTP %d), using the CLI", command, status)
+            self._route_missing_until[command] = time.monotonic() + self._retry_after
+            raise _ServerUnreachable
+        if status >= 500:
+            logger.debug("OV %s returned HTTP %d", command, status)
+            self.breaker.record_failure()
+            return None
+        self.breaker.record_success()
+        if not 200 <= status < 300:
+            logger.debug("OV %s returned HTTP %d", command, status)
+            return None
+        text = data.decode("utf-8", errors="replace")
+        if "json" not in content_type:
+            return text
+        decoded = _parse_json(text)
+        if isinstance(decoded, dict) and "result" in decoded:
+            if decoded.get("status", "ok") != "ok":
+                return None
+            return decoded["result"]
+        return decoded
+
+
+def _parse_json(text: str | None) -> Any:
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        logger.debug("Failed to parse OV JSON output", exc_info=True)
+        return None
+
+
+def _entries(data: Any, key: str) -> list[Any] | None:
+    """A list response, or the list under *key* of an object response."""
+    if isinstance(data, dict):
+        data = data.get(key)
+    return data if isinstance(data, list) else None
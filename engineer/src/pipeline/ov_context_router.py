@@ -1,34 +1,41 @@
 """OpenViking-backed context router for slot-aware context loading.
 
-Delegates to the ``ov`` CLI for L0/L1/L2 context retrieval and semantic
-search.  Falls back gracefully when OpenViking is unavailable — every
+Delegates to OpenViking for L0/L1/L2 context retrieval and semantic
+search through :class:`OVClient` -- one pooled keep-alive HTTP
+connection to the OV server, or the ``ov`` CLI when the server is not
+reachable.  Falls back gracefully when OpenViking is unavailable — every
 public method returns ``None`` on failure so the caller can use the
 standard file-scan ContextRouter.
 
-Only depends on stdlib (subprocess, json, logging) + pipeline.models.
+Availability is tracked by the client's circuit breaker rather than
+decided once: while OpenViking keeps failing the router reports itself
+unavailable without waiting on it, and re-checks ``health`` once the
+breaker lets a probe through.
+
+Only depends on stdlib + pipeline.models, pipeline.circuit_breaker,
+pipeline.ov_client and pipeline.token_estimator.
 No external Python packages (Constitution §2.2).
 """
 
 from __future__ import annotations
 
-import json
 import logging
-import subprocess
-from typing import Any
+from collections.abc import Callable
 
+from pipeline.circuit_breaker import BreakerState, CircuitBreaker
 from pipeline.models import ContextItem, ContextTier
+from pipeline.ov_client import OVClient
+from pipeline.token_estimator import estimate_tokens as _default_estimate
 
 logger = logging.getLogger(__name__)
 
-_OV_TIMEOUT = 30  # seconds per CLI call
-
 
 class OVContextRouter:
-    """Context router backed by the OpenViking CLI.
+    """Context router backed by OpenViking.
 
-    All ``ov`` calls are wrapped in try/except and return ``None`` on
-    failure.  The caller should fall back to :class:`ContextRouter` when
-    this router is unavailable or returns ``None``.
+    All OV calls return ``None`` on failure.  The caller should fall back
+    to :class:`ContextRouter` when this router is unavailable or returns
+    ``None``.
     """
 
     def __init__(
@@ -37,18 +44,58 @@ class OVContextRouter:
         *,
         ov_binary: str = "ov",
         ov_namespace: str = "viking://agent-orchestrator",
+        ov_url: str | None = None,
+        client: OVClient | None = None,
+        cache_ttl: float = 300.0,
+        max_parallel: int = 4,
+        estimate_tokens: Callable[[str], int] = _default_estimate,
     ) -> None:
+        """
+        Args:
+            project_root: Project root directory.
+            ov_binary: ``ov`` CLI, used when the server is unreachable.
+            ov_namespace: OpenViking namespace of this project.
+            ov_url: OV server URL (see ov_client.default_base_url).
+            client: Shared client; overrides *ov_binary*, *ov_url*,
+                *cache_ttl* and *max_parallel*.
+            cache_ttl: Seconds abstracts and overviews stay cached.
+            max_parallel: Overviews fetched concurrently.
+            estimate_tokens: Token estimate of retrieved text.  Defaults
+                to token_estimator.estimate_tokens (approximate default
+                rates).
+        """
         self._project_root = project_root
-        self._ov = ov_binary
         self._namespace = ov_namespace
-        self._available: bool | None = None  # lazy check
+        self._estimate = estimate_tokens
+        self._client = client or OVClient(
+            ov_url, ov_binary=ov_binary, pool_size=max_parallel, content_ttl=cache_ttl
+        )
+        self._healthy = False  # health confirmed since the breaker last closed
+
+    @property
+    def client(self) -> OVClient:
+        return self._client
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._client.breaker
 
     @property
     def is_available(self) -> bool:
-        """Check if ov CLI is reachable and server is running."""
-        if self._available is None:
-            self._available = self._run_ov(["health"]) is not None
-        return self._available
+        """Check if the OV server is reachable (over HTTP or the CLI).
+
+        ``health`` is called on first use and whenever the breaker
+        half-opens; a failed check opens the breaker.  A check the
+        breaker refused (open, or another caller is probing) leaves it
+        as it is.
+        """
+        if self._healthy and self.breaker.state is BreakerState.CLOSED:
+            return True
+        healthy = self._client.check_health()
+        self._healthy = healthy is True
+        if healthy is False and self.breaker.state is not BreakerState.OPEN:
+            self.breaker.trip()
+        return self._healthy
 
     def build_context(
         self,
@@ -76,9 +123,9 @@ class OVContextRouter:
         used_tokens = 0
 
         # 1. L0 — namespace abstract
-        abstract_text = self._run_ov(["abstract", self._namespace])
+        abstract_text = self._client.abstract(self._namespace)
         if abstract_text:
-            tokens = len(abstract_text) // 4
+            tokens = self._estimate(abstract_text)
             if used_tokens + tokens <= max_tokens:
                 items.append(ContextItem(
                     path=f"{self._namespace}/",
@@ -88,21 +135,20 @@ class OVContextRouter:
                 ))
                 used_tokens += tokens
 
-        # 2. L1 — overview of relevant sub-resources
-        ls_output = self._run_ov(["ls", self._namespace, "-s"])
-        if ls_output:
-            for line in ls_output.strip().splitlines():
-                resource = line.strip()
-                if not resource:
-                    continue
-                uri = (
-                    f"{self._namespace}/{resource}"
-                    if not resource.startswith("viking://")
-                    else resource
-                )
-                overview_text = self._run_ov(["overview", uri])
+        # 2. L1 — overview of relevant sub-resources, fetched in parallel
+        # (and served from the client's cache when fresh)
+        uris = [
+            f"{self._namespace}/{resource}"
+            if not resource.startswith("viking://")
+            else resource
+            for resource in self._client.ls(self._namespace) or []
+        ]
+        if uris:
+            overviews = self._client.overviews(uris)
+            for uri in uris:
+                overview_text = overviews[uri]
                 if overview_text:
-                    tokens = len(overview_text) // 4
+                    tokens = self._estimate(overview_text)
                     if used_tokens + tokens <= max_tokens:
                         items.append(ContextItem(
                             path=uri,
@@ -136,31 +182,24 @@ class OVContextRouter:
         if not self.is_available:
             return []
 
-        output = self._run_ov([
-            "find", query,
-            "--uri", self._namespace,
-            "--limit", str(limit),
-            "-o", "json",
-        ])
-        if not output:
+        results = self._client.find(query, uri=self._namespace, limit=limit)
+        if not results:
             return []
 
         items: list[ContextItem] = []
         try:
-            data = json.loads(output)
-            results = data if isinstance(data, list) else data.get("results", [])
             for entry in results:
                 path = entry.get("uri", entry.get("path", "unknown"))
                 score = float(entry.get("score", entry.get("relevance", 0.5)))
                 content = entry.get("content", "")
-                tokens = len(content) // 4 if content else 200
+                tokens = self._estimate(content) if content else 200
                 items.append(ContextItem(
                     path=str(path),
                     tier=ContextTier.L1,
                     relevance=min(score, 1.0),
                     tokens_estimate=tokens,
                 ))
-        except (json.JSONDecodeError, TypeError, KeyError, ValueError):
+        except (AttributeError, TypeError, KeyError, ValueError):
             logger.debug("Failed to parse ov find output", exc_info=True)
 
         return items
@@ -171,48 +210,7 @@ class OVContextRouter:
         Returns:
             List of related URIs, or empty list on failure.
         """
-        output = self._run_ov(["relations", uri, "-o", "json"])
-        if not output:
-            return []
-        try:
-            data = json.loads(output)
-            if isinstance(data, list):
-                return [str(r.get("uri", r)) for r in data]
-            return [str(r.get("uri", r)) for r in data.get("relations", [])]
-        except (json.JSONDecodeError, TypeError, KeyError):
+        data = self._client.relations(uri)
+        if not data:
             return []
-
-    # --- Private helpers ---
-
-    def _run_ov(self, args: list[str]) -> str | None:
-        """Execute an ``ov`` CLI command.
-
-        Uses explicit argument list (no ``shell=True``) per Constitution
-        §6.2.  Returns stdout on success, ``None`` on any failure.
-        """
-        try:
-            result = subprocess.run(
-                [self._ov, *args],
-                capture_output=True,
-                text=True,
-                timeout=_OV_TIMEOUT,
-            )
-            if result.returncode == 0:
-                return result.stdout
-            logger.debug(
-                "ov %s failed (rc=%d): %s",
-                args[0] if args else "?",
-                result.returncode,
-                result.stderr[:200],
-            )
-            return None
-        except FileNotFoundError:
-            logger.debug("ov binary not found at %s", self._ov)
-            self._available = False
-            return None
-        except subprocess.TimeoutExpired:
-            logger.debug("ov %s timed out after %ds", args[0] if args else "?", _OV_TIMEOUT)
-            return None
-        except Exception:
-            logger.debug("ov call failed", exc_info=True)
-            return None
+        return [str(r.get("uri", r)) if isinstance(r, dict) else str(r) for r in data]
@@ -0,0 +1,230 @@
+"""Lightweight per-stage timing instrumentation for the pipeline engine.
+
+A :class:`PhaseProfiler` records ``time.perf_counter_ns`` spans around
+named internal stages (loading, validation, gate checks, state saves,
+observer dispatch, ...) and aggregates them per stage.  When disabled,
+``span()`` returns a shared no-op context manager, so instrumented code
+pays one attribute lookup and one branch per stage.
+
+For whole-call diagnosis, :func:`collapse_stats` turns cProfile output
+into collapsed stacks (``frame;frame;frame weight``), the input format
+of flamegraph.pl / speedscope.
+
+Only depends on stdlib (time, threading, dataclasses, pstats).
+"""
+
+from __future__ import annotations
+
+import pstats
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Collapsed-stack reconstruction limits: deeper paths and paths carrying
+# less than one microsecond of self time are dropped.
+_MAX_STACK_DEPTH = 64
+_MIN_WEIGHT_SECONDS = 1e-6
+
+
+@dataclass
+class PhaseStats:
+    """Aggregated timings for a single named stage."""
+
+    name: str
+    count: int = 0
+    total_ns: int = 0
+    min_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def add(self, elapsed_ns: int) -> None:
+        if self.count == 0 or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.mean_ns / 1e6,
+            "min_ms": self.min_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+class _NullSpan:
+    """No-op context manager returned while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Times one execution of a stage and reports it to the profiler."""
+
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: PhaseProfiler, name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._start = 0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, *exc: object) -> bool:
+        self._profiler.record(self._name, time.perf_counter_ns() - self._start)
+        return False
+
+
+class PhaseProfiler:
+    """Toggleable per-stage timing aggregator.
+
+    Usage:
+        profiler = PhaseProfiler(enabled=True)
+        with profiler.span("load"):
+            ...
+        print(profiler.format_table())
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._stats: dict[str, PhaseStats] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str) -> _Span | _NullSpan:
+        """Return a context manager timing the stage *name*."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        """Add one measured execution of stage *name*."""
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = PhaseStats(name)
+            stats.add(elapsed_ns)
+
+    def reset(self) -> None:
+        """Discard all recorded timings."""
+        with self._lock:
+            self._stats = {}
+
+    def get_profile(self) -> dict[str, dict[str, Any]]:
+        """Aggregated timings keyed by stage name, in first-seen order."""
+        with self._lock:
+            return {name: s.to_dict() for name, s in self._stats.items()}
+
+    def format_table(self) -> str:
+        """Human-readable table of stage timings, slowest total first."""
+        with self._lock:
+            rows = sorted(
+                self._stats.values(), key=lambda s: s.total_ns, reverse=True
+            )
+        if not rows:
+            return "No stage timings recorded."
+        width = max(len("stage"), *(len(s.name) for s in rows))
+        lines = [
+            f"{'stage':<{width}}  {'count':>5}  {'total ms':>10}  "
+            f"{'mean ms':>9}  {'max ms':>9}",
+        ]
+        for s in rows:
+            lines.append(
+                f"{s.name:<{width}}  {s.count:>5}  {s.total_ns / 1e6:>10.3f}  "
+                f"{s.mean_ns / 1e6:>9.3f}  {s.max_ns / 1e6:>9.3f}"
+            )
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# cProfile -> collapsed stacks
+# ---------------------------------------------------------------------------
+
+
+def _frame_label(func: tuple[str, int, str]) -> str:
+    """Format a pstats function key as ``file.py:name:line``."""
+    filename, lineno, name = func
+    if filename == "~":  # built-in
+        label = name
+    else:
+        label = f"{Path(filename).name}:{name}:{lineno}"
+    return label.replace(";", ":")
+
+
+def collapse_stats(stats: pstats.Stats) -> list[str]:
+    """Reconstruct collapsed stacks from cProfile caller/callee data.
+
+    cProfile only records caller -> callee edges, not full stacks, so
+    each function's self time is distributed over its call paths in
+    proportion to the cumulative time of every edge on the path.
+    Recursive edges are cut at the first repeat.
+
+    Returns:
+        Lines of the form ``root;child;leaf <microseconds>``, sorted.
+    """
+    raw: dict[Any, tuple] = stats.stats  # type: ignore[attr-defined]
+    children: dict[Any, list[tuple[Any, float]]] = {}
+    for callee, (_cc, _nc, _tt, _ct, callers) in raw.items():
+        for caller, edge in callers.items():
+            edge_ct = edge[3] if isinstance(edge, tuple) else 0.0
+            children.setdefault(caller, []).append((callee, edge_ct))
+
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    weights: dict[str, float] = {}
+
+    def visit(func: Any, path: list[Any], scale: float) -> None:
+        self_time = raw[func][2] * scale
+        if self_time >= _MIN_WEIGHT_SECONDS:
+            key = ";".join(_frame_label(f) for f in path)
+            weights[key] = weights.get(key, 0.0) + self_time
+        if len(path) >= _MAX_STACK_DEPTH:
+            return
+        for child, edge_ct in children.get(func, []):
+            if child in path:
+                continue
+            child_ct = raw[child][3]
+            if child_ct <= 0 or edge_ct <= 0:
+                continue
+            child_scale = scale * edge_ct / child_ct
+            if child_ct * child_scale < _MIN_WEIGHT_SECONDS:
+                continue
+            path.append(child)
+            visit(child, path, child_scale)
+            path.pop()
+
+    for root in roots:
+        visit(root, [root], 1.0)
+
+    return sorted(
+        f"{stack} {round(seconds * 1e6)}"
+        for stack, seconds in weights.items()
+        if round(seconds * 1e6) > 0
+    )
+
+
+def write_collapsed_stacks(stats: pstats.Stats, path: str | Path) -> int:
+    """Write :func:`collapse_stats` output to *path*.
+
+    Returns:
+        Number of stack lines written.
+    """
+    lines = collapse_stats(stats)
+    Path(path).write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+    return len(lines)
@@ -1,20 +1,25 @@
 """Pipeline orchestration engine.
 
 Coordinates loader, validator, state tracker, slot registry, and gate
-checker to execute a pipeline DAG step by step.  The runner is the only
-module that instantiates and wires together all other modules.
+checker to execute a pipeline DAG step by step.  The runner wires these
+modules together; the shared ones come from a Components container
+(see pipeline.components), so runners, boot() and the CLI reuse them.
 """
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from pipeline.components import Components
+from pipeline.context_pack import BlockStore, write_manifest
 from pipeline.context_router import ContextRouter
-from pipeline.gate_checker import GateChecker
-from pipeline.loader import PipelineLoader
 from pipeline.models import (
+    ContextItem,
     Pipeline,
     PipelineObserver,
     PipelineState,
@@ -22,17 +27,37 @@ from pipeline.models import (
     Slot,
     SlotStatus,
 )
-from pipeline.slot_registry import SlotRegistry
+from pipeline.profiling import PhaseProfiler
 from pipeline.state import PipelineStateTracker
-from pipeline.validator import PipelineValidator
+from pipeline.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Context pack block store, in the state directory
+CONTEXT_BLOCKS_DIRNAME = "context-blocks"
+
+# Memoized context plans, in the state directory
+CONTEXT_PLANS_FILENAME = ".context-plans.json"
+CONTEXT_PLANS_TTL = 7 * 24 * 3600
+CONTEXT_PLANS_MAX_ENTRIES = 512
+
 
 class PipelineExecutionError(Exception):
     """Raised on unrecoverable pipeline execution errors."""
 
 
+@dataclass
+class _PrefetchedContext:
+    """Slot context built by prefetch_context(), ahead of begin_slot()."""
+
+    # ContextRouter.context_fingerprint() before the build
+    fingerprint: str
+    items: list[ContextItem]
+    context_yaml: str
+    # Manifest entries of the items' stored blocks (None without packs)
+    pack_entries: list[dict[str, Any]] | None
+
+
 class PipelineRunner:
     """Top-level pipeline orchestration engine.
 
@@ -58,39 +83,127 @@ class PipelineRunner:
         use_openviking: bool = False,
         ov_binary: str = "ov",
         ov_namespace: str = "viking://agent-orchestrator",
+        profiler: PhaseProfiler | None = None,
+        components: Components | None = None,
+        context_selection: str = "greedy",
+        context_text_index: bool = False,
+        context_packs: bool = False,
+        context_plans: bool = False,
     ) -> None:
+        """
+        Args:
+            components: Shared loader, validator, registry, gate checker
+                and pipeline cache.  Defaults to a private container for
+                the given directories.
+            context_selection: ContextRouter file-scan selection
+                ("greedy" or "knapsack").
+            context_text_index: Rank project files against each slot's
+                task with ContextRouter's offline BM25 index.
+            context_packs: Also materialize each slot's context as a
+                pack (``<pipeline>-<slot>-context.pack.json``) whose
+                contents are deduplicated in ``context-blocks/`` under
+                the state directory.  prepare() compacts that store to
+                the blocks the existing packs reference.
+            context_plans: Memoize ContextRouter's context plans in
+                ``.context-plans.json`` under the state directory, shared
+                by runners with the same components: slots of the same
+                type and task are planned once, across runs too.
+        """
         self._project_root = project_root
-        self._loader = PipelineLoader()
-        self._validator = PipelineValidator(project_root)
+        self._profiler = profiler if profiler is not None else PhaseProfiler()
+        if components is None:
+            components = Components(
+                project_root,
+                templates_dir=templates_dir,
+                state_dir=state_dir,
+                slot_types_dir=slot_types_dir,
+                agents_dir=agents_dir,
+            )
+        self._components = components
+        self._loader = components.loader
+        self._validator = components.validator
+        # Relative directories resolve against project_root, as they do in
+        # Components, so state lives next to the registry cache.
+        state_dir = components.state_dir
         self._state_tracker = PipelineStateTracker(state_dir)
-        self._registry = SlotRegistry(slot_types_dir, agents_dir)
-        self._gate_checker = GateChecker(project_root)
+        self._registry = components.registry
+        self._gate_checker = components.gate_checker
         self._observers: list[PipelineObserver] = observers or []
+        # Resolved pipelines keyed by (path, mtime_ns, size, params).
+        # Runners sharing components reuse them: a runner never mutates a
+        # resolved pipeline (Pipeline and Slot are not frozen; see
+        # TestResume.test_lifecycle_leaves_cached_pipeline_unchanged).
+        self._pipeline_cache = components.pipeline_cache
         self._context_router: ContextRouter | None = None
         if constitution_path is not None:
+            plan_cache: TTLCache | None = None
+            if context_plans:
+                plans_path = Path(state_dir) / CONTEXT_PLANS_FILENAME
+                plan_cache = components.get(
+                    f"context_plans:{plans_path}",
+                    lambda: TTLCache(
+                        CONTEXT_PLANS_TTL,
+                        path=plans_path,
+                        max_entries=CONTEXT_PLANS_MAX_ENTRIES,
+                    ),
+                )
             self._context_router = ContextRouter(
                 project_root,
                 constitution_path,
                 use_openviking=use_openviking,
                 ov_binary=ov_binary,
                 ov_namespace=ov_namespace,
+                file_cache=components.file_cache,
+                selection=context_selection,
+                use_text_index=context_text_index,
+                plan_cache=plan_cache,
             )
+        # (pipeline_id, slot_id) -> context built by prefetch_context(),
+        # used by begin_slot() while its fingerprint is unchanged
+        self._prefetched_context: dict[tuple[str, str], _PrefetchedContext] = {}
+        self._block_store: BlockStore | None = None
+        if context_packs:
+            self._block_store = BlockStore(Path(state_dir) / CONTEXT_BLOCKS_DIRNAME)
+
+    @property
+    def components(self) -> Components:
+        """Shared components this runner was built from."""
+        return self._components
 
     def add_observer(self, observer: PipelineObserver) -> None:
         """Register an observer for pipeline events."""
         self._observers.append(observer)
 
+    # --- Profiling ---
+
+    @property
+    def profiler(self) -> PhaseProfiler:
+        """Per-stage timing profiler.  Toggle with ``profiler.enabled``."""
+        return self._profiler
+
+    def get_profile(self) -> dict[str, dict[str, Any]]:
+        """Aggregated per-stage timings (empty while profiling is off).
+
+        Stages: ``prepare`` / ``begin_slot`` / ``complete_slot`` totals,
+        plus ``load``, ``validate``, ``registry_load``,
+        ``slot_type_check``, ``state_init``, ``gate_check``,
+        ``context_routing``, ``context_prefetch``, ``state_save`` and
+        ``observer_dispatch``.
+        """
+        return self._profiler.get_profile()
+
     def _notify(self, method: str, *args: Any, **kwargs: Any) -> None:
         """Dispatch an event to all observers.  Never raises."""
-        for obs in self._observers:
-            try:
-                getattr(obs, method)(*args, **kwargs)
-            except Exception:
-                logger.warning(
-                    "Observer %s.%s failed",
-                    type(obs).__name__, method,
-                    exc_info=True,
-                )
+        with self._profiler.span("observer_dispatch"):
+            for obs in self._observers:
+                try:
+                    getattr(obs, method)(*args, **kwargs)
+                except Exception:
+                    logger.warning(
+                        "Observer %s.%s failed",
+                        type(obs).__name__, method,
+                        exc_info=True,
+                    )
 
     # --- Core lifecycle ---
 
@@ -113,26 +226,37 @@ class PipelineRunner:
             PipelineParameterError: Parameter resolution failed.
             PipelineExecutionError: Validation failed.
         """
-        pipeline = self._loader.load_and_resolve(yaml_path, params)
-
-        result = self._validator.validate(pipeline)
-        if not result.is_valid:
-            raise PipelineExecutionError(
-                f"Pipeline validation failed: {'; '.join(result.errors)}"
-            )
+        with self._profiler.span("prepare"):
+            with self._profiler.span("load"):
+                pipeline = self._load_pipeline(yaml_path, params)
+
+            with self._profiler.span("validate"):
+                result = self._validator.validate(pipeline)
+            if not result.is_valid:
+                raise PipelineExecutionError(
+                    f"Pipeline validation failed: {'; '.join(result.errors)}"
+                )
 
-        # Slot type check -- non-fatal (warn only)
-        self._registry.load_slot_types()
-        slot_type_errors = self._validator.check_slot_types(
-            pipeline, self._registry
-        )
-        if slot_type_errors:
-            raise PipelineExecutionError(
-                f"Slot type validation failed: {'; '.join(slot_type_errors)}"
-            )
+            # Slot type check -- non-fatal (warn only)
+            with self._profiler.span("registry_load"):
+                self._registry.load_slot_types()
+            with self._profiler.span("slot_type_check"):
+                slot_type_errors = self._validator.check_slot_types(
+                    pipeline, self._registry
+                )
+            if slot_type_errors:
+                raise PipelineExecutionError(
+                    f"Slot type validation failed: {'; '.join(slot_type_errors)}"
+                )
 
-        state = self._state_tracker.init_state(pipeline, params, yaml_path=yaml_path)
-        return pipeline, state
+            with self._profiler.span("state_init"):
+                state = self._state_tracker.init_state(
+                    pipeline, params, yaml_path=yaml_path
+                )
+            if self._block_store is not None:
+                with self._profiler.span("context_compact"):
+                    self._compact_context_blocks()
+            return pipeline, state
 
     def get_next_slots(
         self, pipeline: Pipeline, state: PipelineState
@@ -168,78 +292,67 @@ class PipelineRunner:
         Returns:
             Updated PipelineState.
         """
-        pre_results = self._gate_checker.check_pre_conditions(slot, state)
-        self._notify(
-            "on_gate_check_completed",
-            state.pipeline_id, slot.id, "pre", pre_results,
-        )
-
-        if self._gate_checker.all_passed(pre_results):
-            # Update pipeline status to RUNNING if not already
-            old_status = state.status
-            if state.status != PipelineStatus.RUNNING:
-                state = self._state_tracker.update_pipeline_status(
-                    state, PipelineStatus.RUNNING
-                )
-                self._notify(
-                    "on_status_changed",
-                    state.pipeline_id, old_status, state.status,
-                )
-                self._notify(
-                    "on_pipeline_started", state.pipeline_id, state,
-                )
+        with self._profiler.span("begin_slot"):
+            with self._profiler.span("gate_check"):
+                pre_results = self._gate_checker.check_pre_conditions(slot, state)
+            self._notify(
+                "on_gate_check_completed",
+                state.pipeline_id, slot.id, "pre", pre_results,
+            )
 
-            # Build context if router is available (enhancement, non-critical)
-            if self._context_router is not None:
-                try:
-                    context_items = self._context_router.build_context(
-                        slot, pipeline
+            if self._gate_checker.all_passed(pre_results):
+                # Update pipeline status to RUNNING if not already
+                old_status = state.status
+                if state.status != PipelineStatus.RUNNING:
+                    with self._profiler.span("state_save"):
+                        state = self._state_tracker.update_pipeline_status(
+                            state, PipelineStatus.RUNNING
+                        )
+                    self._notify(
+                        "on_status_changed",
+                        state.pipeline_id, old_status, state.status,
                     )
-                    context_yaml = self._context_router.generate_slot_context_yaml(
-                        context_items
+                    self._notify(
+                        "on_pipeline_started", state.pipeline_id, state,
                     )
-                    context_path = (
-                        Path(self._state_tracker._state_dir)
-                        / f"{state.pipeline_id}-{slot.id}-context.yaml"
+
+                # Build context if router is available (enhancement, non-critical)
+                if self._context_router is not None:
+                    with self._profiler.span("context_routing"):
+                        self._write_slot_context(slot, pipeline, state)
+
+                with self._profiler.span("state_save"):
+                    state = self._state_tracker.update_slot(
+                        state,
+                        slot.id,
+                        SlotStatus.IN_PROGRESS,
+                        agent_id=agent_id,
+                        agent_prompt=agent_prompt,
+                        pre_check_results=pre_results,
                     )
-                    context_path.write_text(context_yaml, encoding="utf-8")
-                except Exception:
-                    logger.warning(
-                        "Context routing failed for slot %s",
+                self._notify(
+                    "on_slot_started",
+                    state.pipeline_id, slot.id, agent_id,
+                )
+            else:
+                failed_conditions = [
+                    r.evidence for r in pre_results if not r.passed
+                ]
+                error_msg = f"Pre-conditions failed: {'; '.join(failed_conditions)}"
+                with self._profiler.span("state_save"):
+                    state = self._state_tracker.update_slot(
+                        state,
                         slot.id,
-                        exc_info=True,
+                        SlotStatus.FAILED,
+                        error=error_msg,
+                        pre_check_results=pre_results,
                     )
+                self._notify(
+                    "on_slot_failed",
+                    state.pipeline_id, slot.id, error_msg,
+                )
 
-            state = self._state_tracker.update_slot(
-                state,
-                slot.id,
-                SlotStatus.IN_PROGRESS,
-                agent_id=agent_id,
-                agent_prompt=agent_prompt,
-                pre_check_results=pre_results,
-            )
-            self._notify(
-                "on_slot_started",
-                state.pipeline_id, slot.id, agent_id,
-            )
-        else:
-            failed_conditions = [
-                r.evidence for r in pre_results if not r.passed
-            ]
-            error_msg = f"Pre-conditions failed: {'; '.join(failed_conditions)}"
-            state = self._state_tracker.update_slot(
-                state,
-                slot.id,
-                SlotStatus.FAILED,
-                error=error_msg,
-                pre_check_results=pre_results,
-            )
-            self._notify(
-                "on_slot_failed",
-                state.pipeline_id, slot.id, error_msg,
-            )
-
-        return state
+            return state
 
     def complete_slot(
         self, slot_id: str, pipeline: Pipeline, state: PipelineState
@@ -255,57 +368,62 @@ class PipelineRunner:
         Returns:
             Updated PipelineState.
         """
-        slot = self._find_slot(pipeline, slot_id)
-
-        post_results = self._gate_checker.check_post_conditions(slot, state)
-        self._notify(
-            "on_gate_check_completed",
-            state.pipeline_id, slot_id, "post", post_results,
-        )
+        with self._profiler.span("complete_slot"):
+            slot = self._find_slot(pipeline, slot_id)
 
-        if self._gate_checker.all_passed(post_results):
-            state = self._state_tracker.update_slot(
-                state,
-                slot_id,
-                SlotStatus.COMPLETED,
-                post_check_results=post_results,
-            )
+            with self._profiler.span("gate_check"):
+                post_results = self._gate_checker.check_post_conditions(slot, state)
             self._notify(
-                "on_slot_completed", state.pipeline_id, slot_id,
-            )
-        else:
-            failed_conditions = [
-                r.evidence for r in post_results if not r.passed
-            ]
-            error_msg = (
-                f"Post-conditions failed: {'; '.join(failed_conditions)}"
-            )
-            state = self._state_tracker.update_slot(
-                state,
-                slot_id,
-                SlotStatus.FAILED,
-                error=error_msg,
-                post_check_results=post_results,
-            )
-            self._notify(
-                "on_slot_failed", state.pipeline_id, slot_id, error_msg,
+                "on_gate_check_completed",
+                state.pipeline_id, slot_id, "post", post_results,
             )
 
-        # Check if pipeline is complete
-        if self._state_tracker.is_complete(state):
-            old_status = state.status
-            state = self._state_tracker.update_pipeline_status(
-                state, PipelineStatus.COMPLETED
-            )
-            self._notify(
-                "on_status_changed",
-                state.pipeline_id, old_status, state.status,
-            )
-            self._notify(
-                "on_pipeline_completed", state.pipeline_id, state,
-            )
+            if self._gate_checker.all_passed(post_results):
+                with self._profiler.span("state_save"):
+                    state = self._state_tracker.update_slot(
+                        state,
+                        slot_id,
+                        SlotStatus.COMPLETED,
+                        post_check_results=post_results,
+                    )
+                self._notify(
+                    "on_slot_completed", state.pipeline_id, slot_id,
+                )
+            else:
+                failed_conditions = [
+                    r.evidence for r in post_results if not r.passed
+                ]
+                error_msg = (
+                    f"Post-conditions failed: {'; '.join(failed_conditions)}"
+                )
+                with self._profiler.span("state_save"):
+                    state = self._state_tracker.update_slot(
+                        state,
+                        slot_id,
+                        SlotStatus.FAILED,
+                        error=error_msg,
+                        post_check_results=post_results,
+                    )
+                self._notify(
+                    "on_slot_failed", state.pipeline_id, slot_id, error_msg,
+                )
 
-        return state
+            # Check if pipeline is complete
+            if self._state_tracker.is_complete(state):
+                old_status = state.status
+                with self._profiler.span("state_save"):
+                    state = self._state_tracker.update_pipeline_status(
+                        state, PipelineStatus.COMPLETED
+                    )
+                self._notify(
+                    "on_status_changed",
+                    state.pipeline_id, old_status, state.status,
+                )
+                self._notify(
+                    "on_pipeline_completed", state.pipeline_id, state,
+                )
+
+            return state
 
     def fail_slot(
         self, slot_id: str, error: str, state: PipelineState
@@ -442,25 +560,7 @@ class PipelineRunner:
             [IN_PROGRESS] slot-implement (implementer) -- agent: ENG-001
             [BLOCKED] slot-review (reviewer)
         """
-        summary = self._state_tracker.get_status_summary(state)
-        total = len(state.slots)
-        completed_count = len(summary.get("completed", []))
-
-        lines = [
-            f"Pipeline: {state.pipeline_id} v{state.pipeline_version}",
-            f"Status: {state.status.value}",
-            f"Progress: {completed_count}/{total} slots",
-            "---",
-        ]
-
-        for slot_id, slot_state in state.slots.items():
-            status_tag = f"[{slot_state.status.value.upper()}]"
-            agent_info = ""
-            if slot_state.agent_id:
-                agent_info = f" -- agent: {slot_state.agent_id}"
-            lines.append(f"{status_tag} {slot_id}{agent_info}")
-
-        return "\n".join(lines)
+        return self._state_tracker.format_summary(state)
 
     def start_auditing(self, state: PipelineState) -> PipelineState:
         """Transition a COMPLETED pipeline to AUDITING state.
@@ -530,7 +630,8 @@ class PipelineRunner:
             PipelineExecutionError: Hash mismatch (pipeline was modified).
         """
         state = self._state_tracker.load(state_path)
-        pipeline = self._loader.load_and_resolve(yaml_path, params)
+        with self._profiler.span("load"):
+            pipeline = self._load_pipeline(yaml_path, params)
 
         # Verify definition hash using the same method as state tracker
         computed_hash = PipelineStateTracker._compute_hash(pipeline)
@@ -547,6 +648,151 @@ class PipelineRunner:
 
     # --- Private helpers ---
 
+    def _load_pipeline(self, yaml_path: str, params: dict[str, Any]) -> Pipeline:
+        """Load and resolve *yaml_path*, reusing an unchanged earlier result.
+
+        The cache key includes the file's mtime and size, so editing the
+        template (or passing different params) forces a fresh load.
+        """
+        try:
+            st = os.stat(yaml_path)
+            key = (
+                os.path.abspath(yaml_path),
+                st.st_mtime_ns,
+                st.st_size,
+                json.dumps(params, sort_keys=True, default=str),
+            )
+        except OSError:
+            # Let the loader raise its usual PipelineLoadError
+            return self._loader.load_and_resolve(yaml_path, params)
+
+        pipeline = self._pipeline_cache.get(key)
+        if pipeline is None:
+            pipeline = self._loader.load_and_resolve(yaml_path, params)
+            # Drop entries for older versions of the same file
+            stale = [
+                k for k in self._pipeline_cache
+                if k[0] == key[0] and k[1:3] != key[1:3]
+            ]
+            for old in stale:
+                del self._pipeline_cache[old]
+            self._pipeline_cache[key] = pipeline
+        return pipeline
+
+    def prefetch_context(self, slot: Slot, pipeline: Pipeline) -> None:
+        """Build *slot*'s context ahead of begin_slot(), off the critical path.
+
+        Routes the context, renders its YAML and, with context packs,
+        stores the items' blocks.  begin_slot() then only writes the
+        YAML and the pack manifest -- provided the router's context
+        fingerprint (every candidate file's ``(mtime_ns, size)``) is
+        unchanged; otherwise it builds the context again.  Nothing is
+        kept when the router has no fingerprint (OpenViking).  Never
+        raises.
+        """
+        if self._context_router is None:
+            return
+        try:
+            with self._profiler.span("context_prefetch"):
+                fingerprint = self._context_router.context_fingerprint(slot)
+                if fingerprint is None:
+                    return
+                items = self._context_router.build_context(slot, pipeline)
+                context_yaml = self._context_router.generate_slot_context_yaml(items)
+                pack_entries = None
+                if self._block_store is not None:
+                    pack_entries = self._context_router.store_context_blocks(
+                        items, self._block_store
+                    )
+            self._prefetched_context[(pipeline.id, slot.id)] = _PrefetchedContext(
+                fingerprint, items, context_yaml, pack_entries,
+            )
+        except Exception:
+            logger.warning(
+                "Context prefetch failed for slot %s",
+                slot.id,
+                exc_info=True,
+            )
+
+    def discard_prefetched(self, pipeline_id: str) -> int:
+        """Drop prefetched context of *pipeline_id*'s slots that never began.
+
+        Call when a run ends: slots predicted to be next may never start
+        (an upstream slot failed or was skipped), and the runner outlives
+        the run.
+
+        Returns:
+            Number of prefetched contexts dropped.
+        """
+        stale = [key for key in list(self._prefetched_context) if key[0] == pipeline_id]
+        for key in stale:
+            self._prefetched_context.pop(key, None)
+        return len(stale)
+
+    def _compact_context_blocks(self) -> None:
+        """Drop context blocks no pack in the state directory references.
+
+        Runs before a pipeline writes its packs, so blocks of documents
+        edited since earlier runs do not accumulate.  Prefetched context
+        is dropped: its blocks are in no manifest yet.  Failures are
+        logged, never raised.
+        """
+        self._prefetched_context.clear()
+        try:
+            self._block_store.compact(
+                Path(self._state_tracker._state_dir).glob("*-context.pack.json")
+            )
+        except Exception:
+            logger.warning(
+                "Context block compaction failed in %s",
+                self._block_store.root,
+                exc_info=True,
+            )
+
+    def _write_slot_context(
+        self, slot: Slot, pipeline: Pipeline, state: PipelineState
+    ) -> None:
+        """Build the slot's context list and write it next to the state file.
+
+        A prefetched context (see prefetch_context()) is used as is while
+        its fingerprint is unchanged.  With context packs enabled the
+        context is also materialized as a pack.  Context routing is an enhancement -- failures are logged,
+        never raised.
+        """
+        try:
+            prefetched = self._prefetched_context.pop((pipeline.id, slot.id), None)
+            if (
+                prefetched is not None
+                and prefetched.fingerprint == self._context_router.context_fingerprint(slot)
+            ):
+                context_items = prefetched.items
+                context_yaml = prefetched.context_yaml
+                pack_entries = prefetched.pack_entries
+            else:
+                context_items = self._context_router.build_context(
+                    slot, pipeline
+                )
+                context_yaml = self._context_router.generate_slot_context_yaml(
+                    context_items
+                )
+                pack_entries = None
+            prefix = Path(self._state_tracker._state_dir) / f"{state.pipeline_id}-{slot.id}"
+            Path(f"{prefix}-context.yaml").write_text(context_yaml, encoding="utf-8")
+            if self._block_store is not None:
+                if pack_entries is None:
+                    pack_entries = self._context_router.store_context_blocks(
+                        context_items, self._block_store
+                    )
+                write_manifest(
+                    f"{prefix}-context.pack.json", self._block_store, pack_entries,
+                )
+        except Exception:
+            logger.warning(
+                "Context routing failed for slot %s",
+                slot.id,
+                exc_info=True,
+            )
+
     @staticmethod
     def _find_slot(pipeline: Pipeline, slot_id: str) -> Slot:
         """Find a Slot object by ID in the pipeline.
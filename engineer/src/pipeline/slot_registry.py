@@ -2,16 +2,30 @@
 
 Loads SlotType definitions from YAML files, parses agent .md front-matter
 for capability metadata, and matches agents to slot types.
+
+Parsed files are kept with an (mtime, size) fingerprint, so reloads only
+re-parse files that were added or changed; with ``cache_path`` the table
+is persisted as JSON for the next process.
+
+Matching goes through an inverted index (capability -> bitset of agent
+ordinals): the agents compatible with a slot type are the AND of the
+bitsets of its required capabilities.  Results are memoized per set of
+required capabilities and dropped only when the loaded agents change.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from pipeline.atomic_file import mtime_settled, write_json
 from pipeline.models import (
     AgentCapabilities,
     CapabilityMatch,
@@ -19,6 +33,18 @@ from pipeline.models import (
     SlotTypeDefinition,
 )
 
+logger = logging.getLogger(__name__)
+
+# Parsed file cache entry: ((mtime_ns, size) or None, parsed value or None)
+_FileEntry = tuple[tuple[int, int] | None, Any]
+
+# Agent front-matter larger than this is ignored (the prompt body
+# after the closing --- is never read)
+_MAX_FRONT_MATTER_BYTES = 64 * 1024
+
+# Bump when the persisted registry cache layout changes
+_CACHE_VERSION = 1
+
 
 class SlotTypeNotFoundError(Exception):
     """Raised when a requested slot type does not exist in the registry."""
@@ -32,24 +58,137 @@ class SlotManifest:
     slots: list[dict[str, Any]]
 
 
+class _CapabilityIndex:
+    """Inverted capability -> agents index over agent ordinals.
+
+    Agent ``i`` (in load order) is bit ``1 << i`` of each bitset, so a
+    set of agents is a single Python int and intersection is ``&``.
+    """
+
+    __slots__ = ("agents", "bits", "all_mask")
+
+    def __init__(self, agents: Iterable[AgentCapabilities]) -> None:
+        self.agents = list(agents)
+        ordinals: dict[str, list[int]] = {}
+        for ordinal, agent in enumerate(self.agents):
+            for cap in set(agent.capabilities):
+                ordinals.setdefault(cap, []).append(ordinal)
+        self.bits = {cap: _mask_of(ords) for cap, ords in ordinals.items()}
+        self.all_mask = (1 << len(self.agents)) - 1
+
+    def compatible_mask(self, required: Iterable[str]) -> int:
+        """Bitset of agents holding every capability in *required*."""
+        # Rarest capability first: the mask empties out soonest
+        caps = sorted(set(required), key=lambda c: self.bits.get(c, 0).bit_count())
+        mask = self.all_mask
+        for cap in caps:
+            mask &= self.bits.get(cap, 0)
+            if not mask:
+                break
+        return mask
+
+    def matches(self, required: tuple[str, ...]) -> list[CapabilityMatch]:
+        """One CapabilityMatch per agent, most matched capabilities first.
+
+        *required* must be sorted and de-duplicated.  Ties keep load
+        order, as the original linear scan did.
+        """
+        # Walk each required capability's bitset once instead of testing
+        # every agent against every requirement.
+        matched_by: dict[int, list[str]] = {}
+        for cap in required:
+            for ordinal in _iter_bits(self.bits.get(cap, 0)):
+                matched_by.setdefault(ordinal, []).append(cap)
+
+        n_required = len(required)
+        buckets: list[list[CapabilityMatch]] = [[] for _ in range(n_required + 1)]
+        for ordinal, agent in enumerate(self.agents):
+            matched = matched_by.get(ordinal, [])
+            if len(matched) == n_required:
+                missing: list[str] = []
+            elif not matched:
+                missing = list(required)
+            else:
+                have = set(matched)
+                missing = [c for c in required if c not in have]
+            buckets[len(matched)].append(CapabilityMatch(
+                agent_id=agent.agent_id,
+                prompt_path=agent.prompt_path,
+                matched_capabilities=matched,
+                missing_capabilities=missing,
+                is_compatible=not missing,
+            ))
+        return [m for bucket in reversed(buckets) for m in bucket]
+
+
+def _mask_of(ordinals: list[int]) -> int:
+    """Bitset with the given (ascending) ordinals set."""
+    if not ordinals:
+        return 0
+    bits = bytearray((ordinals[-1] >> 3) + 1)
+    for o in ordinals:
+        bits[o >> 3] |= 1 << (o & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _fingerprint(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of *path*, or None if modified too recently to trust."""
+    st = path.stat()
+    if not mtime_settled(st.st_mtime_ns, time.time_ns()):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Ordinals of the set bits in *mask*, ascending."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
 class SlotRegistry:
     """Loads SlotType definitions and matches agents to slots."""
 
-    def __init__(self, slot_types_dir: str, agents_dir: str) -> None:
+    def __init__(
+        self,
+        slot_types_dir: str,
+        agents_dir: str,
+        *,
+        cache_path: str | None = None,
+    ) -> None:
         """
         Args:
             slot_types_dir: Directory containing SlotType YAML files.
             agents_dir: Directory containing agent .md files.
+            cache_path: Optional JSON file persisting parsed slot types
+                and agents with their file fingerprints, so a fresh
+                process only re-parses files that changed.
         """
         self._slot_types_dir = Path(slot_types_dir)
         self._agents_dir = Path(agents_dir)
         self._slot_types: dict[str, SlotTypeDefinition] = {}
         self._agents: dict[str, AgentCapabilities] = {}
         self._loaded = False
+        # Built lazily from _agents; memos are keyed by the sorted
+        # required-capability tuple, so slot types sharing requirements
+        # share entries and reloaded slot types never see stale ones.
+        self._index: _CapabilityIndex | None = None
+        self._match_memo: dict[tuple[str, ...], list[CapabilityMatch]] = {}
+        self._compatible_memo: dict[tuple[str, ...], tuple[str, ...]] = {}
+        # Per-file parse results: path -> (fingerprint, parsed or None)
+        self._slot_type_files: dict[str, _FileEntry] = {}
+        self._agent_files: dict[str, _FileEntry] = {}
+        self._cache_path = Path(cache_path) if cache_path else None
+        self._disk_cache_read = False
+        self._cache_dirty = False
 
     def load_slot_types(self) -> dict[str, SlotTypeDefinition]:
         """Load all .yaml files from slot_types_dir.
 
+        Only files added or changed since the last load (by mtime and
+        size) are parsed again; deleted files drop out.
+
         Returns:
             Dict mapping slot type ID -> SlotTypeDefinition.
 
@@ -57,62 +196,39 @@ class SlotRegistry:
             yaml.YAMLError: A YAML file is malformed.
             KeyError: A YAML file is missing required fields.
         """
+        self._read_disk_cache()
+        files = (
+            sorted(self._slot_types_dir.glob("*.yaml"))
+            if self._slot_types_dir.exists() else []
+        )
         self._slot_types = {}
-        if not self._slot_types_dir.exists():
-            return self._slot_types
-
-        for yaml_file in sorted(self._slot_types_dir.glob("*.yaml")):
-            data = yaml.safe_load(yaml_file.read_text(encoding="utf-8"))
-            if data is None:
-                continue
-            st_data = data.get("slot_type", data)
-            std = SlotTypeDefinition(
-                id=str(st_data["id"]),
-                name=str(st_data["name"]),
-                category=str(st_data["category"]),
-                description=str(st_data.get("description", "")),
-                input_schema=st_data.get("input_schema", {}),
-                output_schema=st_data.get("output_schema", {}),
-                required_capabilities=list(st_data.get("required_capabilities", [])),
-                constraints=list(st_data.get("constraints", [])),
-                allowed_tools=list(st_data.get("allowed_tools", [])),
-                denied_tools=list(st_data.get("denied_tools", [])),
-                required_tools=list(st_data.get("required_tools", [])),
-            )
+        for std in self._refresh(files, self._slot_type_files, self._parse_slot_type):
             self._slot_types[std.id] = std
 
         self._loaded = True
+        self._write_disk_cache()
         return self._slot_types
 
     def load_agent_capabilities(self) -> dict[str, AgentCapabilities]:
         """Parse YAML front-matter from all agent .md files.
 
         Front-matter is the YAML block between --- delimiters at the
-        start of the file.
+        start of the file.  Unchanged files (by mtime and size) are not
+        parsed again, and the capability index is rebuilt only if the
+        resulting agents differ from the ones already loaded.
 
         Returns:
             Dict mapping agent_id -> AgentCapabilities.
         """
-        self._agents = {}
-        if not self._agents_dir.exists():
-            return self._agents
-
-        for md_file in sorted(self._agents_dir.glob("*.md")):
-            front_matter = self._parse_front_matter(md_file)
-            if front_matter is None:
-                continue
-            agent_id = front_matter.get("agent_id")
-            if not agent_id:
-                continue
-            ac = AgentCapabilities(
-                agent_id=str(agent_id),
-                version=str(front_matter.get("version", "1.0")),
-                capabilities=list(front_matter.get("capabilities", [])),
-                compatible_slot_types=list(front_matter.get("compatible_slot_types", [])),
-                prompt_path=str(md_file),
-            )
-            self._agents[ac.agent_id] = ac
-
+        self._read_disk_cache()
+        files = sorted(self._agents_dir.glob("*.md")) if self._agents_dir.exists() else []
+        agents: dict[str, AgentCapabilities] = {}
+        for ac in self._refresh(files, self._agent_files, self._parse_agent):
+            agents[ac.agent_id] = ac
+        if agents != self._agents:
+            self._agents = agents
+            self._invalidate_index()
+        self._write_disk_cache()
         return self._agents
 
     def get_slot_type(self, slot_type_id: str) -> SlotTypeDefinition:
@@ -149,32 +265,48 @@ class SlotRegistry:
 
         Returns:
             List of CapabilityMatch objects, sorted by number of
-            matched capabilities (descending).
+            matched capabilities (descending).  Computed once per set
+            of required capabilities until the agents change.
 
         Raises:
             SlotTypeNotFoundError: slot_type_id not found.
         """
-        slot_type = self.get_slot_type(slot_type_id)
-        required = set(slot_type.required_capabilities)
+        key = self._requirement_key(slot_type_id)
+        matches = self._match_memo.get(key)
+        if matches is None:
+            matches = self._match_memo[key] = self._get_index().matches(key)
+        return list(matches)
 
-        if not self._agents:
-            self.load_agent_capabilities()
+    def compatible_agent_ids(self, slot_type_id: str) -> list[str]:
+        """IDs of the agents able to fill a slot type, in load order.
 
-        matches: list[CapabilityMatch] = []
-        for agent in self._agents.values():
-            agent_caps = set(agent.capabilities)
-            matched = sorted(required & agent_caps)
-            missing = sorted(required - agent_caps)
-            matches.append(CapabilityMatch(
-                agent_id=agent.agent_id,
-                prompt_path=agent.prompt_path,
-                matched_capabilities=matched,
-                missing_capabilities=missing,
-                is_compatible=len(missing) == 0,
-            ))
+        The same agents, in the same order, as the compatible entries of
+        find_compatible_agents(), without building a match per agent.
+
+        Raises:
+            SlotTypeNotFoundError: slot_type_id not found.
+        """
+        key = self._requirement_key(slot_type_id)
+        ids = self._compatible_memo.get(key)
+        if ids is None:
+            index = self._get_index()
+            ids = tuple(
+                index.agents[o].agent_id for o in _iter_bits(index.compatible_mask(key))
+            )
+            self._compatible_memo[key] = ids
+        return list(ids)
 
-        matches.sort(key=lambda m: len(m.matched_capabilities), reverse=True)
-        return matches
+    def get_agent(self, agent_id: str) -> AgentCapabilities:
+        """Look up a loaded agent by ID.
+
+        Raises:
+            KeyError: agent_id not found.
+        """
+        if not self._agents:
+            self.load_agent_capabilities()
+        if agent_id not in self._agents:
+            raise KeyError(f"Agent '{agent_id}' not found in registry")
+        return self._agents[agent_id]
 
     def validate_assignment(
         self, slot_type_id: str, agent_id: str
@@ -253,30 +385,192 @@ class SlotRegistry:
     # Private helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _parse_front_matter(md_path: Path) -> dict | None:
-        """Parse YAML front-matter from a markdown file.
+    def _requirement_key(self, slot_type_id: str) -> tuple[str, ...]:
+        """Sorted required capabilities of a slot type (memo key)."""
+        slot_type = self.get_slot_type(slot_type_id)
+        return tuple(sorted(set(slot_type.required_capabilities)))
+
+    def _get_index(self) -> _CapabilityIndex:
+        if not self._agents:
+            self.load_agent_capabilities()
+        if self._index is None:
+            self._index = _CapabilityIndex(self._agents.values())
+        return self._index
+
+    def _invalidate_index(self) -> None:
+        self._index = None
+        self._match_memo = {}
+        self._compatible_memo = {}
+
+    # --- Incremental loading ---
 
-        Front-matter is between the first --- and the second ---.
-        Returns None if no front-matter found.
+    def _refresh(
+        self,
+        files: list[Path],
+        table: dict[str, _FileEntry],
+        parse: Callable[[Path], Any],
+    ) -> list[Any]:
+        """Re-parse added/changed *files* into *table*, drop deleted ones.
+
+        Returns:
+            Parsed objects (skipping files that yield None), in file order.
         """
-        text = md_path.read_text(encoding="utf-8")
-        lines = text.split("\n")
+        seen: set[str] = set()
+        results: list[Any] = []
+        for path in files:
+            key = str(path)
+            seen.add(key)
+            fingerprint = _fingerprint(path)
+            entry = table.get(key)
+            if entry is None or fingerprint is None or entry[0] != fingerprint:
+                new_entry = (fingerprint, parse(path))
+                if new_entry != entry:
+                    table[key] = entry = new_entry
+                    self._cache_dirty = True
+            if entry[1] is not None:
+                results.append(entry[1])
+        for key in [k for k in table if k not in seen]:
+            del table[key]
+            self._cache_dirty = True
+        return results
 
-        if not lines or lines[0].strip() != "---":
+    @staticmethod
+    def _parse_slot_type(yaml_file: Path) -> SlotTypeDefinition | None:
+        data = yaml.safe_load(yaml_file.read_text(encoding="utf-8"))
+        if data is None:
             return None
+        st_data = data.get("slot_type", data)
+        return SlotTypeDefinition(
+            id=str(st_data["id"]),
+            name=str(st_data["name"]),
+            category=str(st_data["category"]),
+            description=str(st_data.get("description", "")),
+            input_schema=st_data.get("input_schema", {}),
+            output_schema=st_data.get("output_schema", {}),
+            required_capabilities=list(st_data.get("required_capabilities", [])),
+            constraints=list(st_data.get("constraints", [])),
+            allowed_tools=list(st_data.get("allowed_tools", [])),
+            denied_tools=list(st_data.get("denied_tools", [])),
+            required_tools=list(st_data.get("required_tools", [])),
+        )
 
-        end_index = None
-        for i in range(1, len(lines)):
-            if lines[i].strip() == "---":
-                end_index = i
-                break
-
-        if end_index is None:
+    @classmethod
+    def _parse_agent(cls, md_file: Path) -> AgentCapabilities | None:
+        front_matter = cls._parse_front_matter(md_file)
+        if front_matter is None:
+            return None
+        agent_id = front_matter.get("agent_id")
+        if not agent_id:
             return None
+        return AgentCapabilities(
+            agent_id=str(agent_id),
+            version=str(front_matter.get("version", "1.0")),
+            capabilities=list(front_matter.get("capabilities", [])),
+            compatible_slot_types=list(front_matter.get("compatible_slot_types", [])),
+            prompt_path=str(md_file),
+        )
+
+    # --- Persisted cache ---
+
+    def _cache_header(self) -> dict[str, Any]:
+        return {
+            "version": _CACHE_VERSION,
+            "slot_types_dir": str(self._slot_types_dir.resolve()),
+            "agents_dir": str(self._agents_dir.resolve()),
+        }
+
+    def _read_disk_cache(self) -> None:
+        """Seed the per-file tables from cache_path, once.
+
+        A missing, corrupt or foreign cache file is ignored.
+        """
+        if self._disk_cache_read or self._cache_path is None:
+            return
+        self._disk_cache_read = True
+        try:
+            raw = json.loads(self._cache_path.read_text(encoding="utf-8"))
+            if raw.get("header") != self._cache_header():
+                return
+            slot_types = {
+                path: ((mtime, size), None if data is None else SlotTypeDefinition(**data))
+                for path, (mtime, size, data) in raw["slot_types"].items()
+            }
+            agents = {
+                path: ((mtime, size), None if data is None else AgentCapabilities(**data))
+                for path, (mtime, size, data) in raw["agents"].items()
+            }
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return
+        self._slot_type_files.update(slot_types)
+        self._agent_files.update(agents)
+
+    def _write_disk_cache(self) -> None:
+        """Persist the per-file tables to cache_path if they changed.
+
+        Written atomically (temp file + rename).  Entries with a recent
+        mtime (no stable fingerprint) or non-JSON values are left out.
+        Failures are logged, never raised.
+        """
+        if self._cache_path is None or not self._cache_dirty:
+            return
+
+        def encode(table: dict[str, _FileEntry]) -> dict[str, list]:
+            out: dict[str, list] = {}
+            for path, (fingerprint, value) in table.items():
+                if fingerprint is None:
+                    continue
+                data = None if value is None else asdict(value)
+                try:
+                    json.dumps(data)
+                except (TypeError, ValueError):
+                    continue
+                out[path] = [fingerprint[0], fingerprint[1], data]
+            return out
+
+        payload = {
+            "header": self._cache_header(),
+            "slot_types": encode(self._slot_type_files),
+            "agents": encode(self._agent_files),
+        }
+        try:
+            write_json(self._cache_path, payload)
+        except OSError:
+            logger.warning("Could not write registry cache %s", self._cache_path, exc_info=True)
+            return
+        self._cache_dirty = False
+
+    @staticmethod
+    def _parse_front_matter(md_path: Path) -> dict | None:
+        """Parse YAML front-matter from a markdown file.
+
+        Front-matter is between the first --- and the second ---.  The
+        file is read line by line and reading stops at the closing
+        delimiter, so the prompt body is never loaded.  Returns None if
+        no front-matter is found within _MAX_FRONT_MATTER_BYTES.
+        """
+        with open(md_path, "rb") as f:
+            first = f.readline(_MAX_FRONT_MATTER_BYTES)
+            if first.strip() != b"---":
+                return None
+
+            header: list[bytes] = []
+            size = 0
+            while True:
+                line = f.readline(_MAX_FRONT_MATTER_BYTES - size + 1)
+                if not line:
+                    return None  # no closing delimiter
+                if line.strip() == b"---":
+                    break
+                size += len(line)
+                if size > _MAX_FRONT_MATTER_BYTES:
+                    logger.warning(
+                        "Front-matter of %s exceeds %d bytes; ignored",
+                        md_path, _MAX_FRONT_MATTER_BYTES,
+                    )
+                    return None
+                header.append(line)
 
-        yaml_text = "\n".join(lines[1:end_index])
         try:
-            return yaml.safe_load(yaml_text)
+            return yaml.safe_load(b"".join(header).decode("utf-8"))
         except yaml.YAMLError:
             return None
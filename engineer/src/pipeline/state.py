@@ -8,13 +8,13 @@ from __future__ import annotations
 
 import hashlib
 import os
-import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from pipeline.atomic_file import write_text
 from pipeline.models import (
     DeterministicMetrics,
     GateCheckResult,
@@ -100,6 +100,8 @@ class PipelineStateTracker:
 
         File name: {pipeline.id}-{ISO-timestamp}.state.yaml
         """
+        # A new run always gets its own file, even on a reused tracker.
+        self._state_file = None
         definition_hash = self._compute_hash(pipeline)
         slots: dict[str, SlotState] = {}
         for slot in pipeline.slots:
@@ -347,10 +349,44 @@ class PipelineStateTracker:
             **groups,
         }
 
+    def format_summary(self, state: PipelineState) -> str:
+        """Human-readable pipeline status string.
+
+        Needs only the state (no Pipeline definition), so read-only
+        callers can print it straight from a loaded state file.
+
+        Format:
+            Pipeline: {id} v{version}
+            Status: {status}
+            Progress: {completed}/{total} slots
+            ---
+            [COMPLETED] slot-design
+            [IN_PROGRESS] slot-implement -- agent: ENG-001
+        """
+        summary = self.get_status_summary(state)
+        total = len(state.slots)
+        completed_count = len(summary.get("completed", []))
+
+        lines = [
+            f"Pipeline: {state.pipeline_id} v{state.pipeline_version}",
+            f"Status: {state.status.value}",
+            f"Progress: {completed_count}/{total} slots",
+            "---",
+        ]
+
+        for slot_id, slot_state in state.slots.items():
+            status_tag = f"[{slot_state.status.value.upper()}]"
+            agent_info = ""
+            if slot_state.agent_id:
+                agent_info = f" -- agent: {slot_state.agent_id}"
+            lines.append(f"{status_tag} {slot_id}{agent_info}")
+
+        return "\n".join(lines)
+
     def save(self, state: PipelineState) -> str:
         """Persist state to YAML file. Returns file path.
 
-        Writes atomically: write to temp file, then os.rename().
+        Writes atomically (see pipeline.atomic_file).
         """
         if self._state_file is None:
             timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -360,28 +396,15 @@ class PipelineStateTracker:
         data = self._state_to_dict(state)
         yaml_content = yaml.safe_dump(data, default_flow_style=False, sort_keys=False)
 
-        # Atomic write
-        fd, tmp_path = tempfile.mkstemp(
-            dir=str(self._state_dir), suffix=".tmp"
-        )
-        fd_closed = False
-        try:
-            os.write(fd, yaml_content.encode("utf-8"))
-            os.close(fd)
-            fd_closed = True
-            os.rename(tmp_path, self._state_file)
-        except Exception:
-            if not fd_closed:
-                os.close(fd)
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            raise
-
+        write_text(self._state_file, yaml_content)
         return self._state_file
 
     def load(self, state_path: str) -> PipelineState:
         """Load state from YAML file.
 
+        Subsequent save() calls write back to *state_path*, so a resumed
+        run keeps updating the file it was loaded from.
+
         Returns:
             PipelineState hydrated from YAML.
 
@@ -394,7 +417,9 @@ class PipelineStateTracker:
             raise FileNotFoundError(f"State file not found: {state_path}")
 
         raw = yaml.safe_load(path.read_text(encoding="utf-8"))
-        return self._dict_to_state(raw)
+        state = self._dict_to_state(raw)
+        self._state_file = str(path)
+        return state
 
     def archive(self, state: PipelineState) -> str:
         """Move state file from active/ to archive/. Returns new path."""
@@ -0,0 +1,450 @@
+"""Offline BM25 text index for ranking short documents against a query.
+
+Used by NLMatcher to rank templates by their name, description and slot
+objectives when no keyword matches, without calling an external search
+service.  Text is tokenized into lowercase word tokens plus character
+bigrams for Chinese (which has no spaces between words), so "量化交易"
+matches documents containing "量化" or "交易".
+
+Scoring is precomputed: every posting stores its final BM25 term weight
+at build time, so a query only sums the postings of its own terms into
+a dense score vector -- one addition per (query term, document) pair
+that actually shares the term.
+
+Usage:
+    index = BM25Index({"hotfix": "Urgent bug fix", "research": "调研 分析"})
+    index.search("fix the login bug")   # [("hotfix", 0.5)]
+
+Indexes serialize to JSON (:meth:`BM25Index.to_dict`); :func:`save_index`
+and :func:`load_index` persist one atomically, keyed by a fingerprint of
+the documents it was built from.
+
+:class:`IncrementalBM25Index` scores the same way but lets documents be
+added, replaced and removed one at a time, for corpora that change
+between queries (project files).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import re
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from pipeline.atomic_file import write_json
+
+logger = logging.getLogger(__name__)
+
+_INDEX_VERSION = 1
+
+_CJK_RANGES = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+# A run of CJK characters, or a run of other word characters
+_TOKEN_RE = re.compile(rf"[{_CJK_RANGES}]+|[^\W{_CJK_RANGES}]+")
+_CJK_RE = re.compile(rf"[{_CJK_RANGES}]")
+
+# Too common to carry meaning in template text or requests
+_STOPWORDS = frozenset(
+    "a an and are as at be by do for from i in into is it its of on or please "
+    "that the this to we with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split *text* into index terms.
+
+    Non-CJK runs become lowercase word tokens (stopwords dropped); CJK
+    runs become overlapping character bigrams, or the character itself
+    for a one-character run.
+
+    Returns:
+        Terms in input order, with repeats.
+    """
+    terms: list[str] = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if _CJK_RE.match(run):
+            if len(run) == 1:
+                terms.append(run)
+            else:
+                terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+        elif run not in _STOPWORDS:
+            terms.append(run)
+    return terms
+
+
+def fingerprint(documents: Mapping[str, str]) -> str:
+    """Content hash of *documents*, for checking a persisted index."""
+    digest = hashlib.sha256()
+    for doc_id in sorted(documents):
+        digest.update(doc_id.encode("utf-8") + b"\0")
+        digest.update(documents[doc_id].encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """Okapi BM25 index over a fixed set of documents.
+
+    Usage:
+        index = BM25Index({"doc-a": "text ...", "doc-b": "..."})
+        index.search("query text", limit=5)
+    """
+
+    def __init__(
+        self,
+        documents: Mapping[str, str],
+        *,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        """
+        Args:
+            documents: Document id -> text.
+            k1: Term frequency saturation.
+            b: Document length normalization (0 = none, 1 = full).
+        """
+        self._k1 = k1
+        self._b = b
+        self._doc_ids: list[str] = list(documents)
+        # term -> (document indexes, precomputed BM25 weights)
+        self._postings: dict[str, tuple[list[int], list[float]]] = {}
+
+        counts = [Counter(tokenize(documents[d])) for d in self._doc_ids]
+        lengths = [sum(c.values()) for c in counts]
+        n = len(counts)
+        avg_length = (sum(lengths) / n) if n else 0.0
+
+        doc_freq: Counter[str] = Counter()
+        for c in counts:
+            doc_freq.update(c.keys())
+        idf = {term: self._idf(n, df) for term, df in doc_freq.items()}
+
+        for index, (c, length) in enumerate(zip(counts, lengths)):
+            norm = k1 * (1 - b + b * length / avg_length) if avg_length else k1
+            for term, tf in c.items():
+                docs, weights = self._postings.setdefault(term, ([], []))
+                docs.append(index)
+                weights.append(idf[term] * tf * (k1 + 1) / (tf + norm))
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    @property
+    def doc_ids(self) -> list[str]:
+        """Document ids, in index order."""
+        return list(self._doc_ids)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def scores(self, query: str) -> list[float]:
+        """Raw BM25 score of every document for *query*, in index order."""
+        totals = [0.0] * len(self._doc_ids)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            for index, weight in zip(*posting):
+                totals[index] += weight
+        return totals
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = 10,
+        *,
+        normalize: bool = True,
+    ) -> list[tuple[str, float]]:
+        """Rank documents against *query*.
+
+        Args:
+            query: Free text.
+            limit: Maximum results (None for all matching documents).
+            normalize: Divide scores by the summed idf of the query's
+                terms, capped at 1.0.  About 1.0 means every query term
+                occurs once in a document of average length; unknown
+                terms lower the score.
+
+        Returns:
+            (document id, score) pairs with a positive score, best first
+            (ties in index order).
+        """
+        terms = set(tokenize(query))
+        totals = self.scores(query)
+        ranked = sorted(
+            (i for i, s in enumerate(totals) if s > 0), key=lambda i: -totals[i]
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        scale = 1.0
+        if normalize and ranked:
+            # df is the posting length; unknown terms count as df = 0
+            n = len(self._doc_ids)
+            scale = sum(
+                self._idf(n, len(self._postings[t][0]) if t in self._postings else 0)
+                for t in terms
+            )
+        return [
+            (self._doc_ids[i], min(totals[i] / scale, 1.0) if normalize else totals[i])
+            for i in ranked
+        ]
+
+    # --- Serialization ---
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form of the index (see :meth:`from_dict`)."""
+        return {
+            "k1": self._k1,
+            "b": self._b,
+            "doc_ids": self._doc_ids,
+            "postings": {t: [d, w] for t, (d, w) in self._postings.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> BM25Index:
+        """Rebuild an index from :meth:`to_dict` output without re-tokenizing.
+
+        Raises:
+            KeyError, TypeError, ValueError: *data* is not a valid index.
+        """
+        index = cls.__new__(cls)
+        index._k1 = float(data["k1"])
+        index._b = float(data["b"])
+        index._doc_ids = list(data["doc_ids"])
+        # Postings are taken as stored (JSON keeps ints and floats); only
+        # their shape is checked, which keeps loading cheaper than a build
+        index._postings = {}
+        n = len(index._doc_ids)
+        for term, (docs, weights) in data["postings"].items():
+            if len(docs) != len(weights) or (docs and not 0 <= docs[-1] < n):
+                raise ValueError(f"Corrupt posting list for {term!r}")
+            index._postings[term] = (docs, weights)
+        return index
+
+    # --- Private helpers ---
+
+    @staticmethod
+    def _idf(n: int, df: int) -> float:
+        # Lucene's variant: always positive, even for very common terms
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+
+class IncrementalBM25Index:
+    """Okapi BM25 index whose documents can be added and removed.
+
+    BM25Index bakes idf and length normalization -- which depend on the
+    whole corpus -- into its postings.  This index keeps raw term
+    frequencies instead and computes a term's weight vector on the first
+    query that uses it after a change; later queries reuse the vector,
+    so a query over an unchanged corpus costs what a BM25Index query
+    does.
+
+    Usage:
+        index = IncrementalBM25Index()
+        index.add("doc-a", "text ...")
+        index.remove("doc-a")
+        index.search("query text", limit=5)
+    """
+
+    def __init__(self, *, k1: float = 1.5, b: float = 0.75) -> None:
+        """
+        Args:
+            k1: Term frequency saturation.
+            b: Document length normalization (0 = none, 1 = full).
+        """
+        self._k1 = k1
+        self._b = b
+        # doc id -> (term counts, length)
+        self._docs: dict[str, tuple[dict[str, int], int]] = {}
+        # term -> {doc id: term frequency}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._total_length = 0
+        # term -> (doc ids, BM25 weights), valid until the next change
+        self._weights: dict[str, tuple[list[str], list[float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._docs
+
+    @property
+    def doc_ids(self) -> list[str]:
+        """Document ids, in insertion order."""
+        return list(self._docs)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index *text* as *doc_id*, replacing any previous version."""
+        self.add_counts(doc_id, Counter(tokenize(text)))
+
+    def add_counts(self, doc_id: str, counts: Mapping[str, int]) -> None:
+        """Index pre-tokenized term *counts* as *doc_id* (see term_counts())."""
+        self.remove(doc_id)
+        counts = {term: int(tf) for term, tf in counts.items() if tf > 0}
+        length = sum(counts.values())
+        self._docs[doc_id] = (counts, length)
+        self._total_length += length
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        self._weights.clear()
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop *doc_id* from the index.  Returns whether it was indexed."""
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return False
+        counts, length = entry
+        self._total_length -= length
+        for term in counts:
+            posting = self._postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[term]
+        self._weights.clear()
+        return True
+
+    def term_counts(self, doc_id: str) -> dict[str, int]:
+        """Term frequencies of *doc_id*.
+
+        Raises:
+            KeyError: *doc_id* is not indexed.
+        """
+        return dict(self._docs[doc_id][0])
+
+    def scores(self, query: str) -> dict[str, float]:
+        """Raw BM25 score of every document sharing a term with *query*."""
+        totals: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            vector = self._term_weights(term)
+            if vector is None:
+                continue
+            for doc_id, weight in zip(*vector):
+                totals[doc_id] = totals.get(doc_id, 0.0) + weight
+        return totals
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = 10,
+        *,
+        normalize: bool = True,
+    ) -> list[tuple[str, float]]:
+        """Rank documents against *query*, as :meth:`BM25Index.search` does.
+
+        Returns:
+            (document id, score) pairs with a positive score, best first
+            (ties by document id).
+        """
+        totals = self.scores(query)
+        ranked = sorted(
+            (d for d, s in totals.items() if s > 0), key=lambda d: (-totals[d], d)
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        scale = 1.0
+        if normalize and ranked:
+            n = len(self._docs)
+            scale = sum(
+                BM25Index._idf(n, len(self._postings.get(t, ())))
+                for t in set(tokenize(query))
+            )
+        return [
+            (d, min(totals[d] / scale, 1.0) if normalize else totals[d])
+            for d in ranked
+        ]
+
+    # --- Private helpers ---
+
+    def _term_weights(self, term: str) -> tuple[list[str], list[float]] | None:
+        vector = self._weights.get(term)
+        if vector is not None:
+            return vector
+        posting = self._postings.get(term)
+        if posting is None:
+            return None
+        n = len(self._docs)
+        avg_length = self._total_length / n
+        idf = BM25Index._idf(n, len(posting))
+        k1, b = self._k1, self._b
+        docs = list(posting)
+        weights = []
+        for doc_id in docs:
+            tf = posting[doc_id]
+            length = self._docs[doc_id][1]
+            norm = k1 * (1 - b + b * length / avg_length) if avg_length else k1
+            weights.append(idf * tf * (k1 + 1) / (tf + norm))
+        vector = self._weights[term] = (docs, weights)
+        return vector
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+def load_index(path: str | Path, expected_fingerprint: str) -> BM25Index | None:
+    """Load a persisted index if it was built from the same documents.
+
+    Returns:
+        The index, or None when the file is missing, corrupt, from
+        another index version or built from different documents.
+    """
+    try:
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        if raw.get("version") != _INDEX_VERSION:
+            return None
+        if raw.get("fingerprint") != expected_fingerprint:
+            return None
+        return BM25Index.from_dict(raw["index"])
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def save_index(index: BM25Index, path: str | Path, fingerprint: str) -> bool:
+    """Persist *index* to *path* atomically (temp file + rename).
+
+    Failures are logged, never raised.
+
+    Returns:
+        True if the index was written.
+    """
+    path = Path(path)
+    payload = {
+        "version": _INDEX_VERSION,
+        "fingerprint": fingerprint,
+        "index": index.to_dict(),
+    }
+    try:
+        write_json(path, payload)
+    except OSError:
+        logger.warning("Could not write text index %s", path, exc_info=True)
+        return False
+    return True
+
+
+def load_or_build(documents: Mapping[str, str], path: str | Path | None) -> BM25Index:
+    """Return the index persisted at *path* for *documents*, or build it.
+
+    A freshly built index is saved to *path*.  With *path* None the index
+    is always built and never persisted.
+
+    Args:
+        documents: Document id -> text.
+        path: Index file, or None.
+    """
+    if path is None:
+        return BM25Index(documents)
+    key = fingerprint(documents)
+    index = load_index(path, key)
+    if index is None:
+        index = BM25Index(documents)
+        save_index(index, path, key)
+    return index
@@ -0,0 +1,161 @@
+"""Thread-safe TTL cache with optional JSON persistence.
+
+Caches the results of slow external lookups (OpenViking queries) for a
+fixed time-to-live.  Entries expire *ttl* seconds after they were
+stored; expired entries are never returned and are evicted lazily.  When
+the cache is full the oldest entry is evicted first.
+
+With a *path*, the cache is loaded from that JSON file on first use and
+rewritten atomically (temp file + rename) after every store, so entries
+survive across processes.  Values must then be JSON-serializable.
+Timestamps are wall-clock (``time.time``) for the same reason.
+
+Usage:
+    cache = TTLCache(ttl=3600, path="state/.ov-cache.json")
+    hit = cache.get(key)
+    if hit is None:
+        cache.put(key, compute())
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+from pipeline.atomic_file import write_json
+
+logger = logging.getLogger(__name__)
+
+_CACHE_VERSION = 1
+
+
+class TTLCache:
+    """String-keyed cache whose entries expire after *ttl* seconds."""
+
+    def __init__(
+        self,
+        ttl: float,
+        *,
+        path: str | Path | None = None,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            ttl: Seconds an entry stays valid.  ``0`` disables caching.
+            path: JSON file to persist entries in, or None for memory only.
+            max_entries: Entries kept before the oldest is evicted.
+            clock: Time source (seconds); injectable for tests.
+        """
+        self._ttl = ttl
+        self._path = Path(path) if path is not None else None
+        self._max_entries = max_entries
+        self._clock = clock
+        # key -> (stored_at, value), oldest first
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._loaded = self._path is None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return sum(1 for stored, _ in self._entries.values() if self._fresh(stored))
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for *key*, or *default* if absent or expired."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if not self._fresh(entry[0]):
+                del self._entries[key]
+                return default
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        """Store *value* under *key* (a no-op when ttl is 0)."""
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            self._load()
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock(), value)
+            self._prune_locked()
+            self._save()
+
+    def invalidate(self, key: str) -> None:
+        """Drop *key* if cached."""
+        with self._lock:
+            self._load()
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def clear(self) -> None:
+        """Drop every entry (and the persisted copy)."""
+        with self._lock:
+            self._entries.clear()
+            self._loaded = True
+            self._save()
+
+    # --- Private helpers ---
+
+    def _fresh(self, stored_at: float) -> bool:
+        return self._clock() - stored_at < self._ttl
+
+    def _prune_locked(self) -> None:
+        for key in [k for k, (stored, _) in self._entries.items() if not self._fresh(stored)]:
+            del self._entries[key]
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self) -> None:
+        """Read the persisted entries, once.  A missing or corrupt file is ignored."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+            if raw.get("version") != _CACHE_VERSION:
+                return
+            entries = sorted(
+                (float(stored), str(key), value)
+                for key, (stored, value) in raw["entries"].items()
+            )
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return
+        for stored, key, value in entries:
+            if self._fresh(stored):
+                self._entries[key] = (stored, value)
+        self._prune_locked()
+
+    def _save(self) -> None:
+        """Persist the entries atomically; failures are logged, never raised."""
+        if self._path is None:
+            return
+        payload = {
+            "version": _CACHE_VERSION,
+            "entries": {k: [stored, value] for k, (stored, value) in self._entries.items()},
+        }
+        try:
+            write_json(self._path, payload)
+        except (OSError, TypeError, ValueError):
+            logger.warning("Could not write cache %s", self._path, exc_info=True)
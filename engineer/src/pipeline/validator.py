@@ -1,13 +1,19 @@
 """DAG validation for pipeline definitions.
 
 Validates structural correctness: unique slot IDs, valid dependencies,
-DAG acyclicity (Kahn's algorithm), I/O compatibility, and slot type
-existence.
+DAG acyclicity, I/O compatibility, and slot type existence.
+
+The dependency graph is built once per validation and shared by every
+check.  Acyclicity is checked with Kahn's algorithm; only when slots are
+left over are the cycles located, by an iterative Tarjan SCC pass over
+the leftover slots and a breadth-first search per strongly connected
+component for a shortest cycle through it.  Every step is linear in
+slots plus dependencies.
 """
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import deque
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
@@ -55,21 +61,22 @@ class PipelineValidator:
         """
         errors: list[str] = []
         warnings: list[str] = []
+        graph = _SlotGraph(pipeline.slots)
 
         # 1. Unique slot IDs
-        errors.extend(self._check_unique_ids(pipeline.slots))
+        errors.extend(self._check_unique_ids(graph))
 
         # 2. Valid dependencies
-        errors.extend(self._check_valid_dependencies(pipeline.slots))
+        errors.extend(self._check_valid_dependencies(graph))
 
         # 3. DAG acyclicity
-        errors.extend(self.check_dag(pipeline.slots))
+        errors.extend(graph.cycle_errors())
 
         # 4. I/O compatibility
-        errors.extend(self.check_io_compatibility(pipeline))
+        errors.extend(self._check_io(pipeline, graph))
 
         # 5. Terminal slot
-        terminal_warnings = self._check_terminal_slot(pipeline)
+        terminal_warnings = self._check_terminal_slot(pipeline, graph)
         warnings.extend(terminal_warnings)
 
         return ValidationResult(
@@ -79,7 +86,11 @@ class PipelineValidator:
         )
 
     def check_dag(self, slots: list[Slot]) -> list[str]:
-        """Check for dependency cycles using Kahn's algorithm.
+        """Check for dependency cycles.
+
+        Each cycle is reported once, as a shortest cycle through its
+        strongly connected component ("a -> b -> a", each slot depending
+        on the next).
 
         Args:
             slots: List of Slot objects.
@@ -87,32 +98,7 @@ class PipelineValidator:
         Returns:
             List of error messages. Empty = no cycles.
         """
-        slot_ids = {s.id for s in slots}
-        # Build adjacency: for each slot, its dependents
-        dependents: dict[str, list[str]] = defaultdict(list)
-        in_degree: dict[str, int] = {s.id: 0 for s in slots}
-
-        for slot in slots:
-            for dep in slot.depends_on:
-                if dep in slot_ids:
-                    dependents[dep].append(slot.id)
-                    in_degree[slot.id] += 1
-
-        queue = deque(sid for sid, deg in in_degree.items() if deg == 0)
-        sorted_count = 0
-
-        while queue:
-            node = queue.popleft()
-            sorted_count += 1
-            for dependent in dependents[node]:
-                in_degree[dependent] -= 1
-                if in_degree[dependent] == 0:
-                    queue.append(dependent)
-
-        if sorted_count != len(slots):
-            cycle_nodes = [sid for sid, deg in in_degree.items() if deg > 0]
-            return [f"Dependency cycle detected involving slots: {', '.join(cycle_nodes)}"]
-        return []
+        return _SlotGraph(slots).cycle_errors()
 
     def topological_sort(self, slots: list[Slot]) -> list[str]:
         """Return slot IDs in valid execution order.
@@ -129,33 +115,11 @@ class PipelineValidator:
         Raises:
             PipelineCycleError: Dependency cycle detected.
         """
-        slot_ids = {s.id for s in slots}
-        dependents: dict[str, list[str]] = defaultdict(list)
-        in_degree: dict[str, int] = {s.id: 0 for s in slots}
-
-        for slot in slots:
-            for dep in slot.depends_on:
-                if dep in slot_ids:
-                    dependents[dep].append(slot.id)
-                    in_degree[slot.id] += 1
-
-        queue = deque(sid for sid, deg in in_degree.items() if deg == 0)
-        result: list[str] = []
-
-        while queue:
-            node = queue.popleft()
-            result.append(node)
-            for dependent in dependents[node]:
-                in_degree[dependent] -= 1
-                if in_degree[dependent] == 0:
-                    queue.append(dependent)
-
-        if len(result) != len(slots):
-            cycle_nodes = [sid for sid, deg in in_degree.items() if deg > 0]
-            raise PipelineCycleError(
-                f"Dependency cycle detected involving slots: {', '.join(cycle_nodes)}"
-            )
-        return result
+        graph = _SlotGraph(slots)
+        order = graph.order()
+        if len(order) != len(graph.ids):
+            raise PipelineCycleError("; ".join(graph.cycle_errors()))
+        return [graph.ids[node] for node in order]
 
     def check_io_compatibility(self, pipeline: Pipeline) -> list[str]:
         """Verify every data_flow edge has a matching producer output.
@@ -168,29 +132,7 @@ class PipelineValidator:
         Returns:
             List of error messages. Empty = all compatible.
         """
-        errors: list[str] = []
-        slot_map = {s.id: s for s in pipeline.slots}
-        output_map: dict[str, set[str]] = {}
-        for slot in pipeline.slots:
-            output_map[slot.id] = {o.name for o in slot.outputs}
-
-        for edge in pipeline.data_flow:
-            if edge.from_slot not in slot_map:
-                errors.append(
-                    f"data_flow: from_slot '{edge.from_slot}' does not exist"
-                )
-                continue
-            if edge.to_slot not in slot_map:
-                errors.append(
-                    f"data_flow: to_slot '{edge.to_slot}' does not exist"
-                )
-                continue
-            if edge.artifact not in output_map.get(edge.from_slot, set()):
-                errors.append(
-                    f"data_flow: slot '{edge.from_slot}' has no output named "
-                    f"'{edge.artifact}' (required by '{edge.to_slot}')"
-                )
-        return errors
+        return self._check_io(pipeline, _SlotGraph(pipeline.slots))
 
     def check_slot_types(
         self, pipeline: Pipeline, registry: SlotRegistry
@@ -219,43 +161,254 @@ class PipelineValidator:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _check_unique_ids(slots: list[Slot]) -> list[str]:
+    def _check_unique_ids(graph: _SlotGraph) -> list[str]:
         """Check for duplicate slot IDs."""
-        seen: set[str] = set()
-        duplicates: list[str] = []
-        for slot in slots:
-            if slot.id in seen:
-                duplicates.append(f"Duplicate slot ID: '{slot.id}'")
-            seen.add(slot.id)
-        return duplicates
+        return [f"Duplicate slot ID: '{slot_id}'" for slot_id in graph.duplicates]
 
     @staticmethod
-    def _check_valid_dependencies(slots: list[Slot]) -> list[str]:
+    def _check_valid_dependencies(graph: _SlotGraph) -> list[str]:
         """Check all depends_on references point to existing slots."""
-        slot_ids = {s.id for s in slots}
+        return [
+            f"Slot '{slot_id}': depends_on '{dep}' does not exist"
+            for slot_id, dep in graph.missing
+        ]
+
+    @staticmethod
+    def _check_io(pipeline: Pipeline, graph: _SlotGraph) -> list[str]:
+        """check_io_compatibility() on an already built graph."""
         errors: list[str] = []
-        for slot in slots:
-            for dep in slot.depends_on:
-                if dep not in slot_ids:
-                    errors.append(
-                        f"Slot '{slot.id}': depends_on '{dep}' does not exist"
-                    )
+        outputs: dict[str, set[str]] = {}
+        for edge in pipeline.data_flow:
+            if edge.from_slot not in graph.index:
+                errors.append(
+                    f"data_flow: from_slot '{edge.from_slot}' does not exist"
+                )
+                continue
+            if edge.to_slot not in graph.index:
+                errors.append(
+                    f"data_flow: to_slot '{edge.to_slot}' does not exist"
+                )
+                continue
+            names = outputs.get(edge.from_slot)
+            if names is None:
+                slot = graph.slots[graph.index[edge.from_slot]]
+                names = outputs[edge.from_slot] = {o.name for o in slot.outputs}
+            if edge.artifact not in names:
+                errors.append(
+                    f"data_flow: slot '{edge.from_slot}' has no output named "
+                    f"'{edge.artifact}' (required by '{edge.to_slot}')"
+                )
         return errors
 
     @staticmethod
-    def _check_terminal_slot(pipeline: Pipeline) -> list[str]:
+    def _check_terminal_slot(pipeline: Pipeline, graph: _SlotGraph) -> list[str]:
         """Check that at least one slot has no dependents."""
         warnings: list[str] = []
-        all_deps: set[str] = set()
-        for slot in pipeline.slots:
-            all_deps.update(slot.depends_on)
-        # Also check data_flow edges
-        for edge in pipeline.data_flow:
-            all_deps.add(edge.from_slot)
-
-        slot_ids = {s.id for s in pipeline.slots}
+        # data_flow sources count as depended on, too
+        sources = {edge.from_slot for edge in pipeline.data_flow}
         # A terminal slot is one that no other slot depends on
-        terminal_slots = slot_ids - all_deps
-        if not terminal_slots and pipeline.slots:
+        has_terminal = any(
+            not graph.has_dependents(node) and slot_id not in sources
+            for node, slot_id in enumerate(graph.ids)
+        )
+        if not has_terminal and pipeline.slots:
             warnings.append("No terminal slot found (every slot is a dependency of another)")
         return warnings
+
+
+class _SlotGraph:
+    """Dependency graph of a slot list; nodes are numbered in list order.
+
+    Duplicate slot IDs share one node (their dependencies are merged).
+    Dependencies on unknown slots are kept in ``missing``, not as edges.
+    Adjacency is stored as flat arrays (CSR: the neighbours of node ``i``
+    are ``targets[start[i]:start[i + 1]]``) rather than one list per
+    node, which keeps the build cheap on very large pipelines.
+    """
+
+    def __init__(self, slots: list[Slot]) -> None:
+        self.index: dict[str, int] = {}
+        self.ids: list[str] = []
+        # Slot of each node; the last definition of a duplicate ID
+        self.slots: list[Slot] = []
+        self.duplicates: list[str] = []
+        for slot in slots:
+            node = self.index.get(slot.id)
+            if node is not None:
+                self.duplicates.append(slot.id)
+                self.slots[node] = slot
+            else:
+                self.index[slot.id] = len(self.ids)
+                self.ids.append(slot.id)
+                self.slots.append(slot)
+        # One entry per edge: the dependent slot and the slot it depends on
+        self._dependent: list[int] = []
+        self._dependency: list[int] = []
+        self.missing: list[tuple[str, str]] = []
+        index = self.index
+        for slot in slots:
+            node = index[slot.id]
+            for dep in slot.depends_on:
+                target = index.get(dep)
+                if target is None:
+                    self.missing.append((slot.id, dep))
+                else:
+                    self._dependent.append(node)
+                    self._dependency.append(target)
+        # Dependents of each slot, in slot order
+        self.dependents_start, self.dependents = _csr(
+            len(self.ids), self._dependency, self._dependent
+        )
+        self._order: list[int] | None = None
+
+    def has_dependents(self, node: int) -> bool:
+        """Whether any slot depends on *node*."""
+        return self.dependents_start[node + 1] > self.dependents_start[node]
+
+    def order(self) -> list[int]:
+        """Kahn's order; nodes on or behind a cycle are left out."""
+        if self._order is None:
+            in_degree = [0] * len(self.ids)
+            for node in self._dependent:
+                in_degree[node] += 1
+            queue = deque(node for node, degree in enumerate(in_degree) if degree == 0)
+            order: list[int] = []
+            start, dependents = self.dependents_start, self.dependents
+            while queue:
+                node = queue.popleft()
+                order.append(node)
+                for dependent in dependents[start[node]:start[node + 1]]:
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        queue.append(dependent)
+            self._order = order
+        return self._order
+
+    def cycles(self) -> list[list[str]]:
+        """A shortest cycle through each cyclic component.
+
+        Each cycle starts and ends with the component's first slot (in
+        slot order), each slot depending on the next; cycles are sorted
+        by that slot.
+        """
+        order = self.order()
+        if len(order) == len(self.ids):
+            return []
+        # Every cycle lies among the nodes Kahn's algorithm left over
+        excluded = bytearray(len(self.ids))
+        for node in order:
+            excluded[node] = 1
+        leftover = [node for node in range(len(self.ids)) if not excluded[node]]
+        start, targets = _csr(len(self.ids), self._dependent, self._dependency)
+        found: list[tuple[int, list[int]]] = []
+        for component in _strongly_connected(leftover, start, targets, excluded):
+            first = min(component)
+            if len(component) == 1 and first not in targets[start[first]:start[first + 1]]:
+                continue  # behind a cycle, not on one
+            found.append((first, _shortest_cycle(first, component, start, targets)))
+        found.sort()
+        return [[self.ids[node] for node in cycle] for _, cycle in found]
+
+    def cycle_errors(self) -> list[str]:
+        """One error message per cyclic component."""
+        return [
+            f"Dependency cycle detected: {' -> '.join(cycle)} "
+            "(each slot depends on the next)"
+            for cycle in self.cycles()
+        ]
+
+
+def _csr(n: int, keys: list[int], values: list[int]) -> tuple[list[int], list[int]]:
+    """Group *values* by *keys* (stable): returns (start, targets)."""
+    start = [0] * (n + 1)
+    for key in keys:
+        start[key + 1] += 1
+    for node in range(n):
+        start[node + 1] += start[node]
+    fill = start[:-1]
+    targets = [0] * len(values)
+    for key, value in zip(keys, values):
+        targets[fill[key]] = value
+        fill[key] += 1
+    return start, targets
+
+
+def _strongly_connected(
+    nodes: list[int], start: list[int], targets: list[int], excluded: bytearray
+) -> list[list[int]]:
+    """Tarjan's strongly connected components of *nodes*, iteratively.
+
+    Edges to nodes flagged in *excluded* are ignored.
+    """
+    index: dict[int, int] = {}
+    low: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    components: list[list[int]] = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        # (node, position of its next edge in targets)
+        work = [(root, start[root])]
+        while work:
+            node, pos = work[-1]
+            end = start[node + 1]
+            while pos < end:
+                target = targets[pos]
+                pos += 1
+                if excluded[target]:
+                    continue
+                if target not in index:
+                    work[-1] = (node, pos)
+                    index[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, start[target]))
+                    break
+                if target in on_stack and index[target] < low[node]:
+                    low[node] = index[target]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def _shortest_cycle(
+    first: int, component: list[int], start: list[int], targets: list[int]
+) -> list[int]:
+    """Shortest path from *first* back to itself within *component* (BFS)."""
+    members = set(component)
+    parent: dict[int, int] = {}
+    queue = deque([first])
+    while queue:
+        node = queue.popleft()
+        for target in targets[start[node]:start[node + 1]]:
+            if target == first:
+                path = [first]
+                while node != first:
+                    path.append(node)
+                    node = parent[node]
+                path.append(first)
+                return path[:1] + path[1:-1][::-1] + path[-1:]
+            if target in members and target not in parent:
+                parent[target] = node
+                queue.append(target)
+    return [first, first]  # unreachable for a strongly connected component
@@ -1,5 +1,8 @@
 """Shared pytest fixtures for pipeline tests."""
 
+import os
+import time
+
 import pytest
 
 from src.pipeline.models import (
@@ -20,6 +23,24 @@ from src.pipeline.models import (
 )
 
 
+@pytest.fixture
+def backdate():
+    """Return ``backdate(*paths, seconds=60)``, which ages files past the racy-mtime window.
+
+    Every file and directory under each path (the path itself included)
+    gets an mtime *seconds* in the past, so caches that distrust entries
+    modified within their mtime slack treat the tree as settled.
+    """
+    def _backdate(*paths, seconds=60):
+        past = time.time() - seconds
+        for root in paths:
+            for dirpath, _dirnames, filenames in os.walk(root):
+                for name in filenames:
+                    os.utime(os.path.join(dirpath, name), (past, past))
+                os.utime(dirpath, (past, past))
+    return _backdate
+
+
 @pytest.fixture
 def sample_slot_task():
     """Minimal SlotTask for unit tests."""
@@ -108,3 +129,94 @@ def state_dir(tmp_path):
     d.mkdir()
     (tmp_path / "archive").mkdir()
     return d
+
+
+# ---------------------------------------------------------------------------
+# Stub OpenViking server (pipeline.ov_client)
+# ---------------------------------------------------------------------------
+
+
+class StubOVServer:
+    """Local HTTP/1.1 server answering the OV routes used by OVClient.
+
+    ``routes`` maps a path to ``handler(query, body) -> (status, result)``;
+    results are wrapped as ``{"status": "ok", "result": ...}``.  Every
+    request is logged in ``requests`` and every client connection's port
+    in ``connections``.
+    """
+
+    def __init__(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        stub = self
+        self.requests = []
+        self.connections = set()
+        self.delay = 0.0
+        self.routes = {
+            "/health": lambda q, b: (200, "healthy"),
+            "/api/v1/content/abstract": lambda q, b: (200, "Project abstract text."),
+            "/api/v1/content/overview": lambda q, b: (200, f"Overview of {q['uri']}"),
+            "/api/v1/fs/ls": lambda q, b: (200, ["pipeline", "specs"]),
+            "/api/v1/search/find": lambda q, b: (200, [
+                {"uri": f"{b['target_uri']}/runner.py", "score": 0.85, "content": "runner code"},
+            ]),
+            "/api/v1/relations": lambda q, b: (200, [{"uri": "viking://test/a"}]),
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                import json
+                import time
+                from urllib.parse import parse_qsl, urlsplit
+
+                parts = urlsplit(self.path)
+                query = dict(parse_qsl(parts.query))
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                stub.requests.append((self.command, parts.path, query, body))
+                stub.connections.add(self.client_address[1])
+                if stub.delay:
+                    time.sleep(stub.delay)
+                route = stub.routes.get(parts.path)
+                status, result = route(query, body) if route else (404, "not found")
+                payload = json.dumps({"status": "ok", "result": result}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def paths(self):
+        return [path for _, path, _, _ in self.requests]
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def ov_server():
+    """A running StubOVServer."""
+    server = StubOVServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,176 @@
+"""Tests for pipeline.assignment -- policies, capacity and batch assignment."""
+
+from __future__ import annotations
+
+import pytest
+import yaml
+
+from pipeline.assignment import (
+    AgentAssigner,
+    BestOverlapPolicy,
+    FirstCompatiblePolicy,
+    LeastLoadedPolicy,
+    RoundRobinPolicy,
+    make_policy,
+)
+from pipeline.models import ExecutionConfig, Slot, SlotTask
+from pipeline.slot_registry import SlotRegistry
+
+
+def _agent(agents_dir, name, capabilities, slot_types=()):
+    lines = ["---", f"agent_id: {name}", "capabilities:"]
+    lines += [f"  - {c}" for c in capabilities]
+    if slot_types:
+        lines.append("compatible_slot_types:")
+        lines += [f"  - {t}" for t in slot_types]
+    (agents_dir / f"{name.lower()}.md").write_text("\n".join(lines + ["---", f"# {name}", ""]))
+
+
+def _slot(slot_id, slot_type="implementer"):
+    return Slot(
+        id=slot_id,
+        slot_type=slot_type,
+        name=slot_id,
+        task=SlotTask(objective=f"Do {slot_id}"),
+        execution=ExecutionConfig(parallel_group="g"),
+    )
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """implementer: ALL, ENG-A, ENG-B; designer: ALL, ARCH; tester: nobody.
+
+    Agents load in file name order, so the generalist ALL comes first.
+    """
+    types = tmp_path / "slot-types"
+    types.mkdir()
+    for type_id, caps in [
+        ("implementer", ["python"]),
+        ("designer", ["design"]),
+        ("tester", ["qa"]),
+    ]:
+        (types / f"{type_id}.yaml").write_text(yaml.dump({"slot_type": {
+            "id": type_id, "name": type_id, "category": "engineering",
+            "required_capabilities": caps,
+        }}))
+    agents = tmp_path / "agents"
+    agents.mkdir()
+    _agent(agents, "ALL", ["python", "design"])
+    _agent(agents, "ARCH", ["design"], ["designer"])
+    _agent(agents, "ENG-A", ["python", "sql", "docs"])
+    _agent(agents, "ENG-B", ["python"], ["implementer"])
+    return SlotRegistry(str(types), str(agents))
+
+
+class TestPolicies:
+    def test_make_policy(self):
+        assert isinstance(make_policy("first"), FirstCompatiblePolicy)
+        assert isinstance(make_policy("least-loaded"), LeastLoadedPolicy)
+        assert isinstance(make_policy("round-robin"), RoundRobinPolicy)
+        assert isinstance(make_policy("best-overlap"), BestOverlapPolicy)
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError, match="Unknown assignment policy"):
+            make_policy("random")
+
+    def test_first_keeps_load_order(self, registry):
+        assigner = AgentAssigner(registry)
+        assert assigner.candidates("implementer") == ["ALL", "ENG-A", "ENG-B"]
+
+    def test_least_loaded(self, registry):
+        assigner = AgentAssigner(registry, "least-loaded")
+        assigner.acquire("ALL")
+        assert assigner.candidates("implementer") == ["ENG-A", "ENG-B", "ALL"]
+
+    def test_round_robin_rotates(self, registry):
+        assigner = AgentAssigner(registry, "round-robin")
+        picked = [assigner.assign(_slot(f"s{i}")) for i in range(4)]
+        assert picked == ["ALL", "ENG-A", "ENG-B", "ALL"]
+
+    def test_best_overlap_prefers_specialists(self, registry):
+        assigner = AgentAssigner(registry, "best-overlap")
+        # ENG-B declares the type; ALL has one extra capability, ENG-A two
+        assert assigner.candidates("implementer") == ["ENG-B", "ALL", "ENG-A"]
+
+    def test_policy_instance(self, registry):
+        policy = RoundRobinPolicy()
+        assert AgentAssigner(registry, policy).policy is policy
+
+
+class TestAssign:
+    def test_no_compatible_agent(self, registry):
+        assert AgentAssigner(registry).assign(_slot("s", "tester")) is None
+
+    def test_load_tracking(self, registry):
+        assigner = AgentAssigner(registry)
+        agent = assigner.assign(_slot("s"))
+        assert assigner.load(agent) == 1
+        assigner.release(agent)
+        assert assigner.load(agent) == 0
+        assert assigner.total_assigned(agent) == 1
+        assigner.release(agent)
+        assert assigner.load(agent) == 0
+
+    def test_capacity_moves_to_next_agent(self, registry):
+        assigner = AgentAssigner(registry, capacity=1)
+        picked = [assigner.assign(_slot(f"s{i}")) for i in range(3)]
+        assert picked == ["ALL", "ENG-A", "ENG-B"]
+
+    def test_per_agent_capacity(self, registry):
+        assigner = AgentAssigner(registry, capacities={"ALL": 1})
+        picked = [assigner.assign(_slot(f"s{i}")) for i in range(3)]
+        assert picked == ["ALL", "ENG-A", "ENG-A"]
+
+    def test_all_full_overcommits_least_loaded(self, registry):
+        assigner = AgentAssigner(registry, capacity=1)
+        for i in range(3):
+            assigner.assign(_slot(f"s{i}"))
+        assigner.acquire("ALL")
+        assert assigner.assign(_slot("s3")) == "ENG-A"
+        assert assigner.load("ENG-A") == 2
+
+    def test_invalid_capacity(self, registry):
+        with pytest.raises(ValueError, match="at least 1"):
+            AgentAssigner(registry, capacity=0)
+
+
+class TestAssignBatch:
+    def test_first_policy_matches_original_behavior(self, registry):
+        batch = AgentAssigner(registry).assign_batch([_slot(f"s{i}") for i in range(4)])
+        assert set(batch.assigned.values()) == {"ALL"}
+        assert batch.deferred == [] and batch.unassigned == []
+
+    def test_balanced_spreads_wave(self, registry):
+        assigner = AgentAssigner(registry, "least-loaded")
+        batch = assigner.assign_batch([_slot(f"s{i}") for i in range(6)])
+        placed = list(batch.assigned.values())
+        assert {a: placed.count(a) for a in set(placed)} == {"ALL": 2, "ENG-A": 2, "ENG-B": 2}
+        assert assigner.load("ENG-A") == 2
+
+    def test_balancing_accounts_for_existing_load(self, registry):
+        assigner = AgentAssigner(registry, "least-loaded")
+        assigner.acquire("ALL")
+        assigner.acquire("ALL")
+        batch = assigner.assign_batch([_slot(f"s{i}") for i in range(4)])
+        assert "ALL" not in batch.assigned.values()
+
+    def test_augmenting_path_beats_greedy(self, registry):
+        assigner = AgentAssigner(registry, capacity=1)
+        assigner.acquire("ARCH")
+        # Greedy would give i1 the generalist and leave d1 with no agent
+        batch = assigner.assign_batch(
+            [_slot("i1"), _slot("i2"), _slot("d1", "designer")]
+        )
+        assert batch.assigned["d1"] == "ALL"
+        assert {batch.assigned["i1"], batch.assigned["i2"]} == {"ENG-A", "ENG-B"}
+        assert batch.deferred == []
+
+    def test_unassigned_and_deferred(self, registry):
+        assigner = AgentAssigner(registry, capacity=1)
+        batch = assigner.assign_batch(
+            [_slot("t", "tester")] + [_slot(f"s{i}") for i in range(4)]
+        )
+        assert batch.unassigned == ["t"]
+        assert batch.assigned == {"s0": "ALL", "s1": "ENG-A", "s2": "ENG-B"}
+        assert batch.deferred == ["s3"]
+        assert all(assigner.load(a) == 1 for a in ("ALL", "ENG-A", "ENG-B"))
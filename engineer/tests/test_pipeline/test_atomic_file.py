@@ -0,0 +1,50 @@
+"""Tests for pipeline.atomic_file -- atomic text and JSON writes."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.pipeline.atomic_file import RACY_WINDOW_NS, mtime_settled, write_json, write_text
+
+
+class TestWriteText:
+    def test_creates_parents_and_replaces(self, tmp_path):
+        path = tmp_path / "a" / "b" / "state.yaml"
+        write_text(path, "first\n")
+        write_text(path, "second 状态\n")
+        assert path.read_text(encoding="utf-8") == "second 状态\n"
+        assert [p.name for p in path.parent.iterdir()] == ["state.yaml"]
+
+    def test_failed_rename_keeps_old_file(self, tmp_path):
+        path = tmp_path / "state.yaml"
+        write_text(path, "old")
+        with patch("os.rename", side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                write_text(path, "new")
+        assert path.read_text() == "old"
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestWriteJson:
+    def test_round_trip_keeps_unicode(self, tmp_path):
+        path = tmp_path / "index.json"
+        write_json(path, {"关键词": [1, 2]}, indent=1)
+        assert "关键词" in path.read_text(encoding="utf-8")
+        assert json.loads(path.read_text(encoding="utf-8")) == {"关键词": [1, 2]}
+
+    def test_unserializable_payload_leaves_file(self, tmp_path):
+        path = tmp_path / "cache.json"
+        write_json(path, {"ok": True})
+        with pytest.raises(TypeError):
+            write_json(path, {"bad": object()})
+        assert json.loads(path.read_text()) == {"ok": True}
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestMtimeSettled:
+    def test_window_boundary(self):
+        observed = 10 * RACY_WINDOW_NS
+        assert mtime_settled(observed - RACY_WINDOW_NS - 1, observed)
+        assert not mtime_settled(observed - RACY_WINDOW_NS, observed)
+        assert not mtime_settled(observed, observed)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import dataclasses
 import threading
 from unittest.mock import MagicMock, patch
 
@@ -15,6 +16,7 @@ from pipeline.auto_executor import (
     AutoExecutorConfig,
     CallbackExecutor,
     SubprocessExecutor,
+    _Prefetched,
     _SlotTask,
 )
 from pipeline.models import (
@@ -253,6 +255,9 @@ class TestAutoExecutorConfig:
         assert cfg.max_parallel == 4
         assert cfg.timeout_default_hours == 4.0
         assert cfg.dry_run is False
+        assert cfg.assignment_policy == "first"
+        assert cfg.agent_capacity is None
+        assert cfg.prefetch is False
 
     def test_custom(self):
         cfg = AutoExecutorConfig(max_parallel=8, dry_run=True)
@@ -741,6 +746,7 @@ class TestAgentResolution:
         """Registry error falls through to (None, None)."""
         mock_registry = MagicMock(spec=SlotRegistry)
         mock_registry.find_compatible_agents.side_effect = RuntimeError("broken")
+        mock_registry.compatible_agent_ids.side_effect = RuntimeError("broken")
 
         slot = _make_slot("slot-a", slot_type="unknown-type")
         auto = AutoExecutor(
@@ -752,6 +758,113 @@ class TestAgentResolution:
         assert prompt is None
 
 
+class TestLoadBalancing:
+    """Tests for spreading parallel groups across compatible agents."""
+
+    @pytest.fixture
+    def second_engineer(self, project_dirs):
+        (project_dirs / "agents" / "eng2.md").write_text(
+            "---\nagent_id: ENG-002\ncapabilities:\n  - python\n---\n# Engineer 2\n"
+        )
+
+    def _run_group(self, runner, contract_manager, registry, project_dirs, config, n=4):
+        slots = [_make_slot(f"slot-{i}", parallel_group="g") for i in range(n)]
+        pipeline = _make_pipeline(slots)
+        state = _make_state(pipeline)
+        waves: list[list[tuple[str, str]]] = []
+        lock = threading.Lock()
+
+        def callback(si, aid):
+            with lock:
+                waves[-1].append((si.slot_id, aid))
+            return True
+
+        auto = AutoExecutor(
+            runner, CallbackExecutor(callback), contract_manager, registry,
+            config=config, project_root=str(project_dirs),
+        )
+        original = auto._execute_group
+
+        def tracked(group, *args):
+            waves.append([])
+            return original(group, *args)
+
+        auto._execute_group = tracked
+        final = auto.run(pipeline, state)
+        assert all(s.status == SlotStatus.COMPLETED for s in final.slots.values())
+        return [w for w in waves if w], auto
+
+    def test_default_uses_first_agent(
+        self, runner, contract_manager, registry, project_dirs, second_engineer
+    ):
+        waves, _ = self._run_group(
+            runner, contract_manager, registry, project_dirs, AutoExecutorConfig()
+        )
+        assert len(waves) == 1
+        assert {aid for _, aid in waves[0]} == {"ENG-001"}
+
+    def test_least_loaded_spreads_group(
+        self, runner, contract_manager, registry, project_dirs, second_engineer
+    ):
+        config = AutoExecutorConfig(assignment_policy="least-loaded")
+        waves, auto = self._run_group(
+            runner, contract_manager, registry, project_dirs, config
+        )
+        agents = [aid for _, aid in waves[0]]
+        assert agents.count("ENG-001") == agents.count("ENG-002") == 2
+        assert auto._assigner.load("ENG-001") == auto._assigner.load("ENG-002") == 0
+
+    def test_capacity_defers_to_next_wave(
+        self, runner, contract_manager, registry, project_dirs, second_engineer
+    ):
+        config = AutoExecutorConfig(assignment_policy="least-loaded", agent_capacity=1)
+        waves, _ = self._run_group(
+            runner, contract_manager, registry, project_dirs, config, n=5
+        )
+        assert [len(w) for w in waves] == [2, 2, 1]
+        for wave in waves:
+            agents = [aid for _, aid in wave]
+            assert len(agents) == len(set(agents))
+
+    def test_explicit_assignment_counts_toward_capacity(
+        self, runner, contract_manager, registry, project_dirs, second_engineer
+    ):
+        slots = [_make_slot(f"slot-{i}", parallel_group="g") for i in range(2)]
+        auto = AutoExecutor(
+            runner, CallbackExecutor(lambda si, aid: True), contract_manager, registry,
+            config=AutoExecutorConfig(agent_capacity=1),
+            assignments=[SlotAssignment(
+                slot_id="slot-0", slot_type="implementer",
+                agent_id="ENG-001", agent_prompt="eng.md",
+            )],
+        )
+        plan = auto._plan_group(slots)
+        assert plan["slot-0"][0] == "ENG-001"
+        assert plan["slot-1"][0] == "ENG-002"
+
+    def test_single_agent_at_capacity_does_not_stall(
+        self, runner, contract_manager, registry, project_dirs
+    ):
+        config = AutoExecutorConfig(agent_capacity=1)
+        waves, _ = self._run_group(
+            runner, contract_manager, registry, project_dirs, config, n=3
+        )
+        assert [len(w) for w in waves] == [1, 1, 1]
+
+    def test_run_single_slot_releases_agent(
+        self, runner, contract_manager, registry, project_dirs
+    ):
+        slot = _make_slot("slot-a")
+        pipeline = _make_pipeline([slot])
+        auto = AutoExecutor(
+            runner, CallbackExecutor(lambda si, aid: True), contract_manager, registry,
+            project_root=str(project_dirs),
+        )
+        auto.run_single_slot(slot, pipeline, _make_state(pipeline))
+        assert auto._assigner.load("ENG-001") == 0
+        assert auto._assigner.total_assigned("ENG-001") == 1
+
+
 # ===========================================================================
 # TestRetry
 # ===========================================================================
@@ -1261,3 +1374,152 @@ class TestGroupByParallel:
         assert len(groups) == 2
         assert "g1" in groups
         assert len(groups["g1"]) == 2
+
+
+# ===========================================================================
+# TestPrefetch
+# ===========================================================================
+
+
+class TestPrefetch:
+    """Tests for prefetching the next wave while agents run."""
+
+    @staticmethod
+    def _auto(runner, contract_manager, registry, project_dirs, callback):
+        return AutoExecutor(
+            runner, CallbackExecutor(callback), contract_manager, registry,
+            config=AutoExecutorConfig(prefetch=True),
+            project_root=str(project_dirs),
+        )
+
+    def test_dependent_prepared_while_upstream_runs(
+        self, runner, contract_manager, registry, project_dirs, monkeypatch
+    ):
+        """B's contract and context are built while A's agent runs."""
+        slot_a = _make_slot("slot-a")
+        slot_b = _make_slot("slot-b", depends_on=["slot-a"])
+        pipeline = _make_pipeline([slot_a, slot_b])
+        state = _make_state(pipeline)
+
+        prepared = threading.Event()
+        generate = contract_manager.generate_slot_input
+
+        def tracking_generate(slot, pipeline, state):
+            result = generate(slot, pipeline, state)
+            if slot.id == "slot-b":
+                prepared.set()
+            return result
+
+        monkeypatch.setattr(contract_manager, "generate_slot_input", tracking_generate)
+        prefetched_context = []
+        monkeypatch.setattr(
+            runner, "prefetch_context",
+            lambda slot, pipeline: prefetched_context.append(slot.id),
+        )
+        overlapped = []
+
+        def callback(si, aid):
+            if si.slot_id == "slot-a":
+                overlapped.append(prepared.wait(timeout=5))
+            return True
+
+        auto = self._auto(runner, contract_manager, registry, project_dirs, callback)
+        final = auto.run(pipeline, state)
+        assert final.slots["slot-b"].status == SlotStatus.COMPLETED
+        assert overlapped == [True]
+        assert prefetched_context == ["slot-b"]
+        assert (auto.prefetch_hits, auto.prefetch_discarded) == (1, 0)
+
+    def test_wrong_prediction_discarded(
+        self, runner, contract_manager, registry, project_dirs, monkeypatch
+    ):
+        """A fails, so B's speculative contract is never used."""
+        slot_a = _make_slot("slot-a", retry_on_fail=False)
+        slot_b = _make_slot("slot-b", depends_on=["slot-a"])
+        pipeline = _make_pipeline([slot_a, slot_b])
+        state = _make_state(pipeline)
+
+        monkeypatch.setattr(
+            runner, "prefetch_context",
+            lambda slot, pipeline: runner._prefetched_context.update(
+                {(pipeline.id, slot.id): ([], "")}
+            ),
+        )
+        auto = self._auto(
+            runner, contract_manager, registry, project_dirs, lambda si, aid: False
+        )
+        final = auto.run(pipeline, state)
+        assert final.slots["slot-b"].status == SlotStatus.PENDING
+        assert (auto.prefetch_hits, auto.prefetch_discarded) == (0, 1)
+        assert not auto._prefetched
+        assert not runner._prefetched_context
+
+    def test_mismatched_upstream_regenerates(
+        self, runner, contract_manager, registry, project_dirs
+    ):
+        """A contract whose upstream statuses changed is not reused."""
+        slot_a = _make_slot("slot-a")
+        slot_b = _make_slot("slot-b", depends_on=["slot-a"])
+        pipeline = _make_pipeline([slot_a, slot_b])
+        state = _make_state(pipeline)
+        state.slots["slot-a"].status = SlotStatus.SKIPPED
+
+        auto = self._auto(
+            runner, contract_manager, registry, project_dirs, lambda si, aid: True
+        )
+        auto._prefetched["slot-b"] = _Prefetched(
+            slot_input=_make_slot_input("slot-b"),
+            assumed={"slot-a": SlotStatus.COMPLETED},
+        )
+        assert auto._take_prefetched(slot_b, state) is None
+        assert auto.prefetch_discarded == 1
+
+    def test_diamond_prefetches_each_wave(
+        self, runner, contract_manager, registry, project_dirs
+    ):
+        """A -> B,C -> D: B, C and D are all served from the prefetch."""
+        slot_a = _make_slot("slot-a")
+        slot_b = _make_slot("slot-b", depends_on=["slot-a"], parallel_group="p1")
+        slot_c = _make_slot("slot-c", depends_on=["slot-a"], parallel_group="p1")
+        slot_d = _make_slot("slot-d", depends_on=["slot-b", "slot-c"])
+        pipeline = _make_pipeline([slot_a, slot_b, slot_c, slot_d])
+        state = _make_state(pipeline)
+
+        auto = self._auto(
+            runner, contract_manager, registry, project_dirs, lambda si, aid: True
+        )
+        final = auto.run(pipeline, state)
+        for sid in ["slot-a", "slot-b", "slot-c", "slot-d"]:
+            assert final.slots[sid].status == SlotStatus.COMPLETED
+        assert (auto.prefetch_hits, auto.prefetch_discarded) == (3, 0)
+
+    def test_reused_contract_restamped(
+        self, runner, contract_manager, registry, project_dirs
+    ):
+        slot_a = _make_slot("slot-a")
+        pipeline = _make_pipeline([slot_a])
+        state = _make_state(pipeline)
+        speculative = dataclasses.replace(
+            contract_manager.generate_slot_input(slot_a, pipeline, state),
+            generated_at="2000-01-01T00:00:00+00:00",
+        )
+        auto = self._auto(
+            runner, contract_manager, registry, project_dirs, lambda si, aid: True
+        )
+        auto._prefetched["slot-a"] = _Prefetched(slot_input=speculative, assumed={})
+        reused = auto._take_prefetched(slot_a, state)
+        assert reused.generated_at > speculative.generated_at
+        assert dataclasses.replace(reused, generated_at=speculative.generated_at) == speculative
+
+    def test_disabled_by_default(
+        self, runner, contract_manager, registry, project_dirs
+    ):
+        slot_a = _make_slot("slot-a")
+        slot_b = _make_slot("slot-b", depends_on=["slot-a"])
+        pipeline = _make_pipeline([slot_a, slot_b])
+        auto = AutoExecutor(
+            runner, CallbackExecutor(lambda si, aid: True), contract_manager, registry,
+            project_root=str(project_dirs),
+        )
+        auto.run(pipeline, _make_state(pipeline))
+        assert auto.prefetch_hits == 0
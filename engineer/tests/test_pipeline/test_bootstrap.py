@@ -161,6 +161,25 @@ class TestBoot:
         assert final.slots["slot-impl"].status == SlotStatus.COMPLETED
 
 
+class TestSharedComponents:
+    """boot() builds each component once and the matcher lazily."""
+
+    def test_runner_and_executor_share_registry(self, project_root):
+        auto, runner = boot(str(project_root))
+        assert auto._auto._registry is runner._registry
+
+    def test_matcher_built_on_first_use(self, project_root):
+        auto, runner = boot(str(project_root))
+        assert not runner.components.is_built("matcher")
+        auto.match("implement a new feature")
+        assert runner.components.is_built("matcher")
+
+    def test_directory_overrides(self, project_root):
+        (project_root / "custom-agents").mkdir()
+        auto, runner = boot(str(project_root), agents_dir="custom-agents")
+        assert runner.components.agents_dir == str(project_root.resolve() / "custom-agents")
+
+
 class TestBootstrappedExecutor:
     """Tests for BootstrappedExecutor wrapper."""
 
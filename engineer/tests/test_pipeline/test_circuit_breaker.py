@@ -0,0 +1,77 @@
+"""Tests for pipeline.circuit_breaker -- closed / open / half-open breaker."""
+
+import pytest
+
+from src.pipeline.circuit_breaker import BreakerState, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+
+
+class TestCircuitBreaker:
+    def test_starts_closed(self, breaker):
+        assert breaker.state is BreakerState.CLOSED
+        assert breaker.allow() is True
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow() is True
+        breaker.record_failure()
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.allow() is False
+
+    def test_success_resets_failure_count(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state is BreakerState.CLOSED
+        assert breaker.failures == 1
+
+    def test_half_open_allows_single_probe(self, breaker, clock):
+        breaker.trip()
+        clock.now += 29
+        assert breaker.allow() is False
+        clock.now += 1
+        assert breaker.allow() is True
+        assert breaker.state is BreakerState.HALF_OPEN
+        assert breaker.allow() is False
+
+    def test_probe_success_closes(self, breaker, clock):
+        breaker.trip()
+        clock.now += 30
+        breaker.allow()
+        breaker.record_success()
+        assert breaker.state is BreakerState.CLOSED
+        assert breaker.failures == 0
+
+    def test_probe_failure_reopens(self, breaker, clock):
+        breaker.trip()
+        clock.now += 30
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state is BreakerState.OPEN
+        clock.now += 29
+        assert breaker.allow() is False
+        clock.now += 1
+        assert breaker.allow() is True
+
+    def test_invalid_threshold(self):
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_threshold=0)
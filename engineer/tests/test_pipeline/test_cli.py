@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import json
+import os
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 import yaml
@@ -116,6 +120,13 @@ class TestMatch:
         out = capsys.readouterr().out
         assert "No template matched" in out
 
+    def test_match_rank(self, project, capsys):
+        # "design" only occurs in the slot objectives
+        assert main(["-P", str(project), "match", "design", "review"]) == 1
+        capsys.readouterr()
+        assert main(["-P", str(project), "match", "--rank", "design", "review"]) == 0
+        assert "standard-feature" in capsys.readouterr().out
+
 
 class TestPrepare:
     def test_prepare_creates_pipeline(self, project, capsys):
@@ -240,6 +251,88 @@ class TestWorkflow:
         assert "COMPLETED" in out
 
 
+class TestTimings:
+    def test_timings_printed_to_stderr(self, project, capsys):
+        main(["-P", str(project), "prepare", "standard-feature.yaml"])
+        capsys.readouterr()
+        ret = main(["--timings", "begin", "slot-design"])
+        assert ret == 0
+        captured = capsys.readouterr()
+        assert "Slot started: slot-design" in captured.out
+        assert "Stage timings" in captured.err
+        assert "gate_check" in captured.err
+
+    def test_no_timings_by_default(self, project, capsys):
+        main(["-P", str(project), "prepare", "standard-feature.yaml"])
+        captured = capsys.readouterr()
+        assert "Stage timings" not in captured.err
+
+
+class TestProfile:
+    def test_profile_writes_pstats_and_collapsed(self, project, capsys):
+        main(["-P", str(project), "prepare", "standard-feature.yaml"])
+        capsys.readouterr()
+        ret = main(["--profile", "--profile-top", "5", "begin", "slot-design"])
+        assert ret == 0
+        captured = capsys.readouterr()
+        assert "Slot started: slot-design" in captured.out
+        assert "cumulative" in captured.err
+
+        profiles = project / "state" / "active" / "profiles"
+        pstats_files = list(profiles.glob("begin-*.pstats"))
+        collapsed_files = list(profiles.glob("begin-*.collapsed.txt"))
+        assert len(pstats_files) == 1
+        assert len(collapsed_files) == 1
+
+        lines = collapsed_files[0].read_text().splitlines()
+        assert lines
+        stack, weight = lines[0].rsplit(" ", 1)
+        assert int(weight) > 0
+        assert any("cmd_begin" in line for line in lines)
+
+    def test_profile_keeps_exit_code(self, project, capsys):
+        main(["-P", str(project), "prepare", "standard-feature.yaml"])
+        ret = main(["--profile", "begin", "no-such-slot"])
+        assert ret == 1
+
+
+class TestFastStart:
+    def test_import_does_not_load_engine_modules(self):
+        """pipeline.cli must stay cheap to import (lazy engine imports)."""
+        src_dir = Path(__file__).resolve().parents[2] / "src"
+        code = (
+            "import sys, pipeline.cli; "
+            "heavy = ['pipeline.runner', 'pipeline.loader', 'pipeline.validator', "
+            "'pipeline.slot_registry', 'pipeline.gate_checker', "
+            "'pipeline.nl_matcher', 'pipeline.auto_executor']; "
+            "print(','.join(m for m in heavy if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True,
+            env={**os.environ, "PYTHONPATH": str(src_dir)},
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == ""
+
+    def test_status_reads_state_without_template(self, project, capsys):
+        """Read-only commands do not re-parse the pipeline template."""
+        main(["-P", str(project), "prepare", "standard-feature.yaml"])
+        main(["begin", "slot-design"])
+        (project / "specs" / "pipelines" / "templates" / "standard-feature.yaml").unlink()
+        capsys.readouterr()
+
+        assert main(["status"]) == 0
+        out = capsys.readouterr().out
+        assert "Pipeline: standard-feature v1.0.0" in out
+        assert "in_progress: 1" in out
+
+        assert main(["summary"]) == 0
+        out = capsys.readouterr().out
+        assert "[IN_PROGRESS] slot-design" in out
+        assert "Progress: 0/2 slots" in out
+
+
 class TestFail:
     def test_fail_slot(self, project, capsys):
         main(["-P", str(project), "prepare", "standard-feature.yaml"])
@@ -0,0 +1,121 @@
+"""Tests for pipeline.components -- shared, lazily built engine components."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+import yaml
+
+from pipeline.components import DEFAULT_DIRS, Components
+from pipeline.runner import PipelineRunner
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "specs" / "pipelines" / "templates").mkdir(parents=True)
+    (tmp_path / "specs" / "pipelines" / "slot-types").mkdir(parents=True)
+    (tmp_path / "state" / "active").mkdir(parents=True)
+    (tmp_path / "agents").mkdir()
+    (tmp_path / "specs" / "pipelines" / "templates" / "research-task.yaml").write_text(
+        yaml.dump({"pipeline": {"id": "research-task", "description": "Research"}})
+    )
+    return tmp_path
+
+
+class TestDirs:
+    def test_defaults(self, project):
+        c = Components(str(project))
+        assert c.project_root == str(project.resolve())
+        assert c.templates_dir == str(project.resolve() / DEFAULT_DIRS["templates_dir"])
+        assert c.contracts_dir == str(project.resolve() / "state" / "contracts")
+
+    def test_overrides(self, project, tmp_path):
+        c = Components(str(project), agents_dir="my-agents", state_dir=str(tmp_path / "s"))
+        assert c.agents_dir == str(project.resolve() / "my-agents")
+        assert c.state_dir == str(tmp_path / "s")
+
+
+class TestLazy:
+    def test_nothing_built_up_front(self, project):
+        c = Components(str(project))
+        for name in ("loader", "registry", "matcher", "runner"):
+            assert not c.is_built(name)
+
+    def test_built_once(self, project):
+        c = Components(str(project))
+        assert c.registry is c.registry
+        assert c.loader is c.loader
+        assert c.runner is c.runner
+        assert c.is_built("registry")
+
+    def test_runner_shares_components(self, project):
+        c = Components(str(project))
+        runner = c.runner
+        assert runner.components is c
+        assert runner._registry is c.registry
+        assert runner._loader is c.loader
+        assert not c.is_built("matcher")
+
+    def test_make_runner_is_new_but_shared(self, project):
+        c = Components(str(project))
+        runner = c.make_runner()
+        assert runner is not c.runner
+        assert runner._registry is c.runner._registry
+        assert runner._pipeline_cache is c.runner._pipeline_cache
+
+    def test_standalone_runner_builds_private_container(self, project):
+        root = project
+        runner = PipelineRunner(
+            project_root=str(root),
+            templates_dir=str(root / DEFAULT_DIRS["templates_dir"]),
+            state_dir=str(root / DEFAULT_DIRS["state_dir"]),
+            slot_types_dir=str(root / DEFAULT_DIRS["slot_types_dir"]),
+            agents_dir=str(root / DEFAULT_DIRS["agents_dir"]),
+        )
+        assert runner.components.agents_dir == str(root / "agents")
+        assert runner._registry is runner.components.registry
+
+
+class TestCached:
+    def test_matcher_rebuilt_on_template_change(self, project):
+        c = Components(str(project))
+        first = c.matcher
+        assert c.matcher is first
+
+        template = project / "specs" / "pipelines" / "templates" / "research-task.yaml"
+        st = template.stat()
+        os.utime(template, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert c.matcher is not first
+
+    def test_indexed_matcher(self, project):
+        c = Components(str(project))
+        indexed = c.indexed_matcher
+        assert indexed is not c.matcher
+        assert indexed._text_index is not None
+        # Writing the index file does not invalidate either matcher
+        assert c.indexed_matcher is indexed
+
+    def test_runners_share_file_cache(self, project):
+        (project / "constitution.md").write_text("# Constitution\n")
+        c = Components(str(project))
+        runners = [c.make_runner(constitution_path=str(project / "constitution.md"))
+                   for _ in range(2)]
+        assert runners[0]._context_router._files is c.file_cache
+        assert runners[1]._context_router._files is c.file_cache
+
+    def test_cached_file(self, tmp_path):
+        c = Components(str(tmp_path))
+        path = tmp_path / "x.yaml"
+        path.write_text("a: 1")
+        calls = []
+        build = lambda: calls.append(1) or len(calls)
+        assert c.cached("x", path, build) == 1
+        assert c.cached("x", path, build) == 1
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert c.cached("x", path, build) == 2
+
+    def test_cached_missing_path(self, tmp_path):
+        c = Components(str(tmp_path))
+        assert c.cached("x", tmp_path / "missing", lambda: "built") == "built"
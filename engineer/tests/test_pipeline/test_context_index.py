@@ -0,0 +1,143 @@
+"""Tests for pipeline.context_index -- incremental context file index."""
+
+import json
+import os
+
+import pytest
+
+from src.pipeline.context_index import ContextFileIndex
+
+
+@pytest.fixture
+def tree(tmp_path, backdate):
+    root = tmp_path / "project"
+    for rel in ("specs/pipelines", "architect", ".git/objects", "state/active",
+                "engineer/node_modules/pkg"):
+        (root / rel).mkdir(parents=True)
+    for rel in ("specs/.abstract.md", "specs/.overview.md", "specs/pipelines/.overview.md",
+                "architect/.abstract.md", ".git/objects/.abstract.md",
+                "state/active/.overview.md", "engineer/node_modules/pkg/.abstract.md",
+                "specs/README.md"):
+        (root / rel).write_text("x", encoding="utf-8")
+    backdate(root)
+    return root
+
+
+class TestScan:
+    def test_finds_context_files(self, tree):
+        index = ContextFileIndex(tree)
+        index.refresh()
+        assert index.abstract_files == ["architect/.abstract.md", "specs/.abstract.md"]
+        assert index.overview_files == ["specs/.overview.md", "specs/pipelines/.overview.md"]
+
+    def test_ignored_dirs_not_listed(self, tree):
+        index = ContextFileIndex(tree)
+        index.refresh()
+        # root, specs, specs/pipelines, architect, state, engineer
+        assert index.dirs_listed == 6
+
+    def test_custom_ignore(self, tree):
+        index = ContextFileIndex(tree, ignore=["specs/pipelines", "architect"])
+        index.refresh()
+        assert ".git/objects/.abstract.md" in index.abstract_files
+        assert "architect/.abstract.md" not in index.abstract_files
+        assert "specs/pipelines/.overview.md" not in index.overview_files
+
+    def test_extra_suffixes(self, tree):
+        index = ContextFileIndex(tree, suffixes=[".md"])
+        index.refresh()
+        assert index.files("README.md") == ["specs/README.md"]
+        assert "specs/.abstract.md" in index.files()
+        assert index.abstract_files == ["architect/.abstract.md", "specs/.abstract.md"]
+
+    def test_missing_root(self, tmp_path):
+        index = ContextFileIndex(tmp_path / "missing", path=tmp_path / "missing" / "i.json")
+        index.refresh()
+        assert index.abstract_files == []
+        assert not (tmp_path / "missing").exists()
+
+
+class TestIncremental:
+    def test_unchanged_dirs_not_relisted(self, tree):
+        index = ContextFileIndex(tree)
+        index.refresh()
+        index.refresh()
+        assert index.dirs_listed == 0
+
+    def test_added_and_removed_files(self, tree):
+        index = ContextFileIndex(tree)
+        index.refresh()
+        (tree / "architect" / ".overview.md").write_text("x", encoding="utf-8")
+        (tree / "specs" / ".abstract.md").unlink()
+        index.refresh()
+        assert index.dirs_listed == 2
+        assert index.abstract_files == ["architect/.abstract.md"]
+        assert "architect/.overview.md" in index.overview_files
+
+    def test_new_and_deleted_dirs(self, tree):
+        index = ContextFileIndex(tree)
+        index.refresh()
+        (tree / "docs" / "guide").mkdir(parents=True)
+        (tree / "docs" / "guide" / ".abstract.md").write_text("x", encoding="utf-8")
+        (tree / "specs" / "pipelines" / ".overview.md").unlink()
+        (tree / "specs" / "pipelines").rmdir()
+        index.refresh()
+        assert "docs/guide/.abstract.md" in index.abstract_files
+        assert index.overview_files == ["specs/.overview.md"]
+
+    def test_recent_dirs_relisted(self, tree):
+        index = ContextFileIndex(tree)
+        index.refresh()
+        os.utime(tree / "specs", None)  # modified "now", within the mtime slack
+        index.refresh()
+        index.refresh()
+        assert index.dirs_listed == 1
+
+
+class TestPersistence:
+    def test_new_instance_reuses_index(self, tree, tmp_path):
+        path = tmp_path / "index.json"
+        ContextFileIndex(tree, path=path).refresh()
+        index = ContextFileIndex(tree, path=path)
+        index.refresh()
+        assert index.dirs_listed == 0
+        assert index.abstract_files == ["architect/.abstract.md", "specs/.abstract.md"]
+
+    def test_index_in_root_not_rewritten(self, tree):
+        path = tree / ".context-index.json"
+        ContextFileIndex(tree, path=path).refresh()
+        written = path.stat().st_mtime_ns
+        ContextFileIndex(tree, path=path).refresh()
+        ContextFileIndex(tree, path=path).refresh()
+        assert path.stat().st_mtime_ns == written
+
+    def test_other_ignore_set_discards_index(self, tree, tmp_path):
+        path = tmp_path / "index.json"
+        ContextFileIndex(tree, path=path).refresh()
+        index = ContextFileIndex(tree, path=path, ignore=[".git"])
+        index.refresh()
+        assert index.dirs_listed > 0
+        assert "state/active/.overview.md" in index.overview_files
+
+    def test_other_suffixes_discard_index(self, tree, tmp_path):
+        path = tmp_path / "index.json"
+        ContextFileIndex(tree, path=path).refresh()
+        index = ContextFileIndex(tree, path=path, suffixes=[".md"])
+        index.refresh()
+        assert index.dirs_listed > 0
+        assert "specs/README.md" in index.files()
+
+    def test_corrupt_file_ignored(self, tree, tmp_path):
+        path = tmp_path / "index.json"
+        path.write_text("{not json", encoding="utf-8")
+        index = ContextFileIndex(tree, path=path)
+        index.refresh()
+        assert index.abstract_files == ["architect/.abstract.md", "specs/.abstract.md"]
+        assert json.loads(path.read_text(encoding="utf-8"))["version"] == 1
+
+    def test_unwritable_path_is_not_fatal(self, tree, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        index = ContextFileIndex(tree, path=blocker / "index.json")
+        index.refresh()
+        assert index.abstract_files
@@ -0,0 +1,147 @@
+"""Tests for pipeline.context_pack -- deduplicated slot context packs."""
+
+import json
+
+import pytest
+
+from src.pipeline.context_pack import (
+    BlockStore,
+    read_pack,
+    write_pack,
+)
+from src.pipeline.models import ContextItem, ContextTier
+
+
+def _item(path, tier=ContextTier.L0):
+    return ContextItem(path=path, tier=tier, relevance=0.5, tokens_estimate=10)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlockStore(tmp_path / "blocks")
+
+
+class TestBlockStore:
+    def test_put_and_get(self, store):
+        ref = store.put(b"constitution")
+        assert store.get(ref.digest) == b"constitution"
+        assert ref.digest in store
+        assert store.get("0" * 64) is None
+
+    def test_same_content_stored_once(self, store):
+        first = store.put(b"shared")
+        second = store.put(b"shared")
+        store.put(b"other")
+        assert first == second
+        assert len(store) == 2
+        assert (store.blocks_written, store.blocks_reused) == (2, 1)
+        assert store.data_path.stat().st_size == len(b"shared") + len(b"other")
+
+    def test_sees_blocks_of_other_instances(self, store):
+        other = BlockStore(store.root)
+        ref = other.put(b"from another runner")
+        assert store.put(b"from another runner") == ref
+        assert store.blocks_written == 0
+
+    def test_partial_index_line_ignored(self, store):
+        ref = store.put(b"complete")
+        with open(store.root / "blocks.idx", "ab") as f:
+            f.write(b"abc 12")
+        fresh = BlockStore(store.root)
+        assert len(fresh) == 1
+        assert fresh.get(ref.digest) == b"complete"
+
+    def test_corrupt_index_line_skipped(self, store):
+        store.put(b"ok")
+        with open(store.root / "blocks.idx", "ab") as f:
+            f.write(b"not a valid line at all\n")
+        assert len(BlockStore(store.root)) == 1
+
+
+class TestPack:
+    def test_round_trip(self, store, tmp_path):
+        path = tmp_path / "p-slot-context.pack.json"
+        write_pack(path, store, [
+            (_item("docs/constitution.md", ContextTier.L2), "# Rules\n"),
+            (_item("specs/.abstract.md"), "规格摘要"),
+        ])
+        assert read_pack(path) == {
+            "docs/constitution.md": "# Rules\n",
+            "specs/.abstract.md": "规格摘要",
+        }
+
+    def test_manifest_lists_items_in_order(self, store, tmp_path):
+        path = tmp_path / "pack.json"
+        write_pack(path, store, [
+            (_item("b.md"), "b"), (_item("viking://ns/a"), None), (_item("a.md"), "a"),
+        ])
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        assert [i["path"] for i in manifest["items"]] == ["b.md", "viking://ns/a", "a.md"]
+        assert "digest" not in manifest["items"][1]
+        assert manifest["items"][0]["tier"] == ContextTier.L0.value
+        assert "viking://ns/a" not in read_pack(path)
+
+    def test_sibling_packs_share_blocks(self, store, tmp_path):
+        for slot in ("a", "b"):
+            write_pack(tmp_path / f"{slot}.pack.json", store, [
+                (_item("docs/constitution.md"), "shared rules"),
+                (_item(f"{slot}.md"), f"only {slot}"),
+            ])
+        assert store.blocks_written == 3
+        assert read_pack(tmp_path / "b.pack.json")["docs/constitution.md"] == "shared rules"
+
+    def test_empty_documents(self, store, tmp_path):
+        write_pack(tmp_path / "pack.json", store, [(_item("empty.md"), "")])
+        assert read_pack(tmp_path / "pack.json") == {"empty.md": ""}
+
+    def test_no_items(self, store, tmp_path):
+        write_pack(tmp_path / "pack.json", store, [])
+        assert read_pack(tmp_path / "pack.json") == {}
+
+    def test_unsupported_version(self, store, tmp_path):
+        path = tmp_path / "pack.json"
+        path.write_text(json.dumps({"version": 99, "items": []}), encoding="utf-8")
+        with pytest.raises(ValueError):
+            read_pack(path)
+
+
+class TestCompact:
+    def test_drops_unreferenced_blocks(self, store, tmp_path):
+        write_pack(tmp_path / "a.pack.json", store, [(_item("old.md"), "superseded")])
+        write_pack(tmp_path / "a.pack.json", store, [(_item("new.md"), "current text")])
+        write_pack(tmp_path / "b.pack.json", store, [(_item("c.md"), "shared")])
+        reclaimed = store.compact(tmp_path.glob("*.pack.json"))
+        assert reclaimed == len(b"superseded")
+        assert len(store) == 2
+        assert store.data_path.stat().st_size == len(b"current textshared")
+        assert read_pack(tmp_path / "a.pack.json") == {"new.md": "current text"}
+        assert read_pack(tmp_path / "b.pack.json") == {"c.md": "shared"}
+        assert len(BlockStore(store.root)) == 2
+
+    def test_nothing_to_drop(self, store, tmp_path):
+        write_pack(tmp_path / "a.pack.json", store, [(_item("a.md"), "text")])
+        before = (tmp_path / "a.pack.json").read_text()
+        assert store.compact([tmp_path / "a.pack.json"]) == 0
+        assert (tmp_path / "a.pack.json").read_text() == before
+
+    def test_empty_store(self, store):
+        assert store.compact([]) == 0
+
+    def test_other_instances_reload_index(self, store, tmp_path):
+        other = BlockStore(store.root)
+        other.put(b"dropped")
+        write_pack(tmp_path / "a.pack.json", store, [(_item("a.md"), "kept")])
+        store.compact([tmp_path / "a.pack.json"])
+        # other's cached offsets are stale; it must not reuse them
+        assert other.get(store.put(b"kept").digest) == b"kept"
+        assert len(other) == 1
+
+    def test_manifests_of_other_stores_ignored(self, store, tmp_path):
+        foreign = BlockStore(tmp_path / "foreign")
+        write_pack(tmp_path / "f.pack.json", foreign, [(_item("f.md"), "foreign")])
+        store.put(b"unreferenced")
+        (tmp_path / "broken.pack.json").write_text("{not json")
+        paths = [tmp_path / "f.pack.json", tmp_path / "broken.pack.json"]
+        assert store.compact(paths) == len(b"unreferenced")
+        assert len(store) == 0
+        assert read_pack(tmp_path / "f.pack.json") == {"f.md": "foreign"}
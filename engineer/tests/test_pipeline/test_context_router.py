@@ -1,10 +1,13 @@
 """Tests for pipeline.context_router -- context routing engine."""
 
+import os
+
 import pytest
 import yaml
 from dataclasses import FrozenInstanceError
 
-from src.pipeline.context_router import ContextRouter
+from src.pipeline.context_pack import BlockStore, read_pack, write_manifest
+from src.pipeline.context_router import ContextRouter, new_file_cache
 from src.pipeline.models import (
     ContextItem,
     ContextTier,
@@ -12,6 +15,8 @@ from src.pipeline.models import (
     Slot,
     SlotTask,
 )
+from src.pipeline.token_estimator import estimate_tokens
+from src.pipeline.ttl_cache import TTLCache
 
 
 # ---------------------------------------------------------------------------
@@ -514,7 +519,7 @@ class TestOVFallback:
             use_openviking=True,
         )
         # Force OV to return None (unavailable)
-        monkeypatch.setattr(router._ov_router, "_available", False)
+        router._ov_router.breaker.trip()
 
         items = router.build_context(designer_slot, simple_pipeline)
         # Should still get file-scan results (constitution + abstract/overview)
@@ -565,3 +570,321 @@ class TestOVFallback:
         assert runner._context_router is not None
         assert runner._context_router._use_openviking is True
         assert runner._context_router._ov_router is not None
+
+
+# ---------------------------------------------------------------------------
+# Context file index
+# ---------------------------------------------------------------------------
+
+
+class TestContextIndex:
+    def test_scan_is_lazy(
+        self, mock_project, constitution_path, designer_slot, simple_pipeline, monkeypatch
+    ):
+        calls = []
+        router = ContextRouter(str(mock_project), constitution_path)
+        assert router._indexed is False
+        original = router._index.refresh
+        monkeypatch.setattr(router._index, "refresh", lambda: calls.append(1) or original())
+        router.build_context(designer_slot, simple_pipeline)
+        router.build_context(designer_slot, simple_pipeline)
+        assert calls == [1]
+
+    def test_index_persisted_in_root(self, mock_project, constitution_path):
+        router = ContextRouter(str(mock_project), constitution_path)
+        files = router._abstract_files
+        assert (mock_project / ".context-index.json").is_file()
+        again = ContextRouter(str(mock_project), constitution_path)
+        assert again._abstract_files == files
+
+    def test_in_memory_index(self, mock_project, constitution_path):
+        router = ContextRouter(str(mock_project), constitution_path, index_path="")
+        assert router._abstract_files
+        assert not (mock_project / ".context-index.json").exists()
+
+    def test_ignored_dirs_skipped(self, mock_project, constitution_path):
+        (mock_project / ".git").mkdir()
+        (mock_project / ".git" / ".abstract.md").write_text("x", encoding="utf-8")
+        router = ContextRouter(
+            str(mock_project), constitution_path, ignore_dirs=["agents"]
+        )
+        assert not any(p.startswith((".git", "agents")) for p in router._abstract_files)
+
+
+# ---------------------------------------------------------------------------
+# File cache
+# ---------------------------------------------------------------------------
+
+
+class TestFileCache:
+    def test_second_build_reads_nothing(self, router, designer_slot, simple_pipeline):
+        first = router.build_context(designer_slot, simple_pipeline)
+        misses = router._files.misses
+        assert router.build_context(designer_slot, simple_pipeline) == first
+        assert router._files.misses == misses
+
+    def test_edited_file_reread(self, router, mock_project, designer_slot, simple_pipeline):
+        router.build_context(designer_slot, simple_pipeline)
+        path = mock_project / "agents" / ".abstract.md"
+        path.write_text("x" * 400, encoding="utf-8")
+        os.utime(path, ns=(1, 1))
+        misses = router._files.misses
+        items = router.build_context(designer_slot, simple_pipeline)
+        assert router._files.misses == misses + 1
+        assert {i.path: i.tokens_estimate for i in items}["agents/.abstract.md"] == (
+            estimate_tokens("x" * 400)
+        )
+
+    def test_shared_between_routers(self, mock_project, constitution_path,
+                                    designer_slot, simple_pipeline):
+        from src.pipeline.context_router import new_file_cache
+
+        cache = new_file_cache()
+        for _ in range(2):
+            ContextRouter(str(mock_project), constitution_path, file_cache=cache).build_context(
+                designer_slot, simple_pipeline
+            )
+        assert cache.hits >= cache.misses
+
+
+# ---------------------------------------------------------------------------
+# Knapsack selection
+# ---------------------------------------------------------------------------
+
+
+class TestKnapsackSelection:
+    @pytest.fixture
+    def knapsack_router(self, mock_project, constitution_path):
+        return ContextRouter(str(mock_project), constitution_path, selection="knapsack")
+
+    def test_unknown_selection(self, mock_project, constitution_path):
+        with pytest.raises(ValueError):
+            ContextRouter(str(mock_project), constitution_path, selection="random")
+
+    def test_constitution_first(self, knapsack_router, designer_slot, simple_pipeline):
+        items = knapsack_router.build_context(designer_slot, simple_pipeline)
+        assert "constitution" in items[0].path
+        assert items[0].tier == ContextTier.L2
+
+    def test_one_tier_per_directory(self, knapsack_router, designer_slot, simple_pipeline):
+        items = knapsack_router.build_context(designer_slot, simple_pipeline)
+        dirs = [i.path.rsplit("/", 1)[0] for i in items[1:]]
+        assert len(dirs) == len(set(dirs))
+        # Everything fits the default budget: overviews win over abstracts
+        assert {i.path for i in items if i.tier == ContextTier.L1} >= {
+            "specs/.overview.md", "architect/.overview.md",
+        }
+
+    def test_within_budget(self, knapsack_router, designer_slot, simple_pipeline):
+        for budget in (20, 40, 80):
+            items = knapsack_router.build_context(
+                designer_slot, simple_pipeline, max_tokens=budget
+            )
+            assert sum(i.tokens_estimate for i in items[1:]) <= budget - items[0].tokens_estimate
+
+    def test_slot_directories_ranked_first(self, knapsack_router, designer_slot, simple_pipeline):
+        items = knapsack_router.build_context(designer_slot, simple_pipeline)
+        top = items[1]
+        assert top.path.startswith(("specs/", "architect/"))
+        assert top.relevance > items[-1].relevance
+
+    def test_objective_terms_raise_relevance(self, mock_project, simple_pipeline):
+        slot = Slot(
+            id="slot-x", slot_type="researcher", name="Research",
+            task=SlotTask(objective="Survey the compliance auditor findings"),
+        )
+        (mock_project / "compliance-auditor" / ".abstract.md").write_text(
+            "Audit findings.", encoding="utf-8"
+        )
+        router = ContextRouter(
+            str(mock_project), str(mock_project / "docs" / "constitution.md"),
+            selection="knapsack", index_path="",
+        )
+        items = {i.path: i.relevance for i in router.build_context(slot, simple_pipeline)}
+        assert items["compliance-auditor/.abstract.md"] > items["architect/.overview.md"]
+
+
+class TestContextPack:
+    def test_pack_served_from_file_cache(self, router, designer_slot, simple_pipeline,
+                                         tmp_path):
+        items = router.build_context(designer_slot, simple_pipeline)
+        misses = router._files.misses
+        store = BlockStore(tmp_path / "blocks")
+        entries = router.store_context_blocks(items, store)
+        write_manifest(tmp_path / "pack.json", store, entries)
+        assert router._files.misses == misses
+        contents = read_pack(tmp_path / "pack.json")
+        assert set(contents) == {i.path for i in items}
+        assert contents["docs/constitution.md"].startswith("# Constitution")
+
+
+class TestTokenEstimate:
+    def test_chinese_file_budgeted_per_character(self, mock_project, constitution_path):
+        (mock_project / "agents" / ".abstract.md").write_text("文化研究资料汇编" * 25, encoding="utf-8")
+        router = ContextRouter(str(mock_project), constitution_path, index_path="")
+        assert router._file_tokens("agents/.abstract.md") == 200
+
+    def test_custom_estimator(self, mock_project, constitution_path, designer_slot,
+                              simple_pipeline):
+        router = ContextRouter(
+            str(mock_project), constitution_path, index_path="",
+            token_estimator=lambda text: 3,
+        )
+        items = router.build_context(designer_slot, simple_pipeline)
+        assert {i.tokens_estimate for i in items} == {3}
+
+    def test_shared_cache_estimator_wins(self, mock_project, constitution_path):
+        cache = new_file_cache(estimate=lambda text: 5)
+        router = ContextRouter(
+            str(mock_project), constitution_path, index_path="",
+            file_cache=cache, token_estimator=lambda text: 3,
+        )
+        assert router._file_tokens("specs/.abstract.md") == 5
+
+
+# ---------------------------------------------------------------------------
+# Offline text index
+# ---------------------------------------------------------------------------
+
+
+class TestTextIndex:
+    @pytest.fixture
+    def retry_slot(self):
+        return Slot(
+            id="slot-retry", slot_type="implementer", name="Retry",
+            task=SlotTask(
+                objective="Add exponential backoff to slot retries",
+                deliverables=["engineer/src/pipeline/retry.py"],
+                constraints=["Keep the scheduler unchanged"],
+            ),
+        )
+
+    @pytest.fixture
+    def ranked_project(self, mock_project):
+        (mock_project / "engineer" / "src" / "pipeline" / "retry.py").write_text(
+            "def backoff(attempt):\n    '''Exponential backoff for retries.'''\n",
+            encoding="utf-8",
+        )
+        (mock_project / "docs" / "notes.md").write_text(
+            "Unrelated meeting notes.\n", encoding="utf-8",
+        )
+        return mock_project
+
+    def test_disabled_by_default(self, ranked_project, constitution_path, retry_slot,
+                                 simple_pipeline):
+        router = ContextRouter(str(ranked_project), constitution_path, index_path="")
+        paths = [i.path for i in router.build_context(retry_slot, simple_pipeline)]
+        assert "engineer/src/pipeline/retry.py" not in paths
+        assert not (ranked_project / ".context-text-index.json").exists()
+
+    def test_ranked_file_added(self, ranked_project, constitution_path, retry_slot,
+                               simple_pipeline):
+        router = ContextRouter(
+            str(ranked_project), constitution_path, use_text_index=True,
+        )
+        items = {i.path: i for i in router.build_context(retry_slot, simple_pipeline)}
+        item = items["engineer/src/pipeline/retry.py"]
+        assert item.tier == ContextTier.L2
+        assert item.relevance == 0.8
+        assert "docs/notes.md" not in items
+        assert (ranked_project / ".context-text-index.json").is_file()
+
+    def test_ranked_files_within_budget(self, ranked_project, constitution_path, retry_slot,
+                                        simple_pipeline):
+        router = ContextRouter(
+            str(ranked_project), constitution_path, use_text_index=True, text_index_path="",
+        )
+        for budget in (20, 60, 200):
+            items = router.build_context(retry_slot, simple_pipeline, max_tokens=budget)
+            assert sum(i.tokens_estimate for i in items) <= budget
+
+    def test_knapsack_includes_ranked_file(self, ranked_project, constitution_path,
+                                           retry_slot, simple_pipeline):
+        router = ContextRouter(
+            str(ranked_project), constitution_path, selection="knapsack",
+            use_text_index=True, text_index_path="",
+        )
+        items = router.build_context(retry_slot, simple_pipeline)
+        assert "engineer/src/pipeline/retry.py" in [i.path for i in items]
+        assert sum(i.tokens_estimate for i in items) <= 8000
+
+    def test_constitution_not_duplicated(self, ranked_project, constitution_path,
+                                         simple_pipeline):
+        slot = Slot(
+            id="slot-rules", slot_type="designer", name="Rules",
+            task=SlotTask(objective="Follow the project rules in the constitution"),
+        )
+        router = ContextRouter(
+            str(ranked_project), constitution_path, use_text_index=True, text_index_path="",
+        )
+        paths = [i.path for i in router.build_context(slot, simple_pipeline)]
+        assert paths.count("docs/constitution.md") == 1
+
+
+# ---------------------------------------------------------------------------
+# Memoized context plans
+# ---------------------------------------------------------------------------
+
+
+class TestPlanCache:
+    @pytest.fixture
+    def plan_router(self, mock_project, constitution_path):
+        return ContextRouter(
+            str(mock_project), constitution_path, index_path="",
+            plan_cache=TTLCache(3600),
+        )
+
+    def test_sibling_slot_reuses_plan(self, plan_router, designer_slot, simple_pipeline):
+        first = plan_router.build_context(designer_slot, simple_pipeline)
+        sibling = Slot(
+            id="slot-design-2", slot_type="designer", name="Design 2",
+            task=SlotTask(objective="Create design"),
+        )
+        assert plan_router.build_context(sibling, simple_pipeline) == first
+        assert (plan_router.plan_misses, plan_router.plan_hits) == (1, 1)
+
+    def test_plan_matches_uncached(self, mock_project, constitution_path, plan_router,
+                                   designer_slot, simple_pipeline):
+        plain = ContextRouter(str(mock_project), constitution_path, index_path="")
+        expected = plain.build_context(designer_slot, simple_pipeline)
+        plan_router.build_context(designer_slot, simple_pipeline)
+        assert plan_router.build_context(designer_slot, simple_pipeline) == expected
+
+    def test_different_task_or_budget_misses(self, plan_router, designer_slot,
+                                             implementer_slot, simple_pipeline):
+        plan_router.build_context(designer_slot, simple_pipeline)
+        plan_router.build_context(designer_slot, simple_pipeline, max_tokens=50)
+        plan_router.build_context(implementer_slot, simple_pipeline)
+        other = Slot(
+            id="slot-design-2", slot_type="designer", name="Design 2",
+            task=SlotTask(objective="Redesign the scheduler"),
+        )
+        plan_router.build_context(other, simple_pipeline)
+        assert (plan_router.plan_misses, plan_router.plan_hits) == (4, 0)
+
+    def test_edited_file_misses(self, plan_router, mock_project, designer_slot,
+                                simple_pipeline):
+        plan_router.build_context(designer_slot, simple_pipeline)
+        path = mock_project / "specs" / ".overview.md"
+        path.write_text("Rewritten.\n" * 200, encoding="utf-8")
+        os.utime(path, ns=(1, 1))
+        items = plan_router.build_context(designer_slot, simple_pipeline)
+        assert plan_router.plan_misses == 2
+        assert {i.path: i.tokens_estimate for i in items}.get("specs/.overview.md") in (
+            None, estimate_tokens("Rewritten.\n" * 200),
+        )
+
+    def test_persisted_across_routers(self, mock_project, constitution_path, tmp_path,
+                                      designer_slot, simple_pipeline):
+        path = tmp_path / "plans.json"
+        first = ContextRouter(
+            str(mock_project), constitution_path, index_path="",
+            plan_cache=TTLCache(3600, path=path),
+        ).build_context(designer_slot, simple_pipeline)
+        again = ContextRouter(
+            str(mock_project), constitution_path, index_path="",
+            plan_cache=TTLCache(3600, path=path),
+        )
+        assert again.build_context(designer_slot, simple_pipeline) == first
+        assert again.plan_hits == 1
+        assert again._files.misses == 0
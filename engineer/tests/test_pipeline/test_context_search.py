@@ -0,0 +1,121 @@
+"""Tests for pipeline.context_search -- offline BM25 ranking of project files."""
+
+import json
+
+import pytest
+
+from src.pipeline.context_search import ContextTextIndex
+
+FILES = {
+    "specs/retry.md": "# Retry policy\nFailed slots are retried with backoff.",
+    "engineer/src/pipeline/runner.py": "def run():\n    # execute slots in waves\n    pass\n",
+    "engineer/src/pipeline/state.py": "class StateTracker:\n    '''Persist slot state.'''\n",
+    "docs/readme.md": "Agent orchestrator overview.",
+}
+
+
+@pytest.fixture
+def project(tmp_path, backdate):
+    root = tmp_path / "project"
+    for rel, text in FILES.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text, encoding="utf-8")
+    backdate(root)
+    return root
+
+
+class TestSearch:
+    def test_ranks_by_content(self, project):
+        index = ContextTextIndex(project)
+        index.refresh(FILES)
+        assert index.search("retry failed slots with backoff")[0][0] == "specs/retry.md"
+        assert len(index) == 4
+
+    def test_path_words_indexed(self, project):
+        index = ContextTextIndex(project)
+        index.refresh(FILES)
+        assert index.search("runner")[0][0] == "engineer/src/pipeline/runner.py"
+
+    def test_scores_normalized(self, project):
+        index = ContextTextIndex(project)
+        index.refresh(FILES)
+        assert all(0 < score <= 1.0 for _, score in index.search("slot state"))
+
+    def test_large_and_missing_files_skipped(self, project):
+        (project / "big.md").write_text("retry " * 100, encoding="utf-8")
+        index = ContextTextIndex(project, max_file_bytes=200)
+        index.refresh([*FILES, "big.md", "gone.md"])
+        assert "big.md" not in index
+        assert "gone.md" not in index
+
+
+class TestRefresh:
+    def test_unchanged_files_not_retokenized(self, project):
+        index = ContextTextIndex(project)
+        index.refresh(FILES)
+        assert index.tokenized == 4
+        index.refresh(FILES)
+        assert index.tokenized == 0
+
+    def test_changed_file_retokenized(self, project):
+        index = ContextTextIndex(project)
+        index.refresh(FILES)
+        (project / "docs/readme.md").write_text("Backoff tuning notes.", encoding="utf-8")
+        index.refresh(FILES)
+        assert index.tokenized == 1
+        assert index.search("tuning")[0][0] == "docs/readme.md"
+
+    def test_unlisted_file_dropped(self, project):
+        index = ContextTextIndex(project)
+        index.refresh(FILES)
+        index.refresh([f for f in FILES if f != "specs/retry.md"])
+        assert "specs/retry.md" not in index
+        assert index.search("backoff") == []
+
+    def test_deleted_file_dropped(self, project):
+        index = ContextTextIndex(project)
+        index.refresh(FILES)
+        (project / "specs/retry.md").unlink()
+        index.refresh(FILES)
+        assert "specs/retry.md" not in index
+
+
+class TestPersistence:
+    def test_new_instance_reuses_term_counts(self, project, tmp_path):
+        path = tmp_path / "text-index.json"
+        ContextTextIndex(project, path=path).refresh(FILES)
+        index = ContextTextIndex(project, path=path)
+        index.refresh(FILES)
+        assert index.tokenized == 0
+        assert index.search("backoff")[0][0] == "specs/retry.md"
+
+    def test_not_rewritten_when_unchanged(self, project, tmp_path):
+        path = tmp_path / "text-index.json"
+        ContextTextIndex(project, path=path).refresh(FILES)
+        written = path.stat().st_mtime_ns
+        ContextTextIndex(project, path=path).refresh(FILES)
+        assert path.stat().st_mtime_ns == written
+
+    def test_other_root_discards_index(self, project, tmp_path):
+        path = tmp_path / "text-index.json"
+        ContextTextIndex(project, path=path).refresh(FILES)
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload["root"] = "/elsewhere"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        index = ContextTextIndex(project, path=path)
+        index.refresh(FILES)
+        assert index.tokenized == 4
+
+    def test_corrupt_file_ignored(self, project, tmp_path):
+        path = tmp_path / "text-index.json"
+        path.write_text("{not json", encoding="utf-8")
+        index = ContextTextIndex(project, path=path)
+        index.refresh(FILES)
+        assert len(index) == 4
+
+    def test_unwritable_location_is_not_fatal(self, project, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("x", encoding="utf-8")
+        index = ContextTextIndex(project, path=blocker / "text-index.json")
+        index.refresh(FILES)
+        assert len(index) == 4
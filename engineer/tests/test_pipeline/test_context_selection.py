@@ -0,0 +1,95 @@
+"""Tests for pipeline.context_selection -- knapsack context selection."""
+
+import itertools
+
+import pytest
+
+from src.pipeline.context_selection import (
+    Candidate,
+    directory_relevance,
+    select,
+    tier_value,
+)
+from src.pipeline.models import ContextTier
+
+
+def _group(name, *options, relevance=1.0):
+    """Options are (tier, tokens) pairs."""
+    return [
+        Candidate(name, f"{name}/{tier.value}", tier, tokens, tier_value(relevance, tier), relevance)
+        for tier, tokens in options
+    ]
+
+
+def _brute_force(groups, budget):
+    best = 0.0
+    for combo in itertools.product(*[[None, *g] for g in groups]):
+        chosen = [c for c in combo if c is not None]
+        if sum(c.tokens for c in chosen) <= budget:
+            best = max(best, sum(c.value for c in chosen))
+    return best
+
+
+class TestDirectoryRelevance:
+    def test_slot_directory_match(self):
+        inside = directory_relevance("specs/pipelines", slot_dirs=["specs/"], objective_terms=set())
+        outside = directory_relevance("docs", slot_dirs=["specs/"], objective_terms=set())
+        assert inside > outside
+
+    def test_objective_terms(self):
+        terms = {"billing", "invoice"}
+        hit = directory_relevance(
+            "services/billing", slot_dirs=[], objective_terms=terms,
+            text_terms={"generates", "every", "invoice"},
+        )
+        miss = directory_relevance("services/auth", slot_dirs=[], objective_terms=terms)
+        assert hit > miss
+
+    def test_capped_at_one(self):
+        assert directory_relevance(
+            "specs", slot_dirs=["specs/"], objective_terms={"specs"}, text_terms={"specs"}
+        ) <= 1.0
+
+
+class TestSelect:
+    def test_everything_fits(self):
+        groups = [_group("a", (ContextTier.L0, 10), (ContextTier.L1, 50))]
+        assert [c.tier for c in select(groups, 100)] == [ContextTier.L1]
+
+    def test_prefers_relevant_overview_over_cheap_abstracts(self):
+        groups = [
+            _group(f"noise{i}", (ContextTier.L0, 300), relevance=0.2) for i in range(5)
+        ]
+        groups.append(_group("core", (ContextTier.L0, 100), (ContextTier.L1, 900)))
+        chosen = select(groups, 1000)
+        assert any(c.group == "core" and c.tier is ContextTier.L1 for c in chosen)
+        assert sum(c.tokens for c in chosen) <= 1000
+
+    def test_one_tier_per_group(self):
+        groups = [_group(n, (ContextTier.L0, 40), (ContextTier.L1, 200)) for n in "abcd"]
+        chosen = select(groups, 500)
+        assert len({c.group for c in chosen}) == len(chosen)
+
+    @pytest.mark.parametrize("budget", [150, 400, 777])
+    def test_optimal_at_full_resolution(self, budget):
+        groups = [
+            _group("a", (ContextTier.L0, 50), (ContextTier.L1, 240), relevance=0.9),
+            _group("b", (ContextTier.L0, 80), (ContextTier.L1, 300), relevance=0.5),
+            _group("c", (ContextTier.L1, 120), (ContextTier.L2, 400), relevance=0.7),
+            _group("d", (ContextTier.L0, 30), relevance=0.3),
+        ]
+        chosen = select(groups, budget, resolution=budget)
+        assert sum(c.tokens for c in chosen) <= budget
+        assert sum(c.value for c in chosen) == pytest.approx(_brute_force(groups, budget))
+
+    def test_coarse_resolution_stays_within_budget(self):
+        groups = [_group(f"g{i}", (ContextTier.L0, 37 + i), (ContextTier.L1, 211 + 7 * i))
+                  for i in range(20)]
+        chosen = select(groups, 1000, resolution=10)
+        assert sum(c.tokens for c in chosen) <= 1000
+        assert chosen
+
+    def test_empty_and_zero_budget(self):
+        assert select([], 100) == []
+        assert select([_group("a", (ContextTier.L0, 10))], 0) == []
+        assert select([_group("a", (ContextTier.L0, 500))], 100) == []
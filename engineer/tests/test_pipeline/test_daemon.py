@@ -0,0 +1,219 @@
+"""Tests for pipeline.daemon -- long-lived server behind the CLI."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from pipeline import cli
+from pipeline.cli import _global_session_path, main
+from pipeline.daemon import (
+    SOCKET_FILENAME,
+    DaemonError,
+    PipelineDaemon,
+    forward,
+    send_request,
+    socket_path,
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """One-slot project; kept shallow so the socket fits AF_UNIX limits."""
+    root = tmp_path / "p"
+    (root / "specs" / "pipelines" / "templates").mkdir(parents=True)
+    (root / "specs" / "pipelines" / "slot-types").mkdir(parents=True)
+    (root / "state" / "active").mkdir(parents=True)
+    (root / "agents").mkdir()
+
+    (root / "specs" / "pipelines" / "slot-types" / "implementer.yaml").write_text(
+        yaml.dump({
+            "slot_type": {
+                "id": "implementer", "name": "Implementer", "category": "engineering",
+                "description": "impl", "input_schema": {"type": "object"},
+                "output_schema": {"type": "object"},
+                "required_capabilities": ["python"],
+            }
+        })
+    )
+    (root / "agents" / "eng.md").write_text(
+        "---\nagent_id: ENG-001\ncapabilities:\n  - python\n---\n# Engineer\n"
+    )
+    (root / "specs" / "pipelines" / "templates" / "solo.yaml").write_text(
+        yaml.dump({
+            "pipeline": {
+                "id": "solo", "name": "Solo", "version": "1.0.0",
+                "description": "One slot", "created_by": "test",
+                "created_at": "2026-01-01T00:00:00Z",
+                "slots": [
+                    {"id": "slot-impl", "slot_type": "implementer",
+                     "name": "Implement", "task": {"objective": "Implement it"}},
+                ],
+            }
+        })
+    )
+    return root
+
+
+@pytest.fixture(autouse=True)
+def clean_global_session():
+    path = _global_session_path()
+    if path.exists():
+        path.unlink()
+    yield
+    if path.exists():
+        path.unlink()
+
+
+@pytest.fixture
+def state_dir(project):
+    return str(project / "state" / "active")
+
+
+@pytest.fixture
+def running(state_dir):
+    """A daemon serving *state_dir* from a background thread."""
+    daemon = PipelineDaemon(state_dir)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while send_request_quiet(daemon.path) is None:
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield daemon
+    send_request(daemon.path, {"op": "shutdown"}, timeout=5)
+    thread.join(timeout=5)
+
+
+def send_request_quiet(path):
+    if not Path(path).exists():
+        return None
+    return send_request(path, {"op": "ping"}, timeout=1)
+
+
+class TestSocketPath:
+    def test_inside_state_dir(self, state_dir):
+        assert socket_path(state_dir) == Path(state_dir).resolve() / SOCKET_FILENAME
+
+    def test_long_path_falls_back_to_tmp(self, tmp_path):
+        deep = tmp_path / ("x" * 120)
+        path = socket_path(str(deep))
+        assert path.name.startswith("pipeline-")
+        assert len(str(path)) < 108
+        assert socket_path(str(deep)) == path
+
+
+class TestHandle:
+    def test_ping(self, state_dir):
+        response = PipelineDaemon(state_dir).handle({"op": "ping"})
+        assert response["ok"] is True
+        assert response["pid"] > 0
+
+    def test_unknown_op(self, state_dir):
+        response = PipelineDaemon(state_dir).handle({"op": "dance"})
+        assert response["ok"] is False
+
+    def test_argv_must_be_strings(self, state_dir):
+        response = PipelineDaemon(state_dir).handle({"op": "run", "argv": [1]})
+        assert response["ok"] is False
+
+    def test_run_captures_output(self, project, state_dir):
+        response = PipelineDaemon(state_dir).handle(
+            {"op": "run", "argv": ["-P", str(project), "templates"]}
+        )
+        assert response["exit_code"] == 0
+        assert "solo.yaml" in response["stdout"]
+
+    def test_relative_project_resolves_against_cwd(self, project, state_dir):
+        response = PipelineDaemon(state_dir).handle({
+            "op": "run", "argv": ["-P", "p", "templates"],
+            "cwd": str(project.parent),
+        })
+        assert response["exit_code"] == 0
+        assert "solo.yaml" in response["stdout"]
+
+    def test_sys_exit_becomes_exit_code(self, project, state_dir):
+        response = PipelineDaemon(state_dir).handle(
+            {"op": "run", "argv": ["-P", str(project), "status"]}
+        )
+        assert response["exit_code"] == 1
+        assert "No active pipeline" in response["stdout"]
+
+    def test_argparse_error_is_reported(self, state_dir):
+        response = PipelineDaemon(state_dir).handle(
+            {"op": "run", "argv": ["no-such-command"]}
+        )
+        assert response["exit_code"] == 2
+        assert "invalid choice" in response["stderr"]
+
+    def test_runner_reused_between_commands(self, project, state_dir):
+        daemon = PipelineDaemon(state_dir)
+        run = lambda *a: daemon.handle({"op": "run", "argv": ["-P", str(project), *a]})
+        assert run("prepare", "solo.yaml")["exit_code"] == 0
+        containers = [v for k, v in daemon._cache.items() if k[0] == "components"]
+        assert len(containers) == 1
+        runner = containers[0].runner
+
+        assert run("begin", "slot-impl")["exit_code"] == 0
+        assert run("complete", "slot-impl")["exit_code"] == 0
+        assert [v for k, v in daemon._cache.items() if k[0] == "components"] == containers
+        assert containers[0].runner is runner
+        assert "COMPLETED" in run("next")["stdout"].upper()
+
+
+class TestServe:
+    def test_no_daemon_returns_none(self, state_dir):
+        assert forward(state_dir, ["status"], "/") is None
+
+    def test_stale_socket_is_ignored(self, state_dir):
+        path = socket_path(state_dir)
+        path.write_text("")
+        assert send_request(path, {"op": "ping"}) is None
+
+    def test_ping_over_socket(self, running):
+        response = send_request(running.path, {"op": "ping"}, timeout=5)
+        assert response["ok"] is True
+
+    def test_cli_forwards_to_daemon(self, running, project, capsys):
+        before = send_request(running.path, {"op": "ping"})["requests"]
+        assert main(["-P", str(project), "prepare", "solo.yaml"]) == 0
+        assert main(["-P", str(project), "status"]) == 0
+        out = capsys.readouterr().out
+        assert "Pipeline created: solo" in out
+        assert "Pipeline: solo" in out
+        assert send_request(running.path, {"op": "ping"})["requests"] == before + 2
+
+    def test_no_daemon_flag_runs_in_process(self, running, project, capsys):
+        before = send_request(running.path, {"op": "ping"})["requests"]
+        assert main(["-P", str(project), "--no-daemon", "templates"]) == 0
+        assert "solo.yaml" in capsys.readouterr().out
+        assert send_request(running.path, {"op": "ping"})["requests"] == before
+
+    def test_second_daemon_refused(self, running, state_dir):
+        with pytest.raises(DaemonError):
+            PipelineDaemon(state_dir).serve_forever()
+
+    def test_shutdown_removes_socket(self, state_dir):
+        daemon = PipelineDaemon(state_dir)
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while send_request_quiet(daemon.path) is None:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert cli.main(["-P", str(Path(state_dir).parents[1]), "serve", "--stop"]) == 0
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert not daemon.path.exists()
+
+    def test_idle_timeout(self, state_dir):
+        daemon = PipelineDaemon(state_dir, idle_timeout=0.05)
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert not daemon.path.exists()
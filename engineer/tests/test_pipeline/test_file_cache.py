@@ -0,0 +1,108 @@
+"""Tests for pipeline.file_cache -- file text and token estimate cache."""
+
+import os
+
+import pytest
+
+from src.pipeline.file_cache import FileCache
+
+
+def _estimate(text):
+    return len(text) // 4
+
+
+@pytest.fixture
+def cache():
+    return FileCache(estimate=_estimate)
+
+
+def _write(path, text, mtime=None):
+    path.write_text(text, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+class TestFileCache:
+    def test_tokens_and_read(self, cache, tmp_path):
+        path = tmp_path / "a.md"
+        _write(path, "x" * 40)
+        assert cache.tokens(path) == 10
+        assert cache.read(path) == "x" * 40
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    def test_missing_file(self, cache, tmp_path):
+        assert cache.tokens(tmp_path / "missing.md") is None
+        assert cache.read(tmp_path / "missing.md") is None
+        assert cache.tokens(tmp_path) is None  # a directory
+        assert len(cache) == 0
+
+    def test_unchanged_file_not_reread(self, cache, tmp_path, monkeypatch):
+        path = tmp_path / "a.md"
+        _write(path, "x" * 40)
+        cache.tokens(path)
+        monkeypatch.setattr("builtins.open", None)
+        assert cache.tokens(path) == 10
+        assert cache.read(path) == "x" * 40
+
+    def test_changed_file_reread(self, cache, tmp_path):
+        path = tmp_path / "a.md"
+        _write(path, "x" * 40, mtime=1_000_000_000)
+        cache.tokens(path)
+        _write(path, "x" * 80, mtime=2_000_000_000)
+        assert cache.tokens(path) == 20
+        # Same size, new mtime
+        _write(path, "y" * 80, mtime=3_000_000_000)
+        assert cache.read(path) == "y" * 80
+
+    def test_deleted_file_dropped(self, cache, tmp_path):
+        path = tmp_path / "a.md"
+        _write(path, "x" * 40)
+        cache.tokens(path)
+        path.unlink()
+        assert cache.tokens(path) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction_by_bytes(self, tmp_path):
+        cache = FileCache(estimate=_estimate, max_bytes=3 * (1000 + 128))
+        paths = [tmp_path / f"{i}.md" for i in range(4)]
+        for path in paths:
+            _write(path, "x" * 1000)
+        for path in paths[:3]:
+            cache.tokens(path)
+        cache.tokens(paths[0])  # most recently used
+        cache.tokens(paths[3])
+        assert len(cache) == 3
+        assert cache.bytes_used <= 3 * (1000 + 128)
+        misses = cache.misses
+        cache.tokens(paths[0])
+        assert cache.misses == misses
+        cache.tokens(paths[1])  # evicted
+        assert cache.misses == misses + 1
+
+    def test_oversized_file_keeps_tokens_only(self, tmp_path):
+        cache = FileCache(estimate=_estimate, max_bytes=500)
+        path = tmp_path / "big.md"
+        _write(path, "x" * 4000)
+        assert cache.tokens(path) == 1000
+        assert cache.bytes_used == 128
+        assert cache.read(path) == "x" * 4000
+        assert cache.tokens(path) == 1000
+        assert cache.misses == 1
+
+    def test_store_content_off(self, tmp_path):
+        cache = FileCache(estimate=_estimate, store_content=False)
+        path = tmp_path / "a.md"
+        _write(path, "x" * 40)
+        assert cache.tokens(path) == 10
+        assert cache.bytes_used == 128
+        assert cache.read(path) == "x" * 40
+
+    def test_invalidate_and_clear(self, cache, tmp_path):
+        path = tmp_path / "a.md"
+        _write(path, "x" * 40)
+        cache.tokens(path)
+        cache.invalidate(path)
+        assert len(cache) == 0 and cache.bytes_used == 0
+        cache.tokens(path)
+        cache.clear()
+        assert len(cache) == 0 and cache.bytes_used == 0
@@ -0,0 +1,70 @@
+"""Tests for pipeline.keyword_automaton -- Aho-Corasick keyword search."""
+
+import random
+
+from src.pipeline.keyword_automaton import KeywordAutomaton
+
+
+def _naive(keywords, text):
+    lower = text.lower()
+    return {k.lower() for k in keywords if k and k.lower() in lower}
+
+
+class TestFind:
+    def test_basic(self):
+        a = KeywordAutomaton(["bug", "hotfix", "修复"])
+        assert a.find("Urgent HOTFIX: 修复 crash") == {"hotfix", "修复"}
+
+    def test_no_match(self):
+        assert KeywordAutomaton(["bug"]).find("all good") == set()
+
+    def test_empty_automaton(self):
+        a = KeywordAutomaton([])
+        assert len(a) == 0
+        assert a.find("anything") == set()
+
+    def test_overlapping_and_nested(self):
+        a = KeywordAutomaton(["he", "she", "his", "hers"])
+        assert a.find("ushers") == {"he", "she", "hers"}
+
+    def test_keyword_with_space(self):
+        a = KeywordAutomaton(["from scratch", "scratch"])
+        assert a.find("Build it from  scratch") == {"scratch"}
+        assert a.find("build it FROM SCRATCH") == {"from scratch", "scratch"}
+
+    def test_substring_semantics(self):
+        # Like `kw in text`: "add" matches inside "address"
+        assert KeywordAutomaton(["add"]).find("address") == {"add"}
+
+    def test_duplicates_and_empty_ignored(self):
+        a = KeywordAutomaton(["Audit", "audit", ""])
+        assert a.keywords == ["audit"]
+
+    def test_chinese_compound(self):
+        a = KeywordAutomaton(["合规", "合规审查", "审查"])
+        assert a.find("请做合规审查") == {"合规", "合规审查", "审查"}
+
+    def test_matches_naive_search(self):
+        rng = random.Random(7)
+        alphabet = "abc 修复"
+        for _ in range(200):
+            keywords = [
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.randint(1, 15))
+            ]
+            a = KeywordAutomaton(keywords)
+            for _ in range(10):
+                text = "".join(rng.choice(alphabet + "xB") for _ in range(rng.randint(0, 30)))
+                assert a.find(text) == _naive(keywords, text)
+                # Second pass uses memoized transitions
+                assert a.find(text) == _naive(keywords, text)
+
+
+class TestIterMatches:
+    def test_positions(self):
+        a = KeywordAutomaton(["ab", "b"])
+        assert sorted(a.iter_matches("abab")) == [(2, 0), (2, 1), (4, 0), (4, 1)]
+
+    def test_find_ids(self):
+        a = KeywordAutomaton(["x", "y"])
+        assert a.find_ids("y only") == {1}
@@ -1,12 +1,21 @@
 """Tests for pipeline.nl_matcher -- Natural language template matching."""
 
 import json
+import pickle
 import subprocess
+import time
 
 import pytest
 import yaml
 
-from src.pipeline.nl_matcher import NLMatcher, TemplateMatch
+from src.pipeline import nl_matcher
+from src.pipeline.nl_matcher import (
+    OV_CACHE_FILENAME,
+    TEXT_INDEX_FILENAME,
+    NLMatcher,
+    TemplateMatch,
+)
+from src.pipeline.text_index import BM25Index
 
 
 @pytest.fixture
@@ -228,6 +237,148 @@ class TestMatchChinese:
         assert "hotfix" in top_ids
 
 
+# ===================================================================
+# Template-declared match metadata
+# ===================================================================
+
+
+def _declared_template(d, template_id, match):
+    (d / f"{template_id}.yaml").write_text(yaml.dump({
+        "pipeline": {"id": template_id, "name": template_id, "match": match},
+    }, allow_unicode=True))
+
+
+class TestDeclaredMatch:
+    def test_declared_keywords_and_weight(self, tmp_path):
+        _declared_template(tmp_path, "data-migration", {
+            "weight": 2.0, "keywords": ["migrate", "schema", "迁移"],
+        })
+        results = NLMatcher(str(tmp_path)).match("migrate the schema")
+        assert len(results) == 1
+        assert results[0].template_id == "data-migration"
+        assert results[0].matched_keywords == ["migrate", "schema"]
+        assert results[0].confidence == 1.0
+
+    def test_declared_keywords_override_builtin(self, tmp_path):
+        _declared_template(tmp_path, "hotfix", {"keywords": ["firefight"]})
+        m = NLMatcher(str(tmp_path))
+        assert m.match("urgent bug crash") == []
+        assert m.match("firefight")[0].template_id == "hotfix"
+
+    def test_builtin_fallback_without_match_block(self, matcher):
+        assert matcher.match("紧急修复")[0].template_id == "hotfix"
+
+    def test_match_block_disables_builtin_fallback(self, tmp_path):
+        _declared_template(tmp_path, "hotfix", {"weight": 2.0})
+        assert NLMatcher(str(tmp_path)).match("urgent hotfix crash") == []
+
+    def test_template_without_keywords_never_matches(self, tmp_path):
+        _declared_template(tmp_path, "unlisted", {"weight": 1.0})
+        assert NLMatcher(str(tmp_path)).match("unlisted anything") == []
+
+    def test_only_candidate_templates_scored(self, tmp_path):
+        for i in range(50):
+            _declared_template(tmp_path, f"t{i:02d}", {"keywords": [f"word{i:02d}x"]})
+        m = NLMatcher(str(tmp_path))
+        results = m.match("please handle word07x and word42x")
+        assert [r.template_id for r in results] == ["t07", "t42"]
+
+    def test_ties_keep_template_order(self, tmp_path):
+        for tid in ("b-template", "a-template"):
+            _declared_template(tmp_path, tid, {"keywords": ["shared"]})
+        results = NLMatcher(str(tmp_path)).match("shared")
+        assert [r.template_id for r in results] == ["a-template", "b-template"]
+
+    def test_declared_param_patterns(self, tmp_path):
+        _declared_template(tmp_path, "ticket", {
+            "keywords": ["ticket"],
+            "params": [
+                {"name": "ticket_id", "pattern": r"#(\d+)"},
+                {"name": "owner", "pattern": r"owner:\s*(\w+)", "ignore_case": True},
+            ],
+        })
+        result = NLMatcher(str(tmp_path)).match("ticket #512 OWNER: alice")[0]
+        assert result.suggested_params["ticket_id"] == "512"
+        assert result.suggested_params["owner"] == "alice"
+
+    def test_declared_params_take_precedence(self, tmp_path):
+        _declared_template(tmp_path, "t", {
+            "keywords": ["feature"],
+            "params": [{"name": "feature_name", "pattern": r"called (\w+)"}],
+        })
+        params = NLMatcher(str(tmp_path)).extract_params(
+            "feature xyz called login", "t"
+        )
+        assert params["feature_name"] == "login"
+
+    def test_invalid_pattern_skipped(self, tmp_path, caplog):
+        _declared_template(tmp_path, "t", {
+            "keywords": ["go"],
+            "params": [{"name": "bad", "pattern": "(unclosed"}, {"name": "x"}],
+            "weight": "heavy",
+        })
+        m = NLMatcher(str(tmp_path))
+        assert m.match("go")[0].template_id == "t"
+        assert "invalid pattern" in caplog.text
+
+    def test_repository_templates_declare_match(self):
+        from pathlib import Path
+        from src.pipeline.nl_matcher import _KEYWORD_MAP
+
+        repo_templates = Path(__file__).resolve().parents[3] / "specs" / "pipelines" / "templates"
+        m = NLMatcher(str(repo_templates))
+        for template_id, (weight, keywords) in _KEYWORD_MAP.items():
+            meta = m._templates[template_id]
+            assert (meta["weight"], meta["keywords"]) == (weight, keywords)
+
+
+# ===================================================================
+# Batch matching
+# ===================================================================
+
+BATCH = [
+    "implement feature login-page for phase5",
+    "urgent hotfix P0-001 crash",
+    "backtest strategy momentum on BTC/USDT",
+    "xyzzy gibberish",
+    "urgent hotfix P0-001 crash",
+    "调研 websocket 方案",
+]
+
+
+class TestMatchMany:
+    def test_same_as_match(self, matcher):
+        assert matcher.match_many(BATCH) == [matcher.match(text) for text in BATCH]
+
+    def test_empty_batch(self, matcher):
+        assert matcher.match_many([]) == []
+
+    def test_repeated_input_gets_independent_params(self, matcher):
+        results = matcher.match_many(BATCH)
+        first, repeat = results[1][0], results[4][0]
+        assert first == repeat
+        repeat.suggested_params["bug_id"] = "changed"
+        assert first.suggested_params["bug_id"] == "P0-001"
+
+    def test_params_match_extract_params(self, matcher):
+        for text, results in zip(BATCH, matcher.match_many(BATCH)):
+            for m in results:
+                assert m.suggested_params == matcher.extract_params(text, m.template_id)
+
+    def test_small_batch_stays_in_process(self, matcher, monkeypatch):
+        def no_pool(*a, **kw):
+            raise AssertionError("pool started")
+
+        monkeypatch.setattr(nl_matcher, "ProcessPoolExecutor", no_pool)
+        assert len(matcher.match_many(BATCH, processes=4)) == len(BATCH)
+
+    def test_process_pool(self, matcher, monkeypatch):
+        monkeypatch.setattr(nl_matcher, "_POOL_MIN_BATCH", 2)
+        batch = BATCH * 3 + [f"feature f{i}" for i in range(10)]
+        expected = [matcher.match(text) for text in batch]
+        assert matcher.match_many(batch, processes=2, chunk_size=3) == expected
+
+
 # ===================================================================
 # extract_params
 # ===================================================================
@@ -326,33 +477,6 @@ class TestGenerateSummary:
         assert "(none)" in summary
 
 
-# ===================================================================
-# _tokenize
-# ===================================================================
-
-
-class TestTokenize:
-    def test_basic_tokenize(self):
-        tokens = NLMatcher._tokenize("Hello World")
-        assert "hello" in tokens
-        assert "world" in tokens
-
-    def test_chinese_tokenize(self):
-        tokens = NLMatcher._tokenize("开发新功能")
-        # Chinese characters should be captured
-        assert len(tokens) > 0
-
-    def test_mixed_tokenize(self):
-        tokens = NLMatcher._tokenize("implement 功能 in phase5")
-        assert "implement" in tokens
-        assert "phase5" in tokens
-
-    def test_punctuation_stripped(self):
-        tokens = NLMatcher._tokenize("hello, world! foo-bar")
-        assert "hello" in tokens
-        assert "world" in tokens
-
-
 # ===================================================================
 # match -- Compliance audit
 # ===================================================================
@@ -399,6 +523,71 @@ class TestMatchComplianceAudit:
         assert results[0].template_id == "compliance-audit"
 
 
+# ===================================================================
+# Offline text index
+# ===================================================================
+
+
+class TestTextIndex:
+    def test_default_no_index(self, matcher, templates_dir):
+        assert matcher._text_index is None
+        assert not (templates_dir / TEXT_INDEX_FILENAME).exists()
+
+    def test_adds_candidate_without_keywords(self, templates_dir):
+        # "investigation" is in the description but not a keyword
+        assert NLMatcher(str(templates_dir)).match("investigation notes") == []
+        results = NLMatcher(str(templates_dir), use_text_index=True).match(
+            "investigation notes"
+        )
+        assert [r.template_id for r in results] == ["research-task"]
+        assert results[0].matched_keywords == []
+        assert results[0].confidence <= 0.4
+
+    def test_never_reduces_confidence(self, templates_dir):
+        text = "implement a new feature end-to-end"
+        baseline = {r.template_id: r.confidence for r in NLMatcher(str(templates_dir)).match(text)}
+        ranked = {
+            r.template_id: r.confidence
+            for r in NLMatcher(str(templates_dir), use_text_index=True).match(text)
+        }
+        for tid, conf in baseline.items():
+            assert ranked[tid] >= conf
+        assert ranked["standard-feature"] > baseline["standard-feature"]
+
+    def test_indexes_slot_objectives(self, tmp_path):
+        (tmp_path / "migrate.yaml").write_text(yaml.dump({"pipeline": {
+            "id": "migrate", "name": "Migrate", "description": "",
+            "slots": [{"id": "s1", "name": "Plan", "task": {"objective": "Move tables to 数据库"}}],
+        }}, allow_unicode=True))
+        m = NLMatcher(str(tmp_path), use_text_index=True)
+        assert m.match("数据库 tables")[0].template_id == "migrate"
+
+    def test_index_persisted_and_reused(self, templates_dir, monkeypatch):
+        NLMatcher(str(templates_dir), use_text_index=True)
+        assert (templates_dir / TEXT_INDEX_FILENAME).exists()
+
+        def fail(*a, **kw):
+            raise AssertionError("index rebuilt")
+
+        monkeypatch.setattr(BM25Index, "__init__", fail)
+        m = NLMatcher(str(templates_dir), use_text_index=True)
+        assert m.match("quantitative")[0].template_id == "quant-strategy"
+
+    def test_index_rebuilt_when_text_changes(self, templates_dir):
+        NLMatcher(str(templates_dir), use_text_index=True)
+        data = yaml.safe_load((templates_dir / "hotfix.yaml").read_text())
+        data["pipeline"]["description"] = "Patch the flaky payment gateway"
+        (templates_dir / "hotfix.yaml").write_text(yaml.dump(data))
+        m = NLMatcher(str(templates_dir), use_text_index=True)
+        assert m.match("gateway")[0].template_id == "hotfix"
+
+    def test_custom_index_path(self, templates_dir, tmp_path):
+        path = tmp_path / "elsewhere" / "index.json"
+        NLMatcher(str(templates_dir), use_text_index=True, text_index_path=str(path))
+        assert path.exists()
+        assert not (templates_dir / TEXT_INDEX_FILENAME).exists()
+
+
 # ===================================================================
 # OpenViking semantic enhancement
 # ===================================================================
@@ -524,3 +713,86 @@ class TestOVEnhancement:
         assert len(results) > 0
         ids = [r.template_id for r in results]
         assert "research-task" in ids
+
+
+class TestOVBudget:
+    @staticmethod
+    def _ov(monkeypatch, delay=0.0, data=None, returncode=0):
+        """Patch ov find to answer after *delay* seconds; returns the call log."""
+        calls = []
+        data = data if data is not None else [
+            {"uri": "viking://test/specs/research-task.yaml", "score": 0.8},
+        ]
+
+        def mock_run(args, **kw):
+            calls.append(args)
+            time.sleep(delay)
+            return subprocess.CompletedProcess(
+                args, returncode, stdout=json.dumps(data), stderr=""
+            )
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        return calls
+
+    def test_slow_ov_returns_keyword_results_within_budget(self, templates_dir, monkeypatch):
+        self._ov(monkeypatch, delay=0.5)
+        m = NLMatcher(str(templates_dir), use_openviking=True, ov_budget=0.05)
+        start = time.monotonic()
+        results = m.match("urgent bug crash")
+        assert time.monotonic() - start < 0.4
+        assert [r.template_id for r in results] == ["hotfix"]
+
+    def test_late_answer_fills_cache(self, templates_dir, monkeypatch):
+        calls = self._ov(monkeypatch, delay=0.2)
+        m = NLMatcher(str(templates_dir), use_openviking=True, ov_budget=0.01)
+        assert "research-task" not in [r.template_id for r in m.match("urgent bug crash")]
+        # Same query while the first is still running joins it
+        m.match("urgent bug crash")
+        time.sleep(0.4)
+        assert "research-task" in [r.template_id for r in m.match("urgent bug crash")]
+        assert len(calls) == 1
+
+    def test_cache_keyed_by_normalized_query(self, templates_dir, monkeypatch):
+        calls = self._ov(monkeypatch)
+        m = NLMatcher(str(templates_dir), use_openviking=True)
+        first = m.match("Urgent  bug crash")
+        assert m.match("urgent bug   CRASH ") == first
+        assert len(calls) == 1
+
+    def test_cache_persisted(self, templates_dir, monkeypatch):
+        calls = self._ov(monkeypatch)
+        NLMatcher(str(templates_dir), use_openviking=True).match("urgent bug crash")
+        assert (templates_dir / OV_CACHE_FILENAME).exists()
+        results = NLMatcher(str(templates_dir), use_openviking=True).match("urgent bug crash")
+        assert "research-task" in [r.template_id for r in results]
+        assert len(calls) == 1
+
+    def test_cache_ttl(self, templates_dir, monkeypatch):
+        calls = self._ov(monkeypatch)
+        m = NLMatcher(str(templates_dir), use_openviking=True, ov_cache_ttl=0)
+        m.match("urgent bug crash")
+        m.match("urgent bug crash")
+        assert len(calls) == 2
+
+    def test_failures_not_cached(self, templates_dir, monkeypatch):
+        calls = self._ov(monkeypatch, returncode=1)
+        m = NLMatcher(str(templates_dir), use_openviking=True)
+        m.match("urgent bug crash")
+        m.match("urgent bug crash")
+        assert len(calls) == 2
+
+    def test_custom_cache_path(self, templates_dir, tmp_path, monkeypatch):
+        self._ov(monkeypatch)
+        path = tmp_path / "state" / "ov.json"
+        NLMatcher(
+            str(templates_dir), use_openviking=True, ov_cache_path=str(path)
+        ).match("urgent bug crash")
+        assert path.exists()
+        assert not (templates_dir / OV_CACHE_FILENAME).exists()
+
+    def test_picklable_for_worker_processes(self, templates_dir, monkeypatch):
+        self._ov(monkeypatch)
+        m = NLMatcher(str(templates_dir), use_openviking=True)
+        m.match("urgent bug crash")
+        clone = pickle.loads(pickle.dumps(m))
+        assert clone.match("urgent bug crash") == m.match("urgent bug crash")
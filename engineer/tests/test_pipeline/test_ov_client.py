@@ -0,0 +1,294 @@
+"""Tests for pipeline.ov_client -- pooled OpenViking HTTP client."""
+
+import socket
+import subprocess
+import time
+
+import pytest
+
+from src.pipeline.circuit_breaker import CircuitBreaker
+from src.pipeline.ov_client import OVClient, default_base_url
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def client(ov_server):
+    with OVClient(ov_server.url) as client:
+        yield client
+
+
+@pytest.fixture
+def cli_calls(monkeypatch):
+    """Record ``ov`` CLI invocations; each answers ``cli:<command>``."""
+    calls = []
+
+    def fake_run(cmd, **kw):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=f"cli:{cmd[1]}", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    return calls
+
+
+class TestDefaultBaseUrl:
+    def test_default_port(self, monkeypatch):
+        monkeypatch.delenv("OV_URL", raising=False)
+        monkeypatch.delenv("OV_PORT", raising=False)
+        assert default_base_url() == "http://127.0.0.1:8686"
+
+    def test_env_overrides(self, monkeypatch):
+        monkeypatch.delenv("OV_URL", raising=False)
+        monkeypatch.setenv("OV_PORT", "9000")
+        assert default_base_url() == "http://127.0.0.1:9000"
+        monkeypatch.setenv("OV_URL", "http://ov.internal:80")
+        assert default_base_url() == "http://ov.internal:80"
+
+    def test_rejects_unsupported_url(self):
+        with pytest.raises(ValueError):
+            OVClient("https://ov.example.com")
+
+
+class TestHttp:
+    def test_operations(self, client, ov_server, cli_calls):
+        ns = "viking://test-project"
+        assert client.health() is True
+        assert client.abstract(ns) == "Project abstract text."
+        assert client.overview(f"{ns}/specs") == f"Overview of {ns}/specs"
+        assert client.ls(ns) == ["pipeline", "specs"]
+        assert client.relations(f"{ns}/a") == [{"uri": "viking://test/a"}]
+        assert cli_calls == []
+        assert client.calls == {"http": 5, "cli": 0}
+
+    def test_find_posts_query(self, client, ov_server):
+        results = client.find("retry logic", uri="viking://ns", limit=3)
+        assert results == [
+            {"uri": "viking://ns/runner.py", "score": 0.85, "content": "runner code"},
+        ]
+        method, path, _, body = ov_server.requests[-1]
+        assert (method, path) == ("POST", "/api/v1/search/find")
+        assert body == {"query": "retry logic", "target_uri": "viking://ns", "limit": 3}
+
+    def test_keep_alive_reuses_one_connection(self, client, ov_server):
+        for i in range(20):
+            assert client.overview(f"viking://ns/r{i}") == f"Overview of viking://ns/r{i}"
+        assert client.pool.connections_opened == 1
+        assert len(ov_server.connections) == 1
+
+    def test_overviews_parallel_within_pool(self, ov_server):
+        ov_server.delay = 0.05
+        client = OVClient(ov_server.url, pool_size=4)
+        uris = [f"viking://ns/r{i}" for i in range(8)]
+        start = time.perf_counter()
+        overviews = client.overviews(uris)
+        elapsed = time.perf_counter() - start
+        assert list(overviews) == uris
+        assert overviews["viking://ns/r7"] == "Overview of viking://ns/r7"
+        assert elapsed < 8 * 0.05
+        assert client.pool.connections_opened <= 4
+
+    def test_error_status_returns_none(self, client, ov_server, cli_calls):
+        ov_server.routes["/api/v1/content/abstract"] = lambda q, b: (400, "bad uri")
+        assert client.abstract("viking://missing") is None
+        assert cli_calls == []
+
+    def test_unwrapped_and_object_responses(self, client, ov_server):
+        ov_server.routes["/api/v1/fs/ls"] = lambda q, b: (
+            200, {"entries": [{"uri": "viking://ns/a"}, {"name": "b"}]},
+        )
+        ov_server.routes["/api/v1/search/find"] = lambda q, b: (200, {"results": []})
+        assert client.ls("viking://ns") == ["viking://ns/a", "b"]
+        assert client.find("q", uri="viking://ns") == []
+
+    def test_stale_connection_retried(self, client, ov_server, cli_calls):
+        assert client.health()
+        # The server has meanwhile closed the idle keep-alive connection
+        stale, peer = socket.socketpair()
+        peer.close()
+        client.pool._idle[0].sock = stale
+        assert client.abstract("viking://ns") == "Project abstract text."
+        assert client.pool.connections_opened == 2
+        assert cli_calls == []
+
+
+class TestCliFallback:
+    def test_unreachable_server_uses_cli(self, cli_calls):
+        client = OVClient(f"http://127.0.0.1:{_unused_port()}")
+        assert client.health() is True
+        assert client.abstract("viking://ns") == "cli:abstract"
+        assert client.ls("viking://ns") == ["cli:ls"]
+        assert [cmd[1] for cmd in cli_calls] == ["health", "abstract", "ls"]
+        assert client.calls["http"] == 0
+
+    def test_cooldown_skips_http(self, cli_calls):
+        client = OVClient(f"http://127.0.0.1:{_unused_port()}", http_retry_after=60)
+        client.health()
+        opened = client.pool.connections_opened
+        client.overviews(["viking://ns/a", "viking://ns/b"])
+        assert client.pool.connections_opened == opened
+        assert len(cli_calls) == 3
+
+    def test_http_retried_after_cooldown(self, ov_server, cli_calls):
+        client = OVClient(ov_server.url, http_retry_after=0)
+        client._http_down_until = float("inf")
+        assert client.abstract("viking://ns") == "cli:abstract"
+        client._http_down_until = 0.0
+        assert client.abstract("viking://other") == "Project abstract text."
+
+    @pytest.mark.parametrize("status", [404, 405, 501])
+    def test_unsupported_route_uses_cli(self, ov_server, cli_calls, status):
+        client = OVClient(ov_server.url, http_retry_after=60)
+        for route in ("/api/v1/content/abstract", "/api/v1/fs/ls", "/api/v1/search/find"):
+            ov_server.routes[route] = lambda q, b: (status, "unsupported")
+        assert client.abstract("viking://ns") == "cli:abstract"
+        assert client.ls("viking://ns") == ["cli:ls"]
+        client.find("q", uri="viking://ns")
+        assert [cmd[1] for cmd in cli_calls] == ["abstract", "ls", "find"]
+        # Within the retry window the route is not asked again; others are
+        assert client.abstract("viking://other") == "cli:abstract"
+        assert ov_server.paths().count("/api/v1/content/abstract") == 1
+        assert client.overview("viking://ns") == "Overview of viking://ns"
+
+    def test_empty_url_is_cli_only(self, cli_calls):
+        client = OVClient("")
+        assert client.pool is None
+        assert client.find("q", uri="viking://ns") is None  # "cli:find" is not JSON
+        assert cli_calls[0] == ["ov", "find", "q", "--uri", "viking://ns",
+                                "--limit", "10", "-o", "json"]
+
+    def test_cli_missing(self, monkeypatch):
+        def raise_fnf(*a, **kw):
+            raise FileNotFoundError("ov not found")
+
+        monkeypatch.setattr(subprocess, "run", raise_fnf)
+        client = OVClient("")
+        assert client.health() is False
+        assert client.cli_missing is True
+
+
+class TestRunCli:
+    def test_success(self, monkeypatch):
+        monkeypatch.setattr(
+            subprocess,
+            "run",
+            lambda *a, **kw: subprocess.CompletedProcess(a[0], 0, stdout="ok\n", stderr=""),
+        )
+        assert OVClient("").run_cli(["health"]) == "ok\n"
+
+    def test_nonzero_returncode(self, monkeypatch):
+        monkeypatch.setattr(
+            subprocess,
+            "run",
+            lambda *a, **kw: subprocess.CompletedProcess(a[0], 1, stdout="", stderr="error"),
+        )
+        assert OVClient("").run_cli(["health"]) is None
+
+    def test_binary_not_found_opens_breaker(self, monkeypatch):
+        def raise_fnf(*a, **kw):
+            raise FileNotFoundError("ov not found")
+
+        monkeypatch.setattr(subprocess, "run", raise_fnf)
+        client = OVClient("")
+        assert client.run_cli(["health"]) is None
+        assert client.breaker.state == "open"
+
+    def test_timeout(self, monkeypatch):
+        def raise_timeout(*a, **kw):
+            raise subprocess.TimeoutExpired(cmd="ov", timeout=30)
+
+        monkeypatch.setattr(subprocess, "run", raise_timeout)
+        assert OVClient("").run_cli(["health"]) is None
+
+    def test_generic_exception(self, monkeypatch):
+        def raise_err(*a, **kw):
+            raise OSError("something went wrong")
+
+        monkeypatch.setattr(subprocess, "run", raise_err)
+        assert OVClient("").run_cli(["health"]) is None
+
+
+class TestContentCache:
+    def test_abstracts_and_overviews_cached(self, client, ov_server):
+        for _ in range(3):
+            client.abstract("viking://ns")
+            client.overviews(["viking://ns/a", "viking://ns/b"])
+        assert ov_server.paths().count("/api/v1/content/abstract") == 1
+        assert ov_server.paths().count("/api/v1/content/overview") == 2
+
+    def test_failures_not_cached(self, client, ov_server):
+        ov_server.routes["/api/v1/content/abstract"] = lambda q, b: (500, "boom")
+        assert client.abstract("viking://ns") is None
+        ov_server.routes["/api/v1/content/abstract"] = lambda q, b: (200, "back")
+        assert client.abstract("viking://ns") == "back"
+
+    def test_zero_ttl_disables(self, ov_server):
+        client = OVClient(ov_server.url, content_ttl=0)
+        client.abstract("viking://ns")
+        client.abstract("viking://ns")
+        assert ov_server.paths().count("/api/v1/content/abstract") == 2
+
+
+class TestBreaker:
+    def test_timeouts_open_breaker(self, monkeypatch):
+        calls = []
+
+        def hang(cmd, **kw):
+            calls.append(cmd)
+            raise subprocess.TimeoutExpired(cmd, kw.get("timeout"))
+
+        monkeypatch.setattr(subprocess, "run", hang)
+        client = OVClient("", breaker=CircuitBreaker(failure_threshold=2))
+        client.overviews([f"viking://ns/r{i}" for i in range(2)])
+        assert client.breaker.state == "open"
+        # Open: fail fast without running anything
+        assert client.abstract("viking://ns") is None
+        assert client.find("q", uri="viking://ns") is None
+        assert client.health() is False
+        assert len(calls) == 2
+
+    def test_cli_error_counts_as_failure(self, monkeypatch):
+        monkeypatch.setattr(
+            subprocess, "run",
+            lambda cmd, **kw: subprocess.CompletedProcess(cmd, 1, stdout="", stderr="down"),
+        )
+        client = OVClient("", breaker=CircuitBreaker(failure_threshold=2))
+        assert client.abstract("viking://ns") is None
+        assert client.abstract("viking://other") is None
+        assert client.breaker.state == "open"
+
+    def test_server_error_probe_reopens(self, ov_server):
+        clock = FakeClock()
+        client = OVClient(ov_server.url, breaker=CircuitBreaker(reset_timeout=30, clock=clock))
+        ov_server.routes["/api/v1/content/abstract"] = lambda q, b: (503, "unavailable")
+        client.breaker.trip()
+        clock.now += 30
+        assert client.abstract("viking://ns") is None
+        assert client.breaker.state == "open"
+
+    def test_cached_content_served_while_open(self, client, ov_server):
+        client.abstract("viking://ns")
+        client.breaker.trip()
+        assert client.abstract("viking://ns") == "Project abstract text."
+        assert client.abstract("viking://other") is None
+
+    def test_half_open_probe_closes(self, ov_server):
+        clock = FakeClock()
+        client = OVClient(ov_server.url, breaker=CircuitBreaker(reset_timeout=30, clock=clock))
+        client.breaker.trip()
+        assert client.health() is False
+        clock.now += 30
+        assert client.health() is True
+        assert client.breaker.state == "closed"
+        assert ov_server.paths() == ["/health"]
@@ -5,6 +5,8 @@ import subprocess
 
 import pytest
 
+from src.pipeline.circuit_breaker import CircuitBreaker
+from src.pipeline.ov_client import OVClient
 from src.pipeline.ov_context_router import OVContextRouter
 from src.pipeline.models import ContextItem, ContextTier
 
@@ -20,59 +22,10 @@ def router(tmp_path):
         str(tmp_path),
         ov_binary="ov",
         ov_namespace="viking://test-project",
+        ov_url="",
     )
 
 
-# ---------------------------------------------------------------------------
-# _run_ov
-# ---------------------------------------------------------------------------
-
-
-class TestRunOv:
-    def test_run_ov_success(self, router, monkeypatch):
-        monkeypatch.setattr(
-            subprocess,
-            "run",
-            lambda *a, **kw: subprocess.CompletedProcess(a[0], 0, stdout="ok\n", stderr=""),
-        )
-        result = router._run_ov(["health"])
-        assert result == "ok\n"
-
-    def test_run_ov_nonzero_returncode(self, router, monkeypatch):
-        monkeypatch.setattr(
-            subprocess,
-            "run",
-            lambda *a, **kw: subprocess.CompletedProcess(a[0], 1, stdout="", stderr="error"),
-        )
-        result = router._run_ov(["health"])
-        assert result is None
-
-    def test_run_ov_binary_not_found(self, router, monkeypatch):
-        def raise_fnf(*a, **kw):
-            raise FileNotFoundError("ov not found")
-
-        monkeypatch.setattr(subprocess, "run", raise_fnf)
-        result = router._run_ov(["health"])
-        assert result is None
-        assert router._available is False
-
-    def test_run_ov_timeout(self, router, monkeypatch):
-        def raise_timeout(*a, **kw):
-            raise subprocess.TimeoutExpired(cmd="ov", timeout=30)
-
-        monkeypatch.setattr(subprocess, "run", raise_timeout)
-        result = router._run_ov(["health"])
-        assert result is None
-
-    def test_run_ov_generic_exception(self, router, monkeypatch):
-        def raise_err(*a, **kw):
-            raise OSError("something went wrong")
-
-        monkeypatch.setattr(subprocess, "run", raise_err)
-        result = router._run_ov(["health"])
-        assert result is None
-
-
 # ---------------------------------------------------------------------------
 # is_available
 # ---------------------------------------------------------------------------
@@ -176,6 +129,35 @@ class TestBuildContext:
         assert len(abstract_items) == 0
 
 
+    def test_chinese_abstract_budgeted_per_character(self, router, monkeypatch):
+        def mock_run(args, **kw):
+            cmd = args[1] if len(args) > 1 else ""
+            if cmd == "health":
+                return subprocess.CompletedProcess(args, 0, stdout="ok", stderr="")
+            if cmd == "abstract":
+                return subprocess.CompletedProcess(args, 0, stdout="量化交易" * 10, stderr="")
+            return subprocess.CompletedProcess(args, 0, stdout="", stderr="")
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        # 40 characters: 10 tokens at 4 characters per token, 40 really
+        items = router.build_context("implementer", max_tokens=20)
+        assert [i for i in items if i.tier == ContextTier.L0] == []
+        items = router.build_context("implementer", max_tokens=40)
+        assert [i.tokens_estimate for i in items if i.tier == ContextTier.L0] == [40]
+
+    def test_custom_estimate(self, tmp_path, monkeypatch):
+        router = OVContextRouter(
+            str(tmp_path), ov_url="", estimate_tokens=lambda text: 7,
+        )
+        monkeypatch.setattr(
+            subprocess,
+            "run",
+            lambda args, **kw: subprocess.CompletedProcess(args, 0, stdout="text", stderr=""),
+        )
+        items = router.build_context("implementer")
+        assert items and all(i.tokens_estimate == 7 for i in items if i.tier == ContextTier.L0)
+
+
 # ---------------------------------------------------------------------------
 # semantic_search
 # ---------------------------------------------------------------------------
@@ -304,3 +286,97 @@ class TestGetRelations:
         monkeypatch.setattr(subprocess, "run", mock_run)
         rels = router.get_relations("viking://test/x")
         assert rels == ["viking://test/rel1"]
+
+
+# ---------------------------------------------------------------------------
+# Over HTTP (stub OV server)
+# ---------------------------------------------------------------------------
+
+
+class TestOverHttp:
+    @pytest.fixture
+    def http_router(self, tmp_path, ov_server, monkeypatch):
+        def no_cli(*a, **kw):
+            raise AssertionError("ov CLI should not run")
+
+        monkeypatch.setattr(subprocess, "run", no_cli)
+        return OVContextRouter(
+            str(tmp_path), ov_namespace="viking://test-project", ov_url=ov_server.url
+        )
+
+    def test_build_context_over_http(self, http_router, ov_server):
+        items = http_router.build_context("implementer", "retry logic")
+        assert [i.path for i in items] == [
+            "viking://test-project/",
+            "viking://test-project/pipeline",
+            "viking://test-project/specs",
+            "viking://test-project/runner.py",
+        ]
+        assert ov_server.paths() == [
+            "/health",
+            "/api/v1/content/abstract",
+            "/api/v1/fs/ls",
+            "/api/v1/content/overview",
+            "/api/v1/content/overview",
+            "/api/v1/search/find",
+        ]
+        assert http_router.client.calls["cli"] == 0
+
+    def test_get_relations(self, http_router):
+        assert http_router.get_relations("viking://test-project/a") == ["viking://test/a"]
+
+    def test_shared_client(self, tmp_path, ov_server):
+        client = OVClient(ov_server.url)
+        routers = [OVContextRouter(str(tmp_path), client=client) for _ in range(2)]
+        assert all(r.is_available for r in routers)
+        assert client.pool.connections_opened == 1
+
+
+# ---------------------------------------------------------------------------
+# Availability (circuit breaker)
+# ---------------------------------------------------------------------------
+
+
+class TestAvailability:
+    def test_outage_then_recovery(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        breaker = CircuitBreaker(reset_timeout=30, clock=lambda: now[0])
+        router = OVContextRouter(str(tmp_path), client=OVClient("", breaker=breaker))
+        healthy = [False]
+        calls = []
+
+        def fake_run(cmd, **kw):
+            calls.append(cmd[1])
+            return subprocess.CompletedProcess(cmd, 0 if healthy[0] else 1, stdout="ok", stderr="")
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+        assert router.build_context("implementer") is None
+        assert router.build_context("implementer") is None
+        assert calls == ["health"]  # open: no further calls
+
+        healthy[0] = True
+        now[0] += 30
+        assert router.is_available is True
+        assert router.breaker.state == "closed"
+        assert calls == ["health", "health"]
+
+    def test_refused_check_leaves_probe_alone(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        breaker = CircuitBreaker(reset_timeout=30, clock=lambda: now[0])
+        router = OVContextRouter(str(tmp_path), client=OVClient("", breaker=breaker))
+        calls = []
+        monkeypatch.setattr(subprocess, "run", lambda cmd, **kw: calls.append(cmd))
+        breaker.trip()
+        now[0] += 30
+        assert breaker.allow() is True  # another caller's probe
+        assert router.is_available is False
+        assert breaker.state == "half_open"
+        assert calls == []
+
+    def test_overviews_cached_across_builds(self, tmp_path, ov_server):
+        router = OVContextRouter(str(tmp_path), ov_url=ov_server.url)
+        first = router.build_context("implementer")
+        second = router.build_context("implementer")
+        assert first == second
+        assert ov_server.paths().count("/api/v1/content/overview") == 2
+        assert ov_server.paths().count("/health") == 1
@@ -0,0 +1,136 @@
+"""Tests for pipeline.profiling -- per-stage timing instrumentation."""
+
+import pytest
+
+from pipeline.profiling import (
+    PhaseProfiler,
+    PhaseStats,
+    collapse_stats,
+    write_collapsed_stacks,
+)
+
+
+class TestPhaseStats:
+    def test_add_tracks_min_max_total(self):
+        stats = PhaseStats("load")
+        stats.add(300)
+        stats.add(100)
+        stats.add(200)
+        assert stats.count == 3
+        assert stats.total_ns == 600
+        assert stats.min_ns == 100
+        assert stats.max_ns == 300
+        assert stats.mean_ns == 200
+
+    def test_empty_mean_is_zero(self):
+        assert PhaseStats("x").mean_ns == 0.0
+
+    def test_to_dict_in_milliseconds(self):
+        stats = PhaseStats("load")
+        stats.add(2_000_000)
+        d = stats.to_dict()
+        assert d["count"] == 1
+        assert d["total_ms"] == pytest.approx(2.0)
+        assert d["mean_ms"] == pytest.approx(2.0)
+
+
+class TestPhaseProfiler:
+    def test_disabled_by_default_records_nothing(self):
+        profiler = PhaseProfiler()
+        with profiler.span("load"):
+            pass
+        assert profiler.get_profile() == {}
+
+    def test_disabled_span_is_shared_noop(self):
+        profiler = PhaseProfiler()
+        assert profiler.span("a") is profiler.span("b")
+
+    def test_enabled_records_spans(self):
+        profiler = PhaseProfiler(enabled=True)
+        for _ in range(3):
+            with profiler.span("load"):
+                pass
+        with profiler.span("validate"):
+            pass
+        profile = profiler.get_profile()
+        assert list(profile) == ["load", "validate"]
+        assert profile["load"]["count"] == 3
+        assert profile["validate"]["count"] == 1
+
+    def test_span_records_on_exception(self):
+        profiler = PhaseProfiler(enabled=True)
+        with pytest.raises(ValueError):
+            with profiler.span("gate_check"):
+                raise ValueError("boom")
+        assert profiler.get_profile()["gate_check"]["count"] == 1
+
+    def test_toggle_at_runtime(self):
+        profiler = PhaseProfiler()
+        profiler.enabled = True
+        with profiler.span("load"):
+            pass
+        profiler.enabled = False
+        with profiler.span("load"):
+            pass
+        assert profiler.get_profile()["load"]["count"] == 1
+
+    def test_reset(self):
+        profiler = PhaseProfiler(enabled=True)
+        profiler.record("load", 10)
+        profiler.reset()
+        assert profiler.get_profile() == {}
+
+    def test_format_table_sorted_by_total(self):
+        profiler = PhaseProfiler(enabled=True)
+        profiler.record("fast", 1_000)
+        profiler.record("slow", 5_000_000)
+        table = profiler.format_table()
+        lines = table.splitlines()
+        assert lines[0].startswith("stage")
+        assert lines[1].startswith("slow")
+        assert lines[2].startswith("fast")
+
+    def test_format_table_empty(self):
+        assert "No stage timings" in PhaseProfiler().format_table()
+
+
+class TestCollapseStats:
+    @staticmethod
+    def _profile(fn):
+        import cProfile
+        import pstats
+
+        profile = cProfile.Profile()
+        profile.enable()
+        fn()
+        profile.disable()
+        return pstats.Stats(profile)
+
+    def test_stacks_nest_callees_under_callers(self):
+        def leaf():
+            return sum(i * i for i in range(20000))
+
+        def outer():
+            return leaf() + leaf()
+
+        lines = collapse_stats(self._profile(outer))
+        assert lines
+        leaf_lines = [l for l in lines if ":leaf:" in l.rsplit(" ", 1)[0]]
+        assert leaf_lines
+        for line in leaf_lines:
+            stack = line.rsplit(" ", 1)[0].split(";")
+            leaf_pos = next(i for i, f in enumerate(stack) if ":leaf:" in f)
+            assert any(":outer:" in f for f in stack[:leaf_pos])
+
+    def test_recursion_terminates(self):
+        def fib(n):
+            return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+        lines = collapse_stats(self._profile(lambda: fib(15)))
+        assert any(":fib:" in line for line in lines)
+
+    def test_write_collapsed_stacks(self, tmp_path):
+        stats = self._profile(lambda: sorted(range(50000), reverse=True))
+        out = tmp_path / "stacks.txt"
+        count = write_collapsed_stacks(stats, out)
+        assert count == len(out.read_text().splitlines())
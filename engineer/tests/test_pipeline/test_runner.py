@@ -1,5 +1,8 @@
 """Tests for pipeline.runner -- Pipeline orchestration engine."""
 
+import copy
+import os
+
 import pytest
 import yaml
 
@@ -8,7 +11,9 @@ from pipeline.models import (
     PipelineStatus,
     SlotStatus,
 )
+from pipeline.context_pack import read_pack
 from pipeline.observer import ComplianceObserver
+from pipeline.profiling import PhaseProfiler
 from pipeline.runner import PipelineExecutionError, PipelineRunner
 
 
@@ -188,6 +193,22 @@ class TestPrepare:
         with pytest.raises(PipelineExecutionError, match="validation failed"):
             runner.prepare(str(path), {})
 
+    def test_relative_dirs_resolve_against_project_root(
+        self, project_dirs, pipeline_yaml, tmp_path_factory, monkeypatch
+    ):
+        monkeypatch.chdir(tmp_path_factory.mktemp("elsewhere"))
+        runner = PipelineRunner(
+            project_root=str(project_dirs),
+            templates_dir="templates",
+            state_dir="state/active",
+            slot_types_dir="slot-types",
+            agents_dir="agents",
+        )
+        _, state = runner.prepare(pipeline_yaml, {})
+        active = project_dirs / "state" / "active"
+        assert list(active.glob(f"{state.pipeline_id}-*.state.yaml"))
+        assert not os.path.exists("state")
+
 
 # ===================================================================
 # get_next_slots
@@ -233,6 +254,26 @@ class TestBeginSlot:
         assert state.slots["slot-design"].agent_id == "ARCH-001"
         assert state.status == PipelineStatus.RUNNING
 
+    def test_begin_writes_context_yaml(self, project_dirs, pipeline_yaml):
+        constitution = project_dirs / "constitution.md"
+        constitution.write_text("# Constitution\n")
+        runner = PipelineRunner(
+            project_root=str(project_dirs),
+            templates_dir=str(project_dirs / "templates"),
+            state_dir=str(project_dirs / "state" / "active"),
+            slot_types_dir=str(project_dirs / "slot-types"),
+            agents_dir=str(project_dirs / "agents"),
+            constitution_path=str(constitution),
+        )
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        state = runner.begin_slot(pipeline.slots[0], pipeline, state)
+        context_path = (
+            project_dirs / "state" / "active"
+            / f"{state.pipeline_id}-slot-design-context.yaml"
+        )
+        assert context_path.is_file()
+        assert "constitution.md" in context_path.read_text()
+
     def test_begin_with_failing_precondition(self, runner, project_dirs):
         # Create pipeline with a file_exists pre-condition that will fail
         pipeline_data = {
@@ -268,6 +309,150 @@ class TestBeginSlot:
         assert "Pre-conditions failed" in state.slots["s1"].error
 
 
+class TestContextPacks:
+    @pytest.fixture
+    def pack_runner(self, project_dirs):
+        (project_dirs / "constitution.md").write_text("# Constitution\n", encoding="utf-8")
+        return PipelineRunner(
+            project_root=str(project_dirs),
+            templates_dir=str(project_dirs / "templates"),
+            state_dir=str(project_dirs / "state" / "active"),
+            slot_types_dir=str(project_dirs / "slot-types"),
+            agents_dir=str(project_dirs / "agents"),
+            constitution_path=str(project_dirs / "constitution.md"),
+            context_packs=True,
+        )
+
+    def test_context_yaml_written(self, project_dirs, pipeline_yaml):
+        runner = PipelineRunner(
+            project_root=str(project_dirs),
+            templates_dir=str(project_dirs / "templates"),
+            state_dir=str(project_dirs / "state" / "active"),
+            slot_types_dir=str(project_dirs / "slot-types"),
+            agents_dir=str(project_dirs / "agents"),
+            constitution_path=str(project_dirs / "constitution.md"),
+        )
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        runner.begin_slot(pipeline.slots[0], pipeline, state)
+        active = project_dirs / "state" / "active"
+        assert (active / f"{state.pipeline_id}-slot-design-context.yaml").is_file()
+        assert not list(active.glob("*.pack.json"))
+
+    def test_sibling_slots_share_blocks(self, pack_runner, project_dirs, pipeline_yaml):
+        pipeline, state = pack_runner.prepare(pipeline_yaml, {})
+        for slot in pipeline.slots:
+            state = pack_runner.begin_slot(slot, pipeline, state)
+        active = project_dirs / "state" / "active"
+        for slot in pipeline.slots:
+            pack = active / f"{state.pipeline_id}-{slot.id}-context.pack.json"
+            assert read_pack(pack) == {"constitution.md": "# Constitution\n"}
+        assert pack_runner._block_store.blocks_written == 1
+        assert pack_runner._block_store.blocks_reused == 1
+
+    def test_prepare_drops_superseded_blocks(self, pack_runner, project_dirs, pipeline_yaml):
+        amended = "# Constitution, amended\n"
+        for text in ("# Constitution\n", amended):
+            (project_dirs / "constitution.md").write_text(text, encoding="utf-8")
+            pipeline, state = pack_runner.prepare(pipeline_yaml, {})
+            for slot in pipeline.slots:
+                state = pack_runner.begin_slot(slot, pipeline, state)
+        store = pack_runner._block_store
+        assert len(store) == 2  # the old constitution is still stored
+        pack_runner.prepare(pipeline_yaml, {})
+        assert len(store) == 1
+        assert store.data_path.read_text(encoding="utf-8") == amended
+        pack = project_dirs / "state" / "active" / f"{state.pipeline_id}-slot-design-context.pack.json"
+        assert read_pack(pack) == {"constitution.md": amended}
+
+    def test_prefetch_stores_blocks_ahead(self, pack_runner, project_dirs, pipeline_yaml,
+                                          monkeypatch):
+        pipeline, state = pack_runner.prepare(pipeline_yaml, {})
+        slot = pipeline.slots[0]
+        pack_runner.prefetch_context(slot, pipeline)
+        assert pack_runner._block_store.blocks_written == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("routed or stored on the critical path")
+
+        monkeypatch.setattr(pack_runner._context_router, "build_context", fail)
+        monkeypatch.setattr(pack_runner._block_store, "put", fail)
+        state = pack_runner.begin_slot(slot, pipeline, state)
+        pack = project_dirs / "state" / "active" / f"{state.pipeline_id}-{slot.id}-context.pack.json"
+        assert read_pack(pack) == {"constitution.md": "# Constitution\n"}
+
+    def test_compaction_drops_prefetched_blocks(self, pack_runner, pipeline_yaml):
+        pipeline, _ = pack_runner.prepare(pipeline_yaml, {})
+        pack_runner.prefetch_context(pipeline.slots[0], pipeline)
+        pack_runner.prepare(pipeline_yaml, {})
+        assert not pack_runner._prefetched_context
+        assert len(pack_runner._block_store) == 0
+
+
+class TestContextPlans:
+    def _runner(self, project_dirs, components=None):
+        constitution = project_dirs / "constitution.md"
+        if not constitution.exists():
+            constitution.write_text("# Constitution\n", encoding="utf-8")
+        return PipelineRunner(
+            project_root=str(project_dirs),
+            templates_dir=str(project_dirs / "templates"),
+            state_dir=str(project_dirs / "state" / "active"),
+            slot_types_dir=str(project_dirs / "slot-types"),
+            agents_dir=str(project_dirs / "agents"),
+            constitution_path=str(project_dirs / "constitution.md"),
+            components=components,
+            context_plans=True,
+        )
+
+    def test_plans_shared_and_persisted(self, project_dirs, pipeline_yaml):
+        runner = self._runner(project_dirs)
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        state = runner.begin_slot(pipeline.slots[0], pipeline, state)
+        assert (project_dirs / "state" / "active" / ".context-plans.json").is_file()
+
+        again = self._runner(project_dirs, components=runner.components)
+        assert again._context_router._plans is runner._context_router._plans
+        fresh = self._runner(project_dirs)
+        pipeline, state = fresh.prepare(pipeline_yaml, {})
+        fresh.begin_slot(pipeline.slots[0], pipeline, state)
+        assert fresh._context_router.plan_hits == 1
+
+    def test_prefetch_warms_begin_slot(self, project_dirs, pipeline_yaml):
+        runner = self._runner(project_dirs)
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        runner.prefetch_context(pipeline.slots[0], pipeline)
+        runner.begin_slot(pipeline.slots[0], pipeline, state)
+        router = runner._context_router
+        assert (router.plan_misses, router.plan_hits) == (1, 0)  # not routed again
+        assert not runner._prefetched_context
+
+    def test_prefetched_yaml_not_reused_after_edit(self, project_dirs, pipeline_yaml):
+        runner = self._runner(project_dirs)
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        slot = pipeline.slots[0]
+        runner.prefetch_context(slot, pipeline)
+        runner._prefetched_context[(pipeline.id, slot.id)].context_yaml = "stale: true\n"
+        constitution = project_dirs / "constitution.md"
+        constitution.write_text("# Constitution, amended\n", encoding="utf-8")
+        os.utime(constitution, ns=(1, 1))
+        state = runner.begin_slot(slot, pipeline, state)
+        context = project_dirs / "state" / "active" / f"{state.pipeline_id}-{slot.id}-context.yaml"
+        assert "stale" not in context.read_text(encoding="utf-8")
+
+    def test_discard_prefetched(self, project_dirs, pipeline_yaml):
+        runner = self._runner(project_dirs)
+        pipeline, _ = runner.prepare(pipeline_yaml, {})
+        for slot in pipeline.slots:
+            runner.prefetch_context(slot, pipeline)
+        runner._prefetched_context[("other-pipeline", "s1")] = object()
+        assert runner.discard_prefetched(pipeline.id) == 2
+        assert list(runner._prefetched_context) == [("other-pipeline", "s1")]
+
+    def test_prefetch_without_router_is_noop(self, runner, pipeline_yaml):
+        pipeline, _ = runner.prepare(pipeline_yaml, {})
+        runner.prefetch_context(pipeline.slots[0], pipeline)
+
+
 # ===================================================================
 # complete_slot
 # ===================================================================
@@ -449,6 +634,66 @@ class TestResume:
         with pytest.raises(PipelineExecutionError, match="yaml_path"):
             runner.resume(state_path)
 
+    def test_resume_reuses_resolved_pipeline(self, runner, pipeline_yaml):
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        state_path = runner._state_tracker.save(state)
+        first, _ = runner.resume(state_path)
+        second, _ = runner.resume(state_path)
+        assert first is second is pipeline
+
+    def test_lifecycle_leaves_cached_pipeline_unchanged(self, project_dirs, pipeline_yaml):
+        """Shared resolved pipelines are never mutated by a runner."""
+        (project_dirs / "constitution.md").write_text("# Constitution\n")
+        runner = PipelineRunner(
+            project_root=str(project_dirs),
+            templates_dir=str(project_dirs / "templates"),
+            state_dir=str(project_dirs / "state" / "active"),
+            slot_types_dir=str(project_dirs / "slot-types"),
+            agents_dir=str(project_dirs / "agents"),
+            constitution_path=str(project_dirs / "constitution.md"),
+            context_packs=True,
+            context_plans=True,
+        )
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        snapshot = copy.deepcopy(pipeline)
+        for slot in pipeline.slots:
+            runner.prefetch_context(slot, pipeline)
+            state = runner.begin_slot(slot, pipeline, state, agent_id="ENG-001")
+            state = runner.complete_slot(slot.id, pipeline, state)
+        runner.resume(runner._state_tracker.save(state))
+        assert state.status == PipelineStatus.COMPLETED
+        assert pipeline == snapshot
+        assert next(iter(runner.components.pipeline_cache.values())) is pipeline
+
+    def test_edited_template_is_reloaded(self, runner, pipeline_yaml):
+        import os
+        from pathlib import Path
+
+        pipeline, _ = runner.prepare(pipeline_yaml, {})
+        path = Path(pipeline_yaml)
+        path.write_text(path.read_text().replace("Test Pipeline", "Edited Pipeline"))
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        edited, _ = runner.prepare(pipeline_yaml, {})
+        assert edited is not pipeline
+        assert edited.name == "Edited Pipeline"
+
+    def test_resumed_saves_update_loaded_file(self, runner, pipeline_yaml, project_dirs):
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        state_path = runner._state_tracker.save(state)
+        fresh = PipelineRunner(
+            project_root=str(project_dirs),
+            templates_dir=str(project_dirs / "templates"),
+            state_dir=str(project_dirs / "state" / "active"),
+            slot_types_dir=str(project_dirs / "slot-types"),
+            agents_dir=str(project_dirs / "agents"),
+        )
+        pipeline, state = fresh.resume(state_path)
+        slot = pipeline.slots[0]
+        fresh.begin_slot(slot, pipeline, state)
+        reloaded = fresh._state_tracker.load(state_path)
+        assert reloaded.slots[slot.id].status == SlotStatus.IN_PROGRESS
+
 
 # ===================================================================
 # _find_slot
@@ -863,3 +1108,44 @@ class TestRetrySlot:
 
         event_types = [e[0] for e in recording_observer.events]
         assert "slot_retrying" in event_types
+
+
+# ===================================================================
+# Profiling
+# ===================================================================
+
+
+class TestProfiling:
+    def test_profile_empty_when_disabled(self, runner, pipeline_yaml):
+        pipeline, state = runner.prepare(pipeline_yaml, {})
+        runner.begin_slot(pipeline.slots[0], pipeline, state)
+        assert runner.get_profile() == {}
+
+    def test_profile_records_stages(self, project_dirs, pipeline_yaml):
+        profiled = PipelineRunner(
+            project_root=str(project_dirs),
+            templates_dir=str(project_dirs / "templates"),
+            state_dir=str(project_dirs / "state" / "active"),
+            slot_types_dir=str(project_dirs / "slot-types"),
+            agents_dir=str(project_dirs / "agents"),
+            profiler=PhaseProfiler(enabled=True),
+        )
+        pipeline, state = profiled.prepare(pipeline_yaml, {})
+        state = profiled.begin_slot(pipeline.slots[0], pipeline, state)
+        profiled.complete_slot("slot-design", pipeline, state)
+
+        profile = profiled.get_profile()
+        for stage in (
+            "prepare", "load", "validate", "registry_load",
+            "slot_type_check", "state_init", "begin_slot",
+            "complete_slot", "gate_check", "state_save",
+            "observer_dispatch",
+        ):
+            assert stage in profile, stage
+        assert profile["gate_check"]["count"] == 2
+        assert profile["prepare"]["total_ms"] >= profile["load"]["total_ms"]
+
+    def test_toggle_via_profiler_property(self, runner, pipeline_yaml):
+        runner.profiler.enabled = True
+        runner.prepare(pipeline_yaml, {})
+        assert runner.get_profile()["prepare"]["count"] == 1
@@ -1,5 +1,8 @@
 """Tests for pipeline.slot_registry -- SlotType loading and agent matching."""
 
+import os
+import time
+
 import pytest
 from pathlib import Path
 
@@ -112,6 +115,30 @@ class TestLoadAgentCapabilities:
         assert agents == {}
 
 
+class TestFrontMatter:
+    def test_body_is_not_read(self, tmp_path):
+        md = tmp_path / "agent.md"
+        # Invalid UTF-8 after the header: decoding the body would fail
+        md.write_bytes(b"---\nagent_id: A-1\n---\n" + b"\xff\xfe" * 500_000)
+        assert SlotRegistry._parse_front_matter(md) == {"agent_id": "A-1"}
+
+    def test_crlf_delimiters(self, tmp_path):
+        md = tmp_path / "agent.md"
+        md.write_bytes(b"---\r\nagent_id: A-1\r\n---\r\n# Body\r\n")
+        assert SlotRegistry._parse_front_matter(md) == {"agent_id": "A-1"}
+
+    def test_unterminated(self, tmp_path):
+        md = tmp_path / "agent.md"
+        md.write_text("---\nagent_id: A-1\n# never closed\n")
+        assert SlotRegistry._parse_front_matter(md) is None
+
+    def test_oversized_header_ignored(self, tmp_path):
+        md = tmp_path / "agent.md"
+        filler = "".join(f"k{i}: {'x' * 60}\n" for i in range(2000))
+        md.write_text(f"---\nagent_id: A-1\n{filler}---\n")
+        assert SlotRegistry._parse_front_matter(md) is None
+
+
 class TestGetSlotType:
     def test_found(self, registry):
         registry.load_slot_types()
@@ -163,6 +190,193 @@ class TestFindCompatibleAgents:
         assert counts == sorted(counts, reverse=True)
 
 
+class TestCapabilityIndex:
+    @staticmethod
+    def _write_agent(agents_dir, name, agent_id, caps):
+        (agents_dir / f"{name}.md").write_text(
+            f"---\nagent_id: {agent_id}\ncapabilities: {list(caps)}\n---\n# {agent_id}\n"
+        )
+
+    def test_compatible_agent_ids(self, registry):
+        assert registry.compatible_agent_ids("implementer") == ["ENG-001"]
+        assert registry.compatible_agent_ids("designer") == ["ARCH-001"]
+
+    def test_same_order_as_find_compatible_agents(self, registry, agents_dir):
+        self._write_agent(agents_dir, "03-second-eng", "ENG-002",
+                          ["python", "yaml", "testing", "git"])
+        registry.load_agent_capabilities()
+        expected = [
+            m.agent_id for m in registry.find_compatible_agents("implementer")
+            if m.is_compatible
+        ]
+        assert registry.compatible_agent_ids("implementer") == expected
+
+    def test_memoized_until_agents_change(self, registry, agents_dir):
+        first = registry.find_compatible_agents("implementer")
+        registry.load_agent_capabilities()  # unchanged files
+        assert registry.find_compatible_agents("implementer") == first
+        assert registry._index is not None
+
+        self._write_agent(agents_dir, "03-new", "NEW-001", ["anything"])
+        registry.load_agent_capabilities()
+        assert registry._index is None
+        ids = [m.agent_id for m in registry.find_compatible_agents("implementer")]
+        assert "NEW-001" in ids
+
+    def test_returned_list_is_a_copy(self, registry):
+        registry.find_compatible_agents("implementer").clear()
+        assert registry.find_compatible_agents("implementer")
+
+    def test_get_agent(self, registry):
+        registry.load_agent_capabilities()
+        assert registry.get_agent("ENG-001").agent_id == "ENG-001"
+        with pytest.raises(KeyError):
+            registry.get_agent("NOPE-001")
+
+    def test_unknown_slot_type(self, registry):
+        with pytest.raises(SlotTypeNotFoundError):
+            registry.compatible_agent_ids("nonexistent")
+
+    def test_matches_linear_scan(self, tmp_path):
+        import random
+
+        rng = random.Random(7)
+        caps = [f"cap-{i}" for i in range(12)]
+        types_dir, agents_dir = tmp_path / "t", tmp_path / "a"
+        types_dir.mkdir()
+        agents_dir.mkdir()
+        for i in range(40):
+            self._write_agent(agents_dir, f"{i:03d}", f"A-{i:03d}",
+                              rng.sample(caps, rng.randint(0, 8)))
+        for i in range(10):
+            required = rng.sample(caps, rng.randint(0, 3))
+            (types_dir / f"t{i}.yaml").write_text(yaml_dump_slot_type(f"t{i}", required))
+
+        reg = SlotRegistry(str(types_dir), str(agents_dir))
+        agents = list(reg.load_agent_capabilities().values())
+        for st_id, st in reg.load_slot_types().items():
+            required = set(st.required_capabilities)
+            expected = sorted(
+                (
+                    (sorted(required & set(a.capabilities)), a.agent_id,
+                     required <= set(a.capabilities))
+                    for a in agents
+                ),
+                key=lambda e: len(e[0]), reverse=True,
+            )
+            got = [
+                (m.matched_capabilities, m.agent_id, m.is_compatible)
+                for m in reg.find_compatible_agents(st_id)
+            ]
+            assert got == expected
+            assert reg.compatible_agent_ids(st_id) == [e[1] for e in expected if e[2]]
+
+
+class TestIncrementalReload:
+    @pytest.fixture
+    def parse_counts(self, monkeypatch):
+        counts = {"slot_types": 0, "agents": 0}
+        orig_st = SlotRegistry._parse_slot_type
+        orig_ag = SlotRegistry._parse_agent
+
+        def count_st(path):
+            counts["slot_types"] += 1
+            return orig_st(path)
+
+        def count_ag(path):
+            counts["agents"] += 1
+            return orig_ag(path)
+
+        monkeypatch.setattr(SlotRegistry, "_parse_slot_type", staticmethod(count_st))
+        monkeypatch.setattr(SlotRegistry, "_parse_agent", staticmethod(count_ag))
+        return counts
+
+    def test_unchanged_files_not_reparsed(self, registry, slot_types_dir, agents_dir,
+                                          parse_counts, backdate):
+        backdate(slot_types_dir, agents_dir)
+        registry.load_slot_types()
+        registry.load_agent_capabilities()
+        assert parse_counts == {"slot_types": 2, "agents": 2}
+        registry.load_slot_types()
+        registry.load_agent_capabilities()
+        assert parse_counts == {"slot_types": 2, "agents": 2}
+
+    def test_changed_file_reparsed(self, registry, slot_types_dir, parse_counts, backdate):
+        backdate(slot_types_dir)
+        registry.load_slot_types()
+        path = slot_types_dir / "designer.yaml"
+        path.write_text(path.read_text().replace("Architecture Designer", "Lead Architect"))
+        os.utime(path, (time.time() - 30, time.time() - 30))
+        types = registry.load_slot_types()
+        assert parse_counts["slot_types"] == 3
+        assert types["designer"].name == "Lead Architect"
+
+    def test_recent_files_always_reparsed(self, registry, parse_counts):
+        registry.load_slot_types()
+        registry.load_slot_types()
+        assert parse_counts["slot_types"] == 4
+
+    def test_added_and_deleted_files(self, registry, slot_types_dir, backdate):
+        backdate(slot_types_dir)
+        registry.load_slot_types()
+        (slot_types_dir / "designer.yaml").unlink()
+        (slot_types_dir / "extra.yaml").write_text(yaml_dump_slot_type("extra", []))
+        types = registry.load_slot_types()
+        assert set(types) == {"implementer", "extra"}
+
+
+class TestRegistryDiskCache:
+    def test_second_process_reads_cache(self, slot_types_dir, agents_dir, tmp_path,
+                                        monkeypatch, backdate):
+        backdate(slot_types_dir, agents_dir)
+        cache = tmp_path / "state" / ".registry-cache.json"
+        first = SlotRegistry(str(slot_types_dir), str(agents_dir), cache_path=str(cache))
+        types = first.load_slot_types()
+        agents = first.load_agent_capabilities()
+        assert cache.exists()
+
+        def boom(path):
+            raise AssertionError(f"re-parsed {path}")
+
+        monkeypatch.setattr(SlotRegistry, "_parse_slot_type", staticmethod(boom))
+        monkeypatch.setattr(SlotRegistry, "_parse_agent", staticmethod(boom))
+        second = SlotRegistry(str(slot_types_dir), str(agents_dir), cache_path=str(cache))
+        assert second.load_slot_types() == types
+        assert second.load_agent_capabilities() == agents
+
+    def test_corrupt_cache_ignored(self, slot_types_dir, agents_dir, tmp_path):
+        cache = tmp_path / "cache.json"
+        cache.write_text("{not json")
+        reg = SlotRegistry(str(slot_types_dir), str(agents_dir), cache_path=str(cache))
+        assert "implementer" in reg.load_slot_types()
+
+    def test_cache_for_other_dirs_ignored(self, slot_types_dir, agents_dir, tmp_path, backdate):
+        backdate(slot_types_dir, agents_dir)
+        cache = tmp_path / "cache.json"
+        SlotRegistry(str(slot_types_dir), str(agents_dir), cache_path=str(cache)).load_slot_types()
+        other = tmp_path / "other-types"
+        other.mkdir()
+        reg = SlotRegistry(str(other), str(agents_dir), cache_path=str(cache))
+        assert reg.load_slot_types() == {}
+
+    def test_recent_files_not_persisted(self, slot_types_dir, agents_dir, tmp_path):
+        import json
+
+        cache = tmp_path / "cache.json"
+        reg = SlotRegistry(str(slot_types_dir), str(agents_dir), cache_path=str(cache))
+        reg.load_slot_types()
+        assert json.loads(cache.read_text())["slot_types"] == {}
+
+
+def yaml_dump_slot_type(st_id, required):
+    import yaml
+
+    return yaml.safe_dump({"slot_type": {
+        "id": st_id, "name": st_id, "category": "engineering",
+        "required_capabilities": required,
+    }})
+
+
 class TestValidateAssignment:
     def test_valid_assignment(self, registry):
         registry.load_slot_types()
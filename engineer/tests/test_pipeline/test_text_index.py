@@ -0,0 +1,171 @@
+"""Tests for pipeline.text_index -- offline BM25 ranking."""
+
+import json
+
+from src.pipeline.text_index import (
+    BM25Index,
+    IncrementalBM25Index,
+    fingerprint,
+    load_index,
+    load_or_build,
+    save_index,
+    tokenize,
+)
+
+DOCS = {
+    "hotfix": "Hotfix. Emergency bug fix for a production crash.",
+    "research": "Research task. Investigate and analyze options. 调研 技术方案",
+    "quant": "Quant strategy. 量化交易策略 backtest a trading signal.",
+    "feature": "Standard feature. Design, implement and test a new feature.",
+}
+
+
+class TestTokenize:
+    def test_words_lowercased_stopwords_dropped(self):
+        assert tokenize("Fix THE login-page bug") == ["fix", "login", "page", "bug"]
+
+    def test_cjk_bigrams(self):
+        assert tokenize("量化交易") == ["量化", "化交", "交易"]
+
+    def test_single_cjk_char(self):
+        assert tokenize("修 bug") == ["修", "bug"]
+
+    def test_mixed_runs_split(self):
+        assert tokenize("alpha策略v2") == ["alpha", "策略", "v2"]
+
+
+class TestBM25Index:
+    def test_ranks_relevant_document_first(self):
+        index = BM25Index(DOCS)
+        assert index.search("fix the production crash")[0][0] == "hotfix"
+        assert index.search("请做量化策略")[0][0] == "quant"
+
+    def test_no_shared_terms(self):
+        assert BM25Index(DOCS).search("xyzzy") == []
+
+    def test_empty_index(self):
+        index = BM25Index({})
+        assert len(index) == 0
+        assert index.search("anything") == []
+
+    def test_limit(self):
+        assert len(BM25Index(DOCS).search("feature research hotfix quant", limit=2)) == 2
+
+    def test_normalized_scores_in_range(self):
+        for _, score in BM25Index(DOCS).search("design implement test feature"):
+            assert 0.0 < score <= 1.0
+
+    def test_unknown_terms_lower_normalized_score(self):
+        index = BM25Index(DOCS)
+        full = dict(index.search("backtest"))["quant"]
+        diluted = dict(index.search("backtest xyzzy plugh"))["quant"]
+        assert diluted < full
+
+    def test_rare_terms_weigh_more(self):
+        docs = {"a": "deploy service", "b": "deploy service", "c": "deploy canary"}
+        scores = dict(BM25Index(docs).search("deploy canary", normalize=False))
+        assert scores["c"] > scores["a"] == scores["b"]
+
+    def test_scores_vector(self):
+        index = BM25Index(DOCS)
+        scores = index.scores("backtest")
+        assert len(scores) == len(DOCS)
+        assert scores[index.doc_ids.index("quant")] > 0
+        assert scores[index.doc_ids.index("hotfix")] == 0
+
+    def test_round_trip(self):
+        index = BM25Index(DOCS)
+        restored = BM25Index.from_dict(json.loads(json.dumps(index.to_dict())))
+        for query in ("fix crash", "量化策略", "new feature"):
+            assert restored.search(query) == index.search(query)
+
+
+class TestIncrementalBM25Index:
+    def test_matches_static_index(self):
+        static = BM25Index(DOCS)
+        index = IncrementalBM25Index()
+        for doc_id, text in DOCS.items():
+            index.add(doc_id, text)
+        for query in ("fix the production crash", "请做量化策略", "design a feature"):
+            expected = static.search(query, limit=None)
+            got = index.search(query, limit=None)
+            assert [d for d, _ in got] == [d for d, _ in expected]
+            for (_, a), (_, b) in zip(got, expected):
+                assert abs(a - b) < 1e-9
+
+    def test_remove_and_replace(self):
+        index = IncrementalBM25Index()
+        index.add("a", "retry failed slots")
+        index.add("b", "render the report")
+        assert index.search("retry")[0][0] == "a"
+        index.add("a", "render charts")
+        assert index.search("retry") == []
+        assert index.remove("b")
+        assert not index.remove("b")
+        assert index.doc_ids == ["a"]
+        assert index.vocabulary_size == 2
+
+    def test_weights_recomputed_after_change(self):
+        index = IncrementalBM25Index()
+        index.add("a", "retry")
+        before = index.search("retry", normalize=False)[0][1]
+        index.add("b", "retry twice")
+        index.add("c", "unrelated text")
+        after = dict(index.search("retry", normalize=False))
+        assert after["a"] != before
+        assert set(after) == {"a", "b"}
+
+    def test_term_counts_round_trip(self):
+        index = IncrementalBM25Index()
+        index.add("a", "retry retry slots")
+        copy = IncrementalBM25Index()
+        copy.add_counts("a", index.term_counts("a"))
+        assert copy.search("retry slots") == index.search("retry slots")
+        assert index.term_counts("a") == {"retry": 2, "slots": 1}
+
+    def test_empty(self):
+        index = IncrementalBM25Index()
+        assert len(index) == 0
+        assert index.search("anything") == []
+
+
+class TestPersistence:
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / "index.json"
+        key = fingerprint(DOCS)
+        assert save_index(BM25Index(DOCS), path, key)
+        loaded = load_index(path, key)
+        assert loaded is not None
+        assert loaded.search("fix crash") == BM25Index(DOCS).search("fix crash")
+
+    def test_fingerprint_mismatch(self, tmp_path):
+        path = tmp_path / "index.json"
+        save_index(BM25Index(DOCS), path, fingerprint(DOCS))
+        changed = dict(DOCS, hotfix="Something else")
+        assert load_index(path, fingerprint(changed)) is None
+
+    def test_missing_or_corrupt(self, tmp_path):
+        path = tmp_path / "index.json"
+        assert load_index(path, "x") is None
+        path.write_text("{not json")
+        assert load_index(path, "x") is None
+
+    def test_load_or_build_persists_once(self, tmp_path, monkeypatch):
+        path = tmp_path / "index.json"
+        load_or_build(DOCS, path)
+        assert path.exists()
+
+        def fail(*a, **kw):
+            raise AssertionError("index rebuilt")
+
+        monkeypatch.setattr(BM25Index, "__init__", fail)
+        assert load_or_build(DOCS, path).search("crash")[0][0] == "hotfix"
+
+    def test_load_or_build_without_path(self, tmp_path):
+        assert load_or_build(DOCS, None).search("crash")[0][0] == "hotfix"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unwritable_location_is_not_fatal(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        assert not save_index(BM25Index(DOCS), blocker / "index.json", "x")
@@ -0,0 +1,96 @@
+"""Tests for pipeline.token_estimator -- per-class token estimates."""
+
+import json
+import random
+
+import pytest
+
+from src.pipeline.token_estimator import (
+    DEFAULT_RATES,
+    FEATURES,
+    TokenEstimator,
+    calibrate,
+    char_estimate,
+    estimate_tokens,
+    features,
+)
+
+
+class TestFeatures:
+    def test_ascii_classes(self):
+        counts = features("Fix bug #42,\n  now")
+        assert counts["words"] == 3
+        assert counts["letters"] == 9
+        assert counts["digits"] == 2
+        assert counts["punct"] == 2
+        assert counts["spaces"] == 4
+        assert counts["newlines"] == 1
+
+    def test_scripts(self):
+        counts = features("量化交易，café Привет 한국 🙂")
+        assert counts["cjk"] == 4
+        assert counts["wide"] == 3  # fullwidth comma, two Hangul syllables
+        assert counts["latin"] == 7  # é + six Cyrillic letters
+        assert counts["astral"] == 1
+
+    def test_empty(self):
+        assert features("") == dict.fromkeys(FEATURES, 0)
+        assert estimate_tokens("") == 0
+
+    def test_lone_surrogate_does_not_raise(self):
+        assert features("a\udc80b")["letters"] == 2
+
+
+class TestTokenEstimator:
+    def test_chinese_costs_about_a_token_per_character(self):
+        text = "量化交易策略的回测与风险控制" * 10
+        assert estimate_tokens(text) == len(text)
+        assert char_estimate(text) < len(text) / 3
+
+    def test_indentation_cheaper_than_chars(self):
+        text = "slots:\n" + "".join(f"        - id: slot{i}\n" for i in range(20))
+        assert estimate_tokens(text) < char_estimate(text)
+
+    def test_english_close_to_char_estimate(self):
+        text = "The router loads the constitution and the slot's overviews first. " * 20
+        assert 0.8 < estimate_tokens(text) / char_estimate(text) < 1.3
+
+    def test_custom_rates(self):
+        estimate = TokenEstimator({"cjk": 2.0})
+        assert estimate("量化 trading") == 4
+        assert estimate.rates["words"] == 0.0
+
+    def test_invalid_rates(self):
+        with pytest.raises(ValueError):
+            TokenEstimator({"emoji": 1.0})
+        with pytest.raises(ValueError):
+            TokenEstimator({"cjk": -1.0})
+
+    def test_round_trip(self):
+        estimate = TokenEstimator({"cjk": 1.5, "words": 1.0})
+        data = json.loads(json.dumps(estimate.to_dict()))
+        assert TokenEstimator.from_dict(data) == estimate
+        assert TokenEstimator() == estimate_tokens
+
+
+class TestCalibrate:
+    def test_recovers_reference_rates(self):
+        reference = TokenEstimator({**DEFAULT_RATES, "cjk": 1.4, "words": 1.1})
+        rng = random.Random(3)
+        pieces = ["word ", "identifier_name ", "42 ", "量化", "：", "\n", "    ", "é", ". "]
+        samples = []
+        for _ in range(200):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(20, 80)))
+            samples.append((text, sum(reference._rates[f] * n for f, n in features(text).items())))
+        rates = calibrate(samples, ridge=1e-6).rates
+        assert rates["cjk"] == pytest.approx(1.4, abs=1e-3)
+        assert rates["words"] == pytest.approx(1.1, abs=1e-3)
+
+    def test_unseen_features_keep_prior(self):
+        estimate = calibrate([("plain words only", 3)] * 5)
+        assert estimate.rates["astral"] == DEFAULT_RATES["astral"]
+        assert estimate.rates["cjk"] == DEFAULT_RATES["cjk"]
+
+    def test_rates_clipped_at_zero(self):
+        estimate = calibrate([("a b c d e f", 0)] * 50, ridge=1e-6)
+        assert all(rate >= 0 for rate in estimate.rates.values())
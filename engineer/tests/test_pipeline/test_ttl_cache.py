@@ -0,0 +1,105 @@
+"""Tests for pipeline.ttl_cache -- TTL cache with JSON persistence."""
+
+import pickle
+
+from src.pipeline.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def test_get_put(self):
+        cache = TTLCache(60)
+        assert cache.get("k") is None
+        assert cache.get("k", "default") == "default"
+        cache.put("k", [1, 2])
+        assert cache.get("k") == [1, 2]
+        assert len(cache) == 1
+
+    def test_expiry(self):
+        clock = FakeClock()
+        cache = TTLCache(60, clock=clock)
+        cache.put("k", "v")
+        clock.now += 59
+        assert cache.get("k") == "v"
+        clock.now += 1
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_zero_ttl_disables(self):
+        cache = TTLCache(0)
+        cache.put("k", "v")
+        assert cache.get("k") is None
+
+    def test_max_entries_evicts_oldest(self):
+        clock = FakeClock()
+        cache = TTLCache(60, max_entries=2, clock=clock)
+        for key in ("a", "b", "c"):
+            cache.put(key, key)
+            clock.now += 1
+        assert cache.get("a") is None
+        assert cache.get("b") == "b" and cache.get("c") == "c"
+
+    def test_put_refreshes_entry(self):
+        clock = FakeClock()
+        cache = TTLCache(60, clock=clock)
+        cache.put("k", 1)
+        clock.now += 50
+        cache.put("k", 2)
+        clock.now += 50
+        assert cache.get("k") == 2
+
+    def test_invalidate_and_clear(self):
+        cache = TTLCache(60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_pickle(self):
+        cache = TTLCache(60)
+        cache.put("k", "v")
+        assert pickle.loads(pickle.dumps(cache)).get("k") == "v"
+
+
+class TestPersistence:
+    def test_survives_new_instance(self, tmp_path):
+        path = tmp_path / "cache.json"
+        TTLCache(60, path=path).put("k", {"a": 1})
+        assert TTLCache(60, path=path).get("k") == {"a": 1}
+
+    def test_expired_entries_not_loaded(self, tmp_path):
+        path = tmp_path / "cache.json"
+        clock = FakeClock()
+        TTLCache(60, path=path, clock=clock).put("k", "v")
+        clock.now += 61
+        assert TTLCache(60, path=path, clock=clock).get("k") is None
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        path = tmp_path / "cache.json"
+        path.write_text("{not json")
+        cache = TTLCache(60, path=path)
+        assert cache.get("k") is None
+        cache.put("k", "v")
+        assert TTLCache(60, path=path).get("k") == "v"
+
+    def test_unwritable_path_is_not_fatal(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        cache = TTLCache(60, path=blocker / "cache.json")
+        cache.put("k", "v")
+        assert cache.get("k") == "v"
+
+    def test_unserializable_value_is_not_fatal(self, tmp_path):
+        path = tmp_path / "cache.json"
+        cache = TTLCache(60, path=path)
+        cache.put("k", object())
+        assert not list(tmp_path.glob("*.tmp"))
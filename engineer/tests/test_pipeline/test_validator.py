@@ -109,6 +109,55 @@ class TestCheckDag:
         assert result.is_valid is False
         assert any("cycle" in e.lower() for e in result.errors)
 
+    def test_reports_cycle_not_blocked_slots(self, validator):
+        slots = [
+            Slot(id="a", slot_type="x", name="A", depends_on=["c"]),
+            Slot(id="b", slot_type="x", name="B", depends_on=["a"]),
+            Slot(id="c", slot_type="x", name="C", depends_on=["b"]),
+            Slot(id="d", slot_type="x", name="D", depends_on=["a"]),
+        ]
+        errors = validator.check_dag(slots)
+        assert len(errors) == 1
+        cycle = errors[0].split(": ", 1)[1].split(" (")[0]
+        assert cycle == "a -> c -> b -> a"
+
+    def test_shortest_cycle_in_component(self, validator):
+        slots = [
+            Slot(id="a", slot_type="x", name="A", depends_on=["b", "c"]),
+            Slot(id="b", slot_type="x", name="B", depends_on=["c"]),
+            Slot(id="c", slot_type="x", name="C", depends_on=["a"]),
+        ]
+        assert "a -> c -> a" in validator.check_dag(slots)[0]
+
+    def test_one_error_per_cycle(self, validator):
+        slots = [
+            Slot(id="a", slot_type="x", name="A", depends_on=["a"]),
+            Slot(id="b", slot_type="x", name="B", depends_on=["c"]),
+            Slot(id="c", slot_type="x", name="C", depends_on=["b"]),
+        ]
+        errors = validator.check_dag(slots)
+        assert len(errors) == 2
+        assert "a -> a" in errors[0]
+        assert "b -> c -> b" in errors[1]
+
+    def test_duplicate_ids_not_a_cycle(self, validator):
+        slots = [
+            Slot(id="a", slot_type="x", name="A"),
+            Slot(id="a", slot_type="x", name="A again"),
+            Slot(id="b", slot_type="x", name="B", depends_on=["a"]),
+        ]
+        assert validator.check_dag(slots) == []
+
+    def test_long_cycle_without_recursion_limit(self, validator):
+        n = 20000
+        slots = [
+            Slot(id=f"s{i}", slot_type="x", name=f"S{i}", depends_on=[f"s{(i + 1) % n}"])
+            for i in range(n)
+        ]
+        errors = validator.check_dag(slots)
+        assert len(errors) == 1
+        assert errors[0].count("->") == n
+
 
 class TestTopologicalSort:
     def test_linear_sort(self, validator):
@@ -142,6 +191,23 @@ class TestTopologicalSort:
         with pytest.raises(PipelineCycleError, match="cycle"):
             validator.topological_sort(slots)
 
+    def test_cycle_error_names_cycle(self, validator):
+        slots = [
+            Slot(id="a", slot_type="x", name="A"),
+            Slot(id="b", slot_type="x", name="B", depends_on=["a", "c"]),
+            Slot(id="c", slot_type="x", name="C", depends_on=["b"]),
+        ]
+        with pytest.raises(PipelineCycleError, match="b -> c -> b"):
+            validator.topological_sort(slots)
+
+    def test_stable_order(self, validator):
+        slots = [
+            Slot(id="c", slot_type="x", name="C"),
+            Slot(id="a", slot_type="x", name="A", depends_on=["c"]),
+            Slot(id="b", slot_type="x", name="B"),
+        ]
+        assert validator.topological_sort(slots) == ["c", "b", "a"]
+
     def test_single_slot(self, validator):
         slots = [Slot(id="only", slot_type="x", name="Only")]
         order = validator.topological_sort(slots)